@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# benchmarks/json_decode.py - Velocidad de decodificación de listas de pods según el backend JSON
+
+"""
+Genera una lista de pods sintética con el volumen típico de un pod real
+(managedFields, annotations, env, volumes, probes) y mide cuánto tarda
+cada backend de JsonDecoder en decodificarla, desde bytes (como la salida
+de kubectl) y desde un archivo mapeado en memoria (--from-file). Con
+msgspec se mide también la decodificación tipada (PodListSchema), que
+descarta los campos que krca no usa.
+
+Uso:
+    python benchmarks/json_decode.py [--deployments 200] [--replicas 50] [--repeat 5]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from krca.decoding import JsonDecoder
+from spec_memory import make_pods
+
+def enrich(payload: str) -> bytes:
+    """Agrega a cada pod los campos voluminosos que krca no lee"""
+    pods = json.loads(payload)
+    for pod in pods["items"]:
+        name = pod["metadata"]["name"]
+        pod["metadata"]["annotations"] = {
+            "kubectl.kubernetes.io/restartedAt": "2024-05-01T10:00:00Z",
+            "prometheus.io/scrape": "true",
+            "checksum/config": "9f2c" * 16,
+        }
+        pod["metadata"]["managedFields"] = [{
+            "manager": "kube-controller-manager", "operation": "Update", "apiVersion": "v1",
+            "time": "2024-05-01T10:00:00Z", "fieldsType": "FieldsV1",
+            "fieldsV1": {f"f:{key}": {} for key in ("metadata", "spec", "status", "labels", "ownerReferences")},
+        }] * 3
+        for container in pod["spec"]["containers"]:
+            container["image"] = f"registry.example.com/team/{name.split('-')[1]}:1.2.3"
+            container["env"] = [{"name": f"VAR_{i}", "value": f"value-{i}"} for i in range(15)]
+            container["ports"] = [{"containerPort": 8080, "protocol": "TCP"}]
+            container["livenessProbe"] = {"httpGet": {"path": "/healthz", "port": 8080}, "periodSeconds": 10}
+            container["volumeMounts"] = [{"name": "config", "mountPath": "/etc/app"}]
+        pod["spec"]["volumes"] = [{"name": "config", "configMap": {"name": "app-config"}}]
+        pod["status"]["conditions"] = [
+            {"type": kind, "status": "True", "lastTransitionTime": "2024-05-01T10:00:00Z"}
+            for kind in ("Initialized", "Ready", "ContainersReady", "PodScheduled")
+        ]
+    return json.dumps(pods).encode()
+
+def best(function, repeat: int) -> float:
+    """Mejor tiempo de `repeat` ejecuciones (segundos)"""
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - started)
+    return min(times)
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Decodificación de pods por backend JSON")
+    parser.add_argument("--deployments", type=int, default=200)
+    parser.add_argument("--replicas", type=int, default=50)
+    parser.add_argument("--containers", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    data = enrich(make_pods(args.deployments, args.replicas, args.containers))
+    size = len(data) / 2**20
+    print(f"{args.deployments * args.replicas} pods, {size:.1f} MiB de JSON")
+    print(f"Backends instalados: {', '.join(JsonDecoder.available())}\n")
+
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as f:
+        f.write(data)
+        path = f.name
+    try:
+        cases = []
+        for backend in JsonDecoder.available():
+            JsonDecoder.configure(backend)
+            cases.append((f"{backend} bytes", lambda backend=backend: JsonDecoder.loads(data, backend)))
+            if backend == "msgspec":
+                cases.append(("msgspec tipado bytes", lambda: JsonDecoder.loads_pods(data, "msgspec")))
+            typed = " tipado" if backend == "msgspec" else ""
+            cases.append((f"{backend}{typed} archivo (mmap)",
+                          lambda backend=backend: (JsonDecoder.configure(backend), JsonDecoder.load_file(path, pods=True))))
+        cases.append(("json str (antes)", lambda: json.loads(data.decode())))
+
+        baseline = None
+        print(f"{'BACKEND':30}  {'SEG':>7}  {'MiB/s':>7}  {'VS JSON':>7}")
+        for label, function in sorted(cases, key=lambda case: case[0] != "json str (antes)"):
+            elapsed = best(function, args.repeat)
+            baseline = baseline or elapsed
+            print(f"{label:30}  {elapsed:7.3f}  {size / elapsed:7.1f}  {baseline / elapsed:6.1f}x")
+    finally:
+        os.unlink(path)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
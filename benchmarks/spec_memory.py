@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# benchmarks/spec_memory.py - Memoria de los recursos por contenedor con y sin SpecCache
+
+"""
+Genera una lista de pods sintética (Deployments con muchas réplicas, como
+la que devuelve `kubectl get pods -o json`) y mide con tracemalloc la
+memoria de los registros de container_records y la que retiene el
+AnalysisResult de collect() una vez liberado el JSON de los pods. Cada
+medición se hace con la caché de plantillas e internado desactivados y
+activados.
+
+Uso:
+    python benchmarks/spec_memory.py [--deployments 200] [--replicas 50] [--containers 2]
+"""
+
+import argparse
+import gc
+import json
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from krca import KRCAnalyzer, KubectlClient, parse_args
+
+def make_pods(deployments: int, replicas: int, containers: int) -> str:
+    """JSON de la lista de pods (se parsea en cada corrida para tener textos nuevos)"""
+    items = []
+    for d in range(deployments):
+        namespace = f"team-{d % 20}"
+        template_hash = f"{d:08x}5f"
+        for r in range(replicas):
+            items.append({
+                "metadata": {
+                    "name": f"app-{d}-{template_hash}-{r:05d}",
+                    "namespace": namespace,
+                    "uid": f"pod-{d}-{r}",
+                    "labels": {"app": f"app-{d}", "pod-template-hash": template_hash},
+                    "ownerReferences": [{
+                        "kind": "ReplicaSet", "name": f"app-{d}-{template_hash}",
+                        "uid": f"rs-{d}", "controller": True
+                    }],
+                },
+                "spec": {
+                    "nodeName": f"node-{r % 40}",
+                    "containers": [{
+                        "name": f"c{c}",
+                        "resources": {
+                            "requests": {"cpu": "250m", "memory": "256Mi"},
+                            "limits": {"cpu": "1", "memory": "512Mi"},
+                        },
+                    } for c in range(containers)],
+                },
+                "status": {
+                    "phase": "Running",
+                    "hostIP": f"10.0.0.{r % 40}",
+                    "containerStatuses": [{
+                        "name": f"c{c}", "restartCount": 0, "state": {"running": {}}
+                    } for c in range(containers)],
+                },
+            })
+    return json.dumps({"items": items})
+
+def collect(pods: dict):
+    return KRCAnalyzer(parse_args(["-A"])).collect(pods, metrics={})
+
+def extract(pods: dict):
+    return [KubectlClient.container_records(pod, include_all=True) for pod in pods["items"]]
+
+def measure(payload: str, enabled: bool, function) -> tuple:
+    """(memoria retenida sin el JSON de los pods, pico sobre el JSON) en bytes"""
+    KubectlClient.specs.clear()
+    KubectlClient.specs.enabled = enabled
+    gc.collect()
+    tracemalloc.start()
+    pods = json.loads(payload)
+    base = tracemalloc.get_traced_memory()[0]
+    result = function(pods)
+    peak = tracemalloc.get_traced_memory()[1]
+    if function is extract:
+        # Los registros sin caché apuntan a textos del JSON: se cuenta solo lo agregado
+        retained = tracemalloc.get_traced_memory()[0] - base
+    else:
+        del pods
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return retained, peak - base
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Memoria de collect() con y sin SpecCache")
+    parser.add_argument("--deployments", type=int, default=200)
+    parser.add_argument("--replicas", type=int, default=50)
+    parser.add_argument("--containers", type=int, default=2)
+    args = parser.parse_args()
+
+    payload = make_pods(args.deployments, args.replicas, args.containers)
+    pods = args.deployments * args.replicas
+    print(f"{pods} pods, {pods * args.containers} contenedores")
+    for title, function in (("container_records", extract), ("KRCAnalyzer.collect", collect)):
+        print(f"\n{title}:")
+        results = {}
+        for label, enabled in (("sin caché", False), ("con caché", True)):
+            retained, peak = measure(payload, enabled, function)
+            results[enabled] = retained
+            print(f"  {label:10}  retenido {retained / 2**20:8.1f} MiB  pico sobre el JSON {peak / 2**20:8.1f} MiB")
+        print(f"  reducción de memoria retenida: {results[False] / max(results[True], 1):.1f}x")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
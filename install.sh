@@ -21,10 +21,29 @@ FILES=(
     "krca/__init__.py"
     "krca/utils.py"
     "krca/models.py"
+    "krca/decoding.py"
+    "krca/specs.py"
     "krca/kubectl.py"
+    "krca/async_kubectl.py"
     "krca/colorizer.py"
     "krca/exporter.py"
+    "krca/table.py"
     "krca/cli.py"
+    "krca/recommender.py"
+    "krca/aggregator.py"
+    "krca/nodes.py"
+    "krca/quotas.py"
+    "krca/selection.py"
+    "krca/deadline.py"
+    "krca/oom.py"
+    "krca/sampling.py"
+    "krca/snapshot.py"
+    "krca/policy.py"
+    "krca/merge.py"
+    "krca/tui.py"
+    "krca/cost.py"
+    "krca/autoscalers.py"
+    "krca/server.py"
     "krca/core.py"
     "scripts/krca"
     "scripts/krca-wrapper.sh"
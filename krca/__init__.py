@@ -8,21 +8,27 @@ __license__ = "GLP3.0"
 
 # Importaciones públicas (API del paquete)
 from .cli import parse_args, show_help
-from .core import analyze_resources
+from .core import analyze_resources, collect_resources, KRCAnalyzer
 from .colorizer import ResourceColorizer
-from .kubectl import KubectlClient, KubectlError
+from .kubectl import KubectlClient, KubectlError, DeadlineExceeded
+from .async_kubectl import AsyncKubectlClient
 from .exporter import Exporter
+from .policy import PolicyIndex
+from .recommender import ResourceRecommender
 from .utils import KRCAUtils
 from .models import (
     ContainerResources,
     ContainerMetrics,
+    ContainerStatus,
     PodStatus,
     PodData,
     ClusterStats,
     Thresholds,
     ExportConfig,
     ColumnDefinition,
-    AnalysisResult
+    AnalysisResult,
+    RecommendationPolicy,
+    ResourceRecommendation
 )
 
 # Aliases para facilitar el acceso
@@ -32,17 +38,23 @@ KRCA = analyze_resources
 __all__ = [
     # Funciones principales
     'analyze_resources',
+    'collect_resources',
     'KRCA',
     
     # Clases de servicio
+    'KRCAnalyzer',
     'ResourceColorizer',
     'KubectlClient',
+    'AsyncKubectlClient',
     'Exporter',
+    'PolicyIndex',
     'KRCAUtils',
+    'ResourceRecommender',
     
     # Modelos de datos
     'ContainerResources',
     'ContainerMetrics',
+    'ContainerStatus',
     'PodStatus',
     'PodData',
     'ClusterStats',
@@ -50,6 +62,8 @@ __all__ = [
     'ExportConfig',
     'ColumnDefinition',
     'AnalysisResult',
+    'RecommendationPolicy',
+    'ResourceRecommendation',
     
     # Utilidades
     'parse_args',
@@ -57,6 +71,7 @@ __all__ = [
     
     # Excepciones
     'KubectlError',
+    'DeadlineExceeded',
     
     # Metadata
     '__version__',
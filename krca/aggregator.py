@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# krca/aggregator.py - Agregación de filas por workload, namespace o nodo
+
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+from .colorizer import ResourceColorizer
+from .utils import KRCAUtils
+
+# Columnas de agrupación según el modo --group-by
+GROUP_HEADERS = {
+    'workload': ["NAMESPACE", "WORKLOAD", "CONTAINER"],
+    'namespace': ["NAMESPACE"],
+    'node': ["NODE"],
+}
+
+# Columnas de estadísticas comunes a todos los modos
+STAT_HEADERS = [
+    "COUNT",
+    "CPU_SUM", "CPU_MIN", "CPU_MAX", "CPU_P95", "REQ_CPU", "LIM_CPU",
+    "MEM_SUM", "MEM_MIN", "MEM_MAX", "MEM_P95", "REQ_MEM", "LIM_MEM",
+]
+
+# Marca de un grupo cuyos contenedores tienen umbrales de política distintos
+MIXED = ()
+
+class _GroupStats:
+    """Acumulador de un grupo: conteo, muestras de uso y sumas de requests/limits"""
+
+    __slots__ = ("count", "cpu", "memory", "req_cpu", "lim_cpu", "req_mem", "lim_mem",
+                 "cpu_matched", "mem_matched", "cpu_partial", "mem_partial", "thresholds")
+
+    def __init__(self):
+        self.count = 0
+        self.cpu = array('d')
+        self.memory = array('d')
+        # Sumas de requests/limits; None mientras ningún contenedor lo defina
+        self.req_cpu = None
+        self.lim_cpu = None
+        self.req_mem = None
+        self.lim_mem = None
+        # [uso, request, limit] sumados solo sobre los contenedores que definen los tres:
+        # el color compara el mismo conjunto de contenedores de cada lado
+        self.cpu_matched = [0.0, 0.0, 0.0]
+        self.mem_matched = [0.0, 0.0, 0.0]
+        # Algún contenedor con uso no define request o limit (cobertura parcial)
+        self.cpu_partial = False
+        self.mem_partial = False
+        # Umbrales de la política de sus contenedores; MIXED si no coinciden
+        self.thresholds = None
+
+class UsageAggregator:
+    """Agrupa filas de contenedores en una sola pasada de hash-aggregation"""
+
+    def __init__(self, group_by: str):
+        if group_by not in GROUP_HEADERS:
+            raise ValueError(f"Modo de agrupación no soportado: {group_by}")
+        self.group_by = group_by
+        self.headers = GROUP_HEADERS[group_by] + STAT_HEADERS
+        self.groups: Dict[Tuple[str, ...], _GroupStats] = {}
+
+    def _group_key(self, row: List) -> Tuple[str, ...]:
+        """Clave de agrupación para una fila completa de KRCAnalyzer"""
+        if self.group_by == 'workload':
+            return (row[0], row[13], row[2])
+        if self.group_by == 'namespace':
+            return (row[0],)
+        return (row[12],)
+
+    @staticmethod
+    def _accumulate(current, value):
+        """Suma ignorando valores no definidos"""
+        if value is None:
+            return current
+        return value if current is None else current + value
+
+    @staticmethod
+    def _match(matched: List[float], usage, request, limit) -> bool:
+        """Suma uso, request y limit si el contenedor define los tres (False si falta request o limit)"""
+        if usage is None:
+            return True
+        if request is None or limit is None:
+            return False
+        matched[0] += usage
+        matched[1] += request
+        matched[2] += limit
+        return True
+
+    def add(self, row: List, thresholds: Optional[Tuple[int, int, int, int]] = None) -> None:
+        """
+        Acumula una fila (formato de KRCAnalyzer._process_pod_data)
+
+        thresholds son los umbrales de la fila según la política (--policy), si hay
+        """
+        key = self._group_key(row)
+        stats = self.groups.get(key)
+        if stats is None:
+            stats = self.groups[key] = _GroupStats()
+
+        stats.count += 1
+        if thresholds is not None and stats.thresholds != thresholds:
+            stats.thresholds = thresholds if stats.thresholds is None else MIXED
+        # Uso exacto (CPU_NANOCORES, MEMORY_BYTES) si la fila lo trae; si no, el texto de la tabla
+        cpu = row[15] / 1_000_000 if row[15] is not None else KRCAUtils.parse_cpu_millicores(row[3])
+        memory = row[16] if row[16] is not None else KRCAUtils.parse_memory_bytes(row[6])
+        if cpu is not None:
+            stats.cpu.append(cpu)
+        if memory is not None:
+            stats.memory.append(memory)
+
+        req_cpu, lim_cpu = KRCAUtils.parse_cpu_millicores(row[4]), KRCAUtils.parse_cpu_millicores(row[5])
+        req_mem, lim_mem = KRCAUtils.parse_memory_bytes(row[7]), KRCAUtils.parse_memory_bytes(row[8])
+        stats.req_cpu = self._accumulate(stats.req_cpu, req_cpu)
+        stats.lim_cpu = self._accumulate(stats.lim_cpu, lim_cpu)
+        stats.req_mem = self._accumulate(stats.req_mem, req_mem)
+        stats.lim_mem = self._accumulate(stats.lim_mem, lim_mem)
+        if not self._match(stats.cpu_matched, cpu, req_cpu, lim_cpu):
+            stats.cpu_partial = True
+        if not self._match(stats.mem_matched, memory, req_mem, lim_mem):
+            stats.mem_partial = True
+
+    @staticmethod
+    def _cpu(value) -> str:
+        return "<none>" if value is None else KRCAUtils.format_cpu(value, canonical=False)
+
+    @staticmethod
+    def _memory(value) -> str:
+        return "<none>" if value is None else KRCAUtils.format_memory(value)
+
+    @staticmethod
+    def _summary(values: array) -> Tuple:
+        """(suma, mínimo, máximo, p95) de un array de muestras, o None si está vacío"""
+        if not values:
+            return (None, None, None, None)
+        ordered = sorted(values)
+        return (sum(ordered), ordered[0], ordered[-1], KRCAUtils.percentile(ordered, 95))
+
+    def rows(self) -> List[List[str]]:
+        """Filas agregadas (sin color), ordenadas por clave de grupo"""
+        result = []
+        for key in sorted(self.groups):
+            stats = self.groups[key]
+            cpu_sum, cpu_min, cpu_max, cpu_p95 = self._summary(stats.cpu)
+            mem_sum, mem_min, mem_max, mem_p95 = self._summary(stats.memory)
+            result.append(list(key) + [
+                str(stats.count),
+                self._cpu(cpu_sum), self._cpu(cpu_min), self._cpu(cpu_max), self._cpu(cpu_p95),
+                self._cpu(stats.req_cpu), self._cpu(stats.lim_cpu),
+                self._memory(mem_sum), self._memory(mem_min), self._memory(mem_max), self._memory(mem_p95),
+                self._memory(stats.req_mem), self._memory(stats.lim_mem),
+            ])
+        return result
+
+    @staticmethod
+    def _colors(matched: List[float], partial: bool, thresholds: Tuple[int, int, int, int]) -> List[str]:
+        """Colores de uso (4 columnas), request y limit de un recurso del grupo"""
+        usage, request, limit = matched
+        if not request and not limit:
+            # Ningún contenedor con uso define request y limit: sin referencia (blanco)
+            usage = request = limit = None
+        usage_color, request_color, limit_color = ResourceColorizer.resource_colors(
+            usage, request, limit, *thresholds)
+        if partial:
+            # Cobertura parcial: el color solo refleja los contenedores con request y limit
+            request_color = limit_color = ResourceColorizer.YELLOW
+        return [usage_color] * 4 + [request_color, limit_color]
+
+    def apply_colors(self, row: List[str], thresholds: Tuple[int, int, int, int]) -> List[str]:
+        """
+        Colorea una fila agregada comparando el uso contra requests/limits sumados
+
+        Solo se comparan los contenedores que definen request y limit (el uso
+        de los demás no se suma de ningún lado); si algún contenedor con uso
+        no los define, REQ/LIM se marcan en amarillo. Se usan los umbrales de
+        la política del grupo si todos sus contenedores comparten los mismos;
+        si no, los globales (thresholds).
+        """
+        offset = len(GROUP_HEADERS[self.group_by])
+        stats = self.groups[tuple(row[:offset])]
+        if stats.thresholds:
+            thresholds = stats.thresholds
+        column_colors = (
+            self._colors(stats.cpu_matched, stats.cpu_partial, thresholds) +
+            self._colors(stats.mem_matched, stats.mem_partial, thresholds)
+        )
+
+        colored = []
+        for header, item in zip(self.headers[:offset], row[:offset]):
+            if header == "NAMESPACE":
+                colored.append(ResourceColorizer.colorize_namespace(item))
+            elif header == "CONTAINER":
+                colored.append(ResourceColorizer.colorize_container(item))
+            elif header == "NODE":
+                colored.append(ResourceColorizer.colorize_node(item))
+            else:
+                colored.append(ResourceColorizer.colorize_pod(item))
+        colored.append(row[offset])
+        for color, item in zip(column_colors, row[offset + 1:]):
+            colored.append(f"{color}{item}{ResourceColorizer.RESET}")
+        return colored
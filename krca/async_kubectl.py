@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# krca/async_kubectl.py - Cliente kubectl asíncrono para servicios asyncio
+
+import asyncio
+from typing import Dict, List, Optional, Sequence
+
+from .decoding import JsonDecoder
+from .kubectl import KubectlClient, KubectlError
+
+# Procesos kubectl simultáneos por defecto para todas las auditorías que comparten el cliente
+DEFAULT_MAX_CONCURRENCY = 8
+
+# Tiempo máximo (segundos) de cada llamada a kubectl
+DEFAULT_TIMEOUT = 30.0
+
+class AsyncKubectlClient:
+    """
+    Cliente asíncrono con la misma interfaz que KubectlClient
+
+    Usa asyncio.create_subprocess_exec (sin shell) y no bloquea el event loop.
+    Una misma instancia puede compartirse entre muchas auditorías concurrentes:
+    todas pasan por un único semáforo que limita los procesos kubectl en curso.
+    Al cancelar la tarea o agotar el timeout, el proceso kubectl se termina.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        timeout: Optional[float] = DEFAULT_TIMEOUT,
+        kubectl: str = "kubectl"
+    ):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency debe ser mayor que 0")
+        self.kubectl = kubectl
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def execute(
+        self,
+        args: Sequence[str],
+        ignore_errors: bool = False,
+        timeout: Optional[float] = None
+    ) -> str:
+        """
+        Ejecuta kubectl con los argumentos indicados y retorna la salida
+
+        Args:
+            args: Argumentos de kubectl (sin el ejecutable), ej. ["get", "pods", "-o", "json"]
+            ignore_errors: Si True, no lanza excepción en errores ni timeouts
+            timeout: Segundos máximos para esta llamada (por defecto, el del cliente)
+
+        Returns:
+            Salida del comando
+
+        Raises:
+            KubectlError: Si kubectl no se puede ejecutar, el comando falla o agota
+                el timeout y ignore_errors es False
+        """
+        argv = [self.kubectl, *args]
+        timeout = self.timeout if timeout is None else timeout
+
+        async with self._semaphore:
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    *argv,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE
+                )
+            except OSError as e:
+                # kubectl no instalado o sin permisos: mismo tratamiento que KubectlClient.execute
+                if ignore_errors:
+                    return ""
+                raise KubectlError(f"No se pudo ejecutar {argv[0]}: {e}")
+            try:
+                stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+            except asyncio.TimeoutError:
+                await self._kill(process)
+                if ignore_errors:
+                    return ""
+                raise KubectlError(f"Tiempo de espera agotado ({timeout}s) ejecutando: {' '.join(argv)}")
+            except asyncio.CancelledError:
+                await self._kill(process)
+                raise
+
+        if process.returncode != 0:
+            if ignore_errors:
+                return ""
+            error_msg = f"Error ejecutando comando: {' '.join(argv)}\n"
+            error_msg += f"Código: {process.returncode}\n"
+            error_msg += f"Error: {stderr.decode('utf-8', errors='replace').strip()}"
+            raise KubectlError(error_msg)
+        return stdout.decode("utf-8", errors="replace").strip()
+
+    @staticmethod
+    async def _kill(process: asyncio.subprocess.Process) -> None:
+        """Termina un proceso kubectl pendiente y espera su salida"""
+        if process.returncode is None:
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+            await process.wait()
+
+    async def _scope(self, namespace: Optional[str], all_namespaces: bool) -> List[str]:
+        """Argumentos de alcance: -A o -n <namespace> (el del contexto si no se indica)"""
+        if all_namespaces:
+            return ["-A"]
+        return ["-n", namespace or await self.get_current_namespace()]
+
+    async def get_pods(
+        self,
+        namespace: Optional[str] = None,
+        all_namespaces: bool = False,
+        selector: Optional[str] = None,
+        field_selector: Optional[str] = None
+    ) -> Dict:
+        """
+        Obtiene la lista de pods en formato JSON
+
+        Args:
+            namespace: Namespace específico (opcional)
+            all_namespaces: Si True, obtiene pods de todos los namespaces
+            selector: Label selector (opcional)
+            field_selector: Field selector (opcional)
+
+        Returns:
+            Diccionario con la lista de pods en formato JSON
+        """
+        scope = await self._scope(namespace, all_namespaces)
+        output = await self.execute(["get", "pods", *scope, *KubectlClient.selector_args(selector, field_selector),
+                                     "-o", "json"])
+        return JsonDecoder.loads_pods(output)
+
+    async def get_current_namespace(self) -> str:
+        """
+        Obtiene el namespace actual del contexto
+
+        Returns:
+            Nombre del namespace actual
+        """
+        output = await self.execute(
+            ["config", "view", "--minify", "-o", "jsonpath={..namespace}"],
+            ignore_errors=True
+        )
+        return KubectlClient.parse_namespace(output)
+
+    async def get_metrics(
+        self,
+        namespace: Optional[str] = None,
+        all_namespaces: bool = False,
+        selector: Optional[str] = None,
+        field_selector: Optional[str] = None
+    ) -> Dict:
+        """
+        Obtiene las métricas de uso (PodMetrics de metrics.k8s.io) paginadas
+
+        Args:
+            namespace: Namespace específico (opcional)
+            all_namespaces: Si True, obtiene métricas de todos los namespaces
+            selector: Label selector (opcional, ver KubectlClient.metrics_path)
+            field_selector: Field selector (opcional, ver KubectlClient.metrics_path)
+
+        Returns:
+            Diccionario (namespace, pod) -> contenedor -> métricas; vacío si la
+            API de métricas no está disponible
+        """
+        current = None if all_namespaces else namespace or await self.get_current_namespace()
+        metrics: Dict = {}
+        continue_token = None
+        while True:
+            path = KubectlClient.metrics_path(current, all_namespaces, continue_token, selector, field_selector)
+            output = await self.execute(["get", "--raw", path], ignore_errors=True)
+            try:
+                page = JsonDecoder.loads(output) if output else {}
+            except ValueError:
+                return {}
+            if not page:
+                return {}
+            KubectlClient.parse_pod_metrics(page, metrics)
+            continue_token = page.get("metadata", {}).get("continue")
+            if not continue_token:
+                return metrics
+
+    async def check_connection(self) -> bool:
+        """
+        Verifica la conexión con el cluster Kubernetes
+
+        Returns:
+            True si la conexión es exitosa, False en caso contrario
+        """
+        try:
+            await self.execute(["cluster-info"])
+            return True
+        except KubectlError:
+            return False
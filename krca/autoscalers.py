@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+# krca/autoscalers.py - Uso frente a los objetivos de HPA y las recomendaciones de VPA
+
+import sys
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from .kubectl import KubectlClient, KubectlError, DeadlineExceeded
+from .colorizer import ResourceColorizer
+from .core import KRCAnalyzer, ROW_COLUMNS
+from .exporter import Exporter
+from .selection import RowSelector
+from .utils import KRCAUtils
+
+# CPU%REQ/MEM%REQ: la utilización que usa el HPA (del pod o del contenedor según su métrica);
+# CTR_CPU%/CTR_MEM%: la del contenedor de la fila
+AUTOSCALER_HEADERS = [
+    "NAMESPACE", "WORKLOAD", "CONTAINER", "REPLICAS",
+    "CPU%REQ", "HPA_CPU", "CTR_CPU%", "MEM%REQ", "HPA_MEM", "CTR_MEM%",
+    "REQ_CPU", "VPA_CPU", "REQ_MEM", "VPA_MEM",
+    "VERDICT"
+]
+
+# Tolerancia del HPA (--horizontal-pod-autoscaler-tolerance): dentro de ±10% del objetivo no escala
+HPA_TOLERANCE = 0.1
+
+# Recursos que puede usar un HPA por utilización: columnas de uso y request y su conversión
+RESOURCES = {
+    "cpu": ("CPU", "REQ_CPU", KRCAUtils.parse_cpu_millicores),
+    "memory": ("MEMORY", "REQ_MEM", KRCAUtils.parse_memory_bytes),
+}
+
+# Sufijos de CONTAINER de los contenedores que no son parte de la utilización del HPA
+AUXILIARY_SUFFIXES = (" (init)", " (ephemeral)")
+
+# Color del veredicto por severidad (los mismos significados que en la tabla principal)
+SEVERITY_COLORS = {
+    ResourceColorizer.SEVERITY_OK: ResourceColorizer.GREEN,
+    ResourceColorizer.SEVERITY_INFO: ResourceColorizer.PURPLE,
+    ResourceColorizer.SEVERITY_WARNING: ResourceColorizer.YELLOW,
+    ResourceColorizer.SEVERITY_DANGER: ResourceColorizer.RED,
+}
+
+# (namespace, "Kind/nombre") del workload al que apunta un autoscaler
+TargetKey = Tuple[str, str]
+
+class HPATarget:
+    """Réplicas y objetivos de utilización (% del request) de un HPA"""
+
+    __slots__ = ("name", "min_replicas", "max_replicas", "current_replicas", "targets")
+
+    def __init__(self, name: str, min_replicas: int, max_replicas: int, current_replicas: Optional[int]):
+        self.name = name
+        self.min_replicas = min_replicas
+        self.max_replicas = max_replicas
+        self.current_replicas = current_replicas
+        # (recurso, contenedor) -> % objetivo; contenedor None = promedio del pod completo
+        self.targets: Dict[Tuple[str, Optional[str]], int] = {}
+
+    def target(self, resource: str, container: str) -> Tuple[Optional[int], bool]:
+        """(% objetivo, True si es por contenedor) para un recurso del contenedor"""
+        if (resource, container) in self.targets:
+            return self.targets[(resource, container)], True
+        return self.targets.get((resource, None)), False
+
+class VPATarget:
+    """Modo de actualización, recursos controlados y recomendación (target) por contenedor de un VPA"""
+
+    __slots__ = ("name", "mode", "recommendations", "controlled")
+
+    def __init__(self, name: str, mode: str):
+        self.name = name
+        self.mode = mode
+        # contenedor -> (milicores, bytes) recomendados
+        self.recommendations: Dict[str, Tuple[Optional[float], Optional[float]]] = {}
+        # resourcePolicy.containerPolicies: contenedor ("*" = el resto) -> recursos que el VPA ajusta
+        self.controlled: Dict[str, FrozenSet[str]] = {}
+
+    def controls(self, container: str, resource: str) -> bool:
+        """True si el VPA actualiza ese recurso del contenedor (sin política: cpu y memoria)"""
+        if self.mode == "Off":
+            return False
+        controlled = self.controlled.get(container, self.controlled.get("*"))
+        return controlled is None or resource in controlled
+
+class AutoscalerIndex:
+    """
+    HPAs y VPAs indexados por su scale target
+
+    Se consultan una vez por ejecución (una lista de cada tipo) y se
+    indexan por (namespace, "Kind/nombre"), la misma clave que la columna
+    WORKLOAD de la auditoría: cada workload se une con su HPA y su VPA con
+    una búsqueda en el diccionario, sin recorrer las listas.
+    """
+
+    def __init__(self):
+        self.hpas: Dict[TargetKey, HPATarget] = {}
+        self.vpas: Dict[TargetKey, VPATarget] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self.hpas or self.vpas)
+
+    @staticmethod
+    def _key(namespace: str, reference: Dict) -> TargetKey:
+        return namespace, f"{reference.get('kind', '')}/{reference.get('name', '')}"
+
+    def add_hpas(self, hpas: Dict) -> None:
+        """Indexa una lista de HorizontalPodAutoscaler (autoscaling/v1 o v2)"""
+        for hpa in hpas.get("items", []):
+            metadata, spec, status = hpa.get("metadata", {}), hpa.get("spec", {}), hpa.get("status", {})
+            entry = HPATarget(
+                metadata.get("name", ""),
+                spec.get("minReplicas") or 1,
+                spec.get("maxReplicas") or 0,
+                status.get("currentReplicas")
+            )
+            # autoscaling/v1: solo CPU del pod completo
+            if spec.get("targetCPUUtilizationPercentage") is not None:
+                entry.targets[("cpu", None)] = spec["targetCPUUtilizationPercentage"]
+            # autoscaling/v2: métricas Resource (pod) y ContainerResource (un contenedor)
+            for metric in spec.get("metrics") or []:
+                kind = metric.get("type")
+                source = metric.get("resource" if kind == "Resource" else "containerResource") or {}
+                target = source.get("target") or {}
+                if kind not in ("Resource", "ContainerResource") or target.get("type") != "Utilization":
+                    continue
+                if source.get("name") in RESOURCES and target.get("averageUtilization") is not None:
+                    container = source.get("container") if kind == "ContainerResource" else None
+                    entry.targets[(source["name"], container)] = target["averageUtilization"]
+            self.hpas[self._key(metadata.get("namespace", ""), spec.get("scaleTargetRef") or {})] = entry
+
+    def add_vpas(self, vpas: Dict) -> None:
+        """Indexa una lista de VerticalPodAutoscaler con sus recomendaciones"""
+        for vpa in vpas.get("items", []):
+            metadata, spec = vpa.get("metadata", {}), vpa.get("spec", {})
+            entry = VPATarget(metadata.get("name", ""), (spec.get("updatePolicy") or {}).get("updateMode") or "Auto")
+            for policy in (spec.get("resourcePolicy") or {}).get("containerPolicies") or []:
+                if policy.get("mode") == "Off":
+                    controlled = frozenset()
+                else:
+                    controlled = frozenset(policy.get("controlledResources") or RESOURCES)
+                entry.controlled[policy.get("containerName") or "*"] = controlled
+            recommendation = (vpa.get("status") or {}).get("recommendation") or {}
+            for container in recommendation.get("containerRecommendations") or []:
+                target = container.get("target") or {}
+                entry.recommendations[container.get("containerName", "")] = (
+                    KRCAUtils.parse_cpu_millicores(target.get("cpu")),
+                    KRCAUtils.parse_memory_bytes(target.get("memory"))
+                )
+            self.vpas[self._key(metadata.get("namespace", ""), spec.get("targetRef") or {})] = entry
+
+    def hpa(self, namespace: str, workload: str) -> Optional[HPATarget]:
+        return self.hpas.get((namespace, workload))
+
+    def vpa(self, namespace: str, workload: str) -> Optional[VPATarget]:
+        return self.vpas.get((namespace, workload))
+
+class Usage:
+    """Uso y requests sumados sobre las réplicas con métricas"""
+
+    __slots__ = ("used", "requested", "missing_request", "measured")
+
+    def __init__(self):
+        self.used = {resource: 0.0 for resource in RESOURCES}
+        self.requested = {resource: 0.0 for resource in RESOURCES}
+        # Recursos sin request en algún contenedor: el HPA no puede calcular su utilización
+        self.missing_request = set()
+        # Recursos con métricas en alguna réplica
+        self.measured = set()
+
+    def add(self, row: List[str], values: RowSelector) -> None:
+        for resource, (usage_column, request_column, _) in RESOURCES.items():
+            # Uso exacto de metrics.k8s.io, no el texto redondeado de la tabla
+            used = values.number(row, usage_column)
+            request = values.number(row, request_column)
+            if used is None:
+                continue
+            self.measured.add(resource)
+            if not request:
+                self.missing_request.add(resource)
+                continue
+            self.used[resource] += used
+            self.requested[resource] += request
+
+    def utilization(self, resource: str) -> Optional[float]:
+        """Uso sobre request en % (None sin métricas o con algún request no definido)"""
+        if resource in self.missing_request or not self.requested[resource]:
+            return None
+        return self.used[resource] / self.requested[resource] * 100
+
+class AutoscalerAuditor:
+    """
+    `krca autoscalers`: uso de cada workload frente a su HPA y su VPA
+
+    La utilización se calcula como la calcula el HPA: uso sobre request
+    sumando las réplicas con métricas, del pod completo (métricas Resource)
+    o de un contenedor (ContainerResource). Se compara con el objetivo
+    usando la tolerancia del HPA; estar sobre el objetivo en el máximo de
+    réplicas o bajo el objetivo en el mínimo son los casos que el HPA ya no
+    puede corregir. La recomendación del VPA se muestra junto al request
+    actual de cada contenedor.
+    """
+
+    def __init__(self, args):
+        self.args = args
+        self.use_color = not getattr(args, 'no_color', False)
+        self.warnings: List[str] = []
+
+    def _optional(self, resource: str, label: str, namespace: Optional[str]):
+        """Consulta de una lista que puede no existir (VPA es un CRD) sin abortar el reporte"""
+        def call() -> Dict:
+            try:
+                return KubectlClient.get_resources(resource, namespace, self.args.all_namespaces)
+            except DeadlineExceeded:
+                raise
+            except KubectlError as e:
+                self.warnings.append(f"No se pudieron obtener los {label}: {str(e).strip().splitlines()[-1]}")
+                return {"items": []}
+        return call
+
+    def fetch(self) -> Tuple[List[List[str]], AutoscalerIndex]:
+        """Filas de auditoría e índice de autoscalers (pods, métricas, HPAs y VPAs en paralelo)"""
+        analyzer = KRCAnalyzer(self.args)
+        all_namespaces = self.args.all_namespaces
+        namespace = KubectlClient.resolve_namespace(self.args.namespace, all_namespaces)
+        fetched = KubectlClient.fetch_all({
+            "pods": lambda: KubectlClient.get_pods(namespace, all_namespaces, *analyzer.selectors),
+            "metrics": lambda: KubectlClient.get_metrics(namespace, all_namespaces, *analyzer.selectors),
+            "hpas": self._optional("horizontalpodautoscalers", "HPA", namespace),
+            "vpas": self._optional("verticalpodautoscalers", "VPA", namespace),
+        })
+        result = analyzer.collect(fetched["pods"], fetched["metrics"])
+        self.warnings = result.warnings + self.warnings
+        index = AutoscalerIndex()
+        index.add_hpas(fetched["hpas"])
+        index.add_vpas(fetched["vpas"])
+        return result.rows, index
+
+    @staticmethod
+    def _hpa_verdict(resource: str, usage: Usage, target: int,
+                     hpa: HPATarget) -> Tuple[int, Optional[str]]:
+        utilization = usage.utilization(resource)
+        if utilization is None:
+            if resource not in usage.measured:
+                return ResourceColorizer.SEVERITY_WARNING, f"sin métricas de {resource}: el HPA no puede calcular el uso"
+            return ResourceColorizer.SEVERITY_WARNING, f"sin request de {resource}: el HPA no puede calcular el uso"
+        current = hpa.current_replicas
+        if utilization > target * (1 + HPA_TOLERANCE):
+            if current is not None and hpa.max_replicas and current >= hpa.max_replicas:
+                return ResourceColorizer.SEVERITY_DANGER, f"{resource} sobre el objetivo en el máximo de réplicas"
+            return ResourceColorizer.SEVERITY_WARNING, f"{resource} sobre el objetivo: escalando"
+        if utilization < target * (1 - HPA_TOLERANCE):
+            if current is not None and current <= hpa.min_replicas:
+                return ResourceColorizer.SEVERITY_INFO, f"{resource} bajo el objetivo en el mínimo de réplicas: request alto"
+            return ResourceColorizer.SEVERITY_OK, f"{resource} bajo el objetivo: reduciendo"
+        return ResourceColorizer.SEVERITY_OK, None
+
+    @staticmethod
+    def _vpa_verdict(resource: str, request: Optional[float],
+                     recommended: Optional[float]) -> Tuple[int, Optional[str]]:
+        if recommended is None:
+            return ResourceColorizer.SEVERITY_OK, None
+        if not request:
+            return ResourceColorizer.SEVERITY_WARNING, f"sin request de {resource} (VPA recomienda)"
+        if request < recommended * (1 - HPA_TOLERANCE):
+            return ResourceColorizer.SEVERITY_WARNING, f"request de {resource} bajo la recomendación de VPA"
+        if request > recommended * (1 + HPA_TOLERANCE):
+            return ResourceColorizer.SEVERITY_INFO, f"request de {resource} sobre la recomendación de VPA"
+        return ResourceColorizer.SEVERITY_OK, None
+
+    def analyze(self, rows: List[List[str]], index: AutoscalerIndex) -> List[Tuple[int, List[str]]]:
+        """Filas (severidad, fila) de los contenedores de workloads con HPA o VPA"""
+        columns = {name: i for i, name in enumerate(ROW_COLUMNS)}
+        values = RowSelector(ROW_COLUMNS)
+        # (namespace, workload) -> contenedor -> filas; solo workloads con algún autoscaler
+        workloads: Dict[TargetKey, Dict[str, List[List[str]]]] = {}
+        for row in rows:
+            key = (row[columns['NAMESPACE']], row[columns['WORKLOAD']])
+            if row[columns['CONTAINER']].endswith(AUXILIARY_SUFFIXES):
+                continue
+            if key in index.hpas or key in index.vpas:
+                workloads.setdefault(key, {}).setdefault(row[columns['CONTAINER']], []).append(row)
+
+        percent = lambda value: "-" if value is None else f"{value:.0f}%"
+        results = []
+        for (namespace, workload), containers in sorted(workloads.items()):
+            hpa, vpa = index.hpa(namespace, workload), index.vpa(namespace, workload)
+            pod_usage = Usage()
+            usages = {}
+            for container, container_rows in containers.items():
+                usages[container] = Usage()
+                for row in container_rows:
+                    usages[container].add(row, values)
+                    pod_usage.add(row, values)
+            pods = len({row[columns['POD']] for container_rows in containers.values() for row in container_rows})
+
+            for container, container_rows in containers.items():
+                usage = usages[container]
+                sample = container_rows[0]
+                severity, verdicts = ResourceColorizer.SEVERITY_OK, []
+                cells = {}
+                for resource in RESOURCES:
+                    target, per_container = hpa.target(resource, container) if hpa else (None, False)
+                    # (utilización que usa el HPA, objetivo, utilización del contenedor); la del
+                    # HPA es la del contenedor solo con una métrica ContainerResource
+                    hpa_usage = usage if per_container else pod_usage
+                    utilization = hpa_usage.utilization(resource)
+                    cells[resource] = (None if target is None else utilization, target, usage.utilization(resource))
+                    if target is not None:
+                        level, verdict = self._hpa_verdict(resource, hpa_usage, target, hpa)
+                        severity = max(severity, level)
+                        if verdict:
+                            verdicts.append(verdict)
+
+                recommended = vpa.recommendations.get(container, (None, None)) if vpa else (None, None)
+                requests = (KRCAUtils.parse_cpu_millicores(sample[columns['REQ_CPU']]),
+                            KRCAUtils.parse_memory_bytes(sample[columns['REQ_MEM']]))
+                for resource, request, value in zip(RESOURCES, requests, recommended):
+                    level, verdict = self._vpa_verdict(resource, request, value)
+                    severity = max(severity, level)
+                    if verdict:
+                        verdicts.append(verdict)
+                    # VPA que actualiza el recurso y HPA sobre el mismo recurso se contradicen
+                    if hpa and vpa and cells[resource][1] is not None and vpa.controls(container, resource):
+                        severity = max(severity, ResourceColorizer.SEVERITY_WARNING)
+                        verdicts.append(f"HPA y VPA ({vpa.mode}) sobre {resource}")
+
+                if hpa:
+                    current = "?" if hpa.current_replicas is None else hpa.current_replicas
+                    replicas = f"{current} ({hpa.min_replicas}-{hpa.max_replicas})"
+                else:
+                    replicas = str(pods)
+                results.append((severity, [
+                    namespace, workload, container, replicas,
+                    *(percent(value) for value in cells["cpu"]),
+                    *(percent(value) for value in cells["memory"]),
+                    sample[columns['REQ_CPU']],
+                    "-" if recommended[0] is None else KRCAUtils.format_cpu(recommended[0]),
+                    sample[columns['REQ_MEM']],
+                    "-" if recommended[1] is None else KRCAUtils.format_memory(recommended[1]),
+                    "; ".join(verdicts) or "ok",
+                ]))
+        return results
+
+    def _row_colors(self, severity: int, row: List[str]) -> List[Optional[str]]:
+        colors: List[Optional[str]] = [ResourceColorizer.NAME_COLORS.get(header) for header in AUTOSCALER_HEADERS]
+        colors[-1] = SEVERITY_COLORS[severity]
+        return colors
+
+    def run(self) -> int:
+        """Ejecuta el subcomando autoscalers y muestra/exporta el reporte"""
+        try:
+            rows, index = self.fetch()
+            results = self.analyze(rows, index)
+            if not index:
+                self.warnings.append("No hay HPAs ni VPAs en el alcance consultado")
+            # Peores primero; dentro de la misma severidad, por namespace y workload
+            results.sort(key=lambda item: -item[0])
+            top = getattr(self.args, 'top', None)
+            if top:
+                results = results[:top]
+            colors = [self._row_colors(severity, row) for severity, row in results] if self.use_color else None
+            table = Exporter.render_table(
+                [row for _, row in results],
+                AUTOSCALER_HEADERS,
+                self.use_color,
+                getattr(self.args, 'number', False),
+                colors
+            )
+            Exporter.export(
+                table,
+                getattr(self.args, 'output_file', None),
+                self.use_color,
+                getattr(self.args, 'force', False),
+                getattr(self.args, 'landscape', False)
+            )
+            for warning in self.warnings:
+                print(ResourceColorizer.yellow(warning) if self.use_color else warning, file=sys.stderr)
+            return 0
+        except Exception as e:
+            KRCAUtils.report_error(e, getattr(self.args, 'debug', False))
+            return 1
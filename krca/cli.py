@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 # krca/cli.py - Módulo para manejo de línea de comandos
 
+import sys
 import argparse
 from . import __version__
 
@@ -10,12 +11,39 @@ DEFAULT_DANGER_PCT = 75
 DEFAULT_DIFF_PCT = 300
 DEFAULT_UNDERUSE_PCT = 5
 
+# Valores por defecto para recomendaciones (recommend)
+DEFAULT_PERCENTILE = 95
+DEFAULT_HEADROOM_PCT = 15
+DEFAULT_LIMIT_HEADROOM_PCT = 50
+
+# Valores por defecto para el modo daemon (serve)
+DEFAULT_SERVE_ADDRESS = "127.0.0.1"
+DEFAULT_SERVE_PORT = 9877
+DEFAULT_SERVE_INTERVAL = 30
+
+# Valores por defecto para la ejecución de kubectl
+DEFAULT_KUBECTL_TIMEOUT = 30
+DEFAULT_KUBECTL_RETRIES = 2
+DEFAULT_MAX_CONCURRENCY = 4
+METRICS_SOURCES = ['metrics-server', 'kubelet']
+JSON_BACKENDS = ['auto', 'msgspec', 'orjson', 'json']
+
+# Valores por defecto para el muestreo (--sample)
+DEFAULT_SAMPLE_EVERY = 10
+
+# Subcomandos disponibles (primer argumento posicional)
+COMMANDS = ['recommend', 'nodes', 'quotas', 'oom', 'serve', 'diff', 'merge', 'tui', 'cost', 'autoscalers']
+
 # Columnas disponibles para custom-columns
 AVAILABLE_COLUMNS = [
     'NAMESPACE', 'POD', 'CONTAINER', 'CPU', 'REQ_CPU', 'LIM_CPU',
-    'MEMORY', 'REQ_MEM', 'LIM_MEM', 'STATUS', 'RESTARTS', 'NODE_IP', 'NODE'
+    'MEMORY', 'REQ_MEM', 'LIM_MEM', 'STATUS', 'RESTARTS', 'NODE_IP', 'NODE',
+    'WORKLOAD', 'LAST_STATE'
 ]
 
+# Modos de agregación para --group-by
+GROUP_BY_MODES = ['workload', 'namespace', 'node']
+
 def create_parser():
     """Crea y configura el parser de argumentos"""
     parser = argparse.ArgumentParser(
@@ -35,6 +63,26 @@ def create_parser():
         help="Especificar un namespace particular"
     )
     
+    # Selectores que se envían al API server (pods y métricas)
+    parser.add_argument(
+        "-l", "--selector",
+        help="Label selector de los pods (ej: app=web,tier!=cache)"
+    )
+    parser.add_argument(
+        "--field-selector",
+        help="Field selector de los pods (ej: spec.nodeName=nodo1,status.phase=Running)"
+    )
+    
+    # Auditoría sin cluster a partir de volcados
+    parser.add_argument(
+        "--from-file",
+        help="Auditar un volcado de `kubectl get pods -o json` en lugar del cluster"
+    )
+    parser.add_argument(
+        "--metrics-file",
+        help="Volcado de PodMetricsList (metrics.k8s.io) con el uso para --from-file"
+    )
+    
     # Opciones de visualización
     parser.add_argument(
         "--number",
@@ -57,11 +105,32 @@ def create_parser():
         "-o", "--output",
         help="Formato de salida (wide|custom-columns=<columnas>)"
     )
+    parser.add_argument(
+        "--group-by",
+        choices=GROUP_BY_MODES,
+        help="Agrupar contenedores por workload, namespace o nodo"
+    )
+    
+    # Selección de filas (sin pasar la tabla coloreada por sort/grep)
+    parser.add_argument(
+        "--sort-by",
+        help="Ordenar por columna o por ratio|cpu-ratio|mem-ratio|severity"
+    )
+    parser.add_argument(
+        "--filter",
+        action="append",
+        help="Filtrar filas con CAMPO OP VALOR (ej: 'severity>=warning'); repetible"
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        help="Mostrar solo las N primeras filas según --sort-by"
+    )
     
     # Exportación a archivo
     parser.add_argument(
         "--output-file",
-        help="Guardar salida en archivo (soporta .txt, .html, .pdf)"
+        help="Guardar salida en archivo (soporta .txt, .html, .pdf; .ndjson, .json y .parquet guardan un snapshot)"
     )
     parser.add_argument(
         "--force",
@@ -74,6 +143,13 @@ def create_parser():
         help="Orientación horizontal para PDF"
     )
     
+    # Argumentos posicionales de los subcomandos (ej: los snapshots de diff y merge)
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        help=argparse.SUPPRESS
+    )
+    
     # Opciones de ayuda y versión
     parser.add_argument(
         "-h", "--help",
@@ -106,6 +182,10 @@ def create_parser():
         default=DEFAULT_DIFF_PCT,
         help=f"Porcentaje de diferencia para color púrpura (default: {DEFAULT_DIFF_PCT}%%)"
     )
+    threshold_group.add_argument(
+        "--policy",
+        help="Archivo de política (YAML o TOML) con umbrales por namespace, workload o etiqueta"
+    )
     threshold_group.add_argument(
         "--underuse-pct",
         type=int,
@@ -113,6 +193,125 @@ def create_parser():
         help=f"Porcentaje para detectar infrautilización (default: {DEFAULT_UNDERUSE_PCT}%%)"
     )
     
+    # Ejecución de kubectl
+    kubectl_group = parser.add_argument_group('Ejecución de kubectl')
+    kubectl_group.add_argument(
+        "--timeout",
+        type=float,
+        default=DEFAULT_KUBECTL_TIMEOUT,
+        help=f"Segundos máximos por llamada a kubectl, 0 = sin límite (default: {DEFAULT_KUBECTL_TIMEOUT})"
+    )
+    kubectl_group.add_argument(
+        "--retries",
+        type=int,
+        default=DEFAULT_KUBECTL_RETRIES,
+        help=f"Reintentos ante timeouts y errores transitorios (default: {DEFAULT_KUBECTL_RETRIES})"
+    )
+    kubectl_group.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=DEFAULT_MAX_CONCURRENCY,
+        help=f"Llamadas a kubectl simultáneas (default: {DEFAULT_MAX_CONCURRENCY})"
+    )
+    kubectl_group.add_argument(
+        "--metrics-source",
+        choices=METRICS_SOURCES,
+        default=METRICS_SOURCES[0],
+        help="Origen de las métricas de uso: metrics-server o /stats/summary de cada kubelet"
+    )
+    kubectl_group.add_argument(
+        "--json-backend",
+        choices=JSON_BACKENDS,
+        default=JSON_BACKENDS[0],
+        help="Decodificador JSON: auto (el más rápido instalado), msgspec, orjson o json"
+    )
+    kubectl_group.add_argument(
+        "--deadline",
+        type=float,
+        help="Plazo total en segundos: al vencer se cortan las consultas y se muestra lo obtenido"
+    )
+    kubectl_group.add_argument(
+        "--progress",
+        action="store_true",
+        help="Mostrar en stderr el avance (namespaces, pods, métricas y filas)"
+    )
+    
+    # Muestreo de uso en el tiempo
+    sample_group = parser.add_argument_group('Muestreo (--sample)')
+    sample_group.add_argument(
+        "--sample",
+        type=int,
+        help="Tomar N muestras de métricas y resumir mín/promedio/máx por contenedor"
+    )
+    sample_group.add_argument(
+        "--every",
+        type=float,
+        default=DEFAULT_SAMPLE_EVERY,
+        help=f"Segundos entre muestras (default: {DEFAULT_SAMPLE_EVERY})"
+    )
+    
+    # Opciones del subcomando recommend
+    recommend_group = parser.add_argument_group('Recomendaciones (recommend)')
+    recommend_group.add_argument(
+        "--percentile",
+        type=float,
+        default=DEFAULT_PERCENTILE,
+        help=f"Percentil de uso para calcular requests (default: p{DEFAULT_PERCENTILE})"
+    )
+    recommend_group.add_argument(
+        "--headroom-pct",
+        type=float,
+        default=DEFAULT_HEADROOM_PCT,
+        help=f"Margen sobre el percentil para requests (default: {DEFAULT_HEADROOM_PCT}%%)"
+    )
+    recommend_group.add_argument(
+        "--limit-headroom-pct",
+        type=float,
+        default=DEFAULT_LIMIT_HEADROOM_PCT,
+        help=f"Margen sobre el máximo para limits (default: {DEFAULT_LIMIT_HEADROOM_PCT}%%)"
+    )
+    recommend_group.add_argument(
+        "--format",
+        choices=['yaml', 'json'],
+        default='yaml',
+        help="Formato de salida de recommend (default: yaml)"
+    )
+    
+    # Opciones del subcomando merge
+    merge_group = parser.add_argument_group('Resumen de flota (merge)')
+    merge_group.add_argument(
+        "--workers",
+        type=int,
+        help="Procesos que leen snapshots en paralelo (default: núcleos disponibles)"
+    )
+    
+    # Opciones del subcomando cost
+    cost_group = parser.add_argument_group('Costos (cost)')
+    cost_group.add_argument(
+        "--prices",
+        help="Tabla de precios YAML/JSON/TOML por core-hora y GiB-hora (default, instance_types, labels)"
+    )
+    
+    # Opciones del subcomando serve
+    serve_group = parser.add_argument_group('Modo daemon (serve)')
+    serve_group.add_argument(
+        "--address",
+        default=DEFAULT_SERVE_ADDRESS,
+        help=f"Dirección de escucha (default: {DEFAULT_SERVE_ADDRESS})"
+    )
+    serve_group.add_argument(
+        "--port",
+        type=int,
+        default=DEFAULT_SERVE_PORT,
+        help=f"Puerto de escucha (default: {DEFAULT_SERVE_PORT})"
+    )
+    serve_group.add_argument(
+        "--interval",
+        type=int,
+        default=DEFAULT_SERVE_INTERVAL,
+        help=f"Segundos entre sondeos de métricas (default: {DEFAULT_SERVE_INTERVAL})"
+    )
+    
     return parser
 
 def parse_custom_columns(spec):
@@ -137,11 +336,19 @@ def parse_args(argv=None):
     """Parse los argumentos de línea de comandos"""
     parser = create_parser()
     
+    # Subcomando opcional como primer argumento (ej: krca recommend -A)
+    command = None
+    tokens = sys.argv[1:] if argv is None else argv
+    if tokens and tokens[0] in COMMANDS:
+        command, argv = tokens[0], list(tokens[1:])
     # Manejo especial para ejecución como plugin de kubectl
-    if argv and len(argv) > 1 and not argv[1].startswith('-'):
+    elif argv and len(argv) > 1 and not argv[1].startswith('-'):
         argv.insert(1, '--')
     
     args = parser.parse_args(argv)
+    args.command = command
+    if args.paths and command not in ('diff', 'merge'):
+        parser.error(f"argumentos no reconocidos: {' '.join(args.paths)}")
     
     # Validación adicional de argumentos
     if args.output:
@@ -163,8 +370,32 @@ def show_help():
 Kubernetes Resource Container Audit (KRCA) v{__version__}
 
 Uso:
-  kubectl resource-container-audit [OPCIONES]
-  kubectl krca [OPCIONES]
+  kubectl resource-container-audit [COMANDO] [OPCIONES]
+  kubectl krca [COMANDO] [OPCIONES]
+
+Comandos:
+  (ninguno)             Tabla de auditoría de recursos por contenedor
+  recommend             Sugiere requests/limits por workload (parche YAML/JSON)
+  nodes                 Capacidad por nodo: requests, limits, uso y nodos liberables
+  quotas                Requests/limits efectivos (LimitRange) y holgura de ResourceQuota
+  oom                   Ranking de riesgo OOM: OOMKilled, reinicios, eventos y uso/limit
+  serve                 Daemon con endpoint HTTP /metrics (formato Prometheus)
+  diff A B              Cambios de severidad y requests/limits entre dos snapshots
+                        (generados con --output-file audit.ndjson|.json|.parquet)
+  merge SNAPSHOT...     Resumen de flota de muchos snapshots (uno por cluster, nombrado
+                        como el archivo): peores contenedores (--top, default 20) y
+                        totales por namespace con el faltante sobre requests
+  tui                   Navegación interactiva: namespaces → workloads → contenedores,
+                        orden por cualquier columna o ratio (< > r) y filtro al
+                        escribir (/); acepta --from-file y --filter
+  cost --prices FILE    Ranking de gasto mensual desperdiciado (request sin usar) y de
+                        uso sobre request, por contenedor o con --group-by
+                        workload|namespace|node; acepta --sort-by, --filter y --top
+  autoscalers           Workloads con HPA o VPA: uso sobre request que calcula el HPA
+                        (CPU%REQ/MEM%REQ: del pod o del contenedor según su métrica)
+                        frente a su objetivo, réplicas actuales (mín-máx), uso del
+                        contenedor (CTR_CPU%/CTR_MEM%) y recomendación del VPA junto
+                        al request de cada contenedor
 
 Opciones:
   -h, --help            Muestra este mensaje de ayuda
@@ -172,12 +403,33 @@ Opciones:
   -A, --all-namespaces  Mostrar recursos en todos los namespaces
   -n, --namespace NAMESPACE
                         Especificar un namespace particular
+  -l, --selector SELECTOR
+                        Label selector de los pods (ej: app=web,tier!=cache)
+  --field-selector SELECTOR
+                        Field selector de los pods (ej: spec.nodeName=nodo1);
+                        ambos los aplica el API server a pods y métricas, así
+                        solo viajan los objetos que coinciden (no aplican a
+                        nodes ni quotas)
+  --from-file FILE      Auditar un volcado de `kubectl get pods -o json` sin
+                        consultar el cluster (el archivo se mapea en memoria)
+  --metrics-file FILE   Uso para --from-file: volcado de
+                        `kubectl get --raw /apis/metrics.k8s.io/v1beta1/pods`
   --number              Mostrar números de fila
   --debug               Mostrar tablas de depuración
   --no-color            Deshabilitar salida coloreada
   -o, --output FORMAT   Formato de salida (wide|custom-columns=<columnas>)
                         Ejemplo: -o custom-columns=NAMESPACE,POD,CPU,MEMORY
+  --group-by MODE       Agrupar por workload|namespace|node (count, suma,
+                        mín, máx y p95 de uso frente a requests/limits;
+                        no admite --sort-by/--filter/--top ni snapshots)
+  --sort-by CAMPO       Ordenar por columna o ratio|cpu-ratio|mem-ratio|severity
+                        (numéricos de mayor a menor, texto alfabético)
+  --filter EXPR         Filtrar con CAMPO OP VALOR, repetible (AND)
+                        Ejemplos: 'severity>=warning', 'mem-ratio>0.9', 'NAMESPACE=prod'
+                        Severidades: ok < info < warning < danger (el color de la tabla)
+  --top N               Mostrar solo las N primeras filas
   --output-file FILE    Guardar salida en archivo (soporta .txt, .html, .pdf)
+                        .ndjson, .json o .parquet guardan un snapshot para diff
   --force               Sobrescribir archivo existente
   --landscape           Orientación horizontal para PDF
 
@@ -186,6 +438,61 @@ Umbrales configurables:
   --danger-pct PCT      Porcentaje de danger (default: {DEFAULT_DANGER_PCT}%)
   --diff-pct PCT        Porcentaje de diferencia (default: {DEFAULT_DIFF_PCT}%)
   --underuse-pct PCT    Porcentaje de infrautilización (default: {DEFAULT_UNDERUSE_PCT}%)
+  --policy FILE         Política YAML/TOML con reglas ordenadas (namespace, workload,
+                        labels) y sus umbrales; la primera que coincide gana y los
+                        umbrales que no define se toman de las opciones anteriores
+
+Ejecución de kubectl:
+  --timeout SEG         Segundos máximos por llamada, 0 = sin límite (default: {DEFAULT_KUBECTL_TIMEOUT})
+  --retries N           Reintentos con backoff exponencial ante timeouts y
+                        errores transitorios (default: {DEFAULT_KUBECTL_RETRIES})
+  --max-concurrency N   Llamadas a kubectl simultáneas (default: {DEFAULT_MAX_CONCURRENCY})
+                        Con --debug se muestran llamadas, reintentos y latencia
+  --metrics-source SRC  Origen de las métricas: metrics-server|kubelet
+                        (kubelet: /stats/summary de cada nodo vía el API server,
+                        en paralelo; no depende de metrics-server)
+  --json-backend NAME   Decodificador JSON: auto|msgspec|orjson|json (default: auto,
+                        el más rápido instalado; msgspec solo decodifica los
+                        campos del pod que usa krca)
+  --deadline SEG        Plazo total de la ejecución. En la auditoría los pods y
+                        las métricas se piden por namespace; al vencer se cancelan
+                        las consultas pendientes, se muestra lo obtenido y se
+                        avisa en stderr qué namespaces faltan
+  --progress            Avance en stderr: namespaces, pods obtenidos, pods con
+                        métricas y filas (activo por defecto con --deadline en
+                        una terminal)
+
+Muestreo (--sample):
+  --sample N            Tomar N muestras de métricas y mostrar mín/promedio/máx
+                        por contenedor y el % de muestras sobre el limit y sobre
+                        --warning-pct (detecta throttling por LIM_CPU ajustado).
+                        No admite --policy, --group-by, -o, --sort-by, --filter
+                        ni --top. Con recommend, usa todas las muestras para el
+                        percentil
+  --every SEG           Segundos entre muestras (default: {DEFAULT_SAMPLE_EVERY})
+
+Recomendaciones (recommend):
+  --percentile P        Percentil de uso para requests (default: p{DEFAULT_PERCENTILE})
+  --headroom-pct PCT    Margen sobre el percentil para requests (default: {DEFAULT_HEADROOM_PCT}%)
+  --limit-headroom-pct PCT
+                        Margen sobre el máximo para limits (default: {DEFAULT_LIMIT_HEADROOM_PCT}%)
+  --format FORMAT       Formato de salida: yaml|json (default: yaml)
+
+Resumen de flota (merge):
+  --workers N           Procesos que leen snapshots en paralelo; cada uno
+                        calcula totales y top-N parciales (default: núcleos)
+
+Costos (cost):
+  --prices FILE         Precios por core-hora y GiB-hora (YAML, JSON o TOML): tarifa
+                        plana (default), por tipo de instancia del nodo
+                        (instance_types) o por etiquetas del nodo (labels, la
+                        primera regla que coincide gana). Costos en moneda por mes
+                        (730 h)
+
+Modo daemon (serve):
+  --address ADDR        Dirección de escucha (default: {DEFAULT_SERVE_ADDRESS})
+  --port PORT           Puerto de escucha (default: {DEFAULT_SERVE_PORT})
+  --interval SEG        Segundos entre sondeos de métricas (default: {DEFAULT_SERVE_INTERVAL})
 
 Columnas disponibles para custom-columns:
   {', '.join(AVAILABLE_COLUMNS)}
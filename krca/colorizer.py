@@ -15,6 +15,32 @@ class ResourceColorizer:
     CYAN = "\033[36m"
     BLUE = "\033[34m"
 
+    # Niveles de severidad (veredicto numérico equivalente a los colores)
+    SEVERITY_OK = 0        # verde/blanco
+    SEVERITY_INFO = 1      # púrpura/azul: sobreasignación o infrautilización
+    SEVERITY_WARNING = 2   # amarillo
+    SEVERITY_DANGER = 3    # rojo
+    SEVERITY_LEVELS = {'ok': 0, 'info': 1, 'warning': 2, 'danger': 3}
+    # Severidad de cada color de uso/request/limit
+    COLOR_SEVERITY = {
+        WHITE: SEVERITY_OK,
+        GREEN: SEVERITY_OK,
+        PURPLE: SEVERITY_INFO,
+        BLUE: SEVERITY_INFO,
+        YELLOW: SEVERITY_WARNING,
+        RED: SEVERITY_DANGER,
+    }
+
+    # Color fijo de las columnas de identificación
+    NAME_COLORS = {
+        "NAMESPACE": CYAN,
+        "POD": WHITE,
+        "WORKLOAD": WHITE,
+        "CONTAINER": CYAN,
+        "NODE_IP": WHITE,
+        "NODE": WHITE
+    }
+
     @classmethod
     def red(cls, text: str) -> str:
         """Aplica color rojo al texto"""
@@ -50,7 +76,7 @@ class ResourceColorizer:
         """Aplica negrita al texto"""
         return f"{cls.BOLD}{text}{cls.RESET}"
 
-    # Métodos existentes para coloreado de recursos (se mantienen igual)
+    # Métodos existentes para coloreado de recursos
     @staticmethod
     def colorize_usage(cpu_usage, mem_usage, req_cpu, req_mem, lim_cpu, lim_mem, 
                       warning_pct, danger_pct, diff_pct, underuse_pct):
@@ -58,125 +84,79 @@ class ResourceColorizer:
         Determina los colores para los valores de uso de recursos
         Retorna tuplas de colores para: (cpu, req_cpu, lim_cpu, mem, req_mem, lim_mem)
         """
-        def get_cpu_colors():
-            """Lógica específica para colores de CPU"""
-            # Valores no definidos
-            if cpu_usage in ("-", "<none>") or req_cpu in ("-", "<none>") or lim_cpu in ("-", "<none>"):
-                return (ResourceColorizer.WHITE, ResourceColorizer.WHITE, ResourceColorizer.WHITE)
-            
-            cpu_num = ResourceColorizer.parse_resource_value(cpu_usage)
-            req_cpu_num = ResourceColorizer.parse_resource_value(req_cpu)
-            lim_cpu_num = ResourceColorizer.parse_resource_value(lim_cpu)
-            
-            cpu_color = ResourceColorizer.WHITE
-            req_cpu_color = ResourceColorizer.WHITE
-            lim_cpu_color = ResourceColorizer.WHITE
-            
-            # Caso especial: Request no definido
-            if req_cpu in ("<none>", "-") or req_cpu_num is None:
-                req_cpu_color = ResourceColorizer.YELLOW
-            
-            # Caso especial: Limit no definido
-            if lim_cpu in ("<none>", "-") or lim_cpu_num is None:
-                lim_cpu_color = ResourceColorizer.YELLOW
-            
-            if cpu_num is not None:
-                # Uso > limit (rojo)
-                if lim_cpu_num and cpu_num > lim_cpu_num:
-                    lim_cpu_color = ResourceColorizer.RED
-                    cpu_color = ResourceColorizer.RED
-                
-                # Uso normal entre request y limit (verde)
-                elif req_cpu_num and lim_cpu_num and req_cpu_num <= cpu_num <= lim_cpu_num:
-                    cpu_color = ResourceColorizer.GREEN
-                    req_cpu_color = ResourceColorizer.GREEN
-                
-                # Uso > danger-pct (rojo)
-                elif lim_cpu_num and (cpu_num / lim_cpu_num * 100) > danger_pct:
-                    cpu_color = ResourceColorizer.RED
-                
-                # warning-pct < Uso < danger-pct (amarillo)
-                elif lim_cpu_num and (cpu_num / lim_cpu_num * 100) > warning_pct:
-                    cpu_color = ResourceColorizer.YELLOW
-                
-                # Uso por debajo del request (púrpura)
-                elif req_cpu_num and cpu_num < req_cpu_num:
-                    req_cpu_color = ResourceColorizer.PURPLE
-                
-                # Infrautilización severa (azul)
-                elif req_cpu_num and (cpu_num / req_cpu_num * 100) < underuse_pct:
-                    req_cpu_color = ResourceColorizer.BLUE
-                
-                # Gran diferencia entre request y limit (púrpura)
-                if (req_cpu_num and lim_cpu_num and 
-                    (lim_cpu_num / req_cpu_num * 100) > diff_pct):
-                    lim_cpu_color = ResourceColorizer.PURPLE
-            
-            return (cpu_color, req_cpu_color, lim_cpu_color)
+        # Import local: utils importa este módulo
+        from .utils import KRCAUtils
+        thresholds = (warning_pct, danger_pct, diff_pct, underuse_pct)
+        cpu_colors = ResourceColorizer.resource_colors(
+            KRCAUtils.parse_cpu_millicores(cpu_usage),
+            KRCAUtils.parse_cpu_millicores(req_cpu),
+            KRCAUtils.parse_cpu_millicores(lim_cpu),
+            *thresholds
+        )
+        mem_colors = ResourceColorizer.resource_colors(
+            KRCAUtils.parse_memory_bytes(mem_usage),
+            KRCAUtils.parse_memory_bytes(req_mem),
+            KRCAUtils.parse_memory_bytes(lim_mem),
+            *thresholds
+        )
+        return cpu_colors + mem_colors  # CPU, REQ_CPU, LIM_CPU, MEM, REQ_MEM, LIM_MEM
+
+    @staticmethod
+    def resource_colors(usage, request, limit, warning_pct, danger_pct, diff_pct, underuse_pct):
+        """
+        Colores de un recurso (CPU o memoria) a partir de valores numéricos en la
+        misma unidad; None indica valor no definido
+        Retorna tupla: (uso, request, limit)
+        """
+        usage_color = request_color = limit_color = ResourceColorizer.WHITE
+        
+        # Valores no definidos: sin referencia no hay veredicto
+        if usage is None or request is None or limit is None:
+            return (usage_color, request_color, limit_color)
+        
+        # Uso > limit (rojo)
+        if limit and usage > limit:
+            limit_color = ResourceColorizer.RED
+            usage_color = ResourceColorizer.RED
+        
+        # Uso normal entre request y limit (verde)
+        elif request and limit and request <= usage <= limit:
+            usage_color = ResourceColorizer.GREEN
+            request_color = ResourceColorizer.GREEN
+        
+        # Uso > danger-pct (rojo)
+        elif limit and (usage / limit * 100) > danger_pct:
+            usage_color = ResourceColorizer.RED
         
-        def get_mem_colors():
-            """Lógica específica para colores de memoria"""
-            # Valores no definidos
-            if mem_usage in ("-", "<none>") or req_mem in ("-", "<none>") or lim_mem in ("-", "<none>"):
-                return (ResourceColorizer.WHITE, ResourceColorizer.WHITE, ResourceColorizer.WHITE)
-            
-            mem_num = ResourceColorizer.parse_resource_value(mem_usage)
-            req_mem_num = ResourceColorizer.parse_resource_value(req_mem)
-            lim_mem_num = ResourceColorizer.parse_resource_value(lim_mem)
-            
-            mem_color = ResourceColorizer.WHITE
-            req_mem_color = ResourceColorizer.WHITE
-            lim_mem_color = ResourceColorizer.WHITE
-            
-            # Caso especial: Request no definido
-            if req_mem in ("<none>", "-") or req_mem_num is None:
-                req_mem_color = ResourceColorizer.YELLOW
-            
-            # Caso especial: Limit no definido
-            if lim_mem in ("<none>", "-") or lim_mem_num is None:
-                lim_mem_color = ResourceColorizer.YELLOW
-            
-            if mem_num is not None:
-                # Uso > limit (rojo)
-                if lim_mem_num and mem_num > lim_mem_num:
-                    lim_mem_color = ResourceColorizer.RED
-                    mem_color = ResourceColorizer.RED
-                
-                # Uso normal entre request y limit (verde)
-                elif req_mem_num and lim_mem_num and req_mem_num <= mem_num <= lim_mem_num:
-                    mem_color = ResourceColorizer.GREEN
-                    req_mem_color = ResourceColorizer.GREEN
-                
-                # Uso > danger-pct (rojo)
-                elif lim_mem_num and (mem_num / lim_mem_num * 100) > danger_pct:
-                    mem_color = ResourceColorizer.RED
-                
-                # warning-pct < Uso < danger-pct (amarillo)
-                elif lim_mem_num and (mem_num / lim_mem_num * 100) > warning_pct:
-                    mem_color = ResourceColorizer.YELLOW
-                
-                # Uso por debajo del request (púrpura)
-                elif req_mem_num and mem_num < req_mem_num:
-                    req_mem_color = ResourceColorizer.PURPLE
-                
-                # Infrautilización severa (azul)
-                elif req_mem_num and (mem_num / req_mem_num * 100) < underuse_pct:
-                    req_mem_color = ResourceColorizer.BLUE
-                
-                # Gran diferencia entre request y limit (púrpura)
-                if (req_mem_num and lim_mem_num and 
-                    (lim_mem_num / req_mem_num * 100) > diff_pct):
-                    lim_mem_color = ResourceColorizer.PURPLE
-            
-            return (mem_color, req_mem_color, lim_mem_color)
+        # warning-pct < Uso < danger-pct (amarillo)
+        elif limit and (usage / limit * 100) > warning_pct:
+            usage_color = ResourceColorizer.YELLOW
         
-        # Obtener colores para CPU y memoria
-        cpu_colors = get_cpu_colors()
-        mem_colors = get_mem_colors()
+        # Uso por debajo del request (púrpura)
+        elif request and usage < request:
+            request_color = ResourceColorizer.PURPLE
         
-        return (
-            cpu_colors[0], cpu_colors[1], cpu_colors[2],  # CPU, REQ_CPU, LIM_CPU
-            mem_colors[0], mem_colors[1], mem_colors[2]   # MEM, REQ_MEM, LIM_MEM
+        # Infrautilización severa (azul)
+        elif request and (usage / request * 100) < underuse_pct:
+            request_color = ResourceColorizer.BLUE
+        
+        # Gran diferencia entre request y limit (púrpura)
+        if request and limit and (limit / request * 100) > diff_pct:
+            limit_color = ResourceColorizer.PURPLE
+        
+        return (usage_color, request_color, limit_color)
+
+    @staticmethod
+    def usage_severity(usage, request, limit, warning_pct, danger_pct, diff_pct, underuse_pct):
+        """
+        Severidad de un recurso (CPU o memoria) a partir de valores numéricos
+        en la misma unidad: la del peor color de resource_colors, así la
+        selección y la tabla dan el mismo veredicto. None indica valor no definido.
+        """
+        return max(
+            ResourceColorizer.COLOR_SEVERITY[color]
+            for color in ResourceColorizer.resource_colors(
+                usage, request, limit, warning_pct, danger_pct, diff_pct, underuse_pct)
         )
 
     @staticmethod
@@ -204,25 +184,39 @@ class ResourceColorizer:
         
         return status_color, restarts_color
 
+    @staticmethod
+    def last_state_color(reason):
+        """Código de color para el motivo de la última terminación (OOMKilled en rojo)"""
+        if reason == "OOMKilled":
+            return ResourceColorizer.RED
+        elif reason in ("-", "Completed"):
+            return ResourceColorizer.WHITE
+        return ResourceColorizer.YELLOW
+
+    @staticmethod
+    def colorize_last_state(reason):
+        """Color para el motivo de la última terminación (OOMKilled en rojo)"""
+        return f"{ResourceColorizer.last_state_color(reason)}{reason}{ResourceColorizer.RESET}"
+
     @staticmethod
     def colorize_namespace(name):
         """Color para nombres de namespace"""
-        return f"{ResourceColorizer.CYAN}{name}{ResourceColorizer.RESET}"
+        return f"{ResourceColorizer.NAME_COLORS['NAMESPACE']}{name}{ResourceColorizer.RESET}"
 
     @staticmethod
     def colorize_pod(name):
         """Color para nombres de pod"""
-        return f"{ResourceColorizer.WHITE}{name}{ResourceColorizer.RESET}"
+        return f"{ResourceColorizer.NAME_COLORS['POD']}{name}{ResourceColorizer.RESET}"
 
     @staticmethod
     def colorize_container(name):
         """Color para nombres de contenedor"""
-        return f"{ResourceColorizer.CYAN}{name}{ResourceColorizer.RESET}"
+        return f"{ResourceColorizer.NAME_COLORS['CONTAINER']}{name}{ResourceColorizer.RESET}"
 
     @staticmethod
     def colorize_node(name):
         """Color para nombres de nodo"""
-        return f"{ResourceColorizer.WHITE}{name}{ResourceColorizer.RESET}"
+        return f"{ResourceColorizer.NAME_COLORS['NODE']}{name}{ResourceColorizer.RESET}"
 
     @staticmethod
     def parse_resource_value(value):
@@ -1,12 +1,123 @@
 #!/usr/bin/env python3
 # krca/core.py - Módulo principal completo
 
-from tabulate import tabulate
-import traceback
-from typing import List, Dict, Any
+import sys
+from typing import List, Dict, Any, Iterable, Optional
 from .kubectl import KubectlClient
 from .colorizer import ResourceColorizer
 from .exporter import Exporter
+from .recommender import ResourceRecommender
+from .aggregator import UsageAggregator
+from .nodes import NodeAuditor
+from .quotas import QuotaAuditor
+from .oom import OOMReporter
+from .selection import RowSelector
+from .sampling import UsageSampler
+from .snapshot import SnapshotStore, AuditDiff, SNAPSHOT_FIELDS
+from .merge import FleetMerge
+from .policy import PolicyIndex
+from .deadline import DeadlineFetcher, Progress
+from .decoding import JsonDecoder
+from .utils import KRCAUtils
+from .cli import parse_args
+from .models import (
+    AnalysisResult,
+    ClusterStats,
+    ContainerMetrics,
+    ContainerResources,
+    ContainerStatus,
+    PodData,
+    PodStatus,
+    Thresholds
+)
+
+# Orden de los campos en cada fila generada por _process_pod_data
+ROW_COLUMNS = [
+    'NAMESPACE', 'POD', 'CONTAINER',
+    'CPU', 'REQ_CPU', 'LIM_CPU',
+    'MEMORY', 'REQ_MEM', 'LIM_MEM',
+    'STATUS', 'RESTARTS',
+    'NODE_IP', 'NODE',
+    'WORKLOAD', 'LAST_STATE',
+    # Uso exacto (nanocores y bytes) para ratios y severidad; no se muestra
+    'CPU_NANOCORES', 'MEMORY_BYTES'
+]
+
+class StatsAccumulator:
+    """
+    Acumula ClusterStats pod a pod, a partir de las mismas filas que se generan
+    para la tabla (sin recorrer el cluster una segunda vez)
+
+    Un pod cuenta como warning/error según la peor severidad de sus
+    contenedores, como sobreutilizado si algún contenedor supera danger-pct
+    de su limit y como subutilizado si alguno usa menos de underuse-pct de su
+    request (con los umbrales de la política, si hay). Los porcentajes
+    globales son uso sobre requests, sumando solo contenedores con ambos
+    valores definidos.
+    """
+
+    __slots__ = ("selector", "total", "running", "warning", "error",
+                 "underutilized", "overutilized", "cpu_usage", "cpu_requests", "mem_usage", "mem_requests")
+
+    def __init__(self, selector: RowSelector):
+        self.selector = selector
+        self.total = self.running = self.warning = self.error = 0
+        self.underutilized = self.overutilized = 0
+        self.cpu_usage = self.cpu_requests = 0.0
+        self.mem_usage = self.mem_requests = 0.0
+
+    def _add_usage(self, row: List, usage_column: str, request_column: str, cpu: bool) -> None:
+        usage = self.selector.number(row, usage_column)
+        request = self.selector.number(row, request_column)
+        if usage is None or not request:
+            return
+        if cpu:
+            self.cpu_usage += usage
+            self.cpu_requests += request
+        else:
+            self.mem_usage += usage
+            self.mem_requests += request
+
+    def add_pod(self, pod: Dict[str, Any], rows: List[List]) -> None:
+        """Suma un pod con sus filas ya generadas"""
+        selector = self.selector
+        self.total += 1
+        if pod.get("status", {}).get("phase") == "Running":
+            self.running += 1
+
+        worst = ResourceColorizer.SEVERITY_OK
+        over = under = False
+        for row in rows:
+            worst = max(worst, selector.severity(row))
+            _, danger_pct, _, underuse_pct = selector.thresholds_for(row)
+            for usage, request, limit, cpu in (("CPU", "REQ_CPU", "LIM_CPU", True),
+                                               ("MEMORY", "REQ_MEM", "LIM_MEM", False)):
+                self._add_usage(row, usage, request, cpu)
+                limit_ratio = selector.ratio(row, usage, limit)
+                request_ratio = selector.ratio(row, usage, request)
+                if limit_ratio is not None and limit_ratio * 100 > danger_pct:
+                    over = True
+                if request_ratio is not None and request_ratio * 100 < underuse_pct:
+                    under = True
+
+        if worst == ResourceColorizer.SEVERITY_DANGER:
+            self.error += 1
+        elif worst == ResourceColorizer.SEVERITY_WARNING:
+            self.warning += 1
+        self.overutilized += over
+        self.underutilized += under
+
+    def result(self) -> ClusterStats:
+        return ClusterStats(
+            total_pods=self.total,
+            running_pods=self.running,
+            warning_pods=self.warning,
+            error_pods=self.error,
+            cpu_usage_percent=round(self.cpu_usage / self.cpu_requests * 100, 2) if self.cpu_requests else 0.0,
+            memory_usage_percent=round(self.mem_usage / self.mem_requests * 100, 2) if self.mem_requests else 0.0,
+            underutilized_pods=self.underutilized,
+            overutilized_pods=self.overutilized
+        )
 
 class KRCAnalyzer:
     """Clase principal para el análisis de recursos de Kubernetes"""
@@ -15,6 +126,32 @@ class KRCAnalyzer:
         self.args = args
         self.use_color = not args.no_color
         self.headers = self._determine_headers()
+        self.thresholds = (
+            args.warning_pct,
+            args.danger_pct,
+            args.diff_pct,
+            args.underuse_pct
+        )
+        # Política compilada (ya cargada por analyze_resources o a partir de --policy)
+        self.policy = getattr(args, 'policy_index', None)
+        if self.policy is None and getattr(args, 'policy', None):
+            self.policy = PolicyIndex.load(args.policy, Thresholds(*self.thresholds))
+        # Umbrales resueltos por pod: (namespace, pod) -> tupla de umbrales (solo la pasada actual)
+        self._pod_thresholds: Dict[tuple, tuple] = {}
+        # Label y field selector (-l, --field-selector) que se envían al API server
+        self.selectors = (getattr(args, 'selector', None), getattr(args, 'field_selector', None))
+        # ContainerResources compartidos por las réplicas con el mismo contenedor y recursos
+        self._container_resources: Dict[tuple, ContainerResources] = {}
+        # Valores numéricos de las filas (uso exacto) para colores y severidad
+        self._values = RowSelector(ROW_COLUMNS, thresholds=self.thresholds, thresholds_for=self.thresholds_for)
+
+    def thresholds_for(self, row: List) -> tuple:
+        """Umbrales aplicables a una fila (los de la política o los globales)"""
+        return self._pod_thresholds.get((row[0], row[1]), self.thresholds)
+
+    def reset_thresholds(self) -> None:
+        """Olvida los umbrales por pod de la pasada anterior (los pods borrados no se acumulan)"""
+        self._pod_thresholds.clear()
 
     def _determine_headers(self) -> List[str]:
         """Define las columnas a mostrar basadas en los argumentos"""
@@ -36,6 +173,7 @@ class KRCAnalyzer:
             base_headers.extend([
                 "STATUS", 
                 "RESTARTS", 
+                "LAST_STATE",
                 "NODE_IP", 
                 "NODE"
             ])
@@ -48,42 +186,37 @@ class KRCAnalyzer:
 
     def _get_column_index(self, column_name: str) -> int:
         """Obtiene el índice de una columna por su nombre"""
-        column_mapping = {
-            'NAMESPACE': 0, 'POD': 1, 'CONTAINER': 2,
-            'CPU': 3, 'REQ_CPU': 4, 'LIM_CPU': 5,
-            'MEMORY': 6, 'REQ_MEM': 7, 'LIM_MEM': 8,
-            'STATUS': 9, 'RESTARTS': 10,
-            'NODE_IP': 11, 'NODE': 12
-        }
-        return column_mapping.get(column_name, -1)
-
-    def _process_pod_data(self, pod: Dict[str, Any]) -> List[List[str]]:
+        if column_name in ROW_COLUMNS:
+            return ROW_COLUMNS.index(column_name)
+        return -1
+
+    def _process_pod_data(self, pod: Dict[str, Any], metrics: Dict[str, Any]) -> List[List[str]]:
         """Procesa los datos de un pod y sus contenedores"""
         pod_data = []
         pod_name = pod["metadata"]["name"]
-        namespace = pod["metadata"]["namespace"]
+        namespace = KubectlClient.specs.intern(pod["metadata"]["namespace"])
         
-        status, restarts = KubectlClient.get_pod_status(pod)
+        # Índice nombre -> (estado, reinicios, última terminación), una vez por pod
+        statuses = KubectlClient.get_container_statuses(pod)
         node_ip, node_name = KubectlClient.get_node_info(pod)
-        containers = KubectlClient.get_container_resources(pod)
-        metrics = KubectlClient.get_metrics(self.args.namespace, self.args.all_namespaces)
-        pod_metrics = metrics.get(pod_name, {})
+        kind, workload = KubectlClient.get_workload(pod)
+        workload_name = KubectlClient.specs.intern(f"{kind}/{workload}")
+        containers = KubectlClient.container_records(pod, include_all=True)
+        pod_metrics = metrics.get((namespace, pod_name), {})
+        if self.policy is not None:
+            self._pod_thresholds[(namespace, pod_name)] = self.policy.lookup(
+                namespace, workload_name, pod["metadata"].get("labels"))
         
         for container in containers:
             container_name = container["name"]
             container_metrics = pod_metrics.get(container_name, {})
+            status, restarts, last_state = statuses.get(container_name, ("Unknown", 0, "-"))
+            if container["type"] != "container":
+                container_name = f"{container_name} ({container['type']})"
             
-            # Obtener métricas con validación
             cpu_usage = container_metrics.get("cpu", "-")
             memory_usage = container_metrics.get("memory", "-")
             
-            # Asegurar que memory tenga unidades válidas
-            if memory_usage != "-" and not any(x in memory_usage for x in ['Ki', 'Mi', 'Gi']):
-                if memory_usage.isdigit():
-                    memory_usage = f"{memory_usage}Mi"
-                else:
-                    memory_usage = "-"
-            
             row = [
                 namespace,
                 pod_name,
@@ -97,119 +230,368 @@ class KRCAnalyzer:
                 status,
                 restarts,
                 node_ip,
-                node_name
+                node_name,
+                workload_name,
+                last_state,
+                container_metrics.get("cpu_nanocores"),
+                container_metrics.get("memory_bytes")
             ]
             pod_data.append(row)
         
         return pod_data
 
-    def _apply_colors(self, row: List[str]) -> List[str]:
-        """Aplica colores a los datos según su estado"""
-        colored_row = []
-        for i, item in enumerate(row):
-            if i >= len(self.headers):
-                continue
-                
-            header = self.headers[i]
-            
-            if not self.use_color:
-                colored_row.append(item)
-                continue
-            
-            # Colorización especial para cada tipo de campo
-            if header == "NAMESPACE":
-                colored_row.append(ResourceColorizer.colorize_namespace(item))
-            elif header == "POD":
-                colored_row.append(ResourceColorizer.colorize_pod(item))
-            elif header == "CONTAINER":
-                colored_row.append(ResourceColorizer.colorize_container(item))
-            elif header in ["CPU", "REQ_CPU", "LIM_CPU", "MEMORY", "REQ_MEM", "LIM_MEM"]:
-                cpu_colors = ResourceColorizer.colorize_usage(
-                    row[3], row[6],  # CPU y MEMORY
-                    row[4], row[7],  # REQ_CPU y REQ_MEM
-                    row[5], row[8],  # LIM_CPU y LIM_MEM
-                    self.args.warning_pct,
-                    self.args.danger_pct,
-                    self.args.diff_pct,
-                    self.args.underuse_pct
-                )
-                color_map = {
-                    "CPU": cpu_colors[0],
-                    "REQ_CPU": cpu_colors[1],
-                    "LIM_CPU": cpu_colors[2],
-                    "MEMORY": cpu_colors[3],
-                    "REQ_MEM": cpu_colors[4],
-                    "LIM_MEM": cpu_colors[5]
-                }
-                colored_row.append(f"{color_map[header]}{item}{ResourceColorizer.RESET}")
-            elif header == "STATUS":
-                status_color, _ = ResourceColorizer.colorize_status(item, 0)
-                colored_row.append(f"{status_color}{item}{ResourceColorizer.RESET}")
-            elif header == "RESTARTS":
-                _, restarts_color = ResourceColorizer.colorize_status("", int(item))
-                colored_row.append(f"{restarts_color}{item}{ResourceColorizer.RESET}")
-            elif header in ["NODE_IP", "NODE"]:
-                colored_row.append(ResourceColorizer.colorize_node(item))
-            else:
-                colored_row.append(item)
+    def _row_colors(self, row: List) -> List[Optional[str]]:
+        """Código de color de cada campo de la fila (el renderer lo aplica al rellenar)"""
+        colors: List[Optional[str]] = [None] * len(row)
+        if not self.use_color:
+            return colors
+        # CPU, REQ_CPU, LIM_CPU, MEMORY, REQ_MEM, LIM_MEM con el uso exacto (como la severidad)
+        for position, color in zip((3, 4, 5, 6, 7, 8), self._values.usage_colors(row)):
+            colors[position] = color
+        for i, header in enumerate(ROW_COLUMNS):
+            if header in ResourceColorizer.NAME_COLORS:
+                colors[i] = ResourceColorizer.NAME_COLORS[header]
+        colors[9], _ = ResourceColorizer.colorize_status(row[9], 0)
+        _, colors[10] = ResourceColorizer.colorize_status("", int(row[10]))
+        colors[14] = ResourceColorizer.last_state_color(row[14])
+        return colors
+
+    def _render(self, data: List[List[str]], headers: List[str], colors: Optional[List[List]] = None) -> None:
+        """Genera la tabla y la imprime o exporta según los argumentos"""
+        table_output = Exporter.render_table(
+            data,
+            headers,
+            self.use_color,
+            getattr(self.args, 'number', False),
+            colors
+        )
+        
+        if hasattr(self.args, 'output_file') and self.args.output_file:
+            Exporter.export(
+                table_output,
+                self.args.output_file,
+                self.use_color,
+                getattr(self.args, 'force', False),
+                getattr(self.args, 'landscape', False)
+            )
+        else:
+            print(table_output)
+
+    def _check_grouped(self) -> None:
+        """Rechaza las opciones que solo aplican a filas de contenedores (--group-by muestra grupos)"""
+        selection = [flag for flag, value in (
+            ("--sort-by", getattr(self.args, 'sort_by', None)),
+            ("--filter", getattr(self.args, 'filter', None)),
+            ("--top", getattr(self.args, 'top', None))
+        ) if value]
+        if selection:
+            raise ValueError(f"{', '.join(selection)} no se puede usar con --group-by "
+                             "(seleccionan filas de contenedores, no grupos)")
+        if SnapshotStore.is_snapshot(getattr(self.args, 'output_file', None)):
+            raise ValueError("--group-by no genera snapshots: use --output-file con .txt, .html o .pdf")
+
+    def _analyze_grouped(self, pods: Dict[str, Any], metrics: Dict[str, Any]) -> None:
+        """Agrega los contenedores por workload, namespace o nodo en una sola pasada"""
+        self.reset_thresholds()
+        aggregator = UsageAggregator(self.args.group_by)
+        for pod in pods["items"]:
+            for row in self._process_pod_data(pod, metrics):
+                aggregator.add(row, self.thresholds_for(row))
+        
+        rows = aggregator.rows()
+        if self.use_color:
+            rows = [aggregator.apply_colors(row, self.thresholds) for row in rows]
         
-        return colored_row
+        self._render(rows, aggregator.headers)
+
+    def _build_pod_data(self, pod: Dict[str, Any], rows: List[List]) -> PodData:
+        """Modelo tipado de un pod a partir de sus filas (nombres de contenedor como en la tabla)"""
+        metadata = pod["metadata"]
+        containers, container_metrics, container_statuses = [], {}, {}
+        for row in rows:
+            name = row[2]
+            key = (name, row[4], row[7], row[5], row[8])
+            resources = self._container_resources.get(key)
+            if resources is None:
+                resources = ContainerResources(*key)
+                if KubectlClient.specs.enabled:
+                    self._container_resources[key] = resources
+            containers.append(resources)
+            if row[3] != "-" or row[6] != "-":
+                container_metrics[name] = ContainerMetrics(row[3], row[6], row[0])
+            container_statuses[name] = ContainerStatus(row[9], row[10], row[14])
+
+        node_ip, node_name = KubectlClient.get_node_info(pod)
+        return PodData(
+            name=metadata["name"],
+            namespace=metadata["namespace"],
+            containers=containers,
+            metrics=container_metrics,
+            status=PodStatus(
+                pod.get("status", {}).get("phase", "Unknown"),
+                sum(row[10] for row in rows),
+                node_ip,
+                node_name
+            ),
+            workload=rows[0][13] if rows else "",
+            container_statuses=container_statuses
+        )
+
+    def collect(
+        self,
+        pods: Optional[Dict[str, Any]] = None,
+        metrics: Optional[Dict[str, Any]] = None
+    ) -> AnalysisResult:
+        """
+        Genera filas, modelos de pod y estadísticas del cluster en una sola pasada
+
+        Args:
+            pods: Lista de pods en formato JSON (si no se indica, se consulta)
+            metrics: Métricas de get_metrics (si no se indica, se consultan)
+
+        Returns:
+            AnalysisResult con pod_data, cluster_stats y las filas sin colorear
+        """
+        calls = {}
+        if pods is None or metrics is None:
+            namespace = KubectlClient.resolve_namespace(self.args.namespace, self.args.all_namespaces)
+        if pods is None:
+            calls["pods"] = lambda: KubectlClient.get_pods(namespace, self.args.all_namespaces, *self.selectors)
+        if metrics is None:
+            calls["metrics"] = lambda: KubectlClient.get_metrics(namespace, self.args.all_namespaces, *self.selectors)
+        if calls:
+            fetched = KubectlClient.fetch_all(calls)
+            pods = fetched.get("pods", pods)
+            metrics = fetched.get("metrics", metrics)
+
+        warnings = []
+        if not metrics:
+            warnings.append("No se obtuvieron métricas de uso (¿metrics-server disponible?)")
+
+        self.reset_thresholds()
+        stats = StatsAccumulator(self._values)
+        pod_data, all_rows = [], []
+        for pod in pods["items"]:
+            rows = self._process_pod_data(pod, metrics)
+            stats.add_pod(pod, rows)
+            pod_data.append(self._build_pod_data(pod, rows))
+            all_rows.extend(rows)
+
+        return AnalysisResult(
+            pod_data=pod_data,
+            cluster_stats=stats.result(),
+            warnings=warnings,
+            errors=[],
+            rows=all_rows
+        )
+
+    def _output(self, rows: Iterable[List]) -> None:
+        """Selecciona, colorea, recorta columnas y renderiza las filas"""
+        # Filtro/orden/top-N sobre las filas sin colorear (solo se colorea lo seleccionado)
+        selector = RowSelector(
+            ROW_COLUMNS,
+            getattr(self.args, 'sort_by', None),
+            getattr(self.args, 'filter', None),
+            getattr(self.args, 'top', None),
+            self.thresholds,
+            self.thresholds_for
+        )
+        all_data = selector.select(rows)
+        
+        output_file = getattr(self.args, 'output_file', None)
+        if SnapshotStore.is_snapshot(output_file):
+            # Snapshot para `krca diff`: filas completas sin colores, con su severidad
+            levels = {value: name for name, value in ResourceColorizer.SEVERITY_LEVELS.items()}
+            records = []
+            for row in all_data:
+                record = {field: row[ROW_COLUMNS.index(field.upper())] for field in SNAPSHOT_FIELDS[:-1]}
+                record["severity"] = levels[selector.severity(row)]
+                records.append(record)
+            SnapshotStore.write(records, output_file, self.use_color, getattr(self.args, 'force', False))
+            return
+        
+        # Filtrar solo las columnas que queremos mostrar
+        if hasattr(self.args, 'custom_columns') and self.args.custom_columns:
+            column_indices = [self._get_column_index(col) for col in self.args.custom_columns]
+        else:
+            # Mostrar solo las columnas básicas si no se especifica otra cosa
+            column_indices = [self._get_column_index(col) for col in self.headers]
+        column_indices = [i for i in column_indices if i != -1]
+        
+        # Valores crudos y colores por separado: el ancho se mide sin códigos ANSI
+        data = [[row[i] for i in column_indices] for row in all_data]
+        colors = None
+        if self.use_color:
+            colors = [[row_colors[i] for i in column_indices]
+                      for row_colors in map(self._row_colors, all_data)]
+        
+        self._render(data, self.headers, colors)
+
+    def render(self, result: AnalysisResult) -> None:
+        """Muestra o exporta un AnalysisResult obtenido con collect()"""
+        self._output(result.rows)
+
+    def _rows(self, pods: Dict[str, Any], metrics: Dict[str, Any], progress: Progress) -> Iterable[List]:
+        """Filas de todos los pods en streaming, contando el avance"""
+        self.reset_thresholds()
+        for pod in pods["items"]:
+            rows = self._process_pod_data(pod, metrics)
+            progress.add(rows=len(rows))
+            yield from rows
+
+    def load_dump(self) -> tuple:
+        """
+        Pods y métricas de los volcados de --from-file y --metrics-file
+
+        Los archivos se mapean en memoria y se decodifican con JsonDecoder.
+        Con -n solo se conservan los pods de ese namespace.
+
+        Returns:
+            Tupla (pods, metrics) con el mismo formato que get_pods y get_metrics
+        """
+        if any(self.selectors):
+            raise ValueError("-l/--field-selector los aplica el API server: no se pueden usar con --from-file")
+        pods = JsonDecoder.load_file(self.args.from_file, pods=True)
+        if not isinstance(pods, dict):
+            raise ValueError(f"{self.args.from_file}: se esperaba la salida de `kubectl get pods -o json`")
+        if pods.get("kind") == "Pod":
+            pods = {"items": [pods]}
+        if self.args.namespace and not self.args.all_namespaces:
+            pods = {"items": [pod for pod in pods.get("items", [])
+                              if pod.get("metadata", {}).get("namespace") == self.args.namespace]}
+        pods.setdefault("items", [])
+
+        metrics: Dict[str, Any] = {}
+        if getattr(self.args, 'metrics_file', None):
+            KubectlClient.parse_pod_metrics(JsonDecoder.load_file(self.args.metrics_file), metrics)
+        return pods, metrics
 
     def analyze(self) -> int:
         """Ejecuta el análisis completo y muestra los resultados"""
+        deadline = getattr(self.args, 'deadline', None)
+        progress = Progress(getattr(self.args, 'progress', False) or bool(deadline and sys.stderr.isatty()))
+        partial = None
         try:
-            pods = KubectlClient.get_pods(self.args.namespace, self.args.all_namespaces)
-            all_data = []
-            
-            for pod in pods["items"]:
-                all_data.extend(self._process_pod_data(pod))
-            
-            colored_data = [self._apply_colors(row) for row in all_data]
-            
-            # Filtrar solo las columnas que queremos mostrar
-            if hasattr(self.args, 'custom_columns') and self.args.custom_columns:
-                column_indices = [self._get_column_index(col) for col in self.args.custom_columns]
-                colored_data = [
-                    [row[i] for i in column_indices if i != -1]
-                    for row in colored_data
-                ]
+            if getattr(self.args, 'group_by', None):
+                self._check_grouped()
+            if getattr(self.args, 'from_file', None):
+                pods, metrics = self.load_dump()
+                progress.add(pods=len(pods["items"]),
+                             matched=DeadlineFetcher.matched(pods["items"], metrics))
+            elif deadline:
+                # Por namespace y hasta el plazo: lo que no llegue queda anotado, no aborta
+                partial = DeadlineFetcher(self.args, self.selectors, progress).fetch()
+                pods, metrics = partial.pods, partial.metrics
             else:
-                # Mostrar solo las columnas básicas si no se especifica otra cosa
-                column_indices = [self._get_column_index(col) for col in self.headers]
-                colored_data = [
-                    [row[i] for i in column_indices if i != -1]
-                    for row in colored_data
-                ]
+                namespace = KubectlClient.resolve_namespace(self.args.namespace, self.args.all_namespaces)
+                fetched = KubectlClient.fetch_all({
+                    "pods": lambda: KubectlClient.get_pods(namespace, self.args.all_namespaces, *self.selectors),
+                    "metrics": lambda: KubectlClient.get_metrics(namespace, self.args.all_namespaces, *self.selectors),
+                })
+                pods, metrics = fetched["pods"], fetched["metrics"]
+                progress.add(pods=len(pods["items"]),
+                             matched=DeadlineFetcher.matched(pods["items"], metrics))
             
-            # Usar tablefmt="plain" para eliminar líneas de separación
-            table_output = tabulate(
-                colored_data,
-                headers=[f"{ResourceColorizer.BOLD if self.use_color else ''}{h}{ResourceColorizer.RESET if self.use_color else ''}" 
-                        for h in self.headers],
-                showindex=getattr(self.args, 'number', False),
-                tablefmt="plain"  # Formato sin líneas de separación
-            )
-            
-            if hasattr(self.args, 'output_file') and self.args.output_file:
-                Exporter.export(
-                    table_output,
-                    self.args.output_file,
-                    self.use_color,
-                    getattr(self.args, 'force', False),
-                    getattr(self.args, 'landscape', False)
-                )
+            if getattr(self.args, 'group_by', None):
+                self._analyze_grouped(pods, metrics)
+                progress.finish()
             else:
-                print(table_output)
+                # Sin modelos ni estadísticas: las filas se generan en streaming
+                rows = self._rows(pods, metrics, progress)
+                if progress.enabled:
+                    # La línea de avance se cierra antes de imprimir la tabla
+                    rows = list(rows)
+                    progress.finish()
+                self._output(rows)
             
+            if partial is not None:
+                partial.report(self.use_color)
             return 0
             
         except Exception as e:
-            error_msg = f"{ResourceColorizer.RED}Error:{ResourceColorizer.RESET} {str(e)}"
-            if getattr(self.args, 'debug', False):
-                error_msg += f"\n\n{ResourceColorizer.YELLOW}Debug info:{ResourceColorizer.RESET}\n{traceback.format_exc()}"
-            print(error_msg)
+            progress.finish()
+            KRCAUtils.report_error(e, getattr(self.args, 'debug', False))
             return 1
 
+def collect_resources(args=None) -> AnalysisResult:
+    """
+    API de librería: analiza el cluster sin imprimir nada
+
+    Args:
+        args: Argumentos como los de parse_args (por defecto, los valores por defecto
+              del namespace actual)
+
+    Returns:
+        AnalysisResult con los pods, sus contenedores y las estadísticas del cluster;
+        para mostrarlo usar KRCAnalyzer(args).render(result)
+    """
+    if args is None:
+        args = parse_args([])
+    return KRCAnalyzer(args).collect()
+
 def analyze_resources(args) -> int:
-    """Función principal para iniciar el análisis"""
+    """Función principal para iniciar el análisis (o el subcomando indicado)"""
+    try:
+        KubectlClient.configure(
+            timeout=getattr(args, 'timeout', None),
+            retries=getattr(args, 'retries', None),
+            max_concurrency=getattr(args, 'max_concurrency', None),
+            metrics_source=getattr(args, 'metrics_source', None),
+            deadline=getattr(args, 'deadline', None)
+        )
+        JsonDecoder.configure(getattr(args, 'json_backend', None))
+        if getattr(args, 'deadline', None) and getattr(args, 'command', None) == 'serve':
+            raise ValueError("--deadline no se puede usar con serve (use --timeout por llamada)")
+        thresholds = Thresholds(args.warning_pct, args.danger_pct, args.diff_pct, args.underuse_pct)
+        if not KRCAUtils.validate_thresholds(args.warning_pct, args.danger_pct, args.diff_pct, args.underuse_pct):
+            raise ValueError("Umbrales inconsistentes: se requiere 0 <= --underuse-pct < --warning-pct < "
+                             "--danger-pct <= 1000 y 0 < --diff-pct <= 1000")
+        if not KRCAUtils.validate_percentile(getattr(args, 'percentile', 95.0)):
+            raise ValueError(f"--percentile fuera de rango: {args.percentile:g} (se requiere 0 < P <= 100)")
+        if getattr(args, 'policy', None):
+            args.policy_index = PolicyIndex.load(args.policy, thresholds)
+    except (OSError, ValueError) as e:
+        KRCAUtils.report_error(e, getattr(args, 'debug', False))
+        return 1
+    
+    try:
+        return _dispatch(args)
+    finally:
+        if getattr(args, 'debug', False):
+            print(KubectlClient.stats.summary(), file=sys.stderr)
+            print(KubectlClient.specs.summary(), file=sys.stderr)
+
+def _dispatch(args) -> int:
+    """Ejecuta el subcomando indicado (o el análisis por defecto)"""
+    command = getattr(args, 'command', None)
+    if command == 'recommend':
+        return ResourceRecommender(args).run()
+    if command == 'nodes':
+        return NodeAuditor(args).run()
+    if command == 'quotas':
+        return QuotaAuditor(args).run()
+    if command == 'oom':
+        return OOMReporter(args).run()
+    if command == 'diff':
+        return AuditDiff(args).run()
+    if command == 'merge':
+        return FleetMerge(args).run()
+    if command == 'autoscalers':
+        # Import diferido: autoscalers usa KRCAnalyzer de este módulo
+        from .autoscalers import AutoscalerAuditor
+        return AutoscalerAuditor(args).run()
+    if command == 'cost':
+        # Import diferido: cost usa KRCAnalyzer de este módulo
+        from .cost import CostReport
+        return CostReport(args).run()
+    if command == 'tui':
+        # Import diferido: tui usa KRCAnalyzer de este módulo
+        from .tui import AuditTUI
+        return AuditTUI(args).run()
+    if command == 'serve':
+        # Import diferido: server usa KRCAnalyzer de este módulo
+        from .server import MetricsServer
+        return MetricsServer(args).run()
+    if getattr(args, 'sample', None) is not None:
+        return UsageSampler(args).run()
     return KRCAnalyzer(args).analyze()
@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+# krca/cost.py - Costo del sobre y subaprovisionamiento a partir de una tabla de precios
+
+import operator
+import sys
+from array import array
+from itertools import repeat
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import yaml
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
+from .kubectl import KubectlClient
+from .colorizer import ResourceColorizer
+from .core import KRCAnalyzer, ROW_COLUMNS
+from .exporter import Exporter
+from .selection import RowSelector, SORT_KEYS
+from .snapshot import SnapshotStore
+from .utils import KRCAUtils
+
+# Horas de un mes promedio (365 * 24 / 12): los costos se expresan por mes
+HOURS_PER_MONTH = 730
+
+GIB = 2 ** 30
+
+# Etiquetas estándar con el tipo de instancia del nodo (la beta en clusters antiguos)
+INSTANCE_TYPE_LABELS = ("node.kubernetes.io/instance-type", "beta.kubernetes.io/instance-type")
+
+# Claves aceptadas en la tabla de precios y en cada precio
+TABLE_KEYS = {"default", "instance_types", "labels"}
+PRICE_KEYS = {"cpu", "memory"}
+
+# Precio (por core-hora, por GiB-hora)
+Price = Tuple[float, float]
+
+# Columnas de costo (numéricas para --sort-by/--filter), en moneda por mes
+COST_COLUMNS = ["CPU_WASTE", "MEM_WASTE", "WASTE", "UNDER"]
+
+# Columnas de identificación de cada nivel (--group-by) y su posición en ROW_COLUMNS
+LEVEL_KEYS = {
+    None: ["NAMESPACE", "WORKLOAD", "POD", "CONTAINER", "NODE"],
+    "workload": ["NAMESPACE", "WORKLOAD"],
+    "namespace": ["NAMESPACE"],
+    "node": ["NODE"],
+}
+
+USAGE_COLUMNS = ["CPU", "REQ_CPU", "MEMORY", "REQ_MEM"]
+
+class PriceTable:
+    """
+    Precios por core-hora y GiB-hora de cada nodo
+
+    El precio de un nodo es el de la primera regla de etiquetas que
+    coincide, si no el de su tipo de instancia y si no la tarifa plana
+    (default). Se resuelve una vez por nodo y se guarda en un índice
+    nombre -> precio.
+    """
+
+    def __init__(
+        self,
+        default: Optional[Price],
+        instance_types: Dict[str, Price],
+        labels: List[Tuple[Dict[str, str], Price]]
+    ):
+        self.default = default
+        self.instance_types = instance_types
+        self.labels = labels
+
+    @property
+    def per_node(self) -> bool:
+        """True si algún precio depende del nodo (etiquetas o tipo de instancia)"""
+        return bool(self.instance_types or self.labels)
+
+    @staticmethod
+    def _read(path: str) -> Dict:
+        if path.lower().endswith(".toml"):
+            if tomllib is None:
+                raise ValueError("Las tablas de precios TOML requieren Python 3.11 o superior (use YAML)")
+            with open(path, "rb") as f:
+                return tomllib.load(f)
+        # YAML (JSON también es YAML válido)
+        with open(path, encoding="utf-8") as f:
+            return yaml.safe_load(f) or {}
+
+    @staticmethod
+    def _price(entry, where: str) -> Price:
+        if not isinstance(entry, dict):
+            raise ValueError(f"{where}: se esperaba un objeto con cpu y memory")
+        unknown = set(entry) - PRICE_KEYS - {"match"}
+        if unknown:
+            raise ValueError(f"{where}: claves desconocidas {', '.join(sorted(unknown))} (use cpu, memory)")
+        try:
+            cpu, memory = float(entry.get("cpu", 0)), float(entry.get("memory", 0))
+        except (TypeError, ValueError):
+            raise ValueError(f"{where}: cpu y memory deben ser números (precio por core-hora y GiB-hora)")
+        if cpu < 0 or memory < 0:
+            raise ValueError(f"{where}: los precios no pueden ser negativos")
+        return cpu, memory
+
+    @classmethod
+    def load(cls, path: str) -> "PriceTable":
+        """
+        Lee una tabla de precios YAML, JSON o TOML
+
+        Formato (YAML), precios por core-hora y por GiB-hora:
+            default: {cpu: 0.0316, memory: 0.0042}
+            instance_types:
+              m5.xlarge: {cpu: 0.048, memory: 0.006}
+            labels:
+              - match: {cloud.google.com/gke-spot: "true"}
+                cpu: 0.0095
+                memory: 0.0013
+
+        Raises:
+            ValueError: Si el archivo o algún precio no es válido
+        """
+        data = cls._read(path)
+        if not isinstance(data, dict):
+            raise ValueError(f"{path}: se esperaba un objeto con default, instance_types o labels")
+        unknown = set(data) - TABLE_KEYS
+        if unknown:
+            raise ValueError(f"{path}: claves desconocidas {', '.join(sorted(unknown))}")
+
+        default = cls._price(data["default"], f"{path}: default") if "default" in data else None
+        instance_types = data.get("instance_types") or {}
+        if not isinstance(instance_types, dict):
+            raise ValueError(f"{path}: 'instance_types' debe ser un mapa tipo: precio")
+        rules = data.get("labels") or []
+        if not isinstance(rules, list):
+            raise ValueError(f"{path}: 'labels' debe ser una lista de reglas con match")
+
+        labels = []
+        for position, entry in enumerate(rules, start=1):
+            where = f"{path}: labels[{position}]"
+            match = entry.get("match") if isinstance(entry, dict) else None
+            if not isinstance(match, dict) or not match:
+                raise ValueError(f"{where}: se requiere 'match' con al menos una etiqueta")
+            labels.append(({str(key): str(value) for key, value in match.items()}, cls._price(entry, where)))
+        if default is None and not instance_types and not labels:
+            raise ValueError(f"{path}: la tabla de precios está vacía")
+        return cls(
+            default,
+            {str(name): cls._price(price, f"{path}: instance_types.{name}") for name, price in instance_types.items()},
+            labels
+        )
+
+    def node_price(self, labels: Dict[str, str]) -> Optional[Price]:
+        """Precio de un nodo según sus etiquetas (None si ninguna regla aplica y no hay default)"""
+        for match, price in self.labels:
+            if all(labels.get(key) == value for key, value in match.items()):
+                return price
+        for label in INSTANCE_TYPE_LABELS:
+            price = self.instance_types.get(labels.get(label))
+            if price is not None:
+                return price
+        return self.default
+
+    def index(self, nodes: Dict) -> Dict[str, Optional[Price]]:
+        """Índice nombre de nodo -> precio, resuelto una vez por nodo"""
+        return {
+            node["metadata"]["name"]: self.node_price(node["metadata"].get("labels") or {})
+            for node in nodes.get("items", [])
+        }
+
+class CostEngine:
+    """
+    Costo mensual de request menos uso por contenedor, calculado por columnas
+
+    Las filas se convierten a columnas (array de floats: uso, request y
+    tarifa de cada contenedor) y cada costo se calcula columna contra
+    columna con map sobre operator, sin lógica por fila en Python:
+
+        CPU_WASTE = max(req_cpu - cpu, 0) * tarifa_cpu
+        UNDER     = max(cpu - req_cpu, 0) * tarifa_cpu + (lo mismo en memoria)
+
+    WASTE es lo que se paga reservado y sin usar (sobreaprovisionamiento);
+    UNDER es el uso que excede al request, capacidad que el scheduler no
+    reservó (subaprovisionamiento). Un request no definido cuenta como 0.
+    Los contenedores sin métricas o en nodos sin precio no se costean.
+    """
+
+    def __init__(self, prices: PriceTable, node_prices: Dict[str, Optional[Price]], hours: float = HOURS_PER_MONTH):
+        self.prices = prices
+        self.node_prices = node_prices
+        self.hours = hours
+
+    def compute(self, rows: Sequence[List[str]]) -> Tuple[List[List[str]], Dict[str, array], int, int]:
+        """
+        Costos de cada contenedor
+
+        Returns:
+            (filas costeadas, columnas por nombre: las de COST_COLUMNS y el uso
+             y los requests en milicores y bytes, contenedores sin métricas,
+             contenedores sin precio)
+        """
+        index = {name: i for i, name in enumerate(ROW_COLUMNS)}
+        # Milicores y bytes; el uso con su valor exacto (no el texto redondeado de la tabla)
+        number = RowSelector(ROW_COLUMNS).number
+        costed = []
+        names = ("cpu", "req_cpu", "cpu_metered", "memory", "req_mem", "mem_metered", "cpu_rate", "mem_rate")
+        cpu, req_cpu, cpu_metered, memory, req_mem, mem_metered, cpu_rate, mem_rate = lists = [[] for _ in names]
+        unmetered = unpriced = 0
+        for row in rows:
+            cpu_used = number(row, 'CPU')
+            mem_used = number(row, 'MEMORY')
+            if cpu_used is None and mem_used is None:
+                unmetered += 1
+                continue
+            # Nodos fuera del índice (pods sin nodo, --from-file): precio default
+            rate = self.node_prices.get(row[index['NODE']], self.prices.default)
+            if rate is None:
+                unpriced += 1
+                continue
+            costed.append(row)
+            cpu.append(cpu_used or 0.0)
+            req_cpu.append(number(row, 'REQ_CPU') or 0.0)
+            # Sin uso medido de un recurso, ese recurso no suma desperdicio ni faltante
+            cpu_metered.append(0.0 if cpu_used is None else 1.0)
+            memory.append(mem_used or 0.0)
+            req_mem.append(number(row, 'REQ_MEM') or 0.0)
+            mem_metered.append(0.0 if mem_used is None else 1.0)
+            cpu_rate.append(rate[0] * self.hours / 1000)   # por milicore-mes
+            mem_rate.append(rate[1] * self.hours / GIB)    # por byte-mes
+
+        columns = {name: array('d', values) for name, values in zip(names, lists)}
+        cpu_delta = array('d', map(operator.mul, map(operator.sub, columns["req_cpu"], columns["cpu"]),
+                                   columns["cpu_metered"]))
+        mem_delta = array('d', map(operator.mul, map(operator.sub, columns["req_mem"], columns["memory"]),
+                                   columns["mem_metered"]))
+        zeros = repeat(0.0)
+        cpu_waste = array('d', map(operator.mul, map(max, cpu_delta, zeros), columns["cpu_rate"]))
+        mem_waste = array('d', map(operator.mul, map(max, mem_delta, zeros), columns["mem_rate"]))
+        under = array('d', map(operator.add,
+                               map(operator.mul, map(max, map(operator.neg, cpu_delta), zeros), columns["cpu_rate"]),
+                               map(operator.mul, map(max, map(operator.neg, mem_delta), zeros), columns["mem_rate"])))
+        costs = {
+            "CPU_WASTE": cpu_waste,
+            "MEM_WASTE": mem_waste,
+            "WASTE": array('d', map(operator.add, cpu_waste, mem_waste)),
+            "UNDER": under,
+        }
+        costs["cpu"], costs["req_cpu"] = columns["cpu"], columns["req_cpu"]
+        costs["memory"], costs["req_mem"] = columns["memory"], columns["req_mem"]
+        return costed, costs, unmetered, unpriced
+
+    @staticmethod
+    def aggregate(rows: Sequence[List[str]], costs: Dict[str, array], level: Optional[str]) -> List[List]:
+        """
+        Totales por workload, namespace o nodo en una pasada:
+        [claves..., contenedores, uso y requests, costos]
+        """
+        keys = [ROW_COLUMNS.index(name) for name in LEVEL_KEYS[level]]
+        values = ("cpu", "req_cpu", "memory", "req_mem", *COST_COLUMNS)
+        columns = [costs[name] for name in values]
+        groups: Dict[tuple, List] = {}
+        for position, row in enumerate(rows):
+            key = tuple(row[i] for i in keys)
+            totals = groups.get(key)
+            if totals is None:
+                totals = groups[key] = [0] + [0.0] * len(values)
+            totals[0] += 1
+            for i, column in enumerate(columns, start=1):
+                totals[i] += column[position]
+        return [list(key) + totals for key, totals in groups.items()]
+
+class CostReport:
+    """`krca cost`: ranking de ahorro posible (desperdicio mensual) por contenedor, workload, namespace o nodo"""
+
+    def __init__(self, args):
+        self.args = args
+        self.use_color = not getattr(args, 'no_color', False)
+        self.level = getattr(args, 'group_by', None)
+
+    def headers(self) -> List[str]:
+        count = [] if self.level is None else ["CONTAINERS"]
+        return LEVEL_KEYS[self.level] + count + USAGE_COLUMNS + COST_COLUMNS
+
+    def collect(self) -> Tuple[List[List[str]], Tuple[float, float], List[str]]:
+        """Filas del ranking sin colorear ni ordenar, totales (WASTE, UNDER) y avisos"""
+        prices_path = getattr(self.args, 'prices', None)
+        if not prices_path:
+            raise ValueError("krca cost requiere --prices FILE (tabla de precios por core-hora y GiB-hora)")
+        prices = PriceTable.load(prices_path)
+
+        analyzer = KRCAnalyzer(self.args)
+        warnings = []
+        node_prices: Dict[str, Optional[Price]] = {}
+        if getattr(self.args, 'from_file', None):
+            pods, metrics = analyzer.load_dump()
+            if prices.per_node:
+                warnings.append("Con --from-file no se consultan los nodos: se usa el precio default")
+        else:
+            all_namespaces = self.args.all_namespaces
+            namespace = KubectlClient.resolve_namespace(self.args.namespace, all_namespaces)
+            calls = {
+                "pods": lambda: KubectlClient.get_pods(namespace, all_namespaces, *analyzer.selectors),
+                "metrics": lambda: KubectlClient.get_metrics(namespace, all_namespaces, *analyzer.selectors),
+            }
+            if prices.per_node:
+                calls["nodes"] = KubectlClient.get_nodes
+            fetched = KubectlClient.fetch_all(calls)
+            pods, metrics = fetched["pods"], fetched["metrics"]
+            if prices.per_node:
+                node_prices = prices.index(fetched["nodes"])
+        result = analyzer.collect(pods, metrics)
+        warnings = result.warnings + warnings
+
+        engine = CostEngine(prices, node_prices)
+        rows, costs, unmetered, unpriced = engine.compute(result.rows)
+        if unmetered:
+            warnings.append(f"{unmetered} contenedores sin métricas no se costean")
+        if unpriced:
+            warnings.append(f"{unpriced} contenedores en nodos sin precio (agregue default a la tabla)")
+
+        table = []
+        if self.level is None:
+            # Por contenedor se muestran uso y requests tal como en la tabla principal
+            columns = [ROW_COLUMNS.index(name) for name in LEVEL_KEYS[None] + USAGE_COLUMNS]
+            for position, row in enumerate(rows):
+                table.append([row[i] for i in columns] +
+                             [f"{costs[name][position]:.2f}" for name in COST_COLUMNS])
+        else:
+            for entry in CostEngine.aggregate(rows, costs, self.level):
+                keys = entry[:len(LEVEL_KEYS[self.level])]
+                count, cpu, req_cpu, memory, req_mem, *money = entry[len(keys):]
+                table.append(keys + [str(count)] + [
+                    KRCAUtils.format_cpu(cpu, canonical=False), KRCAUtils.format_cpu(req_cpu, canonical=False),
+                    KRCAUtils.format_memory(memory), KRCAUtils.format_memory(req_mem),
+                    *(f"{value:.2f}" for value in money)
+                ])
+        return table, (sum(costs["WASTE"]), sum(costs["UNDER"])), warnings
+
+    @staticmethod
+    def _row_colors(row: List[str], headers: List[str]) -> List[Optional[str]]:
+        """Desperdicio en púrpura (sobreasignación, como en la tabla principal) y uso sobre request en amarillo"""
+        colors: List[Optional[str]] = []
+        for header, value in zip(headers, row):
+            color = ResourceColorizer.NAME_COLORS.get(header)
+            if header in ("CPU_WASTE", "MEM_WASTE", "WASTE") and float(value) > 0:
+                color = ResourceColorizer.PURPLE
+            elif header == "UNDER" and float(value) > 0:
+                color = ResourceColorizer.YELLOW
+            colors.append(color)
+        return colors
+
+    def run(self) -> int:
+        """Ejecuta el subcomando cost y muestra/exporta el ranking"""
+        try:
+            if SnapshotStore.is_snapshot(getattr(self.args, 'output_file', None)):
+                raise ValueError("cost no genera snapshots: use --output-file con .txt, .html o .pdf")
+            sort_by = getattr(self.args, 'sort_by', None) or "WASTE"
+            if sort_by.lower() in SORT_KEYS:
+                raise ValueError(f"--sort-by {sort_by} no aplica a cost; use una columna: {', '.join(self.headers())}")
+            headers = self.headers()
+            selector = RowSelector(
+                headers, sort_by, getattr(self.args, 'filter', None), getattr(self.args, 'top', None),
+                numeric=["CONTAINERS"] + COST_COLUMNS
+            )
+            table, totals, warnings = self.collect()
+            rows = selector.select(table)
+
+            summary = (f"\nDesperdicio total (request sin usar): {totals[0]:.2f}/mes   "
+                       f"Uso sobre request: {totals[1]:.2f}/mes   "
+                       f"({HOURS_PER_MONTH} h/mes, precios de {self.args.prices})")
+            colors = [self._row_colors(row, headers) for row in rows] if self.use_color else None
+            # Montos con dos decimales fijos (sin ellos, 0.30 y 0.00 se mostrarían como 0.3 y 0)
+            formats = [".2f" if header in COST_COLUMNS else "g" for header in headers]
+            output = Exporter.render_table(rows, headers, self.use_color, getattr(self.args, 'number', False),
+                                           colors, float_format=formats)
+            Exporter.export(
+                output + summary,
+                getattr(self.args, 'output_file', None),
+                self.use_color,
+                getattr(self.args, 'force', False),
+                getattr(self.args, 'landscape', False)
+            )
+            for warning in warnings:
+                print(ResourceColorizer.yellow(warning) if self.use_color else warning, file=sys.stderr)
+            return 0
+        except Exception as e:
+            KRCAUtils.report_error(e, getattr(self.args, 'debug', False))
+            return 1
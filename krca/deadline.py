@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# krca/deadline.py - Auditoría con plazo total (--deadline), avance en stderr y resultados parciales
+
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, List, Optional, TextIO
+
+from .colorizer import ResourceColorizer
+from .kubectl import KubectlClient, DeadlineExceeded
+
+# Intervalo mínimo (segundos) entre dos redibujados de la línea de avance
+PROGRESS_INTERVAL = 0.1
+
+class Progress:
+    """
+    Línea de avance en stderr: namespaces, pods obtenidos, pods con
+    métricas y filas generadas
+
+    Se redibuja en el lugar (\\r) como mucho cada PROGRESS_INTERVAL segundos
+    y es segura entre hilos (las consultas por namespace la actualizan).
+    """
+
+    def __init__(self, enabled: bool, stream: Optional[TextIO] = None):
+        self.enabled = enabled
+        self.stream = stream or sys.stderr
+        self.namespaces_total = 0
+        self.namespaces_done = 0
+        self.pods = 0
+        self.matched = 0
+        self.rows = 0
+        self._lock = threading.Lock()
+        self._drawn = 0.0
+
+    def add(self, namespaces: int = 0, pods: int = 0, matched: int = 0, rows: int = 0) -> None:
+        with self._lock:
+            self.namespaces_done += namespaces
+            self.pods += pods
+            self.matched += matched
+            self.rows += rows
+        self.draw()
+
+    def draw(self, force: bool = False) -> None:
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if not force and now - self._drawn < PROGRESS_INTERVAL:
+                return
+            self._drawn = now
+            namespaces = f"{self.namespaces_done}/{self.namespaces_total}" if self.namespaces_total else "-"
+            line = (f"krca: namespaces {namespaces}  pods {self.pods}  "
+                    f"con métricas {self.matched}  filas {self.rows}")
+        self.stream.write(f"\r{line}")
+        self.stream.flush()
+
+    def finish(self) -> None:
+        """Dibuja los totales y deja la línea terminada (las consultas que aún terminen no redibujan)"""
+        if self.enabled:
+            self.draw(force=True)
+            self.stream.write("\n")
+            self.stream.flush()
+            self.enabled = False
+
+class PartialFetch:
+    """Pods y métricas obtenidos antes del plazo, con los namespaces que faltaron"""
+
+    def __init__(self):
+        self.pods: Dict = {"items": []}
+        self.metrics: Dict = {}
+        self.missing: List[str] = []     # namespaces sin lista de pods
+        self.unmetered: List[str] = []   # namespaces con pods pero sin métricas
+        self.expired = False
+
+    def warnings(self) -> List[str]:
+        """Avisos para el operador sobre lo que no entró en el resultado"""
+        warnings = []
+        if self.expired:
+            warnings.append("Plazo (--deadline) agotado: el resultado es parcial")
+        if self.missing:
+            warnings.append(f"Namespaces sin datos ({len(self.missing)}): {', '.join(sorted(self.missing))}")
+        if self.unmetered:
+            warnings.append(f"Namespaces sin métricas ({len(self.unmetered)}): {', '.join(sorted(self.unmetered))}")
+        return warnings
+
+    def report(self, use_color: bool = True) -> None:
+        for warning in self.warnings():
+            print(ResourceColorizer.yellow(warning) if use_color else warning, file=sys.stderr)
+
+class DeadlineFetcher:
+    """
+    Obtiene pods y métricas namespace por namespace hasta el plazo
+
+    Cada namespace se consulta por separado (pods y métricas en paralelo,
+    con el límite de concurrencia de KubectlClient). Al vencer el plazo las
+    consultas que no empezaron se cancelan y las que están en curso se
+    cortan (execute termina el proceso kubectl), así que la espera nunca
+    pasa de KubectlClient.deadline. Un namespace que falla o no llega a
+    tiempo no descarta el resto: queda anotado en el PartialFetch.
+    """
+
+    def __init__(self, args, selectors: tuple, progress: Progress):
+        self.args = args
+        self.selectors = selectors
+        self.progress = progress
+
+    def namespaces(self) -> List[str]:
+        """Namespaces a consultar: todos con -A, si no el indicado o el del contexto"""
+        if not self.args.all_namespaces:
+            return [self.args.namespace or KubectlClient.get_current_namespace()]
+        output = KubectlClient.execute(
+            ["kubectl", "get", "namespaces", "-o", "jsonpath={.items[*].metadata.name}"])
+        return output.split()
+
+    @staticmethod
+    def _succeeded(future) -> bool:
+        return future.done() and not future.cancelled() and future.exception() is None
+
+    @staticmethod
+    def matched(pods: List[Dict], metrics: Dict) -> int:
+        """Pods de la lista que tienen métricas"""
+        return sum((pod["metadata"]["namespace"], pod["metadata"]["name"]) in metrics for pod in pods)
+
+    def fetch(self) -> PartialFetch:
+        result = PartialFetch()
+        try:
+            namespaces = self.namespaces()
+        except DeadlineExceeded:
+            result.expired = True
+            return result
+        self.progress.namespaces_total = len(namespaces)
+        self.progress.draw(force=True)
+
+        pool = ThreadPoolExecutor(max_workers=KubectlClient._max_concurrency)
+        pod_futures = {
+            namespace: pool.submit(KubectlClient.get_pods, namespace, False, *self.selectors)
+            for namespace in namespaces
+        }
+        # El kubelet entrega todos los namespaces de un nodo juntos: una sola consulta
+        per_namespace_metrics = KubectlClient.metrics_source != "kubelet"
+        if per_namespace_metrics:
+            metric_futures = {
+                namespace: pool.submit(KubectlClient.get_metrics, namespace, False, *self.selectors)
+                for namespace in namespaces
+            }
+        else:
+            shared = pool.submit(KubectlClient.get_metrics, self.args.namespace,
+                                 self.args.all_namespaces, *self.selectors)
+            metric_futures = {namespace: shared for namespace in namespaces}
+
+        # Avance en vivo: cada namespace cuenta cuando terminan sus pods y sus métricas
+        settled = set()
+        lock = threading.Lock()
+
+        def settle(namespace: str) -> None:
+            pods_future, metrics_future = pod_futures[namespace], metric_futures[namespace]
+            if not (pods_future.done() and metrics_future.done()):
+                return
+            with lock:
+                if namespace in settled:
+                    return
+                settled.add(namespace)
+            pods = pods_future.result().get("items", []) if self._succeeded(pods_future) else []
+            metrics = metrics_future.result() if self._succeeded(metrics_future) else {}
+            self.progress.add(namespaces=1, pods=len(pods), matched=self.matched(pods, metrics))
+
+        for namespace in namespaces:
+            pod_futures[namespace].add_done_callback(lambda _, namespace=namespace: settle(namespace))
+            metric_futures[namespace].add_done_callback(lambda _, namespace=namespace: settle(namespace))
+
+        remaining = KubectlClient.remaining()
+        _, pending = wait([*pod_futures.values(), *set(metric_futures.values())],
+                          timeout=None if remaining is None else max(remaining, 0))
+        # Lo que no empezó se cancela; lo que está en curso se corta al vencer el plazo
+        pool.shutdown(wait=False, cancel_futures=True)
+        result.expired = bool(pending)
+
+        for namespace in namespaces:
+            pods_future, metrics_future = pod_futures[namespace], metric_futures[namespace]
+            if not self._succeeded(pods_future):
+                if pods_future.done() and not pods_future.cancelled() \
+                        and isinstance(pods_future.exception(), DeadlineExceeded):
+                    result.expired = True
+                result.missing.append(namespace)
+                continue
+            pods = pods_future.result().get("items", [])
+            result.pods["items"].extend(pods)
+            if self._succeeded(metrics_future):
+                result.metrics.update(metrics_future.result())
+            elif pods:
+                result.unmetered.append(namespace)
+        return result
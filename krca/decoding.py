@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# krca/decoding.py - Decodificación de JSON con backends opcionales (msgspec, orjson) y dumps con mmap
+
+import gc
+import json
+import mmap
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, TypedDict, Union
+
+try:
+    import msgspec
+except ImportError:  # opcional: pip install msgspec
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:  # opcional: pip install orjson
+    orjson = None
+
+# Backends en orden de preferencia para "auto"
+JSON_BACKENDS = ("auto", "msgspec", "orjson", "json")
+
+Buffer = Union[bytes, bytearray, memoryview, str]
+
+# Esquema de los campos del pod que lee krca. Con msgspec el resto del
+# objeto (managedFields, annotations, env, volumes, ...) ni se decodifica.
+
+class OwnerReferenceSchema(TypedDict, total=False):
+    kind: str
+    name: str
+    uid: str
+    controller: bool
+
+class ObjectMetaSchema(TypedDict, total=False):
+    name: str
+    namespace: str
+    uid: str
+    labels: Dict[str, str]
+    ownerReferences: List[OwnerReferenceSchema]
+
+class ResourcesSchema(TypedDict, total=False):
+    requests: Dict[str, str]
+    limits: Dict[str, str]
+
+class ContainerSchema(TypedDict, total=False):
+    name: str
+    resources: ResourcesSchema
+    restartPolicy: str
+
+class PodSpecSchema(TypedDict, total=False):
+    nodeName: str
+    containers: List[ContainerSchema]
+    initContainers: List[ContainerSchema]
+    ephemeralContainers: List[ContainerSchema]
+    overhead: Dict[str, str]
+
+class ContainerStateSchema(TypedDict, total=False):
+    reason: str
+    exitCode: int
+
+class ContainerStatusSchema(TypedDict, total=False):
+    name: str
+    restartCount: int
+    state: Dict[str, ContainerStateSchema]
+    lastState: Dict[str, ContainerStateSchema]
+
+class PodStatusSchema(TypedDict, total=False):
+    phase: str
+    hostIP: str
+    containerStatuses: List[ContainerStatusSchema]
+    initContainerStatuses: List[ContainerStatusSchema]
+    ephemeralContainerStatuses: List[ContainerStatusSchema]
+
+class PodSchema(TypedDict, total=False):
+    kind: str
+    metadata: ObjectMetaSchema
+    spec: PodSpecSchema
+    status: PodStatusSchema
+
+class PodListSchema(TypedDict, total=False):
+    kind: str
+    items: List[PodSchema]
+
+class JsonDecoder:
+    """
+    Capa de decodificación de JSON compartida por el cliente de kubectl
+
+    Usa msgspec u orjson si están instalados y si no la biblioteca estándar.
+    Todos aceptan bytes directamente (la salida de kubectl no se convierte a
+    str antes de parsearla). Con msgspec las listas de pods se decodifican
+    con PodListSchema: solo los campos que usa krca, como diccionarios
+    comunes; si un pod no encaja en el esquema se decodifica completo.
+
+    El recolector de ciclos se pausa mientras se decodifica: un documento
+    JSON no forma ciclos, y con listas de miles de pods las pasadas del GC
+    sobre los objetos recién creados cuestan más que el parseo mismo.
+    """
+
+    backend: str = next((name for name, module in (("msgspec", msgspec), ("orjson", orjson)) if module), "json")
+    _generic = msgspec.json.Decoder() if msgspec else None
+    _pods = msgspec.json.Decoder(PodListSchema) if msgspec else None
+    _gc_lock = threading.Lock()
+    _gc_pauses = 0
+    _gc_was_enabled = False
+
+    @staticmethod
+    @contextmanager
+    def _gc_paused() -> Iterator[None]:
+        """Pausa el GC de ciclos (anidable y entre hilos: se reactiva al salir el último)"""
+        with JsonDecoder._gc_lock:
+            if JsonDecoder._gc_pauses == 0:
+                JsonDecoder._gc_was_enabled = gc.isenabled()
+                gc.disable()
+            JsonDecoder._gc_pauses += 1
+        try:
+            yield
+        finally:
+            with JsonDecoder._gc_lock:
+                JsonDecoder._gc_pauses -= 1
+                if JsonDecoder._gc_pauses == 0 and JsonDecoder._gc_was_enabled:
+                    gc.enable()
+
+    @staticmethod
+    def available() -> List[str]:
+        """Backends instalados"""
+        modules = {"msgspec": msgspec, "orjson": orjson, "json": json}
+        return [name for name in JSON_BACKENDS[1:] if modules[name] is not None]
+
+    @staticmethod
+    def configure(backend: Optional[str] = None) -> None:
+        """
+        Elige el backend ("auto" = el más rápido instalado)
+
+        Raises:
+            ValueError: Si el backend no existe o no está instalado
+        """
+        if backend is None:
+            return
+        if backend not in JSON_BACKENDS:
+            raise ValueError(f"Backend JSON '{backend}' no válido. Use: {', '.join(JSON_BACKENDS)}")
+        available = JsonDecoder.available()
+        if backend == "auto":
+            backend = available[0]
+        elif backend not in available:
+            raise ValueError(f"El backend JSON '{backend}' no está instalado (pip install {backend})")
+        JsonDecoder.backend = backend
+
+    @staticmethod
+    def loads(data: Buffer, backend: Optional[str] = None) -> Any:
+        """Decodifica un documento JSON completo (bytes, str o buffer)"""
+        backend = backend or JsonDecoder.backend
+        with JsonDecoder._gc_paused():
+            if backend == "msgspec":
+                return JsonDecoder._generic.decode(data)
+            if backend == "orjson":
+                return orjson.loads(data)
+            if isinstance(data, (memoryview, mmap.mmap)):
+                data = bytes(data)
+            return json.loads(data)
+
+    @staticmethod
+    def loads_pods(data: Buffer, backend: Optional[str] = None) -> Dict:
+        """
+        Decodifica una lista de pods (`kubectl get pods -o json`)
+
+        Con msgspec solo se conservan los campos de PodSchema; con los
+        demás backends el objeto completo.
+        """
+        backend = backend or JsonDecoder.backend
+        if backend == "msgspec":
+            with JsonDecoder._gc_paused():
+                try:
+                    return JsonDecoder._pods.decode(data)
+                except msgspec.ValidationError:
+                    return JsonDecoder._generic.decode(data)
+        return JsonDecoder.loads(data, backend)
+
+    @staticmethod
+    def load_file(path: str, pods: bool = False) -> Any:
+        """
+        Decodifica un archivo JSON mapeándolo en memoria
+
+        msgspec y orjson parsean directamente desde el mapa (el archivo no
+        se copia a un str de Python); la biblioteca estándar necesita una
+        copia en bytes.
+
+        Args:
+            path: Ruta del archivo
+            pods: Si True, decodificar como lista de pods (ver loads_pods)
+        """
+        decode = JsonDecoder.loads_pods if pods else JsonDecoder.loads
+        with open(path, "rb") as f:
+            try:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Archivo vacío: no se puede mapear
+                return decode(b"")
+            with mapped:
+                view = memoryview(mapped)
+                try:
+                    return decode(view)
+                finally:
+                    view.release()
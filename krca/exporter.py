@@ -4,8 +4,8 @@
 import os
 import tempfile
 import subprocess
-from tabulate import tabulate
 from .colorizer import ResourceColorizer
+from .table import TableRenderer
 
 class Exporter:
     """Clase para manejar la exportación de resultados"""
@@ -58,6 +58,54 @@ class Exporter:
             print(ResourceColorizer.red(error_msg) if use_color else error_msg)
             raise
 
+    @staticmethod
+    def render_table(data, headers, use_color: bool = True, show_index: bool = False, colors=None,
+                     float_format="g") -> str:
+        """
+        Genera la tabla en formato plain (sin líneas de separación)
+        
+        Args:
+            data: Filas de la tabla (valores crudos o ya coloreados)
+            headers: Nombres de las columnas
+            use_color: Mostrar headers en negrita
+            show_index: Mostrar números de fila
+            colors: Código de color de cada celda, si las filas llegan sin colorear (opcional)
+            float_format: Formato de las columnas decimales, uno para todas o uno por header
+                (default "g", como tabulate)
+            
+        Returns:
+            Tabla como texto
+        """
+        return TableRenderer.render(data, headers, use_color, show_index, colors, float_format)
+
+    @staticmethod
+    def export_raw(
+        data: str,
+        output_file: str = None,
+        use_color: bool = True,
+        force: bool = False
+    ) -> None:
+        """
+        Exporta el contenido tal cual (YAML, JSON, etc.) o lo imprime en pantalla
+        
+        Args:
+            data: Texto a exportar
+            output_file: Ruta del archivo de salida (None para imprimir)
+            use_color: Usar colores en los mensajes
+            force: Sobrescribir archivo existente
+        """
+        if not output_file:
+            print(data)
+            return
+        
+        if os.path.exists(output_file) and not force:
+            error_msg = f"Error: El archivo {output_file} ya existe. Use --force para sobrescribir."
+            print(ResourceColorizer.red(error_msg) if use_color else error_msg)
+            return
+        
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write(data if data.endswith('\n') else data + '\n')
+
     @staticmethod
     def _export_text(data: str, output_file: str, use_color: bool) -> None:
         """Exporta a archivo de texto plano"""
@@ -1,72 +1,370 @@
 #!/usr/bin/env python3
 # krca/kubectl.py - Módulo para interacción con Kubernetes
 
-import json
 import subprocess
-from typing import Dict, List, Optional, Tuple, Union
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+from urllib.parse import quote, urlencode
+
+from .decoding import JsonDecoder
+from .specs import SpecCache, ResourceRecord
+from .utils import KRCAUtils
+
+# Valores por defecto de la capa de ejecución (ajustables con KubectlClient.configure)
+DEFAULT_TIMEOUT = 30.0        # segundos por llamada (None o 0 = sin límite)
+DEFAULT_RETRIES = 2           # reintentos ante errores transitorios
+DEFAULT_MAX_CONCURRENCY = 4   # procesos kubectl simultáneos en todo el proceso
+BACKOFF_BASE = 0.5            # primera espera entre reintentos (segundos)
+BACKOFF_MAX = 8.0             # espera máxima entre reintentos (segundos)
+
+# API de métricas (PodMetrics) y tamaño de página al listarla
+METRICS_API = "/apis/metrics.k8s.io/v1beta1"
+METRICS_PAGE_SIZE = 500
+MIB = 1024 ** 2
+
+# Orígenes de métricas: metrics-server (metrics.k8s.io) o /stats/summary de cada kubelet
+METRICS_SOURCES = ("metrics-server", "kubelet")
+
+# Fragmentos de stderr que indican un fallo transitorio del API server o de la red
+TRANSIENT_ERRORS = (
+    "connection refused",
+    "connection reset",
+    "i/o timeout",
+    "tls handshake timeout",
+    "unexpected eof",
+    "service unavailable",
+    "the server is currently unable to handle the request",
+    "too many requests",
+    "etcdserver: request timed out",
+    "context deadline exceeded",
+    "http2: client connection lost",
+)
 
 class KubectlError(Exception):
     """Excepción personalizada para errores de kubectl"""
     pass
 
+class DeadlineExceeded(KubectlError):
+    """Se agotó el plazo total de la ejecución (--deadline)"""
+    pass
+
+class KubectlStats:
+    """Contadores de las llamadas a kubectl (compartidos entre hilos)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.calls = 0
+            self.retries = 0
+            self.failures = 0
+            self.timeouts = 0
+            self.latency_total = 0.0
+            self.latency_max = 0.0
+
+    def record(self, latency: float, retries: int, failed: bool, timeouts: int) -> None:
+        """Registra una llamada completa (latencia incluye reintentos y esperas)"""
+        with self._lock:
+            self.calls += 1
+            self.retries += retries
+            self.failures += failed
+            self.timeouts += timeouts
+            self.latency_total += latency
+            self.latency_max = max(self.latency_max, latency)
+
+    def snapshot(self) -> Dict[str, float]:
+        """Copia consistente de los contadores"""
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "retries": self.retries,
+                "failures": self.failures,
+                "timeouts": self.timeouts,
+                "latency_total": self.latency_total,
+                "latency_max": self.latency_max,
+            }
+
+    def summary(self) -> str:
+        """Resumen legible de los contadores"""
+        stats = self.snapshot()
+        mean = stats["latency_total"] / stats["calls"] if stats["calls"] else 0.0
+        return (f"kubectl: {stats['calls']} llamadas, {stats['retries']} reintentos, "
+                f"{stats['failures']} fallos, {stats['timeouts']} timeouts, "
+                f"latencia media {mean:.2f}s, máx {stats['latency_max']:.2f}s")
+
 class KubectlClient:
     """Cliente para interactuar con kubectl"""
 
+    timeout: Optional[float] = DEFAULT_TIMEOUT
+    retries: int = DEFAULT_RETRIES
+    metrics_source: str = METRICS_SOURCES[0]
+    deadline: Optional[float] = None  # instante (time.monotonic) en que vence --deadline
+    stats = KubectlStats()
+    specs = SpecCache()
+    _semaphore = threading.BoundedSemaphore(DEFAULT_MAX_CONCURRENCY)
+    _max_concurrency = DEFAULT_MAX_CONCURRENCY
+
+    @staticmethod
+    def configure(
+        timeout: Optional[float] = None,
+        retries: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        metrics_source: Optional[str] = None,
+        deadline: Optional[float] = None
+    ) -> None:
+        """
+        Ajusta la capa de ejecución (los valores None no se modifican)
+        
+        Args:
+            timeout: Segundos máximos por llamada (0 = sin límite)
+            retries: Reintentos ante errores transitorios
+            max_concurrency: Procesos kubectl simultáneos
+            metrics_source: Origen de get_metrics ("metrics-server" o "kubelet")
+            deadline: Segundos desde ahora tras los cuales ninguna llamada
+                sigue en curso (0 = sin plazo)
+        """
+        if deadline is not None:
+            if deadline < 0:
+                raise ValueError("--deadline no puede ser negativo")
+            KubectlClient.deadline = time.monotonic() + deadline if deadline else None
+        if metrics_source is not None:
+            if metrics_source not in METRICS_SOURCES:
+                raise ValueError(f"Origen de métricas '{metrics_source}' no válido. Use: {', '.join(METRICS_SOURCES)}")
+            KubectlClient.metrics_source = metrics_source
+        if timeout is not None:
+            if timeout < 0:
+                raise ValueError("--timeout no puede ser negativo")
+            KubectlClient.timeout = timeout or None
+        if retries is not None:
+            if retries < 0:
+                raise ValueError("--retries no puede ser negativo")
+            KubectlClient.retries = retries
+        if max_concurrency is not None and max_concurrency != KubectlClient._max_concurrency:
+            if max_concurrency < 1:
+                raise ValueError("--max-concurrency debe ser mayor que 0")
+            KubectlClient._semaphore = threading.BoundedSemaphore(max_concurrency)
+            KubectlClient._max_concurrency = max_concurrency
+
+    @staticmethod
+    def is_transient(stderr: str) -> bool:
+        """True si el error de kubectl parece transitorio y vale la pena reintentar"""
+        text = (stderr or "").lower()
+        return any(fragment in text for fragment in TRANSIENT_ERRORS)
+
+    @staticmethod
+    def remaining() -> Optional[float]:
+        """Segundos que quedan hasta el plazo (None si no hay plazo)"""
+        if KubectlClient.deadline is None:
+            return None
+        return KubectlClient.deadline - time.monotonic()
+
     @staticmethod
-    def execute(cmd: str, ignore_errors: bool = False) -> str:
+    def execute(
+        cmd: Sequence[str],
+        ignore_errors: bool = False,
+        timeout: Optional[float] = None,
+        binary: bool = False
+    ) -> Union[str, bytes]:
         """
         Ejecuta un comando de kubectl y retorna la salida
         
+        El comando se ejecuta sin shell. Los timeouts y los errores transitorios
+        se reintentan con backoff exponencial acotado; la cantidad de procesos
+        simultáneos está limitada para todo el proceso. Con un plazo
+        (KubectlClient.deadline) cada intento se corta al vencer y no se
+        reintenta ni se lanzan procesos nuevos después.
+        
         Args:
-            cmd: Comando completo a ejecutar
+            cmd: Comando como lista de argumentos (ej. ["kubectl", "get", "pods"])
             ignore_errors: Si True, no lanza excepción en errores
+            timeout: Segundos máximos por intento (por defecto, KubectlClient.timeout)
+            binary: Si True, devuelve la salida como bytes (para JsonDecoder,
+                sin copiarla a un str)
             
         Returns:
             Salida del comando
             
         Raises:
             KubectlError: Si el comando falla y ignore_errors es False
+            DeadlineExceeded: Si se agota el plazo (salvo ignore_errors)
         """
-        try:
-            result = subprocess.run(
-                cmd,
-                shell=True,
-                check=True,
-                text=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
-            )
-            return result.stdout.strip()
-        except subprocess.CalledProcessError as e:
+        argv = list(cmd)
+        timeout = KubectlClient.timeout if timeout is None else timeout
+        started = time.monotonic()
+        attempt = timeouts = 0
+        
+        while True:
+            remaining = KubectlClient.remaining()
+            attempt_timeout = timeout if remaining is None else min(timeout or remaining, remaining)
+            semaphore = KubectlClient._semaphore
+            expired = False
+            try:
+                # Esperar un lugar en el semáforo tampoco puede pasar el plazo
+                if remaining is None:
+                    semaphore.acquire()
+                elif remaining <= 0 or not semaphore.acquire(timeout=remaining):
+                    raise DeadlineExceeded()
+                try:
+                    result = subprocess.run(
+                        argv,
+                        check=True,
+                        text=not binary,
+                        stdout=subprocess.PIPE,
+                        stderr=subprocess.PIPE,
+                        timeout=attempt_timeout
+                    )
+                finally:
+                    semaphore.release()
+                KubectlClient.stats.record(time.monotonic() - started, attempt, False, timeouts)
+                return result.stdout.strip()
+            except DeadlineExceeded:
+                expired = True
+                transient = False
+                error_msg = f"Plazo (--deadline) agotado antes de ejecutar: {' '.join(argv)}"
+            except subprocess.TimeoutExpired:
+                timeouts += 1
+                expired = attempt_timeout != timeout
+                transient = not expired
+                error_msg = f"Tiempo de espera agotado ({timeout}s) ejecutando: {' '.join(argv)}"
+                if expired:
+                    error_msg = f"Plazo (--deadline) agotado ejecutando: {' '.join(argv)}"
+            except subprocess.CalledProcessError as e:
+                stderr = e.stderr.decode("utf-8", errors="replace") if binary else e.stderr
+                transient = KubectlClient.is_transient(stderr)
+                error_msg = f"Error ejecutando comando: {' '.join(argv)}\n"
+                error_msg += f"Código: {e.returncode}\n"
+                error_msg += f"Error: {stderr.strip()}"
+            except OSError as e:
+                transient = False
+                error_msg = f"No se pudo ejecutar {argv[0]}: {e}"
+            
+            backoff = min(BACKOFF_BASE * 2 ** attempt, BACKOFF_MAX)
+            remaining = KubectlClient.remaining()
+            if transient and attempt < KubectlClient.retries and (remaining is None or remaining > backoff):
+                # Espera fuera del semáforo para no bloquear otras llamadas
+                time.sleep(backoff)
+                attempt += 1
+                continue
+            
+            KubectlClient.stats.record(time.monotonic() - started, attempt, True, timeouts)
             if ignore_errors:
-                return ""
-            error_msg = f"Error ejecutando comando: {e.cmd}\n"
-            error_msg += f"Código: {e.returncode}\n"
-            error_msg += f"Error: {e.stderr.strip()}"
-            raise KubectlError(error_msg)
+                return b"" if binary else ""
+            raise (DeadlineExceeded if expired else KubectlError)(error_msg)
+
+    @staticmethod
+    def fetch_all(calls: Dict[str, Callable[[], Any]]) -> Dict[str, Any]:
+        """
+        Ejecuta varias consultas independientes en paralelo
+        
+        Cada consulta corre en su propio hilo; los procesos kubectl siguen
+        limitados por el semáforo global.
+        
+        Args:
+            calls: Diccionario nombre -> función sin argumentos
+            
+        Returns:
+            Diccionario nombre -> resultado (re-lanza la primera excepción)
+        """
+        with ThreadPoolExecutor(max_workers=len(calls) or 1) as pool:
+            futures = {name: pool.submit(call) for name, call in calls.items()}
+            return {name: future.result() for name, future in futures.items()}
+
+    @staticmethod
+    def _scope(namespace: Optional[str] = None, all_namespaces: bool = False) -> List[str]:
+        """Argumentos de alcance: -A o -n <namespace> (el del contexto si no se indica)"""
+        if all_namespaces:
+            return ["-A"]
+        return ["-n", namespace or KubectlClient.get_current_namespace()]
+
+    @staticmethod
+    def selector_args(selector: Optional[str] = None, field_selector: Optional[str] = None) -> List[str]:
+        """Argumentos -l y --field-selector (el filtrado lo hace el API server)"""
+        args = []
+        if selector:
+            args += ["-l", selector]
+        if field_selector:
+            args += ["--field-selector", field_selector]
+        return args
+
+    @staticmethod
+    def _field_terms(field_selector: Optional[str]) -> List[Tuple[str, str, str]]:
+        """Términos (campo, operador, valor) de un field selector ("a=b,c!=d")"""
+        terms = []
+        for term in (field_selector or "").split(","):
+            term = term.strip()
+            if not term:
+                continue
+            for operator in ("!=", "==", "="):
+                if operator in term:
+                    field, value = term.split(operator, 1)
+                    terms.append((field.strip(), operator, value.strip()))
+                    break
+        return terms
 
     @staticmethod
-    def get_pods(namespace: Optional[str] = None, all_namespaces: bool = False) -> Dict:
+    def get_pods(
+        namespace: Optional[str] = None,
+        all_namespaces: bool = False,
+        selector: Optional[str] = None,
+        field_selector: Optional[str] = None
+    ) -> Dict:
         """
         Obtiene la lista de pods en formato JSON
         
         Args:
             namespace: Namespace específico (opcional)
             all_namespaces: Si True, obtiene pods de todos los namespaces
+            selector: Label selector (-l), ej. "app=web,tier!=cache" (opcional)
+            field_selector: Field selector, ej. "spec.nodeName=X" (opcional)
             
         Returns:
-            Diccionario con la lista de pods en formato JSON
+            Diccionario con la lista de pods en formato JSON (con el backend
+            msgspec, solo los campos de decoding.PodSchema)
         """
-        cmd = "kubectl get pods "
-        if all_namespaces:
-            cmd += "-A "
-        elif namespace:
-            cmd += f"-n {namespace} "
-        else:
-            cmd += f"-n {KubectlClient.get_current_namespace()} "
-        cmd += "-o json"
-        output = KubectlClient.execute(cmd)
-        return json.loads(output)
+        return KubectlClient.get_resources("pods", namespace, all_namespaces, selector, field_selector)
+
+    @staticmethod
+    def get_resources(
+        resource: str,
+        namespace: Optional[str] = None,
+        all_namespaces: bool = False,
+        selector: Optional[str] = None,
+        field_selector: Optional[str] = None
+    ) -> Dict:
+        """
+        Obtiene cualquier lista de objetos con namespace en una sola llamada
+        
+        Args:
+            resource: Tipo de recurso (pods, resourcequotas, limitranges, ...)
+            namespace: Namespace específico (opcional)
+            all_namespaces: Si True, obtiene objetos de todos los namespaces
+            selector: Label selector (opcional)
+            field_selector: Field selector (opcional)
+            
+        Returns:
+            Diccionario con la lista de objetos en formato JSON
+        """
+        cmd = ["kubectl", "get", resource, *KubectlClient._scope(namespace, all_namespaces),
+               *KubectlClient.selector_args(selector, field_selector), "-o", "json"]
+        output = KubectlClient.execute(cmd, binary=True)
+        if resource == "pods":
+            return JsonDecoder.loads_pods(output)
+        return JsonDecoder.loads(output)
+
+    @staticmethod
+    def get_nodes() -> Dict:
+        """
+        Obtiene la lista de nodos (con capacity/allocatable) en una sola llamada
+
+        Returns:
+            Diccionario con la lista de nodos en formato JSON
+        """
+        output = KubectlClient.execute(["kubectl", "get", "nodes", "-o", "json"], binary=True)
+        return JsonDecoder.loads(output)
 
     @staticmethod
     def get_current_namespace() -> str:
@@ -76,77 +374,274 @@ class KubectlClient:
         Returns:
             Nombre del namespace actual
         """
-        cmd = "kubectl config view --minify -o jsonpath='{..namespace}'"
+        cmd = ["kubectl", "config", "view", "--minify", "-o", "jsonpath={..namespace}"]
         namespace = KubectlClient.execute(cmd, ignore_errors=True)
+        return KubectlClient.parse_namespace(namespace)
+
+    @staticmethod
+    def resolve_namespace(namespace: Optional[str] = None, all_namespaces: bool = False) -> Optional[str]:
+        """
+        Namespace a consultar, resuelto una sola vez por análisis
+
+        Las llamadas que reciben el namespace ya resuelto no vuelven a
+        lanzar `kubectl config view` cada una.
+
+        Returns:
+            None con all_namespaces; si no, el indicado o el del contexto
+        """
+        if all_namespaces:
+            return None
+        return namespace or KubectlClient.get_current_namespace()
+
+    @staticmethod
+    def parse_namespace(output: str) -> str:
+        """Namespace del contexto a partir de la salida de kubectl config view ("default" si está vacío)"""
+        namespace = output.strip()
         return namespace if namespace else "default"
 
     @staticmethod
-    def get_metrics(namespace: Optional[str] = None, all_namespaces: bool = False) -> Dict:
+    def metrics_path(
+        namespace: Optional[str],
+        all_namespaces: bool,
+        continue_token: Optional[str] = None,
+        selector: Optional[str] = None,
+        field_selector: Optional[str] = None
+    ) -> str:
+        """
+        Ruta de la API metrics.k8s.io para listar PodMetrics (una página)
+        
+        Compartido por el cliente síncrono y el asíncrono. El label selector
+        se envía tal cual; del field selector solo los términos sobre
+        metadata.*, los únicos que admite PodMetrics (el resto, como
+        spec.nodeName, ya acota la lista de pods con la que se cruzan).
+        
+        Args:
+            namespace: Namespace ya resuelto (ignorado si all_namespaces)
+            all_namespaces: Si True, lista todos los namespaces
+            continue_token: Token de la página siguiente (opcional)
+            selector: Label selector (opcional)
+            field_selector: Field selector (opcional)
+            
+        Returns:
+            Ruta para `kubectl get --raw`
+        """
+        if all_namespaces:
+            path = f"{METRICS_API}/pods"
+        else:
+            path = f"{METRICS_API}/namespaces/{quote(namespace, safe='')}/pods"
+        query = {"limit": METRICS_PAGE_SIZE}
+        if selector:
+            query["labelSelector"] = selector
+        metadata_terms = [
+            f"{field}{operator}{value}"
+            for field, operator, value in KubectlClient._field_terms(field_selector)
+            if field.startswith("metadata.")
+        ]
+        if metadata_terms:
+            query["fieldSelector"] = ",".join(metadata_terms)
+        if continue_token:
+            query["continue"] = continue_token
+        return f"{path}?{urlencode(query)}"
+
+    @staticmethod
+    def selected_node(field_selector: Optional[str]) -> Optional[str]:
+        """Nodo fijado por el field selector (spec.nodeName=X), si lo hay"""
+        for field, operator, value in KubectlClient._field_terms(field_selector):
+            if field == "spec.nodeName" and operator != "!=":
+                return value
+        return None
+
+    @staticmethod
+    def get_metrics(
+        namespace: Optional[str] = None,
+        all_namespaces: bool = False,
+        selector: Optional[str] = None,
+        field_selector: Optional[str] = None
+    ) -> Dict:
         """
-        Obtiene las métricas de uso de recursos con validación de formatos
+        Obtiene las métricas de uso (PodMetrics de metrics.k8s.io) paginadas
+        
+        Con KubectlClient.metrics_source == "kubelet" se leen de cada nodo
+        (ver get_kubelet_metrics), con el mismo formato de resultado.
         
         Args:
             namespace: Namespace específico (opcional)
             all_namespaces: Si True, obtiene métricas de todos los namespaces
+            selector: Label selector (opcional, ver metrics_path)
+            field_selector: Field selector (opcional, ver metrics_path)
             
         Returns:
-            Diccionario con las métricas organizadas por pod y contenedor
+            Diccionario (namespace, pod) -> contenedor -> métricas (ver parse_pod_metrics);
+            vacío si la API de métricas no está disponible
         """
+        if KubectlClient.metrics_source == "kubelet":
+            return KubectlClient.get_kubelet_metrics(namespace, all_namespaces, field_selector)
         try:
-            cmd = "kubectl top pods --no-headers --containers"
-            if all_namespaces:
-                cmd += " -A"
-            elif namespace:
-                cmd += f" -n {namespace}"
-            else:
-                cmd += f" -n {KubectlClient.get_current_namespace()}"
+            current = None if all_namespaces else namespace or KubectlClient.get_current_namespace()
+            metrics: Dict = {}
+            continue_token = None
+            while True:
+                path = KubectlClient.metrics_path(current, all_namespaces, continue_token,
+                                                  selector, field_selector)
+                output = KubectlClient.execute(["kubectl", "get", "--raw", path], binary=True)
+                page = JsonDecoder.loads(output) if output else {}
+                KubectlClient.parse_pod_metrics(page, metrics)
+                continue_token = page.get("metadata", {}).get("continue")
+                if not continue_token:
+                    return metrics
+        
+        except DeadlineExceeded:
+            raise
+        except (KubectlError, ValueError):
+            return {}
+
+    @staticmethod
+    def parse_pod_metrics(page: Dict, metrics: Optional[Dict] = None) -> Dict:
+        """
+        Vuelca una página de PodMetricsList en el índice de métricas
+        
+        Solo se conservan namespace, pod, contenedor y uso. Los valores se
+        guardan exactos (nanocores y bytes enteros) junto con un texto en el
+        formato de `kubectl top` (milicores y Mi) para mostrar.
+        
+        Args:
+            page: PodMetricsList en formato JSON
+            metrics: Índice a completar (opcional)
             
-            output = KubectlClient.execute(cmd, ignore_errors=True)
+        Returns:
+            Diccionario (namespace, pod) -> contenedor -> {"cpu", "memory",
+            "cpu_nanocores", "memory_bytes", "namespace"}
+        """
+        if metrics is None:
             metrics = {}
-            
-            for line in output.splitlines():
-                parts = line.split()
-                if not parts:
-                    continue
-                    
-                if all_namespaces and len(parts) >= 5:
-                    ns, pod, container = parts[0], parts[1], parts[2]
-                    cpu, memory = parts[3], parts[4]
-                elif not all_namespaces and len(parts) >= 4:
-                    ns = namespace or KubectlClient.get_current_namespace()
-                    pod, container = parts[0], parts[1]
-                    cpu, memory = parts[2], parts[3]
-                else:
-                    continue
-                
-                # Validar y normalizar el formato de memoria
-                if memory != "-":
-                    if memory.endswith('m'):  # Si es CPU (milicores)
-                        pass  # No hacer nada, es válido
-                    elif not any(x in memory for x in ['Ki', 'Mi', 'Gi']):
-                        if memory.isdigit():
-                            memory = f"{memory}Mi"  # Asumir MiB si no tiene unidad
-                        else:
-                            memory = "-"  # Valor inválido
-                
-                if pod not in metrics:
-                    metrics[pod] = {}
-                
-                metrics[pod][container] = {
-                    "cpu": cpu,
-                    "memory": memory,
-                    "namespace": ns
-                }
-            
-            return metrics
+        for item in page.get("items", []):
+            metadata = item.get("metadata", {})
+            namespace = metadata.get("namespace")
+            pod_metrics = metrics.setdefault((namespace, metadata.get("name")), {})
+            for container in item.get("containers", []):
+                usage = container.get("usage", {})
+                cpu = KRCAUtils.parse_cpu_nanocores(usage.get("cpu"))
+                memory = KRCAUtils.parse_memory_bytes_exact(usage.get("memory"))
+                pod_metrics[container["name"]] = KubectlClient._usage_entry(namespace, cpu, memory)
+        return metrics
+
+    @staticmethod
+    def _usage_entry(namespace: str, cpu_nanocores: Optional[int], memory_bytes: Optional[int]) -> Dict:
+        """Entrada del índice de métricas: valores exactos y texto estilo kubectl top"""
+        return {
+            "cpu": f"{-(-cpu_nanocores // 1_000_000)}m" if cpu_nanocores is not None else "-",
+            "memory": f"{memory_bytes // MIB}Mi" if memory_bytes is not None else "-",
+            "cpu_nanocores": cpu_nanocores,
+            "memory_bytes": memory_bytes,
+            "namespace": namespace
+        }
+
+    @staticmethod
+    def get_kubelet_metrics(
+        namespace: Optional[str] = None,
+        all_namespaces: bool = False,
+        field_selector: Optional[str] = None
+    ) -> Dict:
+        """
+        Obtiene las métricas de uso del /stats/summary de cada kubelet vía el proxy del API server
         
-        except KubectlError:
+        No depende de metrics-server. Los nodos se consultan en paralelo con
+        un pool acotado por --max-concurrency; un nodo que no responde se
+        omite y no invalida el resto. Si el field selector fija el nodo
+        (spec.nodeName=X) solo se consulta ese kubelet; el summary no trae
+        etiquetas, así que el label selector se aplica al cruzar con los pods.
+        
+        Args:
+            namespace: Namespace específico (opcional)
+            all_namespaces: Si True, obtiene métricas de todos los namespaces
+            field_selector: Field selector (opcional)
+            
+        Returns:
+            Diccionario (namespace, pod) -> contenedor -> métricas, igual que
+            get_metrics y con memory_rss_bytes y memory_usage_bytes adicionales
+        """
+        try:
+            current = None if all_namespaces else namespace or KubectlClient.get_current_namespace()
+            node = KubectlClient.selected_node(field_selector)
+            if node is not None:
+                nodes = [node]
+            else:
+                nodes = [node["metadata"]["name"] for node in KubectlClient.get_nodes().get("items", [])]
+        except DeadlineExceeded:
+            raise
+        except (KubectlError, ValueError):
             return {}
+        
+        def fetch(node: str) -> Dict:
+            path = f"/api/v1/nodes/{quote(node, safe='')}/proxy/stats/summary"
+            output = KubectlClient.execute(["kubectl", "get", "--raw", path], ignore_errors=True, binary=True)
+            try:
+                return JsonDecoder.loads(output) if output else {}
+            except ValueError:
+                return {}
+        
+        metrics: Dict = {}
+        with ThreadPoolExecutor(max_workers=KubectlClient._max_concurrency) as pool:
+            for summary in pool.map(fetch, nodes):
+                KubectlClient.parse_stats_summary(summary, metrics, current)
+        return metrics
+
+    @staticmethod
+    def parse_stats_summary(summary: Dict, metrics: Optional[Dict] = None, namespace: Optional[str] = None) -> Dict:
+        """
+        Vuelca el /stats/summary de un kubelet en el índice de métricas
+        
+        La memoria es el working set (el mismo valor que informa metrics-server).
+        
+        Args:
+            summary: Respuesta de /stats/summary en formato JSON
+            metrics: Índice a completar (opcional)
+            namespace: Si se indica, solo se incluyen pods de ese namespace
+            
+        Returns:
+            Diccionario (namespace, pod) -> contenedor -> {"cpu", "memory",
+            "cpu_nanocores", "memory_bytes", "memory_rss_bytes",
+            "memory_usage_bytes", "namespace"}
+        """
+        if metrics is None:
+            metrics = {}
+        for pod in summary.get("pods", []):
+            pod_ref = pod.get("podRef", {})
+            pod_namespace = pod_ref.get("namespace")
+            if namespace and pod_namespace != namespace:
+                continue
+            pod_metrics = metrics.setdefault((pod_namespace, pod_ref.get("name")), {})
+            for container in pod.get("containers", []):
+                memory_stats = container.get("memory", {})
+                entry = KubectlClient._usage_entry(
+                    pod_namespace,
+                    container.get("cpu", {}).get("usageNanoCores"),
+                    memory_stats.get("workingSetBytes")
+                )
+                entry["memory_rss_bytes"] = memory_stats.get("rssBytes")
+                entry["memory_usage_bytes"] = memory_stats.get("usageBytes")
+                pod_metrics[container["name"]] = entry
+        return metrics
+
+    @staticmethod
+    def _format_state(state: Dict) -> str:
+        """Convierte el campo state de un containerStatus en texto (Running, Waiting: X, ...)"""
+        if "running" in state:
+            return "Running"
+        elif "waiting" in state:
+            reason = state["waiting"].get("reason", "Unknown")
+            return f"Waiting: {reason}"
+        elif "terminated" in state:
+            reason = state["terminated"].get("reason", "Unknown")
+            return f"Terminated: {reason}"
+        return "Unknown"
 
     @staticmethod
     def get_pod_status(pod: Dict) -> Tuple[str, int]:
         """
-        Obtiene el estado y conteo de reinicios de un pod
+        Obtiene el estado y conteo de reinicios de un pod (primer contenedor)
+        
+        Para el estado de cada contenedor usar get_container_statuses.
         
         Args:
             pod: Diccionario con la definición del pod
@@ -162,19 +657,36 @@ class KubectlClient:
         
         # Tomamos el estado del primer contenedor
         container_status = container_statuses[0]
-        state = container_status.get("state", {})
-        restart_count = container_status.get("restartCount", 0)
+        return (
+            KubectlClient._format_state(container_status.get("state", {})),
+            container_status.get("restartCount", 0)
+        )
+
+    @staticmethod
+    def get_container_statuses(pod: Dict) -> Dict[str, Tuple[str, int, str]]:
+        """
+        Índice nombre de contenedor -> estado, construido una vez por pod
         
-        if "running" in state:
-            return "Running", restart_count
-        elif "waiting" in state:
-            reason = state["waiting"].get("reason", "Unknown")
-            return f"Waiting: {reason}", restart_count
-        elif "terminated" in state:
-            reason = state["terminated"].get("reason", "Unknown")
-            return f"Terminated: {reason}", restart_count
+        Incluye contenedores normales, init y efímeros.
         
-        return "Unknown", restart_count
+        Args:
+            pod: Diccionario con la definición del pod
+            
+        Returns:
+            Diccionario {contenedor: (estado, reinicios, motivo de la última terminación)}
+        """
+        status = pod.get("status", {})
+        statuses = {}
+        intern = KubectlClient.specs.intern
+        for field in ("initContainerStatuses", "containerStatuses", "ephemeralContainerStatuses"):
+            for container_status in status.get(field, []):
+                last_terminated = container_status.get("lastState", {}).get("terminated", {})
+                statuses[container_status["name"]] = (
+                    intern(KubectlClient._format_state(container_status.get("state", {}))),
+                    container_status.get("restartCount", 0),
+                    intern(last_terminated.get("reason", "-"))
+                )
+        return statuses
 
     @staticmethod
     def get_node_info(pod: Dict) -> Tuple[str, str]:
@@ -197,34 +709,70 @@ class KubectlClient:
         except KeyError:
             node_name = "<none>"
         
-        return node_ip, node_name
+        return KubectlClient.specs.intern(node_ip), KubectlClient.specs.intern(node_name)
 
     @staticmethod
-    def get_container_resources(pod: Dict) -> List[Dict]:
+    def get_workload(pod: Dict) -> Tuple[str, str]:
+        """
+        Determina el workload propietario del pod a partir de ownerReferences
+
+        Los ReplicaSet creados por un Deployment se resuelven al Deployment
+        usando la etiqueta pod-template-hash.
+
+        Args:
+            pod: Diccionario con la definición del pod
+
+        Returns:
+            Tupla con (kind, nombre) del workload, o ("Pod", nombre) si no tiene dueño
+        """
+        metadata = pod.get("metadata", {})
+        owners = metadata.get("ownerReferences", [])
+        owner = next((o for o in owners if o.get("controller")), owners[0] if owners else None)
+
+        if not owner:
+            return "Pod", metadata.get("name", "<none>")
+
+        kind, name = owner.get("kind", "Pod"), owner.get("name", "<none>")
+        template_hash = metadata.get("labels", {}).get("pod-template-hash")
+        if kind == "ReplicaSet" and template_hash and name.endswith(f"-{template_hash}"):
+            return "Deployment", name[:-len(template_hash) - 1]
+
+        return kind, name
+
+    @staticmethod
+    def get_container_resources(pod: Dict, include_all: bool = False) -> List[Dict]:
         """
         Extrae las configuraciones de recursos de los contenedores
         
         Args:
             pod: Diccionario con la definición del pod
+            include_all: Si True, incluye también contenedores init y efímeros
             
         Returns:
-            Lista de diccionarios con recursos por contenedor
+            Lista de diccionarios con recursos por contenedor (con su tipo:
+            "container", "init" o "ephemeral"); son copias que se pueden modificar
         """
-        containers = []
-        for container in pod["spec"].get("containers", []):
-            resources = container.get("resources", {})
-            limits = resources.get("limits", {})
-            requests = resources.get("requests", {})
-            
-            containers.append({
-                "name": container["name"],
-                "req_cpu": requests.get("cpu", "<none>"),
-                "req_mem": requests.get("memory", "<none>"),
-                "lim_cpu": limits.get("cpu", "<none>"),
-                "lim_mem": limits.get("memory", "<none>"),
-            })
+        return [dict(record) for record in KubectlClient.container_records(pod, include_all)]
+
+    @staticmethod
+    def container_records(pod: Dict, include_all: bool = False) -> Sequence[ResourceRecord]:
+        """
+        Como get_container_resources, pero con los registros compartidos de SpecCache
+        
+        Las réplicas de una misma plantilla (pod-template-hash o
+        controller-revision-hash) comparten los registros, que son de solo
+        lectura: es la variante sin copias que usan los análisis internos.
+        
+        Returns:
+            Tupla de registros inmutables con recursos por contenedor
+        """
+        fields = [("containers", "container")]
+        extra_fields = []
+        if include_all:
+            fields = [("initContainers", "init")] + fields
+            extra_fields = [("ephemeralContainers", "ephemeral")]
         
-        return containers
+        return KubectlClient.specs.resources(pod, fields, extra_fields)
 
     @staticmethod
     def check_connection() -> bool:
@@ -235,7 +783,7 @@ class KubectlClient:
             True si la conexión es exitosa, False en caso contrario
         """
         try:
-            KubectlClient.execute("kubectl cluster-info")
+            KubectlClient.execute(["kubectl", "cluster-info"])
             return True
         except KubectlError:
             return False
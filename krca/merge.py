@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+# krca/merge.py - Resumen de flota a partir de los snapshots de muchos clusters
+
+import heapq
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
+
+from .colorizer import ResourceColorizer
+from .exporter import Exporter
+from .snapshot import SnapshotStore, SNAPSHOT_EXTENSIONS
+from .utils import KRCAUtils
+
+# Peores contenedores que se muestran si no se indica --top
+DEFAULT_MERGE_TOP = 20
+
+OFFENDER_HEADERS = [
+    "CLUSTER", "NAMESPACE", "WORKLOAD", "CONTAINER", "POD", "SEVERITY",
+    "CPU", "LIM_CPU", "CPU%LIM", "MEMORY", "LIM_MEM", "MEM%LIM"
+]
+
+NAMESPACE_HEADERS = [
+    "NAMESPACE", "CLUSTERS", "CONTAINERS", "WARNING", "DANGER",
+    "CPU", "REQ_CPU", "MEMORY", "REQ_MEM", "UNDER", "CPU_FALTANTE", "MEM_FALTANTE"
+]
+
+# Posiciones de los totales en cada lista de FleetPartial.namespaces
+(CONTAINERS, WARNING, DANGER, CPU, REQ_CPU, MEMORY, REQ_MEM,
+ UNDER, CPU_DEFICIT, MEM_DEFICIT, CLUSTERS) = range(11)
+
+# Campos del registro que se conservan para cada peor contenedor
+OFFENDER_FIELDS = ("workload", "cpu", "lim_cpu", "memory", "lim_mem")
+
+# Entrada del heap de peores contenedores: (severidad, ratio, clave única, OFFENDER_FIELDS)
+Offender = Tuple[int, float, Tuple[str, ...], Tuple[str, ...]]
+
+class FleetPartial:
+    """
+    Agregados parciales de uno o más snapshots
+
+    Solo guarda totales por namespace y un heap con los `top` peores
+    contenedores, así su tamaño no depende de cuántos contenedores haya.
+    Es lo que devuelve cada proceso y lo que combina el reductor.
+    """
+
+    __slots__ = ("top", "offenders", "namespaces", "containers", "clusters")
+
+    def __init__(self, top: int):
+        self.top = top
+        self.offenders: List[Offender] = []
+        self.namespaces: Dict[str, List[float]] = {}
+        self.containers = 0
+        self.clusters = 0
+
+    @staticmethod
+    def _ratio(usage: Optional[float], limit: Optional[float]) -> Optional[float]:
+        return usage / limit if usage is not None and limit else None
+
+    def _push(self, entry: Offender) -> None:
+        """Mantiene en el heap solo los `top` peores (el mínimo queda en la raíz)"""
+        if len(self.offenders) < self.top:
+            heapq.heappush(self.offenders, entry)
+        elif entry > self.offenders[0]:
+            heapq.heapreplace(self.offenders, entry)
+
+    def add(self, cluster: str, record: Dict) -> None:
+        """Suma un registro del snapshot del cluster indicado"""
+        self.containers += 1
+        cpu = KRCAUtils.parse_cpu_millicores(record.get("cpu"))
+        req_cpu = KRCAUtils.parse_cpu_millicores(record.get("req_cpu"))
+        lim_cpu = KRCAUtils.parse_cpu_millicores(record.get("lim_cpu"))
+        memory = KRCAUtils.parse_memory_bytes(record.get("memory"))
+        req_mem = KRCAUtils.parse_memory_bytes(record.get("req_mem"))
+        lim_mem = KRCAUtils.parse_memory_bytes(record.get("lim_mem"))
+        severity = ResourceColorizer.SEVERITY_LEVELS.get(record.get("severity"), 0)
+
+        totals = self.namespaces.get(record["namespace"])
+        if totals is None:
+            totals = self.namespaces[record["namespace"]] = [0.0] * CLUSTERS + [1]
+        totals[CONTAINERS] += 1
+        totals[WARNING] += severity == ResourceColorizer.SEVERITY_WARNING
+        totals[DANGER] += severity == ResourceColorizer.SEVERITY_DANGER
+        totals[CPU] += cpu or 0
+        totals[REQ_CPU] += req_cpu or 0
+        totals[MEMORY] += memory or 0
+        totals[REQ_MEM] += req_mem or 0
+        # Subaprovisionado: usa más de lo que pide (sin request cuenta todo el uso)
+        cpu_deficit = max(0.0, (cpu or 0) - (req_cpu or 0))
+        mem_deficit = max(0.0, (memory or 0) - (req_mem or 0))
+        if cpu_deficit or mem_deficit:
+            totals[UNDER] += 1
+            totals[CPU_DEFICIT] += cpu_deficit
+            totals[MEM_DEFICIT] += mem_deficit
+
+        ratios = [r for r in (self._ratio(cpu, lim_cpu), self._ratio(memory, lim_mem)) if r is not None]
+        key = (cluster, record["namespace"], record["pod"], record["container"])
+        fields = tuple(str(record.get(field, "-")) for field in OFFENDER_FIELDS)
+        self._push((severity, max(ratios, default=-1.0), key, fields))
+
+    def combine(self, other: "FleetPartial") -> None:
+        """Incorpora los agregados de otro parcial"""
+        self.containers += other.containers
+        self.clusters += other.clusters
+        for entry in other.offenders:
+            self._push(entry)
+        for namespace, other_totals in other.namespaces.items():
+            totals = self.namespaces.get(namespace)
+            if totals is None:
+                self.namespaces[namespace] = list(other_totals)
+            else:
+                for i, value in enumerate(other_totals):
+                    totals[i] += value
+
+class FleetMerge:
+    """Subcomando merge: combina los snapshots de muchos clusters en procesos paralelos"""
+
+    def __init__(self, args):
+        self.args = args
+        self.use_color = not getattr(args, 'no_color', False)
+        self.top = getattr(args, 'top', None) or DEFAULT_MERGE_TOP
+        workers = getattr(args, 'workers', None)
+        self.workers = workers if workers is not None else os.cpu_count() or 1
+
+    @staticmethod
+    def cluster_names(paths: List[str]) -> Dict[str, str]:
+        """
+        Nombre de cluster de cada archivo: el nombre sin extensión
+        (prod-eu.ndjson -> prod-eu), o la ruta sin extensión si se repite
+        """
+        def strip_extension(path: str) -> str:
+            for extension in SNAPSHOT_EXTENSIONS:
+                if path.lower().endswith(extension):
+                    return path[:-len(extension)]
+            return path
+
+        names = {path: strip_extension(os.path.basename(path)) for path in paths}
+        repeated = {name for name, count in Counter(names.values()).items() if count > 1}
+        return {path: strip_extension(path) if name in repeated else name for path, name in names.items()}
+
+    @staticmethod
+    def summarize_file(path: str, cluster: str, top: int) -> FleetPartial:
+        """Agregados de un snapshot, leído en streaming (se ejecuta en un proceso del pool)"""
+        partial = FleetPartial(top)
+        partial.clusters = 1
+        try:
+            for record in SnapshotStore.read(path):
+                partial.add(cluster, record)
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"{path}: snapshot inválido ({e})")
+        return partial
+
+    def collect(self, paths: List[str]) -> FleetPartial:
+        """Reparte los archivos entre procesos y combina los parciales a medida que terminan"""
+        result = FleetPartial(self.top)
+        clusters = self.cluster_names(paths)
+        if self.workers == 1 or len(paths) == 1:
+            for path in paths:
+                result.combine(self.summarize_file(path, clusters[path], self.top))
+            return result
+
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(paths))) as pool:
+            futures = [pool.submit(FleetMerge.summarize_file, path, clusters[path], self.top) for path in paths]
+            for future in as_completed(futures):
+                result.combine(future.result())
+        return result
+
+    def _color(self, text: str, color: str) -> str:
+        return f"{color}{text}{ResourceColorizer.RESET}" if self.use_color else text
+
+    def offender_rows(self, result: FleetPartial) -> List[List[str]]:
+        levels = {value: name for name, value in ResourceColorizer.SEVERITY_LEVELS.items()}
+        severity_colors = [ResourceColorizer.GREEN, ResourceColorizer.BLUE,
+                           ResourceColorizer.YELLOW, ResourceColorizer.RED]
+        rows = []
+        for severity, _, (cluster, namespace, pod, container), fields in sorted(result.offenders, reverse=True):
+            workload, cpu, lim_cpu, memory, lim_mem = fields
+            cpu_ratio = FleetPartial._ratio(KRCAUtils.parse_cpu_millicores(cpu),
+                                            KRCAUtils.parse_cpu_millicores(lim_cpu))
+            mem_ratio = FleetPartial._ratio(KRCAUtils.parse_memory_bytes(memory),
+                                            KRCAUtils.parse_memory_bytes(lim_mem))
+            rows.append([
+                cluster,
+                self._color(namespace, ResourceColorizer.NAME_COLORS["NAMESPACE"]),
+                self._color(workload, ResourceColorizer.NAME_COLORS["WORKLOAD"]),
+                self._color(container, ResourceColorizer.NAME_COLORS["CONTAINER"]),
+                self._color(pod, ResourceColorizer.NAME_COLORS["POD"]),
+                self._color(levels[severity], severity_colors[severity]),
+                cpu,
+                lim_cpu,
+                f"{cpu_ratio * 100:.0f}%" if cpu_ratio is not None else "-",
+                memory,
+                lim_mem,
+                f"{mem_ratio * 100:.0f}%" if mem_ratio is not None else "-",
+            ])
+        return rows
+
+    def namespace_rows(self, result: FleetPartial) -> List[List[str]]:
+        """Totales por namespace, los de mayor faltante de memoria y CPU primero"""
+        ordered = sorted(
+            result.namespaces.items(),
+            key=lambda item: (-item[1][MEM_DEFICIT], -item[1][CPU_DEFICIT], item[0])
+        )
+        rows = []
+        for namespace, totals in ordered:
+            rows.append([
+                self._color(namespace, ResourceColorizer.NAME_COLORS["NAMESPACE"]),
+                int(totals[CLUSTERS]),
+                int(totals[CONTAINERS]),
+                int(totals[WARNING]),
+                int(totals[DANGER]),
+                KRCAUtils.format_cpu(totals[CPU], canonical=False),
+                KRCAUtils.format_cpu(totals[REQ_CPU], canonical=False),
+                KRCAUtils.format_memory(totals[MEMORY]),
+                KRCAUtils.format_memory(totals[REQ_MEM]),
+                int(totals[UNDER]),
+                KRCAUtils.format_cpu(totals[CPU_DEFICIT], canonical=False),
+                KRCAUtils.format_memory(totals[MEM_DEFICIT]),
+            ])
+        return rows
+
+    def run(self) -> int:
+        """Ejecuta el subcomando merge y muestra/exporta el resumen de flota"""
+        try:
+            paths = getattr(self.args, 'paths', None) or []
+            if not paths:
+                raise ValueError("Uso: krca merge SNAPSHOT [SNAPSHOT ...]")
+            for path in paths:
+                if not SnapshotStore.is_snapshot(path):
+                    raise ValueError(f"Formato de snapshot no soportado: {path} (use {', '.join(SNAPSHOT_EXTENSIONS)})")
+                if not os.path.exists(path):
+                    raise ValueError(f"No existe el snapshot: {path}")
+            if self.workers < 1:
+                raise ValueError("--workers debe ser mayor que 0")
+
+            result = self.collect(paths)
+            show_index = getattr(self.args, 'number', False)
+            output = f"Peores {self.top} contenedores de la flota:\n"
+            output += Exporter.render_table(self.offender_rows(result), OFFENDER_HEADERS, self.use_color, show_index)
+            output += "\n\nTotales por namespace (mayor faltante sobre requests primero):\n"
+            output += Exporter.render_table(self.namespace_rows(result), NAMESPACE_HEADERS, self.use_color, show_index)
+            output += (f"\n\nClusters: {result.clusters}  Contenedores: {result.containers}  "
+                       f"Namespaces: {len(result.namespaces)}")
+            Exporter.export(
+                output,
+                getattr(self.args, 'output_file', None),
+                self.use_color,
+                getattr(self.args, 'force', False),
+                getattr(self.args, 'landscape', False)
+            )
+            return 0
+
+        except Exception as e:
+            KRCAUtils.report_error(e, getattr(self.args, 'debug', False))
+            return 1
@@ -1,12 +1,12 @@
 #!/usr/bin/env python3
 # krca/models.py - Modelos de datos para KRCA
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 
-@dataclass
+@dataclass(frozen=True)
 class ContainerResources:
-    """Modelo para los recursos de un contenedor"""
+    """Modelo para los recursos de un contenedor (inmutable: se comparte entre réplicas)"""
     name: str
     request_cpu: str
     request_memory: str
@@ -20,9 +20,16 @@ class ContainerMetrics:
     memory: str
     namespace: Optional[str] = None
 
+@dataclass
+class ContainerStatus:
+    """Modelo para el estado de un contenedor"""
+    status: str
+    restarts: int
+    last_state: str = "-"
+
 @dataclass
 class PodStatus:
-    """Modelo para el estado de un pod"""
+    """Modelo para el estado de un pod (fase del pod y reinicios sumados)"""
     status: str
     restarts: int
     node_ip: str
@@ -36,6 +43,8 @@ class PodData:
     containers: List[ContainerResources]
     metrics: Dict[str, ContainerMetrics]  # key: container name
     status: PodStatus
+    workload: str = ""  # kind/nombre
+    container_statuses: Dict[str, ContainerStatus] = field(default_factory=dict)  # key: container name
 
 @dataclass
 class ClusterStats:
@@ -82,3 +91,26 @@ class AnalysisResult:
     cluster_stats: ClusterStats
     warnings: List[str]
     errors: List[str]
+    rows: List[List] = field(default_factory=list)  # filas sin colorear (orden ROW_COLUMNS)
+
+@dataclass
+class RecommendationPolicy:
+    """Modelo para la política de recomendación de requests y limits"""
+    percentile: float = 95.0
+    headroom_pct: float = 15.0
+    limit_headroom_pct: float = 50.0
+    min_cpu_millicores: float = 10.0
+    min_memory_bytes: float = 16 * 1024 * 1024
+
+@dataclass
+class ResourceRecommendation:
+    """Modelo para la recomendación de recursos de un contenedor de un workload"""
+    namespace: str
+    kind: str
+    workload: str
+    container: str
+    replicas: int
+    current: Dict[str, str]      # req_cpu, req_mem, lim_cpu, lim_mem
+    recommended: Dict[str, str]  # req_cpu, req_mem, lim_cpu, lim_mem
+    reclaimable_cpu_millicores: float = 0.0
+    reclaimable_memory_bytes: float = 0.0
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+# krca/nodes.py - Auditoría de capacidad de nodos y bin-packing
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .kubectl import KubectlClient
+from .colorizer import ResourceColorizer
+from .exporter import Exporter
+from .utils import KRCAUtils
+
+NODE_HEADERS = [
+    "NODE", "PODS",
+    "ALLOC_CPU", "REQ_CPU", "LIM_CPU", "CPU",
+    "ALLOC_MEM", "REQ_MEM", "LIM_MEM", "MEMORY",
+    "FLAGS"
+]
+
+# Diferencia mínima (puntos porcentuales) entre CPU y memoria solicitadas para considerar un nodo fragmentado
+FRAGMENTATION_GAP_PCT = 50
+
+# Campos de cada registro de contenedor y su parser (milicores o bytes)
+RESOURCE_PARSERS = (
+    ("req_cpu", KRCAUtils.parse_cpu_millicores),
+    ("req_mem", KRCAUtils.parse_memory_bytes),
+    ("lim_cpu", KRCAUtils.parse_cpu_millicores),
+    ("lim_mem", KRCAUtils.parse_memory_bytes),
+)
+
+class NodeUsage:
+    """Totales acumulados de un nodo"""
+
+    __slots__ = (
+        "name", "alloc_cpu", "alloc_mem", "pods",
+        "req_cpu", "req_mem", "lim_cpu", "lim_mem", "cpu", "memory",
+        "fixed_cpu", "fixed_mem", "movable"
+    )
+
+    def __init__(self, name: str, alloc_cpu: float, alloc_mem: float):
+        self.name = name
+        self.alloc_cpu = alloc_cpu
+        self.alloc_mem = alloc_mem
+        self.pods = 0
+        self.req_cpu = self.req_mem = self.lim_cpu = self.lim_mem = 0.0
+        self.cpu = self.memory = 0.0
+        # Requests de DaemonSets: se quedan en el nodo aunque se reempaquete
+        self.fixed_cpu = self.fixed_mem = 0.0
+        # Requests (cpu, mem) de los pods que se podrían mover a otro nodo
+        self.movable: List[Tuple[float, float]] = []
+
+class NodeAuditor:
+    """Suma requests, limits y uso por nodo y estima nodos liberables"""
+
+    def __init__(self, args):
+        self.args = args
+        self.use_color = not getattr(args, 'no_color', False)
+
+    def collect(self) -> Dict[str, NodeUsage]:
+        """
+        Construye el índice nodo -> totales en una sola pasada sobre los pods
+
+        Los nodos, pods y métricas se obtienen con una llamada masiva cada uno
+        (siempre de todos los namespaces: un nodo aloja pods de cualquiera).
+        """
+        fetched = KubectlClient.fetch_all({
+            "nodes": KubectlClient.get_nodes,
+            "pods": lambda: KubectlClient.get_pods(all_namespaces=True),
+            "metrics": lambda: KubectlClient.get_metrics(all_namespaces=True),
+        })
+        pods, metrics = fetched["pods"], fetched["metrics"]
+
+        nodes: Dict[str, NodeUsage] = {}
+        for node in fetched["nodes"].get("items", []):
+            allocatable = node.get("status", {}).get("allocatable", {})
+            name = node["metadata"]["name"]
+            nodes[name] = NodeUsage(
+                name,
+                KRCAUtils.parse_cpu_millicores(allocatable.get("cpu")) or 0.0,
+                KRCAUtils.parse_memory_bytes(allocatable.get("memory")) or 0.0
+            )
+
+        for pod in pods["items"]:
+            if pod.get("status", {}).get("phase") in ("Succeeded", "Failed"):
+                continue
+            _, node_name = KubectlClient.get_node_info(pod)
+            node = nodes.get(node_name)
+            if node is None:
+                continue
+
+            namespace = pod["metadata"]["namespace"]
+            pod_metrics = metrics.get((namespace, pod["metadata"]["name"]), {})
+            records = KubectlClient.container_records(pod, include_all=True)
+            pod_cpu, pod_mem, lim_cpu, lim_mem = self.pod_resources(pod, records)
+
+            for container in records:
+                usage = pod_metrics.get(container["name"], {})
+                node.cpu += (usage.get("cpu_nanocores") or 0) / 1_000_000
+                node.memory += usage.get("memory_bytes") or 0
+
+            node.pods += 1
+            node.req_cpu += pod_cpu
+            node.req_mem += pod_mem
+            node.lim_cpu += lim_cpu
+            node.lim_mem += lim_mem
+            if KubectlClient.get_workload(pod)[0] == "DaemonSet":
+                node.fixed_cpu += pod_cpu
+                node.fixed_mem += pod_mem
+            else:
+                node.movable.append((pod_cpu, pod_mem))
+
+        return nodes
+
+    @staticmethod
+    def pod_resources(pod: Dict, records: Optional[Sequence] = None) -> Tuple[float, float, float, float]:
+        """
+        Requests y limits efectivos del pod como los calcula el scheduler
+
+        El mayor entre la suma de los contenedores (más los init containers
+        sidecar, con restartPolicy Always) y cada init container junto a los
+        sidecars que arrancaron antes que él, más `spec.overhead`.
+
+        Args:
+            pod: Diccionario con la definición del pod
+            records: Registros de container_records(pod, include_all=True), si ya se tienen
+
+        Returns:
+            Tupla (req_cpu, req_mem, lim_cpu, lim_mem) en milicores y bytes
+        """
+        spec = pod["spec"]
+        if records is None:
+            records = KubectlClient.container_records(pod, include_all=True)
+        sidecars = {container["name"] for container in spec.get("initContainers") or []
+                    if container.get("restartPolicy") == "Always"}
+        containers = [0.0] * 4
+        started = [0.0] * 4
+        init_peak = [0.0] * 4
+        for record in records:
+            values = [parser(record[field]) or 0.0 for field, parser in RESOURCE_PARSERS]
+            if record["type"] == "container":
+                containers = [a + b for a, b in zip(containers, values)]
+            elif record["type"] == "init":
+                if record["name"] in sidecars:
+                    # Un sidecar sigue corriendo junto a los init siguientes y los contenedores
+                    started = [a + b for a, b in zip(started, values)]
+                    values = started
+                else:
+                    values = [a + b for a, b in zip(values, started)]
+                init_peak = [max(a, b) for a, b in zip(init_peak, values)]
+
+        overhead = spec.get("overhead") or {}
+        overhead_cpu = KRCAUtils.parse_cpu_millicores(overhead.get("cpu")) or 0.0
+        overhead_mem = KRCAUtils.parse_memory_bytes(overhead.get("memory")) or 0.0
+        req_cpu, req_mem, lim_cpu, lim_mem = (
+            max(a + b, c) for a, b, c in zip(containers, started, init_peak))
+        # Como en el scheduler, el overhead solo se suma a los limits que están definidos
+        return (req_cpu + overhead_cpu, req_mem + overhead_mem,
+                lim_cpu + overhead_cpu if lim_cpu else 0.0, lim_mem + overhead_mem if lim_mem else 0.0)
+
+    @staticmethod
+    def _pct(value: float, total: float) -> Optional[float]:
+        return value / total * 100 if total else None
+
+    def flags(self, node: NodeUsage) -> List[str]:
+        """
+        Marcas del nodo:
+        OVERCOMMIT si los limits superan lo allocatable,
+        FRAGMENTED si un recurso está casi agotado en requests y el otro queda libre
+        """
+        flags = []
+        if node.lim_cpu > node.alloc_cpu or node.lim_mem > node.alloc_mem:
+            flags.append("OVERCOMMIT")
+
+        req_cpu_pct = self._pct(node.req_cpu, node.alloc_cpu) or 0.0
+        req_mem_pct = self._pct(node.req_mem, node.alloc_mem) or 0.0
+        if (max(req_cpu_pct, req_mem_pct) >= self.args.warning_pct and
+                abs(req_cpu_pct - req_mem_pct) >= FRAGMENTATION_GAP_PCT):
+            flags.append("FRAGMENTED")
+        return flags
+
+    @staticmethod
+    def estimate_freeable(nodes: List[NodeUsage]) -> int:
+        """
+        Estima cuántos nodos quedarían vacíos reempaquetando los pods movibles
+        con first-fit decreasing sobre la capacidad libre de DaemonSets
+        """
+        if not nodes:
+            return 0
+
+        bins = sorted(
+            ([n.alloc_cpu - n.fixed_cpu, n.alloc_mem - n.fixed_mem] for n in nodes),
+            key=lambda b: (b[0], b[1]),
+            reverse=True
+        )
+        total_cpu = sum(b[0] for b in bins) or 1.0
+        total_mem = sum(b[1] for b in bins) or 1.0
+        pods = sorted(
+            (p for n in nodes for p in n.movable),
+            key=lambda p: max(p[0] / total_cpu, p[1] / total_mem),
+            reverse=True
+        )
+
+        used = [False] * len(bins)
+        for cpu, mem in pods:
+            for i, free in enumerate(bins):
+                if free[0] >= cpu and free[1] >= mem:
+                    free[0] -= cpu
+                    free[1] -= mem
+                    used[i] = True
+                    break
+            else:
+                # No entra en ningún nodo: el cluster no se puede reducir
+                return 0
+
+        return used.count(False)
+
+    def _cell(self, value: float, total: float, formatter, color: bool = True) -> str:
+        """Valor con porcentaje sobre allocatable, coloreado por umbral"""
+        pct = self._pct(value, total)
+        text = formatter(value) if pct is None else f"{formatter(value)} ({pct:.0f}%)"
+        if not self.use_color or not color or pct is None:
+            return text
+        if pct > 100 or pct > self.args.danger_pct:
+            return ResourceColorizer.red(text)
+        if pct > self.args.warning_pct:
+            return ResourceColorizer.yellow(text)
+        return ResourceColorizer.green(text)
+
+    def build_rows(
+        self,
+        nodes: Dict[str, NodeUsage],
+        flags_by_node: Optional[Dict[str, List[str]]] = None
+    ) -> List[List[str]]:
+        """Filas de la tabla de nodos (flags_by_node: marcas ya calculadas por nodo)"""
+        if flags_by_node is None:
+            flags_by_node = {name: self.flags(node) for name, node in nodes.items()}
+        cpu = lambda v: KRCAUtils.format_cpu(v, canonical=False)
+        memory = KRCAUtils.format_memory
+        rows = []
+        for name in sorted(nodes):
+            node = nodes[name]
+            flags = flags_by_node[name]
+            flags_text = ",".join(flags) or "-"
+            if self.use_color and flags:
+                flags_text = ResourceColorizer.red(flags_text) if "OVERCOMMIT" in flags else ResourceColorizer.purple(flags_text)
+            rows.append([
+                ResourceColorizer.colorize_node(name) if self.use_color else name,
+                str(node.pods),
+                cpu(node.alloc_cpu),
+                self._cell(node.req_cpu, node.alloc_cpu, cpu),
+                self._cell(node.lim_cpu, node.alloc_cpu, cpu, color=False),
+                self._cell(node.cpu, node.alloc_cpu, cpu),
+                memory(node.alloc_mem),
+                self._cell(node.req_mem, node.alloc_mem, memory),
+                self._cell(node.lim_mem, node.alloc_mem, memory, color=False),
+                self._cell(node.memory, node.alloc_mem, memory),
+                flags_text,
+            ])
+        return rows
+
+    def run(self) -> int:
+        """Ejecuta el subcomando nodes y muestra/exporta el resultado"""
+        try:
+            nodes = self.collect()
+            flags_by_node = {name: self.flags(node) for name, node in nodes.items()}
+            table = Exporter.render_table(
+                self.build_rows(nodes, flags_by_node),
+                NODE_HEADERS,
+                self.use_color,
+                getattr(self.args, 'number', False)
+            )
+            node_list = list(nodes.values())
+            overcommitted = sum(1 for flags in flags_by_node.values() if "OVERCOMMIT" in flags)
+            fragmented = sum(1 for flags in flags_by_node.values() if "FRAGMENTED" in flags)
+            summary = (
+                f"\nNodos: {len(node_list)}  Sobrecomprometidos: {overcommitted}  "
+                f"Fragmentados: {fragmented}  "
+                f"Liberables por reempaquetado (estimado): {self.estimate_freeable(node_list)}"
+            )
+
+            Exporter.export(
+                table + summary,
+                getattr(self.args, 'output_file', None),
+                self.use_color,
+                getattr(self.args, 'force', False),
+                getattr(self.args, 'landscape', False)
+            )
+            return 0
+
+        except Exception as e:
+            KRCAUtils.report_error(e, getattr(self.args, 'debug', False))
+            return 1
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# krca/oom.py - Reporte de presión de memoria y OOMKills
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+from .kubectl import KubectlClient
+from .colorizer import ResourceColorizer
+from .exporter import Exporter
+from .utils import KRCAUtils
+
+OOM_HEADERS = [
+    "NAMESPACE", "POD", "CONTAINER",
+    "MEMORY", "LIM_MEM", "MEM_PCT",
+    "RESTARTS", "LAST_STATE", "OOM_EVENTS", "BACKOFF_EVENTS",
+    "SCORE"
+]
+
+# Pesos del puntaje de riesgo
+SCORE_LAST_OOM = 50      # última terminación por OOMKilled
+SCORE_USAGE = 40         # uso/limit de memoria (proporcional, tope en 100%)
+SCORE_RESTART = 2        # por reinicio (tope 10 reinicios)
+SCORE_OOM_EVENT = 10     # por evento OOM del contenedor (tope 3 eventos)
+SCORE_BACKOFF_EVENT = 1  # por evento BackOff del contenedor (tope 10 eventos)
+
+# involvedObject.fieldPath de los eventos de un contenedor (ej. spec.containers{app})
+_FIELD_PATH_RE = re.compile(r'^spec\.(?:containers|initContainers|ephemeralContainers)\{(.+)\}$')
+
+# (UID de pod, contenedor); contenedor None = evento del pod sin fieldPath
+EventKey = Tuple[str, Optional[str]]
+
+class EventCounts:
+    """Eventos relevantes de un contenedor (o de un pod)"""
+
+    __slots__ = ("oom", "backoff")
+
+    def __init__(self, oom: int = 0, backoff: int = 0):
+        self.oom = oom
+        self.backoff = backoff
+
+class OOMReporter:
+    """Une estado de contenedores, eventos y uso actual en un ranking de riesgo OOM"""
+
+    def __init__(self, args):
+        self.args = args
+        self.use_color = not getattr(args, 'no_color', False)
+
+    @staticmethod
+    def build_event_index(events: Dict) -> Dict[EventKey, EventCounts]:
+        """
+        Índice (UID de pod, contenedor) -> conteo de eventos OOM y BackOff, en una sola pasada
+
+        El contenedor sale de involvedObject.fieldPath (spec.containers{nombre});
+        los eventos sin fieldPath quedan a nivel de pod (contenedor None).
+        Se usa el campo count de cada evento (Kubernetes agrupa repeticiones).
+        """
+        index: Dict[EventKey, EventCounts] = {}
+        for event in events.get("items", []):
+            involved = event.get("involvedObject", {})
+            if involved.get("kind") != "Pod" or not involved.get("uid"):
+                continue
+            reason = event.get("reason", "")
+            message = event.get("message", "")
+            is_oom = "OOM" in reason or "OOMKilled" in message
+            if not is_oom and reason != "BackOff":
+                continue
+
+            match = _FIELD_PATH_RE.match(involved.get("fieldPath") or "")
+            key = (involved["uid"], match.group(1) if match else None)
+            counts = index.get(key)
+            if counts is None:
+                counts = index[key] = EventCounts()
+            count = event.get("count") or 1
+            if is_oom:
+                counts.oom += count
+            else:
+                counts.backoff += count
+        return index
+
+    @staticmethod
+    def events_for(index: Dict[EventKey, EventCounts], uid: str, container: str) -> Optional[EventCounts]:
+        """Eventos de un contenedor más los del pod sin fieldPath (None si no hay ninguno)"""
+        own, pod = index.get((uid, container)), index.get((uid, None))
+        if own is None or pod is None:
+            return own or pod
+        return EventCounts(own.oom + pod.oom, own.backoff + pod.backoff)
+
+    @staticmethod
+    def score(usage_ratio: float, restarts: int, last_state: str, events: EventCounts) -> float:
+        """Puntaje de riesgo OOM (mayor = más urgente)"""
+        score = SCORE_USAGE * min(usage_ratio, 1.0)
+        score += SCORE_RESTART * min(restarts, 10)
+        if last_state == "OOMKilled":
+            score += SCORE_LAST_OOM
+        if events is not None:
+            score += SCORE_OOM_EVENT * min(events.oom, 3)
+            score += SCORE_BACKOFF_EVENT * min(events.backoff, 10)
+        return round(score, 1)
+
+    def collect(self) -> List[Tuple[float, List[str]]]:
+        """Filas (puntaje, fila) de los contenedores con alguna señal de riesgo, ordenadas"""
+        all_namespaces = self.args.all_namespaces
+        namespace = KubectlClient.resolve_namespace(self.args.namespace, all_namespaces)
+        selectors = (getattr(self.args, 'selector', None), getattr(self.args, 'field_selector', None))
+        fetched = KubectlClient.fetch_all({
+            "pods": lambda: KubectlClient.get_pods(namespace, all_namespaces, *selectors),
+            "metrics": lambda: KubectlClient.get_metrics(namespace, all_namespaces, *selectors),
+            "events": lambda: KubectlClient.get_resources("events", namespace, all_namespaces),
+        })
+        pods, metrics = fetched["pods"], fetched["metrics"]
+        event_index = self.build_event_index(fetched["events"])
+
+        results = []
+        for pod in pods["items"]:
+            metadata = pod["metadata"]
+            pod_namespace = metadata["namespace"]
+            statuses = KubectlClient.get_container_statuses(pod)
+            pod_metrics = metrics.get((pod_namespace, metadata["name"]), {})
+
+            for container in KubectlClient.container_records(pod):
+                name = container["name"]
+                events = self.events_for(event_index, metadata.get("uid"), name)
+                _, restarts, last_state = statuses.get(name, ("Unknown", 0, "-"))
+                usage = pod_metrics.get(name, {})
+                memory = usage.get("memory", "-")
+
+                memory_bytes = usage.get("memory_bytes")
+                limit_bytes = KRCAUtils.parse_memory_bytes(container["lim_mem"])
+                ratio = memory_bytes / limit_bytes if memory_bytes is not None and limit_bytes else 0.0
+
+                # Solo contenedores con alguna señal: OOM previo, reinicios, eventos o uso > warning-pct
+                if (last_state != "OOMKilled" and not restarts and events is None and
+                        ratio * 100 <= self.args.warning_pct):
+                    continue
+                score = self.score(ratio, restarts, last_state, events)
+
+                results.append((score, [
+                    pod_namespace, metadata["name"], name,
+                    memory, container["lim_mem"],
+                    f"{ratio * 100:.0f}%" if limit_bytes else "-",
+                    str(restarts), last_state,
+                    str(events.oom if events else 0),
+                    str(events.backoff if events else 0),
+                    f"{score:g}",
+                ]))
+
+        results.sort(key=lambda item: item[0], reverse=True)
+        return results
+
+    def _colorize(self, score: float, row: List[str]) -> List[str]:
+        """Colores: puntaje por severidad, OOMKilled en rojo"""
+        if score >= SCORE_LAST_OOM:
+            score_color = ResourceColorizer.RED
+        elif score >= SCORE_USAGE * self.args.warning_pct / 100:
+            score_color = ResourceColorizer.YELLOW
+        else:
+            score_color = ResourceColorizer.WHITE
+        namespace, pod, container = row[:3]
+        return [
+            ResourceColorizer.colorize_namespace(namespace),
+            ResourceColorizer.colorize_pod(pod),
+            ResourceColorizer.colorize_container(container),
+            *row[3:7],
+            ResourceColorizer.colorize_last_state(row[7]),
+            *row[8:10],
+            f"{score_color}{row[10]}{ResourceColorizer.RESET}",
+        ]
+
+    def run(self) -> int:
+        """Ejecuta el subcomando oom y muestra/exporta el ranking"""
+        try:
+            results = self.collect()
+            top = getattr(self.args, 'top', None)
+            if top:
+                results = results[:top]
+            rows = [self._colorize(score, row) if self.use_color else row for score, row in results]
+
+            table = Exporter.render_table(
+                rows,
+                OOM_HEADERS,
+                self.use_color,
+                getattr(self.args, 'number', False)
+            )
+            Exporter.export(
+                table,
+                getattr(self.args, 'output_file', None),
+                self.use_color,
+                getattr(self.args, 'force', False),
+                getattr(self.args, 'landscape', False)
+            )
+            return 0
+
+        except Exception as e:
+            KRCAUtils.report_error(e, getattr(self.args, 'debug', False))
+            return 1
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# krca/policy.py - Umbrales por namespace, workload o etiqueta desde un archivo de política
+
+from dataclasses import asdict, fields
+from typing import Dict, List, Optional, Tuple
+
+import yaml
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
+from .models import Thresholds
+from .utils import KRCAUtils
+
+# Claves aceptadas en cada regla
+RULE_KEYS = {"name", "namespace", "workload", "labels", "thresholds"}
+THRESHOLD_KEYS = {field.name for field in fields(Thresholds)}
+
+# Tupla (warning, danger, diff, underuse) en el orden de ResourceColorizer
+ThresholdValues = Tuple[int, int, int, int]
+
+class PolicyRule:
+    """Regla compilada: condiciones exactas y umbrales ya resueltos"""
+
+    __slots__ = ("position", "name", "namespace", "workload", "labels", "values")
+
+    def __init__(
+        self,
+        position: int,
+        name: str,
+        namespace: Optional[str],
+        workload: Optional[str],
+        labels: Dict[str, str],
+        values: ThresholdValues
+    ):
+        self.position = position
+        self.name = name
+        self.namespace = namespace
+        self.workload = workload
+        self.labels = labels
+        self.values = values
+
+    def matches(self, namespace: str, workload: str, labels: Dict[str, str]) -> bool:
+        if self.namespace is not None and self.namespace != namespace:
+            return False
+        if self.workload is not None and self.workload not in (workload, workload.split("/", 1)[-1]):
+            return False
+        return all(labels.get(key) == value for key, value in self.labels.items())
+
+class PolicyIndex:
+    """
+    Reglas ordenadas compiladas en un índice de despacho
+
+    Cada regla se indexa por su condición más selectiva (workload, luego una
+    etiqueta, luego namespace); al buscar solo se evalúan las reglas de las
+    entradas del índice que corresponden al pod, nunca la lista completa.
+    Gana la primera regla del archivo que cumple todas sus condiciones.
+    """
+
+    def __init__(self, rules: List[PolicyRule], default: ThresholdValues):
+        self.rules = rules
+        self.default = default
+        self.by_workload: Dict[str, List[PolicyRule]] = {}
+        self.by_label: Dict[Tuple[str, str], List[PolicyRule]] = {}
+        self.by_namespace: Dict[str, List[PolicyRule]] = {}
+        self.catch_all: List[PolicyRule] = []
+        # Etiquetas que usa alguna regla: solo esas distinguen pods del mismo workload
+        self.label_keys = tuple(sorted({key for rule in rules for key in rule.labels}))
+        # (namespace, workload, valores de label_keys) -> umbrales; acotado por workloads, no por pods
+        self._cache: Dict[tuple, ThresholdValues] = {}
+
+        for rule in rules:
+            if rule.workload is not None:
+                self.by_workload.setdefault(rule.workload, []).append(rule)
+            elif rule.labels:
+                self.by_label.setdefault(next(iter(rule.labels.items())), []).append(rule)
+            elif rule.namespace is not None:
+                self.by_namespace.setdefault(rule.namespace, []).append(rule)
+            else:
+                self.catch_all.append(rule)
+
+    @staticmethod
+    def _read(path: str) -> Dict:
+        if path.lower().endswith(".toml"):
+            if tomllib is None:
+                raise ValueError("Las políticas TOML requieren Python 3.11 o superior (use YAML)")
+            with open(path, "rb") as f:
+                return tomllib.load(f)
+        with open(path, encoding="utf-8") as f:
+            return yaml.safe_load(f) or {}
+
+    @staticmethod
+    def compile_thresholds(values: Dict, default: Thresholds, where: str) -> ThresholdValues:
+        """Combina los umbrales de una regla con los globales y los valida"""
+        unknown = set(values) - THRESHOLD_KEYS
+        if unknown:
+            raise ValueError(f"{where}: umbrales desconocidos {', '.join(sorted(unknown))} "
+                             f"(use {', '.join(sorted(THRESHOLD_KEYS))})")
+        thresholds = Thresholds(**{**asdict(default), **{key: int(value) for key, value in values.items()}})
+        values = (thresholds.warning, thresholds.danger, thresholds.diff, thresholds.underuse)
+        if not KRCAUtils.validate_thresholds(*values):
+            raise ValueError(f"{where}: umbrales inconsistentes (se requiere "
+                             f"0 <= underuse < warning < danger <= 1000 y 0 < diff <= 1000)")
+        return values
+
+    @classmethod
+    def load(cls, path: str, default: Thresholds) -> "PolicyIndex":
+        """
+        Lee y compila un archivo de política YAML o TOML
+
+        Formato (YAML):
+            rules:
+              - name: batch
+                namespace: batch
+                thresholds: {warning: 85, danger: 95}
+              - workload: Deployment/api      # o solo el nombre: api
+                labels: {tier: critical}
+                thresholds: {warning: 50, danger: 65}
+
+        Args:
+            path: Ruta del archivo (.yaml, .yml o .toml)
+            default: Umbrales globales (los de la línea de comandos)
+
+        Raises:
+            ValueError: Si el archivo o alguna regla no es válida
+        """
+        data = cls._read(path)
+        if not isinstance(data, dict) or not isinstance(data.get("rules", []), list):
+            raise ValueError(f"{path}: se esperaba una lista 'rules'")
+
+        default_values = (default.warning, default.danger, default.diff, default.underuse)
+        rules = []
+        for position, entry in enumerate(data.get("rules", []), start=1):
+            where = f"{path}: regla {position}"
+            if not isinstance(entry, dict):
+                raise ValueError(f"{where}: se esperaba un objeto")
+            unknown = set(entry) - RULE_KEYS
+            if unknown:
+                raise ValueError(f"{where}: claves desconocidas {', '.join(sorted(unknown))}")
+            labels = entry.get("labels") or {}
+            if not isinstance(labels, dict):
+                raise ValueError(f"{where}: 'labels' debe ser un mapa clave: valor")
+            rules.append(PolicyRule(
+                position,
+                str(entry.get("name", f"regla {position}")),
+                entry.get("namespace"),
+                entry.get("workload"),
+                {str(key): str(value) for key, value in labels.items()},
+                cls.compile_thresholds(entry.get("thresholds") or {}, default, where)
+            ))
+        return cls(rules, default_values)
+
+    def lookup(self, namespace: str, workload: str, labels: Optional[Dict[str, str]] = None) -> ThresholdValues:
+        """
+        Umbrales (warning, danger, diff, underuse) para un pod
+
+        Args:
+            namespace: Namespace del pod
+            workload: Workload como "Kind/nombre"
+            labels: Etiquetas del pod
+        """
+        labels = labels or {}
+        cache_key = (namespace, workload, tuple(labels.get(key) for key in self.label_keys))
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        candidates = list(self.catch_all)
+        candidates += self.by_namespace.get(namespace, [])
+        candidates += self.by_workload.get(workload, [])
+        candidates += self.by_workload.get(workload.split("/", 1)[-1], [])
+        for item in labels.items():
+            candidates += self.by_label.get(item, [])
+
+        values = self.default
+        for rule in sorted(candidates, key=lambda rule: rule.position):
+            if rule.matches(namespace, workload, labels):
+                values = rule.values
+                break
+        self._cache[cache_key] = values
+        return values
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+# krca/quotas.py - Auditoría de ResourceQuota y LimitRange por namespace
+
+from typing import Dict, List, Optional, Tuple
+
+from .kubectl import KubectlClient
+from .colorizer import ResourceColorizer
+from .exporter import Exporter
+from .utils import KRCAUtils
+
+CONTAINER_HEADERS = [
+    "NAMESPACE", "POD", "CONTAINER",
+    "REQ_CPU", "LIM_CPU", "REQ_MEM", "LIM_MEM",
+    "ISSUES"
+]
+
+QUOTA_HEADERS = ["NAMESPACE", "QUOTA", "RESOURCE", "USED", "HARD", "HEADROOM"]
+
+# Recursos de cómputo de un ResourceQuota -> (campo del contenedor, es CPU)
+QUOTA_RESOURCES = {
+    "requests.cpu": ("req_cpu", True),
+    "cpu": ("req_cpu", True),
+    "limits.cpu": ("lim_cpu", True),
+    "requests.memory": ("req_mem", False),
+    "memory": ("req_mem", False),
+    "limits.memory": ("lim_mem", False),
+}
+
+# Campo del contenedor -> (recurso, sección de la spec)
+FIELDS = {
+    "req_cpu": ("cpu", "requests"),
+    "lim_cpu": ("cpu", "limits"),
+    "req_mem": ("memory", "requests"),
+    "lim_mem": ("memory", "limits"),
+}
+
+class NamespaceLimits:
+    """LimitRange (tipo Container) combinados de un namespace"""
+
+    __slots__ = ("default", "default_request", "min", "max", "ratio")
+
+    def __init__(self):
+        self.default: Dict[str, str] = {}
+        self.default_request: Dict[str, str] = {}
+        self.min: Dict[str, str] = {}
+        self.max: Dict[str, str] = {}
+        self.ratio: Dict[str, str] = {}
+
+class QuotaAuditor:
+    """Calcula requests/limits efectivos con LimitRange y la holgura de ResourceQuota"""
+
+    def __init__(self, args):
+        self.args = args
+        self.use_color = not getattr(args, 'no_color', False)
+
+    @staticmethod
+    def _parse(resource: str, value: Optional[str]) -> Optional[float]:
+        if resource == "cpu":
+            return KRCAUtils.parse_cpu_millicores(value)
+        return KRCAUtils.parse_memory_bytes(value)
+
+    def build_limits_index(self, limit_ranges: Dict) -> Dict[str, NamespaceLimits]:
+        """
+        Índice namespace -> límites combinados
+
+        Los defaults se toman del primer LimitRange que los define; con varios
+        LimitRange se aplica el min más alto y el max más bajo.
+        """
+        index: Dict[str, NamespaceLimits] = {}
+        for item in limit_ranges.get("items", []):
+            limits = index.setdefault(item["metadata"]["namespace"], NamespaceLimits())
+            for entry in item.get("spec", {}).get("limits", []):
+                if entry.get("type", "Container") != "Container":
+                    continue
+                for resource, value in entry.get("default", {}).items():
+                    limits.default.setdefault(resource, value)
+                # Sin defaultRequest para un recurso, Kubernetes usa default también como request
+                for resource, value in {**entry.get("default", {}), **entry.get("defaultRequest", {})}.items():
+                    limits.default_request.setdefault(resource, value)
+                for resource, value in entry.get("min", {}).items():
+                    current = limits.min.get(resource)
+                    if current is None or self._parse(resource, value) > self._parse(resource, current):
+                        limits.min[resource] = value
+                for resource, value in entry.get("max", {}).items():
+                    current = limits.max.get(resource)
+                    if current is None or self._parse(resource, value) < self._parse(resource, current):
+                        limits.max[resource] = value
+                for resource, value in entry.get("maxLimitRequestRatio", {}).items():
+                    limits.ratio.setdefault(resource, value)
+        return index
+
+    @staticmethod
+    def build_quota_index(quotas: Dict) -> Dict[str, List[Dict]]:
+        """Índice namespace -> lista de ResourceQuota"""
+        index: Dict[str, List[Dict]] = {}
+        for item in quotas.get("items", []):
+            index.setdefault(item["metadata"]["namespace"], []).append(item)
+        return index
+
+    def effective_resources(
+        self,
+        container: Dict[str, str],
+        limits: Optional[NamespaceLimits]
+    ) -> Tuple[Dict[str, str], Dict[str, str]]:
+        """
+        Requests/limits efectivos de un contenedor y el origen de cada valor
+
+        Returns:
+            Tupla (valores, origen) donde origen es "spec", "limit" (request
+            igualado al limit) o "LimitRange"
+        """
+        values = {field: container[field] for field in FIELDS}
+        sources = {field: "spec" for field in FIELDS if values[field] != "<none>"}
+
+        for resource, req_field, lim_field in (("cpu", "req_cpu", "lim_cpu"), ("memory", "req_mem", "lim_mem")):
+            # Un request sin definir toma el valor del limit explícito
+            if values[req_field] == "<none>" and values[lim_field] != "<none>":
+                values[req_field] = values[lim_field]
+                sources[req_field] = "limit"
+            if limits is None:
+                continue
+            if values[lim_field] == "<none>" and resource in limits.default:
+                values[lim_field] = limits.default[resource]
+                sources[lim_field] = "LimitRange"
+            if values[req_field] == "<none>" and resource in limits.default_request:
+                values[req_field] = limits.default_request[resource]
+                sources[req_field] = "LimitRange"
+
+        return values, sources
+
+    def check(
+        self,
+        values: Dict[str, str],
+        limits: Optional[NamespaceLimits],
+        quota_fields: set
+    ) -> List[str]:
+        """Incumplimientos de LimitRange (min/max/ratio) y campos exigidos por quota sin valor"""
+        issues = []
+        for field in sorted(quota_fields):
+            if values[field] == "<none>":
+                issues.append(f"QUOTA_REJECT:{field}")
+
+        if limits is None:
+            return issues
+
+        for field, (resource, _) in FIELDS.items():
+            value = self._parse(resource, values[field])
+            if value is None:
+                continue
+            minimum = self._parse(resource, limits.min.get(resource))
+            maximum = self._parse(resource, limits.max.get(resource))
+            if minimum is not None and value < minimum:
+                issues.append(f"BELOW_MIN:{field}")
+            if maximum is not None and value > maximum:
+                issues.append(f"ABOVE_MAX:{field}")
+
+        for resource, req_field, lim_field in (("cpu", "req_cpu", "lim_cpu"), ("memory", "req_mem", "lim_mem")):
+            ratio = limits.ratio.get(resource)
+            request = self._parse(resource, values[req_field])
+            limit = self._parse(resource, values[lim_field])
+            if ratio and request and limit and limit / request > float(ratio):
+                issues.append(f"RATIO:{resource}")
+
+        return issues
+
+    def _cell(self, value: str, source: Optional[str]) -> str:
+        """Valor efectivo con marca de origen (amarillo si no viene de la spec)"""
+        text = value if source in (None, "spec") else f"{value} ({source})"
+        if not self.use_color:
+            return text
+        if value == "<none>" or source not in (None, "spec"):
+            return ResourceColorizer.yellow(text)
+        return ResourceColorizer.green(text)
+
+    def container_rows(
+        self,
+        pods: Dict,
+        limits_index: Dict[str, NamespaceLimits],
+        quota_index: Dict[str, List[Dict]]
+    ) -> Tuple[List[List[str]], int]:
+        """
+        Filas de contenedores cuyo valor efectivo difiere de la spec o incumplen reglas
+
+        Returns:
+            Tupla (filas, total de contenedores analizados)
+        """
+        # Campos exigidos por quota en cada namespace, calculados una vez
+        quota_fields: Dict[str, set] = {
+            namespace: {
+                QUOTA_RESOURCES[resource][0]
+                for quota in namespace_quotas
+                for resource in quota.get("spec", {}).get("hard", {})
+                if resource in QUOTA_RESOURCES
+            }
+            for namespace, namespace_quotas in quota_index.items()
+        }
+
+        rows, total = [], 0
+        for pod in pods["items"]:
+            namespace = pod["metadata"]["namespace"]
+            limits = limits_index.get(namespace)
+            required = quota_fields.get(namespace, set())
+            for container in KubectlClient.container_records(pod):
+                total += 1
+                values, sources = self.effective_resources(container, limits)
+                issues = self.check(values, limits, required)
+                defaulted = any(source != "spec" for source in sources.values())
+                if not issues and not defaulted:
+                    continue
+
+                issues_text = ",".join(issues) or "-"
+                if self.use_color and issues:
+                    issues_text = ResourceColorizer.red(issues_text)
+                rows.append([
+                    ResourceColorizer.colorize_namespace(namespace) if self.use_color else namespace,
+                    ResourceColorizer.colorize_pod(pod["metadata"]["name"]) if self.use_color else pod["metadata"]["name"],
+                    ResourceColorizer.colorize_container(container["name"]) if self.use_color else container["name"],
+                    self._cell(values["req_cpu"], sources.get("req_cpu")),
+                    self._cell(values["lim_cpu"], sources.get("lim_cpu")),
+                    self._cell(values["req_mem"], sources.get("req_mem")),
+                    self._cell(values["lim_mem"], sources.get("lim_mem")),
+                    issues_text,
+                ])
+        return rows, total
+
+    def quota_rows(self, quota_index: Dict[str, List[Dict]]) -> List[List[str]]:
+        """Filas de holgura por namespace, quota y recurso de cómputo"""
+        rows = []
+        for namespace in sorted(quota_index):
+            for quota in quota_index[namespace]:
+                status = quota.get("status", {})
+                hard, used = status.get("hard", {}), status.get("used", {})
+                for resource in QUOTA_RESOURCES:
+                    if resource not in hard:
+                        continue
+                    is_cpu = QUOTA_RESOURCES[resource][1]
+                    parse = KRCAUtils.parse_cpu_millicores if is_cpu else KRCAUtils.parse_memory_bytes
+                    hard_value = parse(hard[resource]) or 0.0
+                    used_value = parse(used.get(resource, "0")) or 0.0
+                    headroom = hard_value - used_value
+                    formatter = (lambda v: KRCAUtils.format_cpu(v, canonical=False)) if is_cpu else KRCAUtils.format_memory
+                    used_pct = used_value / hard_value * 100 if hard_value else 100.0
+                    headroom_text = f"{formatter(max(headroom, 0))} ({100 - used_pct:.0f}%)"
+                    if self.use_color:
+                        if used_pct > self.args.danger_pct:
+                            headroom_text = ResourceColorizer.red(headroom_text)
+                        elif used_pct > self.args.warning_pct:
+                            headroom_text = ResourceColorizer.yellow(headroom_text)
+                        else:
+                            headroom_text = ResourceColorizer.green(headroom_text)
+                    rows.append([
+                        ResourceColorizer.colorize_namespace(namespace) if self.use_color else namespace,
+                        quota["metadata"]["name"],
+                        resource,
+                        used.get(resource, "0"),
+                        hard[resource],
+                        headroom_text,
+                    ])
+        return rows
+
+    def run(self) -> int:
+        """Ejecuta el subcomando quotas y muestra/exporta el resultado"""
+        try:
+            all_namespaces = self.args.all_namespaces
+            namespace = KubectlClient.resolve_namespace(self.args.namespace, all_namespaces)
+            # Una llamada masiva por tipo de objeto (en paralelo), sin llamadas por namespace
+            fetched = KubectlClient.fetch_all({
+                resource: lambda resource=resource: KubectlClient.get_resources(resource, namespace, all_namespaces)
+                for resource in ("pods", "limitranges", "resourcequotas")
+            })
+            pods = fetched["pods"]
+            limits_index = self.build_limits_index(fetched["limitranges"])
+            quota_index = self.build_quota_index(fetched["resourcequotas"])
+
+            container_rows, total = self.container_rows(pods, limits_index, quota_index)
+            show_index = getattr(self.args, 'number', False)
+            output = Exporter.render_table(container_rows, CONTAINER_HEADERS, self.use_color, show_index)
+            output += (f"\n\nContenedores: {total}  Con valores por defecto o incumplimientos: "
+                       f"{len(container_rows)}  Namespaces con LimitRange: {len(limits_index)}")
+            quota_rows = self.quota_rows(quota_index)
+            if quota_rows:
+                output += "\n\n" + Exporter.render_table(quota_rows, QUOTA_HEADERS, self.use_color, show_index)
+
+            Exporter.export(
+                output,
+                getattr(self.args, 'output_file', None),
+                self.use_color,
+                getattr(self.args, 'force', False),
+                getattr(self.args, 'landscape', False)
+            )
+            return 0
+
+        except Exception as e:
+            KRCAUtils.report_error(e, getattr(self.args, 'debug', False))
+            return 1
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+# krca/recommender.py - Motor de recomendaciones de requests y limits
+
+import json
+from array import array
+from dataclasses import asdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import yaml
+
+from .kubectl import KubectlClient
+from .exporter import Exporter
+from .utils import KRCAUtils
+from .sampling import UsageSampler
+from .models import RecommendationPolicy, ResourceRecommendation
+
+# Workloads cuyo pod template se puede parchear directamente (kind -> apiVersion)
+PATCHABLE_KINDS = {
+    "Deployment": "apps/v1",
+    "StatefulSet": "apps/v1",
+    "DaemonSet": "apps/v1",
+    "ReplicaSet": "apps/v1",
+}
+
+# Clave de agrupación: (namespace, kind, workload, container)
+WorkloadKey = Tuple[str, str, str, str]
+
+# Campos de requests/limits y el parser con el que se comparan sus valores
+RESOURCE_FIELDS = {
+    "req_cpu": KRCAUtils.parse_cpu_millicores,
+    "req_mem": KRCAUtils.parse_memory_bytes,
+    "lim_cpu": KRCAUtils.parse_cpu_millicores,
+    "lim_mem": KRCAUtils.parse_memory_bytes,
+}
+
+class UsageSamples:
+    """Muestras de uso de un contenedor agregadas sobre todas las réplicas del workload"""
+
+    __slots__ = ("spec", "replicas", "cpu", "memory")
+
+    def __init__(self, spec: Dict[str, str]):
+        self.spec = spec
+        self.replicas = 0
+        # Arrays compactos de floats: milicores y bytes
+        self.cpu = array('d')
+        self.memory = array('d')
+
+class ResourceRecommender:
+    """Calcula requests y limits sugeridos por workload a partir de muestras de uso"""
+
+    def __init__(self, args, policy: Optional[RecommendationPolicy] = None):
+        self.args = args
+        self.use_color = not getattr(args, 'no_color', False)
+        self.policy = policy or RecommendationPolicy(
+            percentile=getattr(args, 'percentile', 95.0),
+            headroom_pct=getattr(args, 'headroom_pct', 15.0),
+            limit_headroom_pct=getattr(args, 'limit_headroom_pct', 50.0)
+        )
+
+    def collect(
+        self,
+        snapshots: Optional[Iterable[Dict]] = None,
+        pods: Optional[Dict] = None
+    ) -> Dict[WorkloadKey, UsageSamples]:
+        """
+        Agrupa las muestras de uso por workload y contenedor
+
+        Args:
+            snapshots: Lista o iterador de diccionarios de métricas (como los de get_metrics).
+                Si es None se toma una única muestra de metrics.k8s.io.
+            pods: Lista de pods ya obtenida (opcional); con --sample se lista
+                antes de empezar a muestrear, así los pods reemplazados durante
+                la ventana conservan sus muestras.
+
+        Returns:
+            Diccionario (namespace, kind, workload, container) -> UsageSamples
+        """
+        all_namespaces = self.args.all_namespaces
+        selectors = (getattr(self.args, 'selector', None), getattr(self.args, 'field_selector', None))
+        if snapshots is None or pods is None:
+            namespace = KubectlClient.resolve_namespace(self.args.namespace, all_namespaces)
+        if snapshots is None:
+            fetched = KubectlClient.fetch_all({
+                "pods": lambda: KubectlClient.get_pods(namespace, all_namespaces, *selectors),
+                "metrics": lambda: KubectlClient.get_metrics(namespace, all_namespaces, *selectors),
+            })
+            pods, snapshots = fetched["pods"], [fetched["metrics"]]
+        elif pods is None:
+            pods = KubectlClient.get_pods(namespace, all_namespaces, *selectors)
+
+        groups: Dict[WorkloadKey, UsageSamples] = {}
+        # Índice (namespace, pod, container) -> muestras del grupo, para volcar cada snapshot en una pasada
+        index: Dict[Tuple[str, str, str], UsageSamples] = {}
+
+        for pod in pods["items"]:
+            pod_name = pod["metadata"]["name"]
+            pod_namespace = pod["metadata"]["namespace"]
+            kind, workload = KubectlClient.get_workload(pod)
+
+            for container in KubectlClient.container_records(pod):
+                key = (pod_namespace, kind, workload, container["name"])
+                samples = groups.get(key)
+                if samples is None:
+                    samples = groups[key] = UsageSamples(container)
+                samples.replicas += 1
+                index[(pod_namespace, pod_name, container["name"])] = samples
+
+        for metrics in snapshots:
+            for (pod_namespace, pod_name), containers in metrics.items():
+                for container_name, usage in containers.items():
+                    samples = index.get((pod_namespace, pod_name, container_name))
+                    if samples is None:
+                        continue
+                    cpu, memory = usage.get("cpu_nanocores"), usage.get("memory_bytes")
+                    if cpu is None or memory is None:
+                        continue
+                    samples.cpu.append(cpu / 1_000_000)
+                    samples.memory.append(memory)
+
+        return groups
+
+    def recommend(self, groups: Dict[WorkloadKey, UsageSamples]) -> List[ResourceRecommendation]:
+        """
+        Aplica la política (percentil + margen) a cada grupo de muestras
+
+        Args:
+            groups: Resultado de collect()
+
+        Returns:
+            Recomendaciones que cambian algún valor, ordenadas por memoria recuperable
+        """
+        policy = self.policy
+        request_factor = 1 + policy.headroom_pct / 100
+        limit_factor = 1 + policy.limit_headroom_pct / 100
+        recommendations = []
+
+        for (namespace, kind, workload, container), samples in groups.items():
+            if not samples.cpu:
+                continue
+
+            cpu_sorted = sorted(samples.cpu)
+            memory_sorted = sorted(samples.memory)
+
+            req_cpu = max(KRCAUtils.percentile(cpu_sorted, policy.percentile) * request_factor,
+                          policy.min_cpu_millicores)
+            req_mem = max(KRCAUtils.percentile(memory_sorted, policy.percentile) * request_factor,
+                          policy.min_memory_bytes)
+            lim_cpu = max(cpu_sorted[-1] * limit_factor, req_cpu)
+            lim_mem = max(memory_sorted[-1] * limit_factor, req_mem)
+
+            current = {k: samples.spec[k] for k in RESOURCE_FIELDS}
+            recommended = {
+                "req_cpu": KRCAUtils.format_cpu(req_cpu),
+                "req_mem": KRCAUtils.format_memory(req_mem),
+                "lim_cpu": KRCAUtils.format_cpu(lim_cpu),
+                "lim_mem": KRCAUtils.format_memory(lim_mem),
+            }
+            if self.unchanged(current, recommended):
+                continue
+
+            recommendations.append(ResourceRecommendation(
+                namespace=namespace,
+                kind=kind,
+                workload=workload,
+                container=container,
+                replicas=samples.replicas,
+                current=current,
+                recommended=recommended,
+                reclaimable_cpu_millicores=self._delta(
+                    KRCAUtils.parse_cpu_millicores, current["req_cpu"], recommended["req_cpu"], samples.replicas),
+                reclaimable_memory_bytes=self._delta(
+                    KRCAUtils.parse_memory_bytes, current["req_mem"], recommended["req_mem"], samples.replicas),
+            ))
+
+        recommendations.sort(key=lambda r: (-r.reclaimable_memory_bytes, -r.reclaimable_cpu_millicores))
+        return recommendations
+
+    @staticmethod
+    def unchanged(current: Dict[str, str], recommended: Dict[str, str]) -> bool:
+        """True si la recomendación tiene los mismos valores que el spec ("1" y "1000m", "1Gi" y "1024Mi")"""
+        return all(parser(current[field]) == parser(recommended[field])
+                   for field, parser in RESOURCE_FIELDS.items())
+
+    @staticmethod
+    def _delta(parser, current: str, recommended: str, replicas: int) -> float:
+        """Diferencia (actual - recomendado) * réplicas; 0 si el request actual no está definido"""
+        current_value = parser(current)
+        if current_value is None:
+            return 0.0
+        return (current_value - parser(recommended)) * replicas
+
+    @staticmethod
+    def summarize(recommendations: List[ResourceRecommendation]) -> Dict[str, object]:
+        """Totales del cluster: recursos recuperables y recursos faltantes en requests"""
+        cpu = [r.reclaimable_cpu_millicores for r in recommendations]
+        memory = [r.reclaimable_memory_bytes for r in recommendations]
+        reclaimable_cpu = sum(v for v in cpu if v > 0)
+        reclaimable_mem = sum(v for v in memory if v > 0)
+        missing_cpu = -sum(v for v in cpu if v < 0)
+        missing_mem = -sum(v for v in memory if v < 0)
+        return {
+            "recommendations": len(recommendations),
+            "workloads": len({(r.namespace, r.kind, r.workload) for r in recommendations}),
+            "reclaimable_cpu": KRCAUtils.format_cpu(reclaimable_cpu),
+            "reclaimable_memory": KRCAUtils.format_memory(reclaimable_mem),
+            "missing_cpu": KRCAUtils.format_cpu(missing_cpu),
+            "missing_memory": KRCAUtils.format_memory(missing_mem),
+        }
+
+    @staticmethod
+    def build_patches(recommendations: List[ResourceRecommendation]) -> List[Dict]:
+        """Genera un parche (strategic merge / server-side apply) por workload parcheable"""
+        patches: Dict[Tuple[str, str, str], Dict] = {}
+        for rec in recommendations:
+            if rec.kind not in PATCHABLE_KINDS:
+                continue
+            key = (rec.namespace, rec.kind, rec.workload)
+            patch = patches.get(key)
+            if patch is None:
+                patch = patches[key] = {
+                    "apiVersion": PATCHABLE_KINDS[rec.kind],
+                    "kind": rec.kind,
+                    "metadata": {"name": rec.workload, "namespace": rec.namespace},
+                    "spec": {"template": {"spec": {"containers": []}}},
+                }
+            patch["spec"]["template"]["spec"]["containers"].append({
+                "name": rec.container,
+                "resources": {
+                    "requests": {"cpu": rec.recommended["req_cpu"], "memory": rec.recommended["req_mem"]},
+                    "limits": {"cpu": rec.recommended["lim_cpu"], "memory": rec.recommended["lim_mem"]},
+                },
+            })
+        return list(patches.values())
+
+    def render_json(self, recommendations: List[ResourceRecommendation]) -> str:
+        """Salida JSON con resumen, diferencias por contenedor y parches"""
+        return json.dumps({
+            "policy": asdict(self.policy),
+            "summary": self.summarize(recommendations),
+            "recommendations": [asdict(r) for r in recommendations],
+            "patches": self.build_patches(recommendations),
+        }, indent=2)
+
+    def render_yaml(self, recommendations: List[ResourceRecommendation]) -> str:
+        """Salida YAML multi-documento lista para `kubectl apply --server-side -f`"""
+        summary = self.summarize(recommendations)
+        lines = [
+            "# KRCA - recomendaciones de requests/limits",
+            f"# Política: p{self.policy.percentile:g} + {self.policy.headroom_pct:g}% (requests), "
+            f"máximo + {self.policy.limit_headroom_pct:g}% (limits)",
+            f"# CPU recuperable: {summary['reclaimable_cpu']}  Memoria recuperable: {summary['reclaimable_memory']}",
+            f"# CPU faltante: {summary['missing_cpu']}  Memoria faltante: {summary['missing_memory']}",
+            "# Aplicar con: kubectl apply --server-side --field-manager=krca -f <archivo>",
+        ]
+
+        for rec in recommendations:
+            if rec.kind not in PATCHABLE_KINDS:
+                lines.append(f"# {rec.kind} {rec.namespace}/{rec.workload} no es parcheable, "
+                             f"contenedor {rec.container}: {self._describe(rec)}")
+
+        by_workload: Dict[Tuple[str, str, str], List[ResourceRecommendation]] = {}
+        for rec in recommendations:
+            by_workload.setdefault((rec.namespace, rec.kind, rec.workload), []).append(rec)
+
+        for patch in self.build_patches(recommendations):
+            metadata = patch["metadata"]
+            lines.append("---")
+            for rec in by_workload[(metadata["namespace"], patch["kind"], metadata["name"])]:
+                lines.append(f"# {rec.container} ({rec.replicas} réplicas): {self._describe(rec)}")
+            lines.append(yaml.safe_dump(patch, sort_keys=False).rstrip())
+
+        return "\n".join(lines)
+
+    @staticmethod
+    def _describe(rec: ResourceRecommendation) -> str:
+        """Diferencia legible actual -> recomendado"""
+        return ", ".join(
+            f"{field} {rec.current[field]} -> {rec.recommended[field]}"
+            for field in ("req_cpu", "lim_cpu", "req_mem", "lim_mem")
+        )
+
+    def run(self) -> int:
+        """Ejecuta el subcomando recommend y muestra/exporta el resultado"""
+        try:
+            pods = snapshots = None
+            samples = getattr(self.args, 'sample', None)
+            if samples is not None:
+                # Con --sample las recomendaciones usan todas las muestras de la ventana;
+                # los pods se listan antes de empezar (como en UsageSampler.collect)
+                every = getattr(self.args, 'every', 10.0)
+                UsageSampler.validate(samples, every)
+                selectors = (getattr(self.args, 'selector', None), getattr(self.args, 'field_selector', None))
+                all_namespaces = self.args.all_namespaces
+                namespace = KubectlClient.resolve_namespace(self.args.namespace, all_namespaces)
+                pods = KubectlClient.get_pods(namespace, all_namespaces, *selectors)
+                snapshots = UsageSampler.snapshots(namespace, all_namespaces, samples, every, *selectors)
+            recommendations = self.recommend(self.collect(snapshots, pods))
+            if getattr(self.args, 'format', 'yaml') == 'json':
+                output = self.render_json(recommendations)
+            else:
+                output = self.render_yaml(recommendations)
+
+            Exporter.export_raw(
+                output,
+                getattr(self.args, 'output_file', None),
+                self.use_color,
+                getattr(self.args, 'force', False)
+            )
+            return 0
+
+        except Exception as e:
+            KRCAUtils.report_error(e, getattr(self.args, 'debug', False))
+            return 1
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# krca/sampling.py - Muestreo de uso en el tiempo (--sample N --every S)
+
+import sys
+import time
+from array import array
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .kubectl import KubectlClient
+from .colorizer import ResourceColorizer
+from .exporter import Exporter
+from .snapshot import SnapshotStore
+from .utils import KRCAUtils
+
+SAMPLE_HEADERS = [
+    "NAMESPACE", "POD", "CONTAINER",
+    "CPU_MIN", "CPU_AVG", "CPU_MAX", "LIM_CPU", "CPU>LIM", "CPU>WARN",
+    "MEM_MIN", "MEM_AVG", "MEM_MAX", "LIM_MEM", "MEM>LIM", "MEM>WARN",
+    "SAMPLES"
+]
+
+# Consultas de métricas que pueden estar en curso a la vez durante el muestreo
+MAX_PENDING_SNAPSHOTS = 2
+
+class SampleRing:
+    """
+    Buffer circular de N muestras de un contenedor (milicores y bytes)
+
+    Dos arrays de floats preasignados: 16 bytes por muestra, sin objetos por muestra.
+    """
+
+    __slots__ = ("cpu", "memory", "capacity", "count", "position")
+
+    def __init__(self, capacity: int):
+        self.cpu = array('d', bytes(8 * capacity))
+        self.memory = array('d', bytes(8 * capacity))
+        self.capacity = capacity
+        self.count = 0
+        self.position = 0
+
+    def add(self, cpu: float, memory: float) -> None:
+        self.cpu[self.position] = cpu
+        self.memory[self.position] = memory
+        self.position = (self.position + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def values(self, resource: str) -> array:
+        """Muestras válidas ("cpu" o "memory"); el orden no importa para las estadísticas"""
+        return getattr(self, resource)[:self.count]
+
+class UsageSampler:
+    """Toma N snapshots de métricas a ritmo fijo y resume el uso de cada contenedor"""
+
+    def __init__(self, args):
+        self.args = args
+        self.use_color = not getattr(args, 'no_color', False)
+        self.samples = getattr(args, 'sample', 1)
+        self.every = getattr(args, 'every', 10.0)
+
+    @staticmethod
+    def validate(samples: int, every: float) -> None:
+        if samples < 1:
+            raise ValueError("--sample debe ser mayor que 0")
+        if every <= 0:
+            raise ValueError("--every debe ser mayor que 0")
+
+    @staticmethod
+    def check_options(args) -> None:
+        """Rechaza las opciones de la tabla principal que el resumen de muestras no aplica"""
+        ignored = [flag for flag, value in (
+            ("--policy", getattr(args, 'policy', None)),
+            ("--group-by", getattr(args, 'group_by', None)),
+            ("-o", getattr(args, 'output', None)),
+            ("--sort-by", getattr(args, 'sort_by', None)),
+            ("--filter", getattr(args, 'filter', None)),
+            ("--top", getattr(args, 'top', None))
+        ) if value]
+        if ignored:
+            raise ValueError(f"{', '.join(ignored)} no se puede usar con --sample "
+                             "(el resumen de muestras tiene columnas y umbrales propios)")
+        if SnapshotStore.is_snapshot(getattr(args, 'output_file', None)):
+            raise ValueError("--sample no genera snapshots: use --output-file con .txt, .html o .pdf")
+
+    @staticmethod
+    def snapshots(
+        namespace: Optional[str],
+        all_namespaces: bool,
+        samples: int,
+        every: float,
+        selector: Optional[str] = None,
+        field_selector: Optional[str] = None
+    ) -> Iterator[Dict]:
+        """
+        Genera `samples` snapshots de get_metrics separados `every` segundos
+
+        Las consultas se lanzan a ritmo fijo en hilos, así una consulta lenta
+        no atrasa las siguientes, y cada snapshot se entrega en orden apenas
+        termina (no se acumulan en memoria).
+        """
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=MAX_PENDING_SNAPSHOTS) as pool:
+            next_tick = time.monotonic()
+            for taken in range(1, samples + 1):
+                pending.append(pool.submit(KubectlClient.get_metrics, namespace, all_namespaces,
+                                           selector, field_selector))
+                if taken == samples:
+                    break
+                next_tick += every
+                while True:
+                    remaining = next_tick - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    if not pending:
+                        time.sleep(remaining)
+                        continue
+                    done, _ = wait([pending[0]], timeout=remaining)
+                    if done:
+                        yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def collect(self) -> Tuple[List[Tuple[str, str, Dict[str, str]]], Dict[Tuple[str, str, str], SampleRing]]:
+        """
+        Contenedores a observar y sus muestras
+
+        Returns:
+            Tupla (contenedores, índice (namespace, pod, contenedor) -> SampleRing);
+            cada contenedor es (namespace, pod, recursos de container_records)
+        """
+        all_namespaces = self.args.all_namespaces
+        namespace = KubectlClient.resolve_namespace(self.args.namespace, all_namespaces)
+        selectors = (getattr(self.args, 'selector', None), getattr(self.args, 'field_selector', None))
+        pods = KubectlClient.get_pods(namespace, all_namespaces, *selectors)
+
+        containers, rings = [], {}
+        for pod in pods["items"]:
+            pod_namespace, pod_name = pod["metadata"]["namespace"], pod["metadata"]["name"]
+            for container in KubectlClient.container_records(pod):
+                containers.append((pod_namespace, pod_name, container))
+                rings[(pod_namespace, pod_name, container["name"])] = SampleRing(self.samples)
+
+        print(f"Muestreando {self.samples} veces cada {self.every:g}s...", file=sys.stderr)
+        for metrics in self.snapshots(namespace, all_namespaces, self.samples, self.every, *selectors):
+            for (pod_namespace, pod_name), pod_metrics in metrics.items():
+                for container_name, usage in pod_metrics.items():
+                    ring = rings.get((pod_namespace, pod_name, container_name))
+                    cpu, memory = usage.get("cpu_nanocores"), usage.get("memory_bytes")
+                    if ring is None or cpu is None or memory is None:
+                        continue
+                    ring.add(cpu / 1_000_000, memory)
+
+        return containers, rings
+
+    def _fraction(self, values: array, limit: Optional[float], pct: float) -> str:
+        """Fracción de muestras por encima de pct% del limit (la misma comparación que la tabla)"""
+        if not limit or not values:
+            return "-"
+        fraction = sum(1 for value in values if value / limit * 100 > pct) / len(values)
+        text = f"{fraction * 100:.0f}%"
+        if not self.use_color:
+            return text
+        if fraction == 0:
+            return ResourceColorizer.green(text)
+        return ResourceColorizer.red(text) if pct >= 100 else ResourceColorizer.yellow(text)
+
+    def _stats(self, ring: SampleRing, resource: str, limit_text: str) -> List[str]:
+        """Columnas MIN, AVG, MAX, LIM, >LIM y >WARN de un recurso"""
+        values = ring.values(resource)
+        if resource == "cpu":
+            formatter = lambda v: KRCAUtils.format_cpu(v, canonical=False)
+            limit = KRCAUtils.parse_cpu_millicores(limit_text)
+        else:
+            formatter = KRCAUtils.format_memory
+            limit = KRCAUtils.parse_memory_bytes(limit_text)
+        if not values:
+            summary = ["-", "-", "-"]
+        else:
+            summary = [formatter(min(values)), formatter(sum(values) / len(values)), formatter(max(values))]
+        return summary + [
+            limit_text,
+            self._fraction(values, limit, 100),
+            self._fraction(values, limit, self.args.warning_pct),
+        ]
+
+    def build_rows(
+        self,
+        containers: List[Tuple[str, str, Dict[str, str]]],
+        rings: Dict[Tuple[str, str, str], SampleRing]
+    ) -> List[List[str]]:
+        rows = []
+        for namespace, pod, container in containers:
+            ring = rings[(namespace, pod, container["name"])]
+            rows.append([
+                ResourceColorizer.colorize_namespace(namespace) if self.use_color else namespace,
+                ResourceColorizer.colorize_pod(pod) if self.use_color else pod,
+                ResourceColorizer.colorize_container(container["name"]) if self.use_color else container["name"],
+                *self._stats(ring, "cpu", container["lim_cpu"]),
+                *self._stats(ring, "memory", container["lim_mem"]),
+                str(ring.count),
+            ])
+        return rows
+
+    def run(self) -> int:
+        """Ejecuta el muestreo y muestra/exporta el resumen"""
+        try:
+            self.validate(self.samples, self.every)
+            self.check_options(self.args)
+            rows = self.build_rows(*self.collect())
+            table = Exporter.render_table(
+                rows,
+                SAMPLE_HEADERS,
+                self.use_color,
+                getattr(self.args, 'number', False)
+            )
+            Exporter.export(
+                table,
+                getattr(self.args, 'output_file', None),
+                self.use_color,
+                getattr(self.args, 'force', False),
+                getattr(self.args, 'landscape', False)
+            )
+            return 0
+
+        except Exception as e:
+            KRCAUtils.report_error(e, getattr(self.args, 'debug', False))
+            return 1
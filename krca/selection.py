@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# krca/selection.py - Orden, filtros y top-N sobre filas sin renderizar
+
+import re
+import heapq
+import operator
+from itertools import islice
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple
+
+from .colorizer import ResourceColorizer
+from .utils import KRCAUtils
+
+CPU_COLUMNS = {'CPU', 'REQ_CPU', 'LIM_CPU'}
+MEMORY_COLUMNS = {'MEMORY', 'REQ_MEM', 'LIM_MEM'}
+INTEGER_COLUMNS = {'RESTARTS'}
+
+# Columnas ocultas con el uso exacto (nanocores y bytes) y su divisor a milicores y bytes
+EXACT_COLUMNS = {'CPU': ('CPU_NANOCORES', 1_000_000), 'MEMORY': ('MEMORY_BYTES', 1)}
+
+# Columnas (uso, request, limit) de cada recurso
+RESOURCE_COLUMNS = {
+    'CPU': ('CPU', 'REQ_CPU', 'LIM_CPU'),
+    'MEMORY': ('MEMORY', 'REQ_MEM', 'LIM_MEM'),
+}
+
+# Claves calculadas (no son columnas de la tabla)
+RATIO_KEYS = ['ratio', 'cpu-ratio', 'mem-ratio']
+SORT_KEYS = RATIO_KEYS + ['severity']
+
+OPERATORS = {
+    '>=': operator.ge,
+    '<=': operator.le,
+    '!=': operator.ne,
+    '==': operator.eq,
+    '=': operator.eq,
+    '>': operator.gt,
+    '<': operator.lt,
+}
+
+_FILTER_RE = re.compile(r'^\s*([A-Za-z_\-]+)\s*(>=|<=|!=|==|=|>|<)\s*(.+?)\s*$')
+
+# Valor usado cuando un campo numérico no está definido (queda al final en orden descendente)
+_MISSING = float('-inf')
+
+class RowSelector:
+    """
+    Aplica --filter, --sort-by y --top sobre filas de strings sin colorear
+
+    Los valores numéricos se calculan por fila solo para los campos usados;
+    --top mantiene un heap acotado a N elementos, así nunca se ordena ni se
+    guarda la tabla completa.
+    """
+
+    def __init__(
+        self,
+        columns: Sequence[str],
+        sort_by: Optional[str] = None,
+        filters: Optional[List[str]] = None,
+        top: Optional[int] = None,
+        thresholds: Tuple[int, int, int, int] = (60, 75, 300, 5),
+        thresholds_for: Optional[Callable[[List[str]], Tuple[int, int, int, int]]] = None,
+        numeric: Iterable[str] = ()
+    ):
+        self.columns = list(columns)
+        # Columnas numéricas propias de otras tablas (ej: costos), además de CPU/memoria/reinicios
+        self.numeric = set(numeric)
+        self.index = {name: i for i, name in enumerate(self.columns)}
+        self.thresholds = thresholds
+        # Umbrales por fila (política por namespace/workload); por defecto, los globales
+        self.thresholds_for = thresholds_for or (lambda row: thresholds)
+        self.top = top
+        self.sort_by = self._normalize_field(sort_by) if sort_by else None
+        self.filters = [self.parse_filter(expression) for expression in filters or []]
+
+        if top is not None and top < 1:
+            raise ValueError("--top debe ser mayor que 0")
+
+    @property
+    def active(self) -> bool:
+        """True si hay algún criterio de selección"""
+        return bool(self.sort_by or self.filters or self.top)
+
+    def _normalize_field(self, field: str) -> str:
+        """Valida el nombre de campo (columna en mayúsculas o clave calculada en minúsculas)"""
+        if field.upper() in self.index:
+            return field.upper()
+        if field.lower() in SORT_KEYS:
+            return field.lower()
+        raise ValueError(
+            f"Campo '{field}' no reconocido. Disponibles: {', '.join(self.columns + SORT_KEYS)}"
+        )
+
+    def _is_numeric(self, field: str) -> bool:
+        return (field in SORT_KEYS or field in CPU_COLUMNS or field in MEMORY_COLUMNS
+                or field in INTEGER_COLUMNS or field in self.numeric)
+
+    def _parse_value(self, field: str, text: str):
+        """Convierte el valor de un filtro a la misma unidad que value()"""
+        if field == 'severity':
+            if text.lower() not in ResourceColorizer.SEVERITY_LEVELS:
+                raise ValueError(
+                    f"Severidad '{text}' no válida. Use: {', '.join(ResourceColorizer.SEVERITY_LEVELS)}"
+                )
+            return ResourceColorizer.SEVERITY_LEVELS[text.lower()]
+        if field in RATIO_KEYS:
+            return float(text[:-1]) / 100 if text.endswith('%') else float(text)
+        if field in CPU_COLUMNS:
+            value = KRCAUtils.parse_cpu_millicores(text)
+        elif field in MEMORY_COLUMNS:
+            value = KRCAUtils.parse_memory_bytes(text)
+        elif field in INTEGER_COLUMNS or field in self.numeric:
+            value = float(text)
+        else:
+            return text
+        if value is None:
+            raise ValueError(f"Valor '{text}' no válido para {field}")
+        return value
+
+    def parse_filter(self, expression: str) -> Callable[[List[str]], bool]:
+        """
+        Compila una expresión 'CAMPO OP VALOR' (ej. severity>=warning, mem-ratio>0.9,
+        NAMESPACE=prod) en un predicado sobre la fila
+        """
+        match = _FILTER_RE.match(expression)
+        if not match:
+            raise ValueError(f"Filtro no válido: '{expression}' (formato: CAMPO OP VALOR)")
+        field = self._normalize_field(match.group(1))
+        compare = OPERATORS[match.group(2)]
+        expected = self._parse_value(field, match.group(3))
+
+        def predicate(row: List[str]) -> bool:
+            value = self.value(row, field)
+            if value is None or value == _MISSING:
+                return False
+            return compare(value, expected)
+
+        return predicate
+
+    def number(self, row: List[str], column: str) -> Optional[float]:
+        """Valor numérico de una columna (milicores, bytes o número; None si no está definido)"""
+        exact = EXACT_COLUMNS.get(column)
+        if exact is not None and exact[0] in self.index:
+            # Uso exacto de metrics.k8s.io/kubelet: el texto de la tabla está redondeado
+            value = row[self.index[exact[0]]]
+            if value is not None:
+                return value / exact[1]
+        text = row[self.index[column]]
+        if column in CPU_COLUMNS:
+            return KRCAUtils.parse_cpu_millicores(text)
+        if column in MEMORY_COLUMNS:
+            return KRCAUtils.parse_memory_bytes(text)
+        try:
+            return float(text)
+        except (TypeError, ValueError):
+            return None
+
+    def ratio(self, row: List[str], usage_column: str, reference_column: str) -> Optional[float]:
+        """Uso sobre request/limit (None si alguno no está definido)"""
+        usage = self.number(row, usage_column)
+        reference = self.number(row, reference_column)
+        if usage is None or not reference:
+            return None
+        return usage / reference
+
+    def _ratio(self, row: List[str], usage_column: str, limit_column: str) -> float:
+        ratio = self.ratio(row, usage_column, limit_column)
+        return _MISSING if ratio is None else ratio
+
+    def resource(self, row: List[str], resource: str) -> Tuple[Optional[float], ...]:
+        """(uso, request, limit) numéricos de 'CPU' o 'MEMORY'"""
+        return tuple(self.number(row, column) for column in RESOURCE_COLUMNS[resource])
+
+    def usage_colors(self, row: List[str]) -> Tuple[str, ...]:
+        """Colores de CPU, REQ_CPU, LIM_CPU, MEMORY, REQ_MEM y LIM_MEM (los de la tabla)"""
+        thresholds = self.thresholds_for(row)
+        return (ResourceColorizer.resource_colors(*self.resource(row, 'CPU'), *thresholds) +
+                ResourceColorizer.resource_colors(*self.resource(row, 'MEMORY'), *thresholds))
+
+    def severity(self, row: List[str]) -> int:
+        """Veredicto numérico de la fila (máximo entre CPU, memoria y estado)"""
+        thresholds = self.thresholds_for(row)
+        severity = max(
+            ResourceColorizer.usage_severity(*self.resource(row, 'CPU'), *thresholds),
+            ResourceColorizer.usage_severity(*self.resource(row, 'MEMORY'), *thresholds)
+        )
+        if 'STATUS' in self.index and "CrashLoopBackOff" in row[self.index['STATUS']]:
+            severity = ResourceColorizer.SEVERITY_DANGER
+        if 'LAST_STATE' in self.index and row[self.index['LAST_STATE']] == "OOMKilled":
+            severity = ResourceColorizer.SEVERITY_DANGER
+        if 'RESTARTS' in self.index:
+            restarts = self.number(row, 'RESTARTS') or 0
+            if restarts >= 5:
+                severity = ResourceColorizer.SEVERITY_DANGER
+            elif restarts > 0:
+                severity = max(severity, ResourceColorizer.SEVERITY_WARNING)
+        return severity
+
+    def value(self, row: List[str], field: str):
+        """Valor de un campo para filtrar u ordenar (numérico o texto)"""
+        if field == 'severity':
+            return self.severity(row)
+        if field == 'cpu-ratio':
+            return self._ratio(row, 'CPU', 'LIM_CPU')
+        if field == 'mem-ratio':
+            return self._ratio(row, 'MEMORY', 'LIM_MEM')
+        if field == 'ratio':
+            return max(self._ratio(row, 'CPU', 'LIM_CPU'), self._ratio(row, 'MEMORY', 'LIM_MEM'))
+        if self._is_numeric(field):
+            number = self.number(row, field)
+            return _MISSING if number is None else number
+        return row[self.index[field]]
+
+    def select(self, rows: Iterable[List[str]]) -> List[List[str]]:
+        """
+        Filtra, ordena y recorta las filas en streaming
+
+        Los campos numéricos se ordenan de mayor a menor y los de texto
+        alfabéticamente.
+        """
+        if self.filters:
+            rows = (row for row in rows if all(predicate(row) for predicate in self.filters))
+
+        if not self.sort_by:
+            return list(islice(rows, self.top) if self.top else rows)
+
+        field = self.sort_by
+        key = lambda row: self.value(row, field)
+        descending = self._is_numeric(field)
+
+        if self.top:
+            if descending:
+                return heapq.nlargest(self.top, rows, key=key)
+            return heapq.nsmallest(self.top, rows, key=key)
+        return sorted(rows, key=key, reverse=descending)
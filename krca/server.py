@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+# krca/server.py - Modo daemon con endpoint /metrics para Prometheus
+
+import codecs
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import quote, urlencode
+
+from .kubectl import KubectlClient, KubectlError
+from .decoding import JsonDecoder
+from .colorizer import ResourceColorizer
+from .selection import RowSelector
+from .utils import KRCAUtils
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Espera máxima (segundos) antes de relanzar el watch de pods
+MAX_WATCH_BACKOFF = 60
+
+# Pods por página en el listado del informer
+LIST_PAGE_SIZE = 500
+
+def _escape(value: str) -> str:
+    """Escapa un valor de etiqueta según el formato de exposición de Prometheus"""
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+class PodInformer:
+    """
+    Caché de pods mantenida con list + watch sobre la API de pods
+
+    Cada sincronización lista los pods (paginado) en un diccionario nuevo
+    que reemplaza a la caché de una vez, así /metrics nunca publica un
+    listado a medias; synced se activa recién entonces. Después el watch
+    (`kubectl get --raw ...?watch=1`) parte del resourceVersion del listado
+    y solo aplica los cambios. Si el watch se corta se retoma desde el último
+    resourceVersion visto; si el API server ya no lo tiene (410 Gone) se
+    vuelve a listar.
+    """
+
+    def __init__(
+        self,
+        namespace: Optional[str] = None,
+        all_namespaces: bool = False,
+        selector: Optional[str] = None,
+        field_selector: Optional[str] = None
+    ):
+        # Se resuelve una vez: cada página del listado y cada watch reutilizan el mismo
+        self.namespace = KubectlClient.resolve_namespace(namespace, all_namespaces)
+        self.all_namespaces = all_namespaces
+        self.selector = selector
+        self.field_selector = field_selector
+        self.pods: Dict[str, Dict] = {}
+        self.lock = threading.Lock()
+        self.synced = threading.Event()
+        self._stopped = threading.Event()
+        self._process: Optional[subprocess.Popen] = None
+        self._thread = threading.Thread(target=self._run, name="krca-informer", daemon=True)
+
+    def _path(self, **query) -> str:
+        """Ruta de la API de pods para `kubectl get --raw` con los selectores y la query indicada"""
+        if self.all_namespaces:
+            path = "/api/v1/pods"
+        else:
+            path = f"/api/v1/namespaces/{quote(self.namespace, safe='')}/pods"
+        if self.selector:
+            query["labelSelector"] = self.selector
+        if self.field_selector:
+            query["fieldSelector"] = self.field_selector
+        return f"{path}?{urlencode(query)}"
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._process and self._process.poll() is None:
+            self._process.terminate()
+
+    def snapshot(self) -> List[Dict]:
+        """Copia de los pods en caché"""
+        with self.lock:
+            return list(self.pods.values())
+
+    def _list(self) -> str:
+        """
+        Lista los pods y reemplaza la caché completa de una vez
+
+        Returns:
+            resourceVersion del listado (desde donde sigue el watch)
+        """
+        pods: Dict[str, Dict] = {}
+        continue_token = None
+        while True:
+            query = {"limit": LIST_PAGE_SIZE}
+            if continue_token:
+                query["continue"] = continue_token
+            page = JsonDecoder.loads(KubectlClient.execute(
+                ["kubectl", "get", "--raw", self._path(**query)], binary=True))
+            for pod in page.get("items", []):
+                uid = pod.get("metadata", {}).get("uid")
+                if uid:
+                    pods[uid] = pod
+            metadata = page.get("metadata", {})
+            continue_token = metadata.get("continue")
+            if not continue_token:
+                break
+        with self.lock:
+            self.pods = pods
+        self.synced.set()
+        return metadata.get("resourceVersion", "")
+
+    def _apply(self, event: Dict) -> None:
+        """Aplica un evento del watch a la caché"""
+        event_type = event.get("type")
+        pod = event.get("object", {})
+        uid = pod.get("metadata", {}).get("uid")
+        if not uid or event_type not in ("ADDED", "MODIFIED", "DELETED"):
+            return
+        with self.lock:
+            if event_type == "DELETED":
+                self.pods.pop(uid, None)
+            else:
+                self.pods[uid] = pod
+
+    def _watch(self, resource_version: str) -> Optional[str]:
+        """
+        Aplica los eventos del watch hasta que se corte
+
+        Returns:
+            Último resourceVersion visto (para retomar el watch), o None si
+            el API server lo rechazó y hay que volver a listar
+        """
+        self._process = subprocess.Popen(
+            ["kubectl", "get", "--raw", self._path(watch=1, resourceVersion=resource_version,
+                                                   allowWatchBookmarks="true")],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        )
+        decoder = json.JSONDecoder()
+        # Decodificador incremental: un carácter multibyte puede quedar partido entre dos bloques
+        utf8 = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        buffer = ""
+        fd = self._process.stdout.fileno()
+        try:
+            while True:
+                chunk = os.read(fd, 65536)
+                buffer += utf8.decode(chunk, final=not chunk)
+                while True:
+                    buffer = buffer.lstrip()
+                    if not buffer:
+                        break
+                    try:
+                        event, end = decoder.raw_decode(buffer)
+                    except ValueError:
+                        break  # objeto incompleto: esperar más datos
+                    buffer = buffer[end:]
+                    if event.get("type") == "ERROR":
+                        return None  # ej. 410 Gone: el resourceVersion expiró
+                    resource_version = event.get("object", {}).get("metadata", {}).get(
+                        "resourceVersion", resource_version)
+                    self._apply(event)
+                if not chunk:
+                    return resource_version
+        finally:
+            if self._process.poll() is None:
+                self._process.terminate()
+            self._process.wait()
+
+    def _run(self) -> None:
+        """Lista y mira los pods; reintenta con backoff exponencial si algo falla"""
+        backoff = 1
+        resource_version = None
+        while not self._stopped.is_set():
+            previous = resource_version
+            try:
+                if resource_version is None:
+                    resource_version = self._list()
+                resource_version = self._watch(resource_version)
+            except (KubectlError, ValueError, OSError):
+                resource_version = None
+            if resource_version is not None and resource_version != previous:
+                backoff = 1  # hubo progreso: el próximo corte se retoma enseguida
+            if self._stopped.wait(backoff):
+                break
+            backoff = min(backoff * 2, MAX_WATCH_BACKOFF)
+
+class MetricsServer:
+    """Refresca el estado periódicamente y sirve /metrics con el texto precalculado"""
+
+    def __init__(self, args):
+        # Import diferido: core importa este módulo para despachar el subcomando
+        from .core import KRCAnalyzer, ROW_COLUMNS
+
+        self.args = args
+        self.interval = getattr(args, 'interval', 30)
+        self.analyzer = KRCAnalyzer(args)
+        self.selector = RowSelector(ROW_COLUMNS, thresholds=self.analyzer.thresholds,
+                                    thresholds_for=self.analyzer.thresholds_for)
+        self.informer = PodInformer(args.namespace, args.all_namespaces, *self.analyzer.selectors)
+        self.payload = b"# krca: esperando el primer refresco\n"
+        self._stopped = threading.Event()
+
+    def refresh(self) -> None:
+        """Recalcula todas las series a partir de la caché de pods y un sondeo de métricas"""
+        started = time.monotonic()
+        metrics = KubectlClient.get_metrics(self.informer.namespace, self.args.all_namespaces,
+                                            *self.analyzer.selectors)
+        pods = self.informer.snapshot()
+
+        lines = {
+            "krca_container_cpu_limit_ratio": [],
+            "krca_container_cpu_request_ratio": [],
+            "krca_container_memory_limit_ratio": [],
+            "krca_container_memory_request_ratio": [],
+            "krca_container_severity": [],
+        }
+        namespace_counts: Dict[tuple, int] = {}
+        selector = self.selector
+
+        self.analyzer.reset_thresholds()
+        for pod in pods:
+            for row in self.analyzer._process_pod_data(pod, metrics):
+                labels = (f'namespace="{_escape(row[0])}",pod="{_escape(row[1])}",'
+                          f'container="{_escape(row[2])}"')
+                for name, usage, reference in (
+                    ("krca_container_cpu_limit_ratio", 'CPU', 'LIM_CPU'),
+                    ("krca_container_cpu_request_ratio", 'CPU', 'REQ_CPU'),
+                    ("krca_container_memory_limit_ratio", 'MEMORY', 'LIM_MEM'),
+                    ("krca_container_memory_request_ratio", 'MEMORY', 'REQ_MEM'),
+                ):
+                    ratio = selector.ratio(row, usage, reference)
+                    if ratio is not None:
+                        lines[name].append(f"{name}{{{labels}}} {ratio:.6g}")
+
+                severity = selector.severity(row)
+                lines["krca_container_severity"].append(f"krca_container_severity{{{labels}}} {severity}")
+                key = (row[0], severity)
+                namespace_counts[key] = namespace_counts.get(key, 0) + 1
+
+        levels = {value: name for name, value in ResourceColorizer.SEVERITY_LEVELS.items()}
+        output = []
+        help_text = {
+            "krca_container_cpu_limit_ratio": "Uso de CPU sobre el limit del contenedor",
+            "krca_container_cpu_request_ratio": "Uso de CPU sobre el request del contenedor",
+            "krca_container_memory_limit_ratio": "Uso de memoria sobre el limit del contenedor",
+            "krca_container_memory_request_ratio": "Uso de memoria sobre el request del contenedor",
+            "krca_container_severity": "Veredicto del contenedor (0=ok, 1=info, 2=warning, 3=danger)",
+        }
+        for name, samples in lines.items():
+            output.append(f"# HELP {name} {help_text[name]}")
+            output.append(f"# TYPE {name} gauge")
+            output.extend(samples)
+
+        output.append("# HELP krca_namespace_containers Contenedores por namespace y severidad")
+        output.append("# TYPE krca_namespace_containers gauge")
+        for (namespace, severity), count in sorted(namespace_counts.items()):
+            output.append(
+                f'krca_namespace_containers{{namespace="{_escape(namespace)}",severity="{levels[severity]}"}} {count}'
+            )
+
+        output.append("# HELP krca_pods_cached Pods en la caché del informer")
+        output.append("# TYPE krca_pods_cached gauge")
+        output.append(f"krca_pods_cached {len(pods)}")
+        output.append("# HELP krca_refresh_duration_seconds Duración del último refresco")
+        output.append("# TYPE krca_refresh_duration_seconds gauge")
+        output.append(f"krca_refresh_duration_seconds {time.monotonic() - started:.6f}")
+        output.append("# HELP krca_last_refresh_timestamp_seconds Momento del último refresco")
+        output.append("# TYPE krca_last_refresh_timestamp_seconds gauge")
+        output.append(f"krca_last_refresh_timestamp_seconds {time.time():.3f}")
+
+        # Contadores de la capa de ejecución de kubectl
+        kubectl_stats = KubectlClient.stats.snapshot()
+        for name, key, metric_type, description in (
+            ("krca_kubectl_calls_total", "calls", "counter", "Llamadas a kubectl"),
+            ("krca_kubectl_retries_total", "retries", "counter", "Reintentos de llamadas a kubectl"),
+            ("krca_kubectl_failures_total", "failures", "counter", "Llamadas a kubectl fallidas tras reintentar"),
+            ("krca_kubectl_timeouts_total", "timeouts", "counter", "Intentos de kubectl que agotaron el timeout"),
+            ("krca_kubectl_latency_seconds_sum", "latency_total", "counter", "Latencia acumulada de kubectl"),
+            ("krca_kubectl_latency_seconds_max", "latency_max", "gauge", "Latencia máxima de una llamada a kubectl"),
+        ):
+            output.append(f"# HELP {name} {description}")
+            output.append(f"# TYPE {name} {metric_type}")
+            output.append(f"{name} {kubectl_stats[key]:.6g}")
+
+        # Reemplazo atómico: los scrapes en curso siguen usando el payload anterior
+        self.payload = ("\n".join(output) + "\n").encode("utf-8")
+
+    def _refresh_loop(self) -> None:
+        # Sin el listado completo no se publica nada (el payload sigue esperando)
+        while not self.informer.synced.wait(self.interval):
+            if self._stopped.is_set():
+                return
+        while not self._stopped.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"krca serve: error al refrescar: {e}", file=sys.stderr)
+            self._stopped.wait(self.interval)
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] == "/metrics":
+                    body, content_type, status = server.payload, CONTENT_TYPE, 200
+                elif self.path == "/healthz":
+                    body, content_type, status = b"ok\n", "text/plain", 200
+                else:
+                    body, content_type, status = b"not found\n", "text/plain", 404
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                if getattr(server.args, 'debug', False):
+                    super().log_message(format, *args)
+
+        return Handler
+
+    def run(self) -> int:
+        """Ejecuta el subcomando serve hasta Ctrl+C"""
+        httpd = None
+        try:
+            address = getattr(self.args, 'address', '127.0.0.1')
+            port = getattr(self.args, 'port', 9877)
+            httpd = ThreadingHTTPServer((address, port), self._handler())
+            self.informer.start()
+            threading.Thread(target=self._refresh_loop, name="krca-refresh", daemon=True).start()
+            print(f"krca serve escuchando en http://{address}:{port}/metrics (refresco cada {self.interval}s)",
+                  file=sys.stderr)
+            httpd.serve_forever()
+            return 0
+
+        except KeyboardInterrupt:
+            return 0
+        except Exception as e:
+            KRCAUtils.report_error(e, getattr(self.args, 'debug', False))
+            return 1
+        finally:
+            self._stopped.set()
+            self.informer.stop()
+            if httpd is not None:
+                httpd.server_close()
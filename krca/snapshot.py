@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+# krca/snapshot.py - Snapshots de auditoría (NDJSON/JSON/Parquet) y diff entre dos auditorías
+
+import json
+import os
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .colorizer import ResourceColorizer
+from .exporter import Exporter
+from .utils import KRCAUtils
+
+# Campos de cada registro del snapshot (una fila de la tabla de auditoría)
+SNAPSHOT_FIELDS = [
+    "namespace", "workload", "container", "pod",
+    "cpu", "req_cpu", "lim_cpu", "memory", "req_mem", "lim_mem",
+    "status", "restarts", "last_state", "severity"
+]
+
+# Extensiones de --output-file que generan un snapshot en lugar de la tabla
+SNAPSHOT_EXTENSIONS = (".ndjson", ".jsonl", ".json", ".parquet")
+
+SPEC_FIELDS = ("req_cpu", "lim_cpu", "req_mem", "lim_mem")
+
+DIFF_HEADERS = [
+    "NAMESPACE", "WORKLOAD", "CONTAINER", "CHANGE",
+    "SEVERITY", "REPLICAS", "REQ_CPU", "LIM_CPU", "REQ_MEM", "LIM_MEM"
+]
+
+# Valor de un campo de spec que difiere entre réplicas del mismo workload
+MIXED = "<varios>"
+
+# Clave de unión: (namespace, workload, contenedor)
+SnapshotKey = Tuple[str, str, str]
+
+class UnsortedSnapshot(ValueError):
+    """El snapshot no está ordenado por (namespace, workload, contenedor)"""
+    pass
+
+class SnapshotStore:
+    """Lectura y escritura de snapshots de auditoría, siempre registro a registro"""
+
+    @staticmethod
+    def is_snapshot(path: Optional[str]) -> bool:
+        return bool(path) and path.lower().endswith(SNAPSHOT_EXTENSIONS)
+
+    @staticmethod
+    def _require_pyarrow():
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ValueError("Los snapshots .parquet requieren pyarrow (pip install pyarrow)")
+        return pyarrow, pyarrow.parquet
+
+    @staticmethod
+    def key(record: Dict) -> SnapshotKey:
+        return record["namespace"], record["workload"], record["container"]
+
+    @staticmethod
+    def write(records: List[Dict], path: str, use_color: bool = True, force: bool = False) -> bool:
+        """
+        Guarda los registros ordenados por clave (lo que permite el diff en streaming)
+
+        Returns:
+            True si se escribió el archivo
+        """
+        if os.path.exists(path) and not force:
+            error_msg = f"Error: El archivo {path} ya existe. Use --force para sobrescribir."
+            print(ResourceColorizer.red(error_msg) if use_color else error_msg)
+            return False
+
+        records = sorted(records, key=lambda record: (SnapshotStore.key(record), record["pod"]))
+        lower = path.lower()
+        if lower.endswith(".parquet"):
+            pyarrow, parquet = SnapshotStore._require_pyarrow()
+            parquet.write_table(pyarrow.Table.from_pylist(records), path)
+        elif lower.endswith(".json"):
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(records, f, ensure_ascii=False)
+                f.write('\n')
+        else:
+            with open(path, 'w', encoding='utf-8') as f:
+                for record in records:
+                    f.write(json.dumps(record, ensure_ascii=False))
+                    f.write('\n')
+        return True
+
+    @staticmethod
+    def read(path: str) -> Iterator[Dict]:
+        """
+        Registros de un snapshot
+
+        NDJSON y Parquet se leen en streaming (línea a línea / por lotes);
+        .json es un único arreglo y se carga completo.
+        """
+        lower = path.lower()
+        if lower.endswith(".parquet"):
+            _, parquet = SnapshotStore._require_pyarrow()
+            for batch in parquet.ParquetFile(path).iter_batches(batch_size=10000):
+                yield from batch.to_pylist()
+        elif lower.endswith(".json"):
+            with open(path, encoding='utf-8') as f:
+                yield from json.load(f)
+        else:
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+
+class ContainerGroup:
+    """Réplicas de un mismo contenedor de un workload dentro de un snapshot"""
+
+    __slots__ = ("key", "replicas", "severity", "spec")
+
+    def __init__(self, key: SnapshotKey):
+        self.key = key
+        self.replicas = 0
+        self.severity = ResourceColorizer.SEVERITY_OK
+        self.spec: Dict[str, str] = {}
+
+    def add(self, record: Dict) -> None:
+        """Suma una réplica: severidad = la peor, spec = común o <varios>"""
+        self.replicas += 1
+        self.severity = max(self.severity, ResourceColorizer.SEVERITY_LEVELS.get(record.get("severity"), 0))
+        for field in SPEC_FIELDS:
+            value = record.get(field, "<none>")
+            if field not in self.spec:
+                self.spec[field] = value
+            elif self.spec[field] != value:
+                self.spec[field] = MIXED
+
+class AuditDiff:
+    """Compara dos snapshots uniendo por (namespace, workload, contenedor)"""
+
+    def __init__(self, args):
+        self.args = args
+        self.use_color = not getattr(args, 'no_color', False)
+        self.levels = {value: name for name, value in ResourceColorizer.SEVERITY_LEVELS.items()}
+
+    @staticmethod
+    def groups(records: Iterable[Dict]) -> Iterator[ContainerGroup]:
+        """
+        Agrupa registros consecutivos con la misma clave (entrada ordenada)
+
+        Raises:
+            UnsortedSnapshot: Si las claves no vienen en orden
+        """
+        group = None
+        for record in records:
+            key = SnapshotStore.key(record)
+            if group is None or key != group.key:
+                if group is not None:
+                    if key < group.key:
+                        raise UnsortedSnapshot(f"Snapshot no ordenado en {'/'.join(key)}")
+                    yield group
+                group = ContainerGroup(key)
+            group.add(record)
+        if group is not None:
+            yield group
+
+    @staticmethod
+    def index(records: Iterable[Dict]) -> Dict[SnapshotKey, ContainerGroup]:
+        """Índice hash clave -> grupo (para snapshots sin ordenar)"""
+        index: Dict[SnapshotKey, ContainerGroup] = {}
+        for record in records:
+            key = SnapshotStore.key(record)
+            group = index.get(key)
+            if group is None:
+                group = index[key] = ContainerGroup(key)
+            group.add(record)
+        return index
+
+    @staticmethod
+    def merge(
+        old: Iterator[ContainerGroup],
+        new: Iterator[ContainerGroup]
+    ) -> Iterator[Tuple[Optional[ContainerGroup], Optional[ContainerGroup]]]:
+        """Merge-join de dos secuencias de grupos ordenadas: pares (antes, después)"""
+        a, b = next(old, None), next(new, None)
+        while a is not None or b is not None:
+            if b is None or (a is not None and a.key < b.key):
+                yield a, None
+                a = next(old, None)
+            elif a is None or b.key < a.key:
+                yield None, b
+                b = next(new, None)
+            else:
+                yield a, b
+                a, b = next(old, None), next(new, None)
+
+    @staticmethod
+    def hash_join(
+        old: Dict[SnapshotKey, ContainerGroup],
+        new: Dict[SnapshotKey, ContainerGroup]
+    ) -> Iterator[Tuple[Optional[ContainerGroup], Optional[ContainerGroup]]]:
+        for key in sorted(old.keys() | new.keys()):
+            yield old.get(key), new.get(key)
+
+    def _change(self, before, after) -> str:
+        """Texto 'antes -> después' (o el valor si no cambió)"""
+        if before == after:
+            return str(after)
+        return f"{before} -> {after}"
+
+    def _severity(self, before: Optional[int], after: Optional[int]) -> str:
+        names = [self.levels[level] if level is not None else "-" for level in (before, after)]
+        text = names[1] if before == after else f"{names[0]} -> {names[1]}"
+        if not self.use_color or before is None or after is None or before == after:
+            return text
+        return ResourceColorizer.red(text) if after > before else ResourceColorizer.green(text)
+
+    def row(self, old: Optional[ContainerGroup], new: Optional[ContainerGroup]) -> Optional[List[str]]:
+        """Fila del diff, o None si no cambió la severidad ni la spec"""
+        group = new or old
+        if old is None:
+            change = "ADDED"
+        elif new is None:
+            change = "REMOVED"
+        elif old.severity != new.severity or old.spec != new.spec:
+            change = "CHANGED"
+        else:
+            return None
+
+        if self.use_color:
+            change = {"ADDED": ResourceColorizer.green, "REMOVED": ResourceColorizer.red,
+                      "CHANGED": ResourceColorizer.yellow}[change](change)
+        namespace, workload, container = group.key
+        return [
+            ResourceColorizer.colorize_namespace(namespace) if self.use_color else namespace,
+            ResourceColorizer.colorize_pod(workload) if self.use_color else workload,
+            ResourceColorizer.colorize_container(container) if self.use_color else container,
+            change,
+            self._severity(old.severity if old else None, new.severity if new else None),
+            self._change(old.replicas if old else 0, new.replicas if new else 0),
+            *[
+                self._change(old.spec[field] if old else "-", new.spec[field] if new else "-")
+                for field in SPEC_FIELDS
+            ],
+        ]
+
+    def compare(self, old_path: str, new_path: str) -> Tuple[List[List[str]], Dict[str, int]]:
+        """
+        Filas con cambios y conteos por tipo
+
+        Los snapshots escritos por krca están ordenados y se unen en streaming
+        (memoria acotada a un grupo por lado); si alguno no lo está, se usa un
+        índice hash de ambos.
+        """
+        counts = {"ADDED": 0, "REMOVED": 0, "CHANGED": 0}
+
+        def collect(pairs) -> List[List[str]]:
+            rows = []
+            for key in counts:
+                counts[key] = 0
+            for old, new in pairs:
+                row = self.row(old, new)
+                if row is not None:
+                    rows.append(row)
+                    counts["ADDED" if old is None else "REMOVED" if new is None else "CHANGED"] += 1
+            return rows
+
+        try:
+            rows = collect(self.merge(
+                self.groups(SnapshotStore.read(old_path)),
+                self.groups(SnapshotStore.read(new_path))
+            ))
+        except UnsortedSnapshot:
+            rows = collect(self.hash_join(
+                self.index(SnapshotStore.read(old_path)),
+                self.index(SnapshotStore.read(new_path))
+            ))
+        return rows, counts
+
+    def run(self) -> int:
+        """Ejecuta el subcomando diff y muestra/exporta los cambios"""
+        try:
+            paths = getattr(self.args, 'paths', None) or []
+            if len(paths) != 2:
+                raise ValueError("Uso: krca diff SNAPSHOT_ANTERIOR SNAPSHOT_NUEVO")
+            for path in paths:
+                if not SnapshotStore.is_snapshot(path):
+                    raise ValueError(f"Formato de snapshot no soportado: {path} (use {', '.join(SNAPSHOT_EXTENSIONS)})")
+                if not os.path.exists(path):
+                    raise ValueError(f"No existe el snapshot: {path}")
+
+            rows, counts = self.compare(*paths)
+            output = Exporter.render_table(rows, DIFF_HEADERS, self.use_color, getattr(self.args, 'number', False))
+            output += (f"\n\nCambios: {len(rows)}  Agregados: {counts['ADDED']}  "
+                       f"Eliminados: {counts['REMOVED']}  Modificados: {counts['CHANGED']}")
+            Exporter.export(
+                output,
+                getattr(self.args, 'output_file', None),
+                self.use_color,
+                getattr(self.args, 'force', False),
+                getattr(self.args, 'landscape', False)
+            )
+            return 0
+
+        except Exception as e:
+            KRCAUtils.report_error(e, getattr(self.args, 'debug', False))
+            return 1
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# krca/specs.py - Recursos de contenedores compartidos entre réplicas de una misma plantilla
+
+import sys
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+# Plantillas (revisiones) recordadas como máximo; las menos usadas se descartan
+MAX_TEMPLATES = 4096
+
+# Etiquetas que identifican la plantilla de un pod: Deployment/ReplicaSet y StatefulSet/DaemonSet
+TEMPLATE_LABELS = ("pod-template-hash", "controller-revision-hash")
+
+# Registro inmutable de recursos de un contenedor (name, type, req_cpu, req_mem, lim_cpu, lim_mem)
+ResourceRecord = Mapping[str, str]
+
+# Clave de plantilla: (namespace, dueño, revisión)
+TemplateKey = Tuple[str, str, str]
+
+class SpecCache:
+    """
+    Recursos de contenedores extraídos una vez por plantilla de pod
+
+    Todas las réplicas de un Deployment (misma pod-template-hash) o de un
+    StatefulSet/DaemonSet (misma controller-revision-hash) comparten los
+    mismos registros inmutables en lugar de copiar requests y limits en cada
+    pod. Antes de reutilizar una entrada se compara el bloque `resources` de
+    cada contenedor con el de la plantilla (sin copiar nada), así un pod
+    modificado individualmente (VPA, resize en caliente) no toma los valores
+    de otra réplica. Los contenedores efímeros no son parte de la plantilla y
+    se extraen siempre por pod.
+
+    Los textos repetidos en todas las filas (namespace, nodo, estado,
+    cantidades) se internan con `intern` para que cada valor exista una sola
+    vez en memoria.
+    """
+
+    def __init__(self, max_templates: int = MAX_TEMPLATES):
+        self.enabled = True
+        self.max_templates = max_templates
+        self._lock = threading.Lock()
+        # (clave, campos) -> (nombre y resources de cada contenedor de origen, registros)
+        self._templates: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self) -> None:
+        with self._lock:
+            self._templates.clear()
+            self.hits = self.misses = 0
+
+    def intern(self, value):
+        """Versión compartida de un texto (otros valores se devuelven sin cambios)"""
+        if self.enabled and type(value) is str:
+            return sys.intern(value)
+        return value
+
+    @staticmethod
+    def template_key(pod: Dict) -> Optional[TemplateKey]:
+        """Clave de la plantilla del pod, o None si no tiene dueño o revisión conocida"""
+        metadata = pod.get("metadata", {})
+        labels = metadata.get("labels") or {}
+        revision = next((labels[label] for label in TEMPLATE_LABELS if label in labels), None)
+        owners = metadata.get("ownerReferences") or []
+        owner = next((o for o in owners if o.get("controller")), owners[0] if owners else None)
+        if revision is None or owner is None:
+            return None
+        return (metadata.get("namespace", ""), owner.get("uid") or owner.get("name", ""), revision)
+
+    @staticmethod
+    def _source(containers: Sequence[Dict]) -> List[Tuple[str, Optional[Dict]]]:
+        return [(container["name"], container.get("resources")) for container in containers]
+
+    @staticmethod
+    def _matches(source: List[Tuple[str, Optional[Dict]]], containers: Sequence[Dict]) -> bool:
+        """True si los contenedores tienen los mismos nombres y bloques resources que la plantilla"""
+        if len(source) != len(containers):
+            return False
+        for (name, resources), container in zip(source, containers):
+            if container["name"] != name or container.get("resources") != resources:
+                return False
+        return True
+
+    def record(self, container: Dict, container_type: str) -> ResourceRecord:
+        """Registro inmutable con los recursos de un contenedor"""
+        resources = container.get("resources", {})
+        limits = resources.get("limits", {})
+        requests = resources.get("requests", {})
+        intern = self.intern
+        return MappingProxyType({
+            "name": intern(container["name"]),
+            "type": container_type,
+            "req_cpu": intern(requests.get("cpu", "<none>")),
+            "req_mem": intern(requests.get("memory", "<none>")),
+            "lim_cpu": intern(limits.get("cpu", "<none>")),
+            "lim_mem": intern(limits.get("memory", "<none>")),
+        })
+
+    def resources(
+        self,
+        pod: Dict,
+        fields: Sequence[Tuple[str, str]],
+        extra_fields: Sequence[Tuple[str, str]] = ()
+    ) -> Sequence[ResourceRecord]:
+        """
+        Registros de recursos de un pod, compartidos con las demás réplicas de su plantilla
+
+        Devuelve una tupla: la de la plantilla tal cual si el pod no agrega
+        contenedores propios (sin copiarla por cada réplica).
+
+        Args:
+            pod: Diccionario con la definición del pod
+            fields: Campos de spec que forman la plantilla, como (campo, tipo)
+            extra_fields: Campos propios de cada pod (ej: ephemeralContainers)
+        """
+        spec = pod["spec"]
+        containers = [(container, container_type)
+                      for field, container_type in fields for container in spec.get(field, [])]
+        extra = tuple(self.record(container, container_type)
+                      for field, container_type in extra_fields for container in spec.get(field, []))
+
+        template = self.template_key(pod) if self.enabled else None
+        if template is None:
+            return tuple(self.record(container, container_type) for container, container_type in containers) + extra
+
+        key = (template, tuple(fields))
+        raw = [container for container, _ in containers]
+        with self._lock:
+            cached = self._templates.get(key)
+            if cached is not None and self._matches(cached[0], raw):
+                self._templates.move_to_end(key)
+                self.hits += 1
+                return cached[1] + extra if extra else cached[1]
+            self.misses += 1
+
+        records = tuple(self.record(container, container_type) for container, container_type in containers)
+        if cached is None:
+            # Solo la primera réplica define la plantilla; las que difieren no la reemplazan
+            with self._lock:
+                self._templates[key] = (self._source(raw), records)
+                if len(self._templates) > self.max_templates:
+                    self._templates.popitem(last=False)
+        return records + extra
+
+    def summary(self) -> str:
+        """Resumen legible del uso de la caché"""
+        with self._lock:
+            return (f"specs: {len(self._templates)} plantillas, {self.hits} pods reutilizados, "
+                    f"{self.misses} extraídos")
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# krca/table.py - Renderizado de tablas en formato plain (compatible con tabulate)
+
+import math
+import re
+from itertools import zip_longest
+from typing import Any, Optional, Sequence, Union
+
+from .colorizer import ResourceColorizer
+
+# Separación entre columnas y espacio mínimo a la derecha de cada header (como tabulate "plain")
+COLUMN_SEPARATOR = "  "
+MIN_PADDING = 2
+
+# Códigos ANSI (CSI) de celdas que ya llegan coloreadas
+ANSI_CODES = re.compile(r"\x1b\[[\d;]*[\x40-\x7e]")
+
+# Números con separador de miles ("1,000", "-1,000.5"), que tabulate también considera numéricos
+THOUSANDS_NUMBER = re.compile(r"^(([+-]?[0-9]{1,3})(?:,([0-9]{3}))*)?(?(1)\.[0-9]*|\.[0-9]+)?$")
+
+# Tipos de columna de menor a mayor generalidad
+TYPE_EMPTY, TYPE_BOOL, TYPE_INT, TYPE_FLOAT, TYPE_STR = range(5)
+
+class TableRenderer:
+    """
+    Tabla alineada en una sola pasada a partir de los valores sin colorear
+
+    Los anchos se calculan con los valores crudos y el color (si se pasa
+    aparte, en `colors`) se agrega al rellenar cada celda, así no hay que
+    quitar códigos ANSI para medir. El tipo de cada columna se decide
+    recorriéndola solo hasta la primera celda de texto. No se toma de
+    ROW_COLUMNS: el mismo renderizador sirve a todos los subcomandos (la
+    mayoría de sus columnas no están ahí) y, como en tabulate, el tipo
+    depende de los valores ("-" en una columna de RESTARTS la vuelve
+    texto y cambia su alineación). La salida es la
+    misma que `tabulate(..., tablefmt="plain")`: texto a la izquierda,
+    números a la derecha alineados por el punto decimal, columnas separadas
+    por dos espacios y sin espacios al final de cada línea.
+    """
+
+    @staticmethod
+    def cell_type(value: Any) -> int:
+        """Tipo de una celda (TYPE_*) con las mismas reglas que tabulate"""
+        value_type = type(value)
+        if value is None:
+            return TYPE_EMPTY
+        if value_type is int:
+            return TYPE_INT
+        if value_type is float:
+            return TYPE_FLOAT
+        if value_type is bool:
+            return TYPE_BOOL
+        if value_type is not str:
+            try:
+                float(value)
+                return TYPE_FLOAT
+            except (TypeError, ValueError):
+                return TYPE_STR
+        if "\x1b" in value:
+            value = ANSI_CODES.sub("", value)
+        if not value:
+            return TYPE_EMPTY
+        if value == "True" or value == "False":
+            return TYPE_BOOL
+        try:
+            int(value)
+            return TYPE_INT
+        except ValueError:
+            pass
+        thousands = THOUSANDS_NUMBER.match(value) is not None
+        if thousands and "." not in value:
+            return TYPE_INT
+        try:
+            number = float(value)
+        except ValueError:
+            return TYPE_FLOAT if thousands else TYPE_STR
+        if math.isinf(number) or math.isnan(number):
+            return TYPE_FLOAT if value.lower() in ("inf", "-inf", "nan") or thousands else TYPE_STR
+        return TYPE_FLOAT
+
+    @staticmethod
+    def column_type(values: Sequence[Any]) -> int:
+        """Tipo más general de la columna; se deja de mirar en la primera celda de texto"""
+        column_type = TYPE_BOOL
+        cell_type = TableRenderer.cell_type
+        for value in values:
+            value_type = cell_type(value)
+            if value_type > column_type:
+                column_type = value_type
+                if column_type == TYPE_STR:
+                    break
+        return column_type
+
+    @staticmethod
+    def format_cell(value: Any, column_type: int, float_format: str = "g") -> str:
+        """Texto de una celda según el tipo de su columna (float_format como floatfmt de tabulate)"""
+        if value is None or value == "":
+            return ""
+        if column_type == TYPE_FLOAT:
+            if isinstance(value, str):
+                raw = ANSI_CODES.sub("", value) if "\x1b" in value else value
+                try:
+                    return value.replace(raw, format(float(raw.replace(",", "")), float_format))
+                except ValueError:
+                    return value
+            try:
+                return format(float(value), float_format)
+            except (TypeError, ValueError):
+                return f"{value}"
+        if column_type == TYPE_INT and not isinstance(value, str):
+            return format(value, "")
+        return f"{value}"
+
+    @staticmethod
+    def _decimals(text: str) -> int:
+        """Dígitos tras el punto decimal (-1 si no hay), para alinear columnas numéricas"""
+        if TableRenderer.cell_type(text) not in (TYPE_INT, TYPE_FLOAT):
+            return -1
+        try:
+            int(text)
+            return -1
+        except ValueError:
+            pass
+        position = text.rfind(".")
+        if position < 0:
+            position = text.lower().rfind("e")
+        return len(text) - position - 1 if position >= 0 else -1
+
+    @staticmethod
+    def render(
+        data: Sequence[Sequence[Any]],
+        headers: Sequence[str],
+        use_color: bool = True,
+        show_index: bool = False,
+        colors: Optional[Sequence[Sequence[Optional[str]]]] = None,
+        float_format: Union[str, Sequence[str]] = "g"
+    ) -> str:
+        """
+        Genera la tabla como texto
+
+        Args:
+            data: Filas con los valores (str, int, float o None; también se
+                aceptan celdas ya coloreadas)
+            headers: Nombres de las columnas
+            use_color: Mostrar headers en negrita y aplicar `colors`
+            show_index: Agregar una primera columna con el número de fila
+            colors: Código ANSI de cada celda (misma forma que data, None = sin color)
+            float_format: Formato de las columnas decimales, para todas o uno
+                por header como floatfmt de tabulate (ej: ".2f" para montos)
+
+        Returns:
+            Tabla como texto
+        """
+        rows = data if isinstance(data, list) else list(data)
+        headers = [str(header) for header in headers]
+        if not use_color:
+            colors = None
+        if rows and show_index:
+            rows = [[index, *row] for index, row in enumerate(rows)]
+            if colors is not None:
+                colors = [[None, *row_colors] for row_colors in colors]
+        # Headers vacíos para las columnas iniciales sin nombre (ej: el número de fila)
+        header_pad = max(0, len(rows[0]) - len(headers)) if rows else 0
+        headers = [""] * header_pad + headers
+        if isinstance(float_format, str):
+            float_formats = [float_format] * len(headers)
+        else:
+            float_formats = ["g"] * header_pad + list(float_format)
+
+        reset = ResourceColorizer.RESET
+        columns = list(zip_longest(*rows)) if rows else [()] * len(headers)
+        color_columns = list(zip_longest(*colors)) if colors else None
+        padded_columns = []
+        aligned_headers = []
+
+        for index, (header, values) in enumerate(zip(headers, columns)):
+            column_type = TableRenderer.column_type(values) if values else TYPE_STR
+            numeric = column_type in (TYPE_INT, TYPE_FLOAT)
+            texts = [TableRenderer.format_cell(value, column_type, float_formats[index]) for value in values]
+            if not numeric:
+                texts = [text.strip() for text in texts]
+            widths = [
+                len(ANSI_CODES.sub("", text)) if "\x1b" in text else len(text)
+                for text in texts
+            ]
+
+            suffixes = None
+            if numeric:
+                decimals = [
+                    TableRenderer._decimals(ANSI_CODES.sub("", text) if "\x1b" in text else text)
+                    for text in texts
+                ]
+                most = max(decimals)
+                suffixes = [" " * (most - count) for count in decimals]
+                widths = [width + most - count for width, count in zip(widths, decimals)]
+
+            width = max([len(header) + MIN_PADDING, *widths])
+            header_text = header
+            if use_color and index >= header_pad:
+                header_text = f"{ResourceColorizer.BOLD}{header}{reset}"
+            header_padding = " " * (width - len(header))
+            aligned_headers.append(header_padding + header_text if numeric else header_text + header_padding)
+
+            cell_colors = color_columns[index] if color_columns and index < len(color_columns) else None
+            padded = []
+            for row, text in enumerate(texts):
+                color = cell_colors[row] if cell_colors is not None else None
+                if color:
+                    text = f"{color}{text}{reset}"
+                padding = " " * (width - widths[row])
+                if numeric:
+                    padded.append(padding + text + suffixes[row])
+                else:
+                    padded.append(text + padding)
+            padded_columns.append(padded)
+
+        lines = [COLUMN_SEPARATOR.join(aligned_headers).rstrip()]
+        lines.extend(COLUMN_SEPARATOR.join(cells).rstrip() for cells in zip(*padded_columns))
+        return "\n".join(lines)
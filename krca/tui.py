@@ -0,0 +1,492 @@
+#!/usr/bin/env python3
+# krca/tui.py - Interfaz interactiva de terminal sobre los resultados del análisis
+
+import os
+import sys
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import curses
+except ImportError:  # opcional en Windows: pip install windows-curses
+    curses = None
+
+from .colorizer import ResourceColorizer
+from .core import KRCAnalyzer, ROW_COLUMNS
+from .selection import RowSelector
+from .utils import KRCAUtils
+
+# Ancho máximo de una columna en pantalla (los textos más largos se recortan)
+MAX_COLUMN_WIDTH = 48
+
+# Columnas de los niveles agregados (namespace y workload)
+GROUP_HEADERS = [
+    "PODS", "CONTAINERS", "CPU", "REQ_CPU", "CPU%REQ",
+    "MEMORY", "REQ_MEM", "MEM%REQ", "WARNING", "DANGER", "SEVERITY"
+]
+
+CONTAINER_HEADERS = [
+    "NAMESPACE", "WORKLOAD", "POD", "CONTAINER",
+    "CPU", "REQ_CPU", "LIM_CPU", "CPU%LIM",
+    "MEMORY", "REQ_MEM", "LIM_MEM", "MEM%LIM",
+    "STATUS", "RESTARTS", "NODE", "SEVERITY"
+]
+
+# Columnas de texto en las que busca el filtro de los contenedores
+CONTAINER_SEARCH = ("NAMESPACE", "WORKLOAD", "POD", "CONTAINER", "STATUS", "NODE")
+
+# Posiciones de los valores numéricos de cada contenedor en AuditBrowser._numbers
+(CPU, REQ_CPU, LIM_CPU, MEMORY, REQ_MEM, LIM_MEM, RESTARTS, SEVERITY) = range(8)
+
+# Nombre de cada nivel de severidad
+SEVERITY_NAMES = {value: name for name, value in ResourceColorizer.SEVERITY_LEVELS.items()}
+
+HELP_LINE = ("↑↓ PgUp PgDn: mover  Enter/→: entrar  ←: volver  Tab: todos los contenedores  "
+             "< >: columna de orden  r: invertir  /: filtrar  q: salir")
+
+def _percent(usage: Optional[float], reference: Optional[float]) -> Optional[float]:
+    return usage / reference * 100 if usage is not None and reference else None
+
+def _total(values: Iterable[Optional[float]]) -> Optional[float]:
+    """Suma de los valores definidos (None si ninguno lo está)"""
+    defined = [value for value in values if value is not None]
+    return sum(defined) if defined else None
+
+def _format(formatter: Callable[..., str], value: Optional[float], **options) -> str:
+    return "-" if value is None else formatter(value, **options)
+
+def _format_percent(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.0f}%"
+
+class TableView:
+    """
+    Tabla en memoria con orden por cualquier columna y filtro incremental
+
+    Cada tecla cuesta lo mismo sin importar cuántas filas haya detrás:
+
+    - el orden de cada columna se calcula una sola vez (lista de índices) y
+      se guarda; invertirlo solo cambia el sentido en que se lee;
+    - el filtro es una pila de resultados por prefijo de la consulta:
+      agregar un carácter filtra solo las filas del resultado anterior y
+      borrarlo vuelve al resultado guardado, sin recorrer la tabla;
+    - `window` devuelve únicamente las filas visibles en pantalla.
+
+    El texto de búsqueda de cada fila (columnas de identificación en
+    minúsculas) se arma la primera vez que se filtra.
+    """
+
+    def __init__(
+        self,
+        headers: Sequence[str],
+        rows: List[Tuple[str, ...]],
+        numeric: Dict[int, List[Optional[float]]],
+        severities: List[int],
+        search: Sequence[int]
+    ):
+        self.headers = list(headers)
+        self.rows = rows
+        # Columna -> valor numérico de cada fila (las demás se ordenan como texto)
+        self.numeric = numeric
+        self.severities = severities
+        self.search = tuple(search)
+        self.sort_column: Optional[int] = None
+        self.reverse = False
+        self.query = ""
+        self._orders: Dict[int, List[int]] = {}
+        self._haystack: Optional[List[str]] = None
+        self._widths: Optional[List[int]] = None
+        # Pila de (consulta, índices que coinciden en el orden actual)
+        self._stack: List[Tuple[str, List[int]]] = [("", list(range(len(rows))))]
+
+    def __len__(self) -> int:
+        return len(self._stack[-1][1])
+
+    def order(self, column: int) -> List[int]:
+        """Índices de las filas ordenados por la columna (calculado una vez por columna)"""
+        order = self._orders.get(column)
+        if order is None:
+            values = self.numeric.get(column)
+            if values is not None:
+                # Numéricos de mayor a menor; los no definidos al final
+                missing = float('-inf')
+                keys = [missing if value is None else value for value in values]
+                order = sorted(range(len(self.rows)), key=keys.__getitem__, reverse=True)
+            else:
+                keys = [row[column].lower() for row in self.rows]
+                order = sorted(range(len(self.rows)), key=keys.__getitem__)
+            self._orders[column] = order
+        return order
+
+    def sort(self, column: int) -> None:
+        """Ordena por la columna indicada conservando el filtro activo"""
+        self.sort_column = column
+        self.reverse = False
+        order = self.order(column)
+        if self.query:
+            matched = set(self._stack[-1][1])
+            self._stack = [("", order), (self.query, [i for i in order if i in matched])]
+        else:
+            self._stack = [("", order)]
+
+    def toggle_reverse(self) -> None:
+        self.reverse = not self.reverse
+
+    def _matches(self, query: str, indices: List[int]) -> List[int]:
+        if self._haystack is None:
+            self._haystack = [" ".join(row[c] for c in self.search).lower() for row in self.rows]
+        haystack = self._haystack
+        terms = query.lower().split()
+        if not terms:
+            return indices
+        if len(terms) == 1:
+            term = terms[0]
+            return [i for i in indices if term in haystack[i]]
+        return [i for i in indices if all(term in haystack[i] for term in terms)]
+
+    def filter(self, query: str) -> None:
+        """
+        Deja visibles las filas que contienen todos los términos de la consulta
+
+        Agregar texto a la consulta solo puede quitar filas, así que se parte
+        del resultado guardado del prefijo más largo.
+        """
+        while len(self._stack) > 1 and not query.startswith(self._stack[-1][0]):
+            self._stack.pop()
+        if query != self._stack[-1][0]:
+            self._stack.append((query, self._matches(query, self._stack[-1][1])))
+        self.query = query
+
+    def index(self, position: int) -> int:
+        """Índice de fila en la posición visible indicada"""
+        visible = self._stack[-1][1]
+        return visible[len(visible) - 1 - position] if self.reverse else visible[position]
+
+    def window(self, offset: int, height: int) -> List[int]:
+        """Índices de las filas visibles entre offset y offset + height"""
+        end = min(offset + height, len(self))
+        return [self.index(position) for position in range(max(offset, 0), end)]
+
+    def widths(self) -> List[int]:
+        """Ancho de cada columna (calculado una vez sobre todas las filas)"""
+        if self._widths is None:
+            widths = [len(header) for header in self.headers]
+            for row in self.rows:
+                for column, value in enumerate(row):
+                    if len(value) > widths[column]:
+                        widths[column] = len(value)
+            self._widths = [min(width, MAX_COLUMN_WIDTH) for width in widths]
+        return self._widths
+
+class AuditBrowser:
+    """
+    Niveles de navegación sobre las filas de la auditoría
+
+    El camino () es la lista de namespaces, (namespace,) la de sus
+    workloads y (namespace, workload) la de sus contenedores; ALL son todos
+    los contenedores. Los valores numéricos y la severidad de cada
+    contenedor se calculan una vez, los grupos se indexan una vez y cada
+    nivel visitado se guarda con su orden y su filtro.
+    """
+
+    ALL = ("*",)
+
+    def __init__(self, rows: List[List], selector: RowSelector):
+        self.rows = rows
+        index = {name: i for i, name in enumerate(ROW_COLUMNS)}
+        self._columns = index
+        # Milicores y bytes con el uso exacto, como en la severidad
+        self._numbers = [
+            selector.resource(row, 'CPU') + selector.resource(row, 'MEMORY') +
+            (float(row[index['RESTARTS']] or 0), selector.severity(row))
+            for row in rows
+        ]
+        # namespace -> workload -> índices de filas
+        self.groups: Dict[str, Dict[str, List[int]]] = {}
+        for i, row in enumerate(rows):
+            workloads = self.groups.setdefault(row[index['NAMESPACE']], {})
+            workloads.setdefault(row[index['WORKLOAD']] or "-", []).append(i)
+        self._views: Dict[Tuple[str, ...], TableView] = {}
+
+    def view(self, path: Tuple[str, ...]) -> TableView:
+        view = self._views.get(path)
+        if view is None:
+            if path == self.ALL:
+                view = self._containers(range(len(self.rows)))
+            elif len(path) == 0:
+                view = self._grouped("NAMESPACE", {
+                    namespace: [i for indices in workloads.values() for i in indices]
+                    for namespace, workloads in self.groups.items()
+                }, workloads=True)
+            elif len(path) == 1:
+                view = self._grouped("WORKLOAD", self.groups[path[0]])
+            else:
+                view = self._containers(self.groups[path[0]][path[1]])
+            self._views[path] = view
+        return view
+
+    def child(self, path: Tuple[str, ...], row: int) -> Optional[Tuple[str, ...]]:
+        """Camino del nivel que se abre desde una fila (None en los contenedores)"""
+        if path == self.ALL or len(path) >= 2:
+            return None
+        return path + (self.view(path).rows[row][0],)
+
+    def _grouped(self, name: str, groups: Dict[str, List[int]], workloads: bool = False) -> TableView:
+        headers = [name] + (["WORKLOADS"] if workloads else []) + GROUP_HEADERS
+        offset = 2 if workloads else 1
+        rows, severities = [], []
+        numeric: Dict[int, List[Optional[float]]] = {column: [] for column in range(1, len(headers) - 1)}
+        numeric[len(headers) - 1] = severities
+        for key in sorted(groups):
+            indices = groups[key]
+            numbers = [self._numbers[i] for i in indices]
+            pods = len({self.rows[i][self._columns['POD']] for i in indices})
+            # Porcentajes sobre requests solo con contenedores que tienen ambos valores
+            cpu = _total(n[CPU] for n in numbers)
+            req_cpu = _total(n[REQ_CPU] for n in numbers)
+            memory = _total(n[MEMORY] for n in numbers)
+            req_mem = _total(n[REQ_MEM] for n in numbers)
+            cpu_pct = _percent(sum(n[CPU] for n in numbers if n[CPU] is not None and n[REQ_CPU]),
+                               sum(n[REQ_CPU] for n in numbers if n[CPU] is not None and n[REQ_CPU]))
+            mem_pct = _percent(sum(n[MEMORY] for n in numbers if n[MEMORY] is not None and n[REQ_MEM]),
+                               sum(n[REQ_MEM] for n in numbers if n[MEMORY] is not None and n[REQ_MEM]))
+            warning = sum(n[SEVERITY] == ResourceColorizer.SEVERITY_WARNING for n in numbers)
+            danger = sum(n[SEVERITY] == ResourceColorizer.SEVERITY_DANGER for n in numbers)
+            severity = max(n[SEVERITY] for n in numbers)
+
+            values = [pods, len(indices), cpu, req_cpu, cpu_pct, memory, req_mem, mem_pct, warning, danger]
+            if workloads:
+                values.insert(0, len(self.groups[key]))
+            for column, value in enumerate(values, start=1):
+                numeric[column].append(value)
+            severities.append(severity)
+
+            text = [str(v) for v in values[:offset + 1]]
+            text += [
+                _format(KRCAUtils.format_cpu, cpu, canonical=False), _format(KRCAUtils.format_cpu, req_cpu, canonical=False),
+                _format_percent(cpu_pct),
+                _format(KRCAUtils.format_memory, memory), _format(KRCAUtils.format_memory, req_mem),
+                _format_percent(mem_pct),
+                str(warning), str(danger), SEVERITY_NAMES[severity]
+            ]
+            rows.append(tuple([key] + text))
+        return TableView(headers, rows, numeric, severities, search=(0,))
+
+    def _containers(self, indices: Sequence[int]) -> TableView:
+        columns = self._columns
+        source = [columns[name] for name in ("NAMESPACE", "WORKLOAD", "POD", "CONTAINER",
+                                             "CPU", "REQ_CPU", "LIM_CPU")]
+        rows, severities = [], []
+        numeric: Dict[int, List[Optional[float]]] = {
+            CONTAINER_HEADERS.index(name): [] for name in
+            ("CPU", "REQ_CPU", "LIM_CPU", "CPU%LIM", "MEMORY", "REQ_MEM", "LIM_MEM", "MEM%LIM", "RESTARTS")
+        }
+        numeric[CONTAINER_HEADERS.index("SEVERITY")] = severities
+        targets = [numeric[CONTAINER_HEADERS.index(name)] for name in
+                   ("CPU", "REQ_CPU", "LIM_CPU", "CPU%LIM", "MEMORY", "REQ_MEM", "LIM_MEM", "MEM%LIM", "RESTARTS")]
+        for i in indices:
+            row, n = self.rows[i], self._numbers[i]
+            cpu_pct = _percent(n[CPU], n[LIM_CPU])
+            mem_pct = _percent(n[MEMORY], n[LIM_MEM])
+            values = (n[CPU], n[REQ_CPU], n[LIM_CPU], cpu_pct, n[MEMORY], n[REQ_MEM], n[LIM_MEM], mem_pct, n[RESTARTS])
+            for target, value in zip(targets, values):
+                target.append(value)
+            severities.append(n[SEVERITY])
+            rows.append(tuple(
+                [str(row[c]) for c in source] + [_format_percent(cpu_pct)]
+                + [str(row[columns[name]]) for name in ("MEMORY", "REQ_MEM", "LIM_MEM")]
+                + [_format_percent(mem_pct)]
+                + [str(row[columns[name]]) for name in ("STATUS", "RESTARTS", "NODE")]
+                + [SEVERITY_NAMES[n[SEVERITY]]]
+            ))
+        search = [CONTAINER_HEADERS.index(name) for name in CONTAINER_SEARCH]
+        return TableView(CONTAINER_HEADERS, rows, numeric, severities, search)
+
+class AuditTUI:
+    """
+    `krca tui`: navegación interactiva de la auditoría con curses
+
+    Solo se dibujan las filas que entran en pantalla y las teclas que se
+    escriben seguidas se procesan juntas, así el filtro se aplica una vez
+    por tanda y no por cada carácter.
+    """
+
+    def __init__(self, args):
+        self.args = args
+        self.use_color = not args.no_color
+        self.warnings: List[str] = []
+
+    def load(self) -> AuditBrowser:
+        """Obtiene las filas (del cluster o de --from-file) y arma el navegador"""
+        analyzer = KRCAnalyzer(self.args)
+        if getattr(self.args, 'from_file', None):
+            result = analyzer.collect(*analyzer.load_dump())
+        else:
+            result = analyzer.collect()
+        self.warnings = result.warnings
+        # --filter se aplica antes de indexar: la interfaz solo ve esas filas
+        selector = RowSelector(ROW_COLUMNS, filters=getattr(self.args, 'filter', None),
+                               thresholds=analyzer.thresholds, thresholds_for=analyzer.thresholds_for)
+        rows = selector.select(result.rows) if selector.filters else result.rows
+        return AuditBrowser(rows, selector)
+
+    def run(self) -> int:
+        try:
+            if curses is None:
+                raise RuntimeError("krca tui requiere el módulo curses (en Windows: pip install windows-curses)")
+            if not (sys.stdin.isatty() and sys.stdout.isatty()):
+                raise RuntimeError("krca tui requiere una terminal interactiva")
+            browser = self.load()
+            # Esc sin la espera por defecto de curses (1 segundo)
+            os.environ.setdefault("ESCDELAY", "25")
+            curses.wrapper(self._main, browser)
+            return 0
+        except Exception as e:
+            KRCAUtils.report_error(e, getattr(self.args, 'debug', False))
+            return 1
+
+    def _init_colors(self) -> Dict[int, int]:
+        """Atributo de curses por severidad"""
+        attributes = {level: curses.A_NORMAL for level in SEVERITY_NAMES}
+        if not self.use_color or not curses.has_colors():
+            return attributes
+        curses.start_color()
+        curses.use_default_colors()
+        for pair, (level, color) in enumerate((
+            (ResourceColorizer.SEVERITY_INFO, curses.COLOR_CYAN),
+            (ResourceColorizer.SEVERITY_WARNING, curses.COLOR_YELLOW),
+            (ResourceColorizer.SEVERITY_DANGER, curses.COLOR_RED),
+        ), start=1):
+            curses.init_pair(pair, color, -1)
+            attributes[level] = curses.color_pair(pair)
+        return attributes
+
+    def _keys(self, screen) -> List[int]:
+        """Tecla pulsada y todas las que ya estén en cola"""
+        keys = [screen.getch()]
+        screen.nodelay(True)
+        try:
+            while True:
+                key = screen.getch()
+                if key == -1:
+                    break
+                keys.append(key)
+        finally:
+            screen.nodelay(False)
+        return keys
+
+    def _draw(self, screen, browser: AuditBrowser, path, view: TableView,
+              cursor: int, offset: int, editing: bool, attributes: Dict[int, int]) -> None:
+        height, width = screen.getmaxyx()
+        screen.erase()
+
+        location = "todos los contenedores" if path == browser.ALL else " / ".join(("cluster",) + path)
+        sort = "-"
+        if view.sort_column is not None:
+            # Numéricos de mayor a menor y texto alfabético, salvo que se invierta
+            descending = (view.sort_column in view.numeric) != view.reverse
+            sort = view.headers[view.sort_column] + (" ↓" if descending else " ↑")
+        title = f" krca tui  {location}  filas {len(view)}/{len(view.rows)}  orden {sort}"
+        screen.addnstr(0, 0, title.ljust(width), width - 1, curses.A_REVERSE)
+
+        widths = view.widths()
+        header = "  ".join(name.ljust(widths[c]) for c, name in enumerate(view.headers))
+        screen.addnstr(1, 0, header, width - 1, curses.A_BOLD)
+
+        body = max(height - 3, 0)
+        for line, i in enumerate(view.window(offset, body)):
+            text = "  ".join(value[:widths[c]].ljust(widths[c]) for c, value in enumerate(view.rows[i]))
+            attribute = attributes[view.severities[i]]
+            if offset + line == cursor:
+                attribute |= curses.A_REVERSE
+            screen.addnstr(2 + line, 0, text, width - 1, attribute)
+
+        if editing or view.query:
+            status = f"/{view.query}" + ("_" if editing else "")
+        elif self.warnings:
+            status = self.warnings[0]
+        else:
+            status = HELP_LINE
+        screen.addnstr(height - 1, 0, status, width - 1)
+        if height > 1 and editing:
+            screen.move(height - 1, min(len(view.query) + 1, width - 1))
+        screen.refresh()
+
+    def _main(self, screen, browser: AuditBrowser) -> None:
+        attributes = self._init_colors()
+        try:
+            curses.curs_set(0)
+        except curses.error:
+            pass
+
+        path: Tuple[str, ...] = ()
+        cursor = offset = 0
+        # Niveles abiertos: (camino, cursor, offset) para volver al mismo lugar
+        history: List[Tuple[Tuple[str, ...], int, int]] = []
+        editing = False
+
+        while True:
+            view = browser.view(path)
+            body = max(screen.getmaxyx()[0] - 3, 1)
+            cursor = max(min(cursor, len(view) - 1), 0)
+            offset = min(max(offset, cursor - body + 1), cursor)
+            self._draw(screen, browser, path, view, cursor, offset, editing, attributes)
+
+            query = view.query
+            for key in self._keys(screen):
+                if editing:
+                    if key in (10, 13, curses.KEY_ENTER):
+                        editing = False
+                    elif key == 27:
+                        editing, query = False, ""
+                    elif key in (curses.KEY_BACKSPACE, 127, 8):
+                        query = query[:-1]
+                    elif 32 <= key < 127:
+                        query += chr(key)
+                    continue
+
+                if key in (ord('q'), ord('Q')):
+                    return
+                elif key in (curses.KEY_DOWN, ord('j')):
+                    cursor += 1
+                elif key in (curses.KEY_UP, ord('k')):
+                    cursor -= 1
+                elif key == curses.KEY_NPAGE:
+                    cursor += body
+                elif key == curses.KEY_PPAGE:
+                    cursor -= body
+                elif key in (curses.KEY_HOME, ord('g')):
+                    cursor = 0
+                elif key in (curses.KEY_END, ord('G')):
+                    cursor = len(view) - 1
+                elif key == ord('/'):
+                    editing = True
+                elif key == 27:
+                    query = ""
+                elif key in (ord('<'), ord('>')):
+                    step = 1 if key == ord('>') else -1
+                    current = view.sort_column if view.sort_column is not None else (-1 if step > 0 else 0)
+                    view.sort((current + step) % len(view.headers))
+                    cursor = 0
+                elif key == ord('r'):
+                    view.toggle_reverse()
+                    cursor = 0
+                elif key in (10, 13, curses.KEY_ENTER, curses.KEY_RIGHT, ord('l')):
+                    child = browser.child(path, view.index(cursor)) if len(view) else None
+                    if child is not None:
+                        history.append((path, cursor, offset))
+                        path, cursor, offset = child, 0, 0
+                        break
+                elif key in (curses.KEY_LEFT, curses.KEY_BACKSPACE, 127, 8, ord('h')):
+                    if history:
+                        path, cursor, offset = history.pop()
+                        break
+                elif key == 9:
+                    if path == browser.ALL:
+                        if history:
+                            path, cursor, offset = history.pop()
+                    else:
+                        history.append((path, cursor, offset))
+                        path, cursor, offset = browser.ALL, 0, 0
+                    break
+            if query != view.query:
+                view.filter(query)
+                cursor = offset = 0
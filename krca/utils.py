@@ -1,7 +1,18 @@
 #!/usr/bin/env python3
 # krca/utils.py - Módulo utilitario completo (Compatible con v4.0)
 
-from typing import Optional, Union
+import math
+import traceback
+from decimal import Decimal, InvalidOperation
+from typing import Optional, Sequence, Union
+from .colorizer import ResourceColorizer
+
+# Multiplicadores para sufijos de cantidades de Kubernetes
+_BINARY_SUFFIXES = {'Ki': 1024, 'Mi': 1024 ** 2, 'Gi': 1024 ** 3, 'Ti': 1024 ** 4, 'Pi': 1024 ** 5, 'Ei': 1024 ** 6}
+_DECIMAL_SUFFIXES = {'k': 10 ** 3, 'M': 10 ** 6, 'G': 10 ** 9, 'T': 10 ** 12, 'P': 10 ** 15, 'E': 10 ** 18}
+_MIB = 1024 ** 2
+# Nanocores por unidad de los sufijos de CPU
+_CPU_NANO_SUFFIXES = {'n': 1, 'u': 10 ** 3, 'm': 10 ** 6}
 
 # Función independiente para compatibilidad
 def calculate_percentage_diff(current: Union[float, int], reference: Union[float, int]) -> float:
@@ -43,6 +54,14 @@ class KRCAUtils:
         except (ValueError, TypeError):
             return None
 
+    @staticmethod
+    def report_error(error: Exception, debug: bool = False) -> None:
+        """Imprime un error con el formato estándar de KRCA (y traceback si debug)"""
+        error_msg = f"{ResourceColorizer.RED}Error:{ResourceColorizer.RESET} {str(error)}"
+        if debug:
+            error_msg += f"\n\n{ResourceColorizer.YELLOW}Debug info:{ResourceColorizer.RESET}\n{traceback.format_exc()}"
+        print(error_msg)
+
     @staticmethod
     def human_readable_size(size_bytes: float) -> str:
         """Convierte bytes a formato legible (ej. 2048 -> '2.00 KiB')"""
@@ -65,6 +84,11 @@ class KRCAUtils:
             0 < diff_pct <= 1000
         )
 
+    @staticmethod
+    def validate_percentile(pct: float) -> bool:
+        """Valida que un percentil esté en el rango (0, 100]"""
+        return 0 < pct <= 100
+
     @staticmethod
     def get_resource_difference(
         request: Optional[float],
@@ -74,3 +98,117 @@ class KRCAUtils:
         if request is None or limit is None or request == 0:
             return None
         return ((limit - request) / request) * 100
+
+    @staticmethod
+    def parse_cpu_millicores(value: str) -> Optional[float]:
+        """
+        Convierte una cantidad de CPU de Kubernetes a milicores.
+        Ejemplos: "250m" -> 250.0, "2" -> 2000.0, "1500000n" -> 1.5
+        """
+        if value in ("<none>", "-", "", None):
+            return None
+
+        try:
+            if value.endswith('n'):
+                return float(value[:-1]) / 1_000_000
+            elif value.endswith('u'):
+                return float(value[:-1]) / 1_000
+            elif value.endswith('m'):
+                return float(value[:-1])
+            else:
+                return float(value) * 1000
+        except (ValueError, TypeError):
+            return None
+
+    @staticmethod
+    def parse_memory_bytes(value: str) -> Optional[float]:
+        """
+        Convierte una cantidad de memoria de Kubernetes a bytes.
+        Ejemplos: "128Mi" -> 134217728.0, "1G" -> 1e9, "1024" -> 1024.0
+        """
+        if value in ("<none>", "-", "", None):
+            return None
+
+        try:
+            if value[-2:] in _BINARY_SUFFIXES:
+                return float(value[:-2]) * _BINARY_SUFFIXES[value[-2:]]
+            elif value[-1:] in _DECIMAL_SUFFIXES:
+                return float(value[:-1]) * _DECIMAL_SUFFIXES[value[-1:]]
+            elif value.endswith('m'):
+                return float(value[:-1]) / 1000
+            else:
+                return float(value)
+        except (ValueError, TypeError):
+            return None
+
+    @staticmethod
+    def parse_cpu_nanocores(value: str) -> Optional[int]:
+        """
+        Convierte una cantidad de CPU de Kubernetes a nanocores enteros (exacto).
+        Ejemplos: "138215432n" -> 138215432, "250m" -> 250000000, "2" -> 2000000000
+        """
+        if value in ("<none>", "-", "", None):
+            return None
+
+        try:
+            if value[-1:] in _CPU_NANO_SUFFIXES:
+                return int(math.ceil(Decimal(value[:-1]) * _CPU_NANO_SUFFIXES[value[-1:]]))
+            return int(math.ceil(Decimal(value) * 10 ** 9))
+        except (InvalidOperation, ValueError, TypeError):
+            return None
+
+    @staticmethod
+    def parse_memory_bytes_exact(value: str) -> Optional[int]:
+        """
+        Convierte una cantidad de memoria de Kubernetes a bytes enteros (exacto).
+        Ejemplos: "601872Ki" -> 616316928, "1.5Gi" -> 1610612736
+        """
+        if value in ("<none>", "-", "", None):
+            return None
+
+        try:
+            if value[-2:] in _BINARY_SUFFIXES:
+                return int(math.ceil(Decimal(value[:-2]) * _BINARY_SUFFIXES[value[-2:]]))
+            elif value[-1:] in _DECIMAL_SUFFIXES:
+                return int(math.ceil(Decimal(value[:-1]) * _DECIMAL_SUFFIXES[value[-1:]]))
+            elif value.endswith('m'):
+                return int(math.ceil(Decimal(value[:-1]) / 1000))
+            return int(math.ceil(Decimal(value)))
+        except (InvalidOperation, ValueError, TypeError):
+            return None
+
+    @staticmethod
+    def format_cpu(millicores: float, canonical: bool = True) -> str:
+        """
+        Formatea milicores como cantidad de Kubernetes (redondeando hacia arriba)
+        Con canonical=False siempre usa milicores (ej. "2000m" en vez de "2")
+        """
+        value = int(math.ceil(millicores))
+        if canonical and value and value % 1000 == 0:
+            return str(value // 1000)
+        return f"{value}m"
+
+    @staticmethod
+    def format_memory(size_bytes: float) -> str:
+        """Formatea bytes como cantidad de Kubernetes en Mi/Gi (redondeando hacia arriba)"""
+        mebibytes = int(math.ceil(size_bytes / _MIB))
+        if mebibytes and mebibytes % 1024 == 0:
+            return f"{mebibytes // 1024}Gi"
+        return f"{mebibytes}Mi"
+
+    @staticmethod
+    def percentile(sorted_values: Sequence[float], pct: float) -> Optional[float]:
+        """
+        Percentil con interpolación lineal sobre una secuencia ya ordenada
+        Retorna None si la secuencia está vacía
+        """
+        if not sorted_values:
+            return None
+        if len(sorted_values) == 1:
+            return float(sorted_values[0])
+
+        rank = (len(sorted_values) - 1) * pct / 100.0
+        lower = int(math.floor(rank))
+        upper = min(lower + 1, len(sorted_values) - 1)
+        weight = rank - lower
+        return sorted_values[lower] * (1 - weight) + sorted_values[upper] * weight
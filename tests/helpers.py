@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# tests/helpers.py - Datos de prueba compartidos
+
+from krca.cli import COMMANDS, parse_args
+from krca.core import ROW_COLUMNS
+
+# Valores por defecto de una fila de KRCAnalyzer (orden ROW_COLUMNS)
+ROW_DEFAULTS = {
+    'NAMESPACE': "shop", 'POD': "web-0", 'CONTAINER': "app",
+    'CPU': "-", 'REQ_CPU': "<none>", 'LIM_CPU': "<none>",
+    'MEMORY': "-", 'REQ_MEM': "<none>", 'LIM_MEM': "<none>",
+    'STATUS': "Running", 'RESTARTS': 0,
+    'NODE_IP': "10.0.0.1", 'NODE': "node-a",
+    'WORKLOAD': "Deployment/web", 'LAST_STATE': "-",
+    'CPU_NANOCORES': None, 'MEMORY_BYTES': None,
+}
+
+
+def make_row(**fields):
+    """Fila completa de KRCAnalyzer con los campos indicados (ej. make_row(CPU="250m"))"""
+    values = dict(ROW_DEFAULTS, **fields)
+    return [values[column] for column in ROW_COLUMNS]
+
+
+def make_args(*argv):
+    """Argumentos de la línea de comandos sin colores (el subcomando, si hay, va primero)"""
+    if argv and argv[0] in COMMANDS:
+        return parse_args([argv[0], "--no-color", *argv[1:]])
+    return parse_args(["--no-color", *argv])
+
+
+def make_pod(name, namespace="shop", containers=None, labels=None, node="node-a", owner=None, statuses=None):
+    """
+    Pod en el formato de `kubectl get pods -o json`
+
+    containers: {nombre: {"requests": {...}, "limits": {...}}}
+    statuses: {nombre: (reinicios, motivo de la última terminación o None)}
+    owner: (kind, nombre) del controlador
+    """
+    containers = containers if containers is not None else {"app": {}}
+    statuses = statuses or {}
+    metadata = {"name": name, "namespace": namespace, "uid": f"uid-{namespace}-{name}",
+                "labels": dict(labels or {})}
+    if owner:
+        metadata["ownerReferences"] = [{"kind": owner[0], "name": owner[1], "controller": True}]
+    container_statuses = []
+    for container in containers:
+        restarts, last_reason = statuses.get(container, (0, None))
+        status = {"name": container, "restartCount": restarts, "state": {"running": {}}}
+        if last_reason:
+            status["lastState"] = {"terminated": {"reason": last_reason}}
+        container_statuses.append(status)
+    return {
+        "metadata": metadata,
+        "spec": {
+            "nodeName": node,
+            "containers": [{"name": container, "resources": resources}
+                           for container, resources in containers.items()],
+        },
+        "status": {"phase": "Running", "hostIP": "10.0.0.1", "containerStatuses": container_statuses},
+    }
+
+
+def make_metrics(*entries):
+    """Índice de métricas como el de get_metrics: entradas (namespace, pod, contenedor, cpu, memoria)"""
+    from krca.kubectl import KubectlClient
+    from krca.utils import KRCAUtils
+    metrics = {}
+    for namespace, pod, container, cpu, memory in entries:
+        metrics.setdefault((namespace, pod), {})[container] = KubectlClient._usage_entry(
+            namespace, KRCAUtils.parse_cpu_nanocores(cpu), KRCAUtils.parse_memory_bytes_exact(memory))
+    return metrics
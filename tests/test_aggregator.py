@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# tests/test_aggregator.py - Agregación por workload/namespace/nodo (--group-by)
+
+import pytest
+
+from krca.aggregator import GROUP_HEADERS, UsageAggregator
+from krca.colorizer import ResourceColorizer
+from krca.core import KRCAnalyzer
+
+from .helpers import make_args, make_row
+
+THRESHOLDS = (60, 75, 300, 5)
+GREEN, WHITE, YELLOW, RED = (ResourceColorizer.GREEN, ResourceColorizer.WHITE,
+                             ResourceColorizer.YELLOW, ResourceColorizer.RED)
+
+
+def aggregate(rows, group_by='namespace'):
+    aggregator = UsageAggregator(group_by)
+    for row in rows:
+        aggregator.add(row)
+    return aggregator
+
+
+def colors(aggregator, row):
+    """Código de color de cada celda de estadísticas (CPU_SUM..LIM_MEM)"""
+    colored = aggregator.apply_colors(row, THRESHOLDS)
+    offset = len(GROUP_HEADERS[aggregator.group_by]) + 1  # claves y COUNT
+    return [cell[:cell.index('m') + 1] for cell in colored[offset:]]
+
+
+def test_sums_and_summary():
+    aggregator = aggregate([
+        make_row(CPU="100m", REQ_CPU="200m", LIM_CPU="1", MEMORY="64Mi", REQ_MEM="128Mi"),
+        make_row(POD="web-1", CPU="300m", REQ_CPU="200m", LIM_CPU="1", MEMORY="192Mi", REQ_MEM="128Mi"),
+    ])
+    [row] = aggregator.rows()
+    assert row == ["shop", "2", "400m", "100m", "300m", "290m", "400m", "2000m",
+                   "256Mi", "64Mi", "192Mi", "186Mi", "256Mi", "<none>"]
+
+
+def test_usage_compared_only_against_containers_with_request_and_limit():
+    # El sidecar sin request/limit usa 900m: no debe sumarse contra el request del app
+    aggregator = aggregate([
+        make_row(CPU="150m", REQ_CPU="100m", LIM_CPU="200m"),
+        make_row(CONTAINER="sidecar", CPU="900m"),
+    ])
+    [row] = aggregator.rows()
+    assert row[2] == "1050m" and row[6] == "100m"
+    cpu = colors(aggregator, row)[:6]
+    # app está entre request y limit (verde); REQ/LIM en amarillo por cobertura parcial
+    assert cpu == [GREEN] * 4 + [YELLOW, YELLOW]
+
+
+def test_containers_without_usage_do_not_mark_partial_coverage():
+    aggregator = aggregate([
+        make_row(CPU="150m", REQ_CPU="100m", LIM_CPU="200m"),
+        make_row(CONTAINER="migrate (init)", REQ_CPU="50m"),
+    ])
+    [row] = aggregator.rows()
+    assert colors(aggregator, row)[:6] == [GREEN] * 4 + [GREEN, WHITE]
+
+
+def test_group_without_references_is_white():
+    aggregator = aggregate([make_row(CPU="450m", MEMORY="512Mi")])
+    [row] = aggregator.rows()
+    assert colors(aggregator, row) == [WHITE] * 4 + [YELLOW, YELLOW] + [WHITE] * 4 + [YELLOW, YELLOW]
+
+
+def test_usage_over_matched_limit_is_red():
+    aggregator = aggregate([
+        make_row(MEMORY="300Mi", REQ_MEM="128Mi", LIM_MEM="256Mi"),
+        make_row(POD="web-1", MEMORY="200Mi", REQ_MEM="128Mi", LIM_MEM="256Mi"),
+        make_row(POD="web-2", MEMORY="300Mi", REQ_MEM="128Mi", LIM_MEM="256Mi"),
+    ], group_by='workload')
+    [row] = aggregator.rows()
+    mem = colors(aggregator, row)[6:]
+    assert mem == [RED] * 4 + [WHITE, RED]
+
+
+@pytest.mark.parametrize("argv, message", [
+    (["--sort-by", "CPU"], "--sort-by no se puede usar con --group-by"),
+    (["--filter", "severity>=warning", "--top", "3"], "--filter, --top no se puede usar con --group-by"),
+    (["--output-file", "audit.ndjson"], "--group-by no genera snapshots"),
+])
+def test_group_by_rejects_row_options(argv, message, capsys):
+    analyzer = KRCAnalyzer(make_args("--group-by", "namespace", *argv))
+    assert analyzer.analyze() == 1
+    assert message in capsys.readouterr().out
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# tests/test_async_kubectl.py - Cliente asyncio (AsyncKubectlClient) contra un kubectl falso
+
+import asyncio
+import json
+import os
+import sys
+import time
+
+import pytest
+
+from krca.async_kubectl import AsyncKubectlClient
+from krca.kubectl import KubectlError
+
+from .helpers import make_pod
+
+# kubectl falso: responde según los argumentos y anota cada llamada (inicio y fin) en FAKE_LOG;
+# PYTHON y POD se sustituyen al crear el script
+FAKE_KUBECTL = """#!PYTHON
+import json, os, sys, time
+args = sys.argv[1:]
+with open(os.environ["FAKE_LOG"], "a") as log:
+    log.write(json.dumps(["start", time.monotonic(), args]) + "\\n")
+if args[:2] == ["config", "view"]:
+    print("shop")
+elif args[0] == "cluster-info":
+    print("Kubernetes control plane is running")
+elif args[:2] == ["get", "pods"]:
+    print(json.dumps({"items": [POD]}))
+elif args[:2] == ["get", "--raw"]:
+    last = "continue=" in args[2]
+    name = "web-1" if last else "web-0"
+    print(json.dumps({"metadata": {} if last else {"continue": "p2"}, "items": [
+        {"metadata": {"name": name, "namespace": "shop"},
+          "containers": [{"name": "app", "usage": {"cpu": "250000000n", "memory": "131072Ki"}}]}]}))
+elif args[0] == "sleep":
+    time.sleep(float(args[1]))
+elif args[0] == "fail":
+    sys.stderr.write("Error from server (Forbidden): boom\\n")
+    sys.exit(1)
+with open(os.environ["FAKE_LOG"], "a") as log:
+    log.write(json.dumps(["end", time.monotonic(), args]) + "\\n")
+"""
+
+
+@pytest.fixture
+def kubectl(tmp_path, monkeypatch):
+    path = tmp_path / "kubectl"
+    path.write_text(FAKE_KUBECTL.replace("PYTHON", sys.executable).replace("POD", json.dumps(make_pod("web-0"))))
+    path.chmod(0o755)
+    log = tmp_path / "calls.log"
+    log.touch()
+    monkeypatch.setenv("FAKE_LOG", str(log))
+    return str(path)
+
+
+def calls():
+    """Llamadas anotadas por el kubectl falso: lista de (evento, instante, argumentos)"""
+    with open(os.environ["FAKE_LOG"]) as log:
+        return [json.loads(line) for line in log]
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_missing_binary_degrades_like_the_sync_client(tmp_path):
+    client = AsyncKubectlClient(kubectl=str(tmp_path / "nonexistent" / "kubectl"))
+    assert run(client.check_connection()) is False
+    with pytest.raises(KubectlError, match="No se pudo ejecutar"):
+        run(client.execute(["get", "pods"]))
+    assert run(client.execute(["get", "pods"], ignore_errors=True)) == ""
+    assert run(client.get_current_namespace()) == "default"
+    assert run(client.get_metrics("shop")) == {}
+
+
+def test_pods_use_the_context_namespace(kubectl):
+    client = AsyncKubectlClient(kubectl=kubectl)
+    pods = run(client.get_pods(selector="app=web"))
+    assert [pod["metadata"]["name"] for pod in pods["items"]] == ["web-0"]
+    args = [entry[2] for entry in calls() if entry[0] == "start"]
+    assert args[1] == ["get", "pods", "-n", "shop", "-l", "app=web", "-o", "json"]
+    assert run(client.check_connection()) is True
+
+
+def test_metrics_follow_continue_tokens(kubectl):
+    metrics = run(AsyncKubectlClient(kubectl=kubectl).get_metrics(all_namespaces=True))
+    assert set(metrics) == {("shop", "web-0"), ("shop", "web-1")}
+    assert metrics[("shop", "web-0")]["app"]["cpu_nanocores"] == 250_000_000
+    paths = [entry[2][2] for entry in calls() if entry[0] == "start"]
+    assert len(paths) == 2 and "continue=p2" in paths[1]
+
+
+def test_errors_and_timeouts(kubectl):
+    client = AsyncKubectlClient(kubectl=kubectl, timeout=0.5)
+    with pytest.raises(KubectlError, match="Código: 1"):
+        run(client.execute(["fail"]))
+    assert run(client.execute(["fail"], ignore_errors=True)) == ""
+    started = time.monotonic()
+    with pytest.raises(KubectlError, match="Tiempo de espera agotado"):
+        run(client.execute(["sleep", "10"]))
+    assert run(client.execute(["sleep", "10"], ignore_errors=True, timeout=0.2)) == ""
+    assert time.monotonic() - started < 5
+    # El proceso se terminó: nunca llegó a anotar el fin
+    assert not [entry for entry in calls() if entry[0] == "end" and entry[2][0] == "sleep"]
+
+
+def test_cancelling_kills_the_process(kubectl):
+    async def cancel():
+        task = asyncio.ensure_future(AsyncKubectlClient(kubectl=kubectl).execute(["sleep", "10"]))
+        await asyncio.sleep(0.5)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    started = time.monotonic()
+    run(cancel())
+    assert time.monotonic() - started < 5
+
+
+def test_concurrency_is_shared(kubectl):
+    async def audits():
+        client = AsyncKubectlClient(max_concurrency=2, kubectl=kubectl)
+        await asyncio.gather(*(client.execute(["sleep", "0.3"]) for _ in range(5)))
+
+    run(audits())
+    running = peak = 0
+    for event, _, _ in sorted(calls(), key=lambda entry: (entry[1], entry[0] == "start")):
+        running += 1 if event == "start" else -1
+        peak = max(peak, running)
+    assert peak == 2
+
+
+def test_max_concurrency_must_be_positive():
+    with pytest.raises(ValueError):
+        AsyncKubectlClient(max_concurrency=0)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# tests/test_autoscalers.py - Uso frente a objetivos de HPA y recomendaciones de VPA (autoscalers)
+
+from krca.autoscalers import AUTOSCALER_HEADERS, AutoscalerAuditor, AutoscalerIndex
+
+from .helpers import make_args, make_row
+
+HPA = {"items": [{
+    "metadata": {"name": "web", "namespace": "shop"},
+    "spec": {
+        "scaleTargetRef": {"kind": "Deployment", "name": "web"},
+        "minReplicas": 1, "maxReplicas": 4,
+        "metrics": [
+            {"type": "Resource", "resource": {
+                "name": "cpu", "target": {"type": "Utilization", "averageUtilization": 70}}},
+            {"type": "ContainerResource", "containerResource": {
+                "name": "memory", "container": "app", "target": {"type": "Utilization", "averageUtilization": 80}}},
+        ],
+    },
+    "status": {"currentReplicas": 2},
+}]}
+
+
+def vpa(resource_policy=None, mode="Auto"):
+    spec = {"targetRef": {"kind": "Deployment", "name": "web"}, "updatePolicy": {"updateMode": mode}}
+    if resource_policy is not None:
+        spec["resourcePolicy"] = resource_policy
+    return {"items": [{"metadata": {"name": "web", "namespace": "shop"}, "spec": spec}]}
+
+
+def index(vpas=None):
+    result = AutoscalerIndex()
+    result.add_hpas(HPA)
+    result.add_vpas(vpas or {"items": []})
+    return result
+
+
+# Dos réplicas: app al 100% de su request de CPU y sidecar al 300% (pod: 150m / 110m)
+ROWS = [
+    make_row(POD="web-0", CONTAINER="app", CPU="100m", REQ_CPU="100m", MEMORY="64Mi", REQ_MEM="128Mi"),
+    make_row(POD="web-0", CONTAINER="sidecar", CPU="30m", REQ_CPU="10m", MEMORY="16Mi", REQ_MEM="32Mi"),
+    make_row(POD="web-1", CONTAINER="app", CPU="100m", REQ_CPU="100m", MEMORY="64Mi", REQ_MEM="128Mi"),
+    make_row(POD="web-1", CONTAINER="sidecar", CPU="30m", REQ_CPU="10m", MEMORY="16Mi", REQ_MEM="32Mi"),
+]
+
+
+def analyze(vpas=None):
+    results = AutoscalerAuditor(make_args("autoscalers")).analyze(ROWS, index(vpas))
+    return {row[2]: dict(zip(AUTOSCALER_HEADERS, row)) for _, row in results}
+
+
+def test_hpa_column_shows_the_value_the_hpa_uses():
+    rows = analyze()
+    # CPU con métrica Resource: utilización del pod completo en ambos contenedores
+    assert rows["app"]["CPU%REQ"] == rows["sidecar"]["CPU%REQ"] == "118%"
+    assert (rows["app"]["CTR_CPU%"], rows["sidecar"]["CTR_CPU%"]) == ("100%", "300%")
+    # Memoria con ContainerResource solo para app: el sidecar no tiene valor para el HPA
+    assert (rows["app"]["MEM%REQ"], rows["app"]["CTR_MEM%"]) == ("50%", "50%")
+    assert (rows["sidecar"]["MEM%REQ"], rows["sidecar"]["CTR_MEM%"]) == ("-", "50%")
+
+
+def test_conflict_without_resource_policy():
+    rows = analyze(vpa())
+    assert "HPA y VPA (Auto) sobre cpu" in rows["app"]["VERDICT"]
+    assert "HPA y VPA (Auto) sobre memory" in rows["app"]["VERDICT"]
+
+
+def test_conflict_honors_controlled_resources():
+    rows = analyze(vpa({"containerPolicies": [
+        {"containerName": "app", "controlledResources": ["memory"]},
+        {"containerName": "*", "mode": "Off"},
+    ]}))
+    assert "sobre cpu" not in rows["app"]["VERDICT"]
+    assert "HPA y VPA (Auto) sobre memory" in rows["app"]["VERDICT"]
+    assert "HPA y VPA" not in rows["sidecar"]["VERDICT"]
+
+
+def test_vpa_off_never_conflicts():
+    rows = analyze(vpa(mode="Off"))
+    assert all("HPA y VPA" not in row["VERDICT"] for row in rows.values())
+
+
+def test_controls_defaults_to_both_resources():
+    entry = index(vpa({"containerPolicies": [{"containerName": "*", "controlledResources": ["cpu"]}]})).vpas[
+        ("shop", "Deployment/web")]
+    assert entry.controls("app", "cpu") and not entry.controls("app", "memory")
+    assert index(vpa()).vpas[("shop", "Deployment/web")].controls("app", "memory")
+
+
+def test_missing_metrics_is_not_reported_as_missing_request():
+    rows = [make_row(POD=f"web-{i}", CONTAINER="app", REQ_CPU="100m", REQ_MEM="128Mi") for i in range(2)]
+    results = AutoscalerAuditor(make_args("autoscalers")).analyze(rows, index())
+    verdict = dict(zip(AUTOSCALER_HEADERS, results[0][1]))["VERDICT"]
+    assert "sin métricas de cpu: el HPA no puede calcular el uso" in verdict
+    assert "sin request" not in verdict
+
+
+def test_missing_request_is_still_reported():
+    rows = [make_row(POD="web-0", CONTAINER="app", CPU="100m", CPU_NANOCORES=100_000_000,
+                     MEMORY="64Mi", MEMORY_BYTES=64 * 2**20, REQ_MEM="128Mi")]
+    results = AutoscalerAuditor(make_args("autoscalers")).analyze(rows, index())
+    verdict = dict(zip(AUTOSCALER_HEADERS, results[0][1]))["VERDICT"]
+    assert "sin request de cpu: el HPA no puede calcular el uso" in verdict
+    assert "sin métricas" not in verdict
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# tests/test_colorizer.py - Colores de la tabla y severidad de la selección
+
+import pytest
+
+from krca.colorizer import ResourceColorizer
+from krca.core import ROW_COLUMNS
+from krca.selection import RowSelector
+
+from .helpers import make_row
+
+THRESHOLDS = (60, 75, 300, 5)
+OK, INFO, WARNING, DANGER = (ResourceColorizer.SEVERITY_OK, ResourceColorizer.SEVERITY_INFO,
+                             ResourceColorizer.SEVERITY_WARNING, ResourceColorizer.SEVERITY_DANGER)
+WHITE, GREEN, PURPLE, YELLOW, RED = (ResourceColorizer.WHITE, ResourceColorizer.GREEN, ResourceColorizer.PURPLE,
+                                     ResourceColorizer.YELLOW, ResourceColorizer.RED)
+
+
+@pytest.mark.parametrize("fields, cpu_colors, expected", [
+    # Bajo el request (request 900m, limit 1): púrpura hasta el 60% del limit
+    ({"CPU": "100m"}, (WHITE, PURPLE, WHITE), INFO),
+    ({"CPU": "600m"}, (WHITE, PURPLE, WHITE), INFO),
+    # Sobre warning-pct (60%) y hasta danger-pct (75%) incluido: amarillo
+    ({"CPU": "601m"}, (YELLOW, WHITE, WHITE), WARNING),
+    ({"CPU": "750m"}, (YELLOW, WHITE, WHITE), WARNING),
+    ({"CPU": "751m"}, (RED, WHITE, WHITE), DANGER),
+    # Entre request y limit (ambos incluidos): verde aunque supere los umbrales
+    ({"CPU": "900m"}, (GREEN, GREEN, WHITE), OK),
+    ({"CPU": "1"}, (GREEN, GREEN, WHITE), OK),
+    ({"CPU": "1001m"}, (RED, WHITE, RED), DANGER),
+    # Sin request o sin limit no hay referencia: blanco
+    ({"CPU": "5", "REQ_CPU": "<none>"}, (WHITE, WHITE, WHITE), OK),
+    ({"CPU": "5", "LIM_CPU": "<none>"}, (WHITE, WHITE, WHITE), OK),
+    # Limit más de 3 veces el request (--diff-pct 300): púrpura en LIM_CPU
+    ({"CPU": "100m", "REQ_CPU": "200m", "LIM_CPU": "2"}, (WHITE, PURPLE, PURPLE), INFO),
+])
+def test_usage_boundaries(fields, cpu_colors, expected):
+    row = make_row(**dict({"REQ_CPU": "900m", "LIM_CPU": "1"}, **fields))
+    selector = RowSelector(ROW_COLUMNS, thresholds=THRESHOLDS)
+    assert selector.usage_colors(row)[:3] == cpu_colors
+    assert selector.severity(row) == expected
+
+
+@pytest.mark.parametrize("fields, expected", [
+    ({"STATUS": "CrashLoopBackOff"}, DANGER),
+    ({"LAST_STATE": "OOMKilled"}, DANGER),
+    ({"RESTARTS": 1}, WARNING),
+    ({"RESTARTS": 4}, WARNING),
+    ({"RESTARTS": 5}, DANGER),
+    ({"RESTARTS": 0, "LAST_STATE": "Completed"}, OK),
+])
+def test_status_severity(fields, expected):
+    # Uso verde: la severidad viene solo del estado del contenedor
+    row = make_row(CPU="150m", REQ_CPU="100m", LIM_CPU="200m", **fields)
+    assert RowSelector(ROW_COLUMNS, thresholds=THRESHOLDS).severity(row) == expected
+
+
+def test_missing_request_or_limit_is_white_and_ok():
+    colors = ResourceColorizer.colorize_usage("450m", "512Mi", "<none>", "<none>", "<none>", "<none>", *THRESHOLDS)
+    assert set(colors) == {ResourceColorizer.WHITE}
+    assert ResourceColorizer.usage_severity(450, None, None, *THRESHOLDS) == ResourceColorizer.SEVERITY_OK
+    assert ResourceColorizer.usage_severity(450, 50, None, *THRESHOLDS) == ResourceColorizer.SEVERITY_OK
+
+
+def test_whole_cores_are_parsed_as_cores():
+    # "2" son 2000m: 556m está entre request y limit (verde), no sobre el limit;
+    # el limit es 4 veces el request (púrpura por --diff-pct)
+    cpu, req_cpu, lim_cpu = ResourceColorizer.colorize_usage(
+        "556m", "-", "500m", "-", "2", "-", *THRESHOLDS)[:3]
+    assert (cpu, req_cpu, lim_cpu) == (ResourceColorizer.GREEN, ResourceColorizer.GREEN, ResourceColorizer.PURPLE)
+
+
+@pytest.mark.parametrize("usage, expected", [
+    (600, ResourceColorizer.SEVERITY_DANGER),   # sobre el limit
+    (300, ResourceColorizer.SEVERITY_OK),       # entre request y limit
+    (100, ResourceColorizer.SEVERITY_INFO),     # bajo el request
+])
+def test_usage_severity_levels(usage, expected):
+    assert ResourceColorizer.usage_severity(usage, 200, 500, *THRESHOLDS) == expected
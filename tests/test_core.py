@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# tests/test_core.py - API de librería: KRCAnalyzer.collect, ClusterStats y avisos
+
+import pytest
+
+from krca.core import KRCAnalyzer
+
+from .helpers import make_args, make_metrics, make_pod
+
+SPEC = {"requests": {"cpu": "100m", "memory": "128Mi"}, "limits": {"cpu": "500m", "memory": "256Mi"}}
+
+
+def pod(name, spec=SPEC, **options):
+    return make_pod(name, containers={"app": spec}, **options)
+
+
+PODS = {"items": [
+    pod("web-0"),
+    # 350m: bajo el request y sobre el 60% del limit (warning)
+    pod("web-1", {"requests": {"cpu": "400m", "memory": "128Mi"}, "limits": {"cpu": "500m", "memory": "256Mi"}}),
+    pod("db-0"),
+    # 1m de 1 core: infrautilizado
+    pod("idle-0", {"requests": {"cpu": "1", "memory": "128Mi"}, "limits": {"cpu": "2", "memory": "256Mi"}}),
+    pod("crash-0", statuses={"app": (6, "Error")}),
+    dict(pod("pending-0"), status={"phase": "Pending"}),
+]}
+
+METRICS = make_metrics(
+    ("shop", "web-0", "app", "300m", "150Mi"),
+    ("shop", "web-1", "app", "350m", "150Mi"),
+    ("shop", "db-0", "app", "100m", "320Mi"),   # memoria sobre el limit
+    ("shop", "idle-0", "app", "1m", "150Mi"),
+    ("shop", "crash-0", "app", "150m", "150Mi"),
+)
+
+
+def test_cluster_stats():
+    result = KRCAnalyzer(make_args("-A")).collect(PODS, METRICS)
+    stats = result.cluster_stats
+    assert (stats.total_pods, stats.running_pods) == (6, 5)
+    # warning: web-1; error: db-0 (sobre el limit) y crash-0 (6 reinicios)
+    assert (stats.warning_pods, stats.error_pods) == (1, 2)
+    assert (stats.overutilized_pods, stats.underutilized_pods) == (1, 1)
+    # Uso sobre requests de los contenedores con métricas: 901m / 1700m y 920Mi / 640Mi
+    assert stats.cpu_usage_percent == pytest.approx(53.0, abs=0.01)
+    assert stats.memory_usage_percent == 143.75
+    assert result.warnings == [] and result.errors == []
+
+
+def test_pod_data_and_rows():
+    result = KRCAnalyzer(make_args("-A")).collect(PODS, METRICS)
+    assert [data.name for data in result.pod_data] == [item["metadata"]["name"] for item in PODS["items"]]
+    assert len(result.rows) == 6
+    crash = result.pod_data[4]
+    assert crash.workload == "Pod/crash-0"
+    assert crash.container_statuses["app"].restarts == 6
+    assert "app" not in result.pod_data[5].metrics
+
+
+def test_missing_metrics_is_a_warning():
+    result = KRCAnalyzer(make_args("-A")).collect(PODS, {})
+    assert result.warnings == ["No se obtuvieron métricas de uso (¿metrics-server disponible?)"]
+    stats = result.cluster_stats
+    assert (stats.cpu_usage_percent, stats.memory_usage_percent) == (0.0, 0.0)
+    # Sin uso solo cuentan los reinicios
+    assert (stats.error_pods, stats.overutilized_pods, stats.underutilized_pods) == (1, 0, 0)
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+# tests/test_cost.py - Costo del sobre y subaprovisionamiento (krca cost)
+
+import pytest
+
+from krca.cost import CostReport
+
+from .helpers import make_args
+
+
+@pytest.fixture
+def prices(tmp_path):
+    path = tmp_path / "prices.yaml"
+    path.write_text("default: {cpu: 0.03, memory: 0.004}\n")
+    return str(path)
+
+
+def test_money_keeps_two_decimals(prices, monkeypatch, capsys):
+    table = [["shop", "Deployment/web", "web-0", "app", "node-a", "250m", "100m", "64Mi", "128Mi",
+              "2.53", "0.00", "2.53", "0.30"]]
+    monkeypatch.setattr(CostReport, "collect", lambda self: (table, (2.53, 0.3), []))
+    assert CostReport(make_args("cost", "--prices", prices)).run() == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[1].split()[-4:] == ["2.53", "0.00", "2.53", "0.30"]
+
+
+def test_snapshot_output_is_rejected_before_fetching(prices, monkeypatch, capsys, tmp_path):
+    monkeypatch.setattr(CostReport, "collect", lambda self: pytest.fail("no debe consultar el cluster"))
+    args = make_args("cost", "--prices", prices, "--output-file", str(tmp_path / "cost.ndjson"))
+    assert CostReport(args).run() == 1
+    assert "cost no genera snapshots" in capsys.readouterr().out
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# tests/test_deadline.py - Plazo total (--deadline), cancelación y resultados parciales
+
+import io
+import sys
+import threading
+import time
+
+import pytest
+
+from krca.deadline import DeadlineFetcher, Progress
+from krca.kubectl import DEFAULT_MAX_CONCURRENCY, DeadlineExceeded, KubectlClient
+
+from .helpers import make_args, make_pod
+
+
+@pytest.fixture(autouse=True)
+def restore_client():
+    yield
+    KubectlClient.configure(deadline=0, max_concurrency=DEFAULT_MAX_CONCURRENCY)
+
+
+@pytest.fixture
+def release():
+    """Evento que libera las consultas "colgadas" al terminar la prueba"""
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+def test_running_command_is_cut_at_the_deadline():
+    KubectlClient.configure(deadline=0.3)
+    started = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        KubectlClient.execute([sys.executable, "-c", "import time; time.sleep(10)"])
+    assert time.monotonic() - started < 3
+
+
+def test_no_command_starts_after_the_deadline(monkeypatch):
+    KubectlClient.configure(deadline=0.01)
+    time.sleep(0.02)
+    monkeypatch.setattr("subprocess.run", lambda *args, **kwargs: pytest.fail("no debe lanzar kubectl"))
+    with pytest.raises(DeadlineExceeded):
+        KubectlClient.execute(["kubectl", "get", "pods"])
+
+
+def fetcher(monkeypatch, namespaces, get_pods, get_metrics=None):
+    monkeypatch.setattr(DeadlineFetcher, "namespaces", lambda self: list(namespaces))
+    monkeypatch.setattr(KubectlClient, "get_pods", staticmethod(get_pods))
+    monkeypatch.setattr(KubectlClient, "get_metrics",
+                        staticmethod(get_metrics or (lambda namespace, *args: {(namespace, "web-0"): {}})))
+    return DeadlineFetcher(make_args("-A"), (None, None), Progress(False))
+
+
+def test_slow_namespace_is_reported_and_the_rest_kept(monkeypatch, release):
+    def get_pods(namespace, *args):
+        if namespace == "slow":
+            release.wait(10)
+        return {"items": [make_pod("web-0", namespace=namespace)]}
+
+    KubectlClient.configure(deadline=0.5)
+    started = time.monotonic()
+    result = fetcher(monkeypatch, ["shop", "slow", "batch"], get_pods).fetch()
+    assert time.monotonic() - started < 3
+    assert result.expired
+    assert result.missing == ["slow"]
+    assert sorted(pod["metadata"]["namespace"] for pod in result.pods["items"]) == ["batch", "shop"]
+    assert ("shop", "web-0") in result.metrics
+    assert "Namespaces sin datos (1): slow" in result.warnings()
+
+
+def test_queued_calls_are_cancelled(monkeypatch, release):
+    started_namespaces = []
+
+    def get_pods(namespace, *args):
+        started_namespaces.append(namespace)
+        release.wait(10)
+        return {"items": []}
+
+    KubectlClient.configure(deadline=0.3, max_concurrency=1)
+    result = fetcher(monkeypatch, ["a", "b", "c"], get_pods).fetch()
+    # Con un solo hilo solo llegó a empezar la primera consulta; las demás se cancelaron
+    assert started_namespaces == ["a"]
+    assert result.missing == ["a", "b", "c"]
+    assert result.expired
+
+
+def test_namespace_without_metrics_is_unmetered(monkeypatch):
+    def get_metrics(namespace, *args):
+        if namespace == "batch":
+            raise RuntimeError("metrics-server no responde")
+        return {}
+
+    result = fetcher(monkeypatch, ["shop", "batch"],
+                     lambda namespace, *args: {"items": [make_pod("web-0", namespace=namespace)]},
+                     get_metrics).fetch()
+    assert not result.expired
+    assert result.missing == []
+    assert result.unmetered == ["batch"]
+
+
+def test_progress_line_counts_namespaces():
+    stream = io.StringIO()
+    progress = Progress(True, stream)
+    progress.namespaces_total = 2
+    progress.add(namespaces=1, pods=3, matched=2)
+    progress.finish()
+    assert stream.getvalue().endswith("krca: namespaces 1/2  pods 3  con métricas 2  filas 0\n")
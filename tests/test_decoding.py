@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# tests/test_decoding.py - Backends de decodificación JSON (--json-backend) y dumps con mmap
+
+import gc
+import json
+
+import pytest
+
+from krca.core import KRCAnalyzer
+from krca.decoding import JsonDecoder
+
+from .helpers import make_args, make_pod
+
+BACKENDS = JsonDecoder.available()
+
+
+def pod_list():
+    pod = make_pod("web-0", containers={"app": {"requests": {"cpu": "100m"}, "limits": {"memory": "1Gi"}}},
+                   labels={"app": "web"}, owner=("ReplicaSet", "web-7d9f8c6b5"), statuses={"app": (2, "OOMKilled")})
+    # Campos que krca no lee: con msgspec no se decodifican
+    pod["metadata"]["managedFields"] = [{"manager": "kubectl", "fieldsV1": {"f:spec": {}}}]
+    pod["metadata"]["annotations"] = {"note": "ñandú ✓"}
+    pod["spec"]["containers"][0]["env"] = [{"name": "MODE", "value": "prod"}]
+    return {"kind": "PodList", "items": [pod, make_pod("db-0", namespace="data")]}
+
+
+@pytest.fixture(autouse=True)
+def restore_backend():
+    backend = JsonDecoder.backend
+    yield
+    JsonDecoder.backend = backend
+
+
+def test_json_is_always_available():
+    assert "json" in BACKENDS
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("data", [
+    b'{"a": [1, 2.5, null, true], "b": "\\u00f1and\\u00fa"}',
+    '{"a": [1, 2.5, null, true], "b": "ñandú"}',
+    memoryview(b'{"a": [1, 2.5, null, true], "b": "\\u00f1and\\u00fa"}'),
+])
+def test_loads_same_result_for_every_backend(backend, data):
+    assert JsonDecoder.loads(data, backend) == {"a": [1, 2.5, None, True], "b": "ñandú"}
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_pod_lists_give_the_same_rows(backend):
+    payload = json.dumps(pod_list()).encode()
+    decoded = JsonDecoder.loads_pods(payload, backend)
+    analyzer = KRCAnalyzer(make_args("-A"))
+    reference = KRCAnalyzer(make_args("-A")).collect(pod_list(), {}).rows
+    assert analyzer.collect(decoded, {}).rows == reference
+
+
+@pytest.mark.skipif("msgspec" not in BACKENDS, reason="msgspec no está instalado")
+def test_msgspec_keeps_only_schema_fields():
+    decoded = JsonDecoder.loads_pods(json.dumps(pod_list()).encode(), "msgspec")
+    pod = decoded["items"][0]
+    assert "managedFields" not in pod["metadata"] and "annotations" not in pod["metadata"]
+    assert "env" not in pod["spec"]["containers"][0]
+    assert pod["spec"]["containers"][0]["resources"]["limits"] == {"memory": "1Gi"}
+
+
+@pytest.mark.skipif("msgspec" not in BACKENDS, reason="msgspec no está instalado")
+def test_msgspec_falls_back_when_the_schema_does_not_fit():
+    pods = pod_list()
+    pods["items"][0]["status"]["containerStatuses"][0]["restartCount"] = "2"
+    decoded = JsonDecoder.loads_pods(json.dumps(pods).encode(), "msgspec")
+    assert decoded["items"][0]["metadata"]["managedFields"]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_load_file_maps_the_dump(tmp_path, backend):
+    path = tmp_path / "pods.json"
+    path.write_text(json.dumps(pod_list()), encoding="utf-8")
+    JsonDecoder.configure(backend)
+    decoded = JsonDecoder.load_file(str(path), pods=True)
+    assert [pod["metadata"]["name"] for pod in decoded["items"]] == ["web-0", "db-0"]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_gc_is_restored_after_errors(backend):
+    assert gc.isenabled()
+    with pytest.raises(Exception):
+        JsonDecoder.loads(b'{"a": ', backend)
+    assert gc.isenabled()
+    assert JsonDecoder._gc_pauses == 0
+
+
+def test_configure_rejects_unknown_backends():
+    with pytest.raises(ValueError, match="no válido"):
+        JsonDecoder.configure("yaml")
+    JsonDecoder.configure("auto")
+    assert JsonDecoder.backend == BACKENDS[0]
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+# tests/test_kubectl.py - Cliente de kubectl: estados por contenedor, ejecución (timeouts, reintentos), métricas y namespace
+
+import json
+import subprocess
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from krca.autoscalers import AutoscalerAuditor
+from krca.core import ROW_COLUMNS, KRCAnalyzer
+from krca.kubectl import (BACKOFF_MAX, DEFAULT_MAX_CONCURRENCY, DEFAULT_RETRIES, DEFAULT_TIMEOUT, METRICS_API,
+                          METRICS_PAGE_SIZE, KubectlClient, KubectlError)
+from krca.oom import OOMReporter
+from krca.quotas import QuotaAuditor
+from krca.recommender import ResourceRecommender
+
+from .helpers import make_args, make_pod
+
+
+def test_statuses_cover_init_and_ephemeral_containers():
+    pod = make_pod("web-0", statuses={"app": (3, "OOMKilled")})
+    pod["status"]["initContainerStatuses"] = [
+        {"name": "migrate", "restartCount": 0, "state": {"terminated": {"reason": "Completed"}}}]
+    pod["status"]["ephemeralContainerStatuses"] = [
+        {"name": "debugger", "restartCount": 0, "state": {"waiting": {"reason": "ContainerCreating"}}}]
+    assert KubectlClient.get_container_statuses(pod) == {
+        "migrate": ("Terminated: Completed", 0, "-"),
+        "app": ("Running", 3, "OOMKilled"),
+        "debugger": ("Waiting: ContainerCreating", 0, "-"),
+    }
+
+
+def test_missing_last_state_and_fields():
+    pod = make_pod("web-0")
+    pod["status"]["containerStatuses"] = [
+        {"name": "app"},
+        {"name": "sidecar", "restartCount": 1, "state": {"waiting": {}}, "lastState": {}},
+        {"name": "probe", "restartCount": 2, "lastState": {"terminated": {"exitCode": 137}}},
+    ]
+    assert KubectlClient.get_container_statuses(pod) == {
+        "app": ("Unknown", 0, "-"),
+        "sidecar": ("Waiting: Unknown", 1, "-"),
+        "probe": ("Unknown", 2, "-"),
+    }
+
+
+def test_pod_without_container_statuses():
+    # Pod pendiente: el API server todavía no publicó containerStatuses
+    pod = make_pod("web-0", containers={"app": {}, "sidecar": {}})
+    pod["status"] = {"phase": "Pending"}
+    assert KubectlClient.get_container_statuses(pod) == {}
+    rows = KRCAnalyzer(make_args("-A")).collect({"items": [pod]}, {}).rows
+    columns = [ROW_COLUMNS.index(name) for name in ("CONTAINER", "STATUS", "RESTARTS", "LAST_STATE")]
+    assert [[row[i] for i in columns] for row in rows] == [
+        ["app", "Unknown", 0, "-"],
+        ["sidecar", "Unknown", 0, "-"],
+    ]
+
+
+@pytest.fixture
+def runner(monkeypatch):
+    """subprocess.run falso: cada llamada consume la siguiente respuesta (excepción o stdout)"""
+    class Runner:
+        def __init__(self):
+            self.responses = []
+            self.calls = []
+            self.sleeps = []
+
+        def run(self, argv, **kwargs):
+            self.calls.append(kwargs["timeout"])
+            response = self.responses.pop(0) if len(self.responses) > 1 else self.responses[0]
+            if isinstance(response, Exception):
+                raise response
+            return subprocess.CompletedProcess(argv, 0, response, "")
+
+    runner = Runner()
+    monkeypatch.setattr(subprocess, "run", runner.run)
+    monkeypatch.setattr(time, "sleep", runner.sleeps.append)
+    KubectlClient.stats.reset()
+    yield runner
+    KubectlClient.configure(timeout=DEFAULT_TIMEOUT, retries=DEFAULT_RETRIES, max_concurrency=DEFAULT_MAX_CONCURRENCY)
+    KubectlClient.stats.reset()
+
+
+def failure(stderr, code=1):
+    return subprocess.CalledProcessError(code, ["kubectl"], "", stderr)
+
+
+def test_timeouts_are_retried_with_backoff(runner):
+    runner.responses = [subprocess.TimeoutExpired(["kubectl"], DEFAULT_TIMEOUT)]
+    with pytest.raises(KubectlError, match="Tiempo de espera agotado"):
+        KubectlClient.execute(["kubectl", "get", "pods"])
+    assert runner.calls == [DEFAULT_TIMEOUT] * (DEFAULT_RETRIES + 1)
+    assert runner.sleeps == [0.5, 1.0]
+    stats = KubectlClient.stats.snapshot()
+    assert (stats["calls"], stats["retries"], stats["timeouts"], stats["failures"]) == (1, 2, 3, 1)
+
+
+def test_transient_error_then_success(runner):
+    runner.responses = [failure("Error from server: the server is currently unable to handle the request"),
+                        " pods \n"]
+    assert KubectlClient.execute(["kubectl", "get", "pods"]) == "pods"
+    assert len(runner.calls) == 2
+    assert runner.sleeps == [0.5]
+    assert KubectlClient.stats.snapshot()["failures"] == 0
+
+
+def test_backoff_is_capped(runner):
+    KubectlClient.configure(retries=6)
+    runner.responses = [failure("dial tcp: i/o timeout")]
+    with pytest.raises(KubectlError, match="Código: 1"):
+        KubectlClient.execute(["kubectl", "get", "pods"])
+    assert runner.sleeps == [0.5, 1.0, 2.0, 4.0, BACKOFF_MAX, BACKOFF_MAX]
+
+
+@pytest.mark.parametrize("error", [failure('Error from server (NotFound): pods "x" not found'),
+                                   FileNotFoundError(2, "No such file or directory")])
+def test_permanent_errors_are_not_retried(runner, error):
+    runner.responses = [error]
+    with pytest.raises(KubectlError):
+        KubectlClient.execute(["kubectl", "get", "pods", "x"])
+    assert len(runner.calls) == 1 and runner.sleeps == []
+
+
+def test_ignore_errors_returns_empty_output(runner):
+    runner.responses = [failure("forbidden")]
+    assert KubectlClient.execute(["kubectl", "get", "pods"], ignore_errors=True) == ""
+    # Con binary=True stderr también llega en bytes
+    runner.responses = [failure(b"forbidden")]
+    assert KubectlClient.execute(["kubectl", "get", "pods"], ignore_errors=True, binary=True) == b""
+
+
+def test_timeout_per_call_and_zero_disables_it(runner):
+    runner.responses = ["ok"]
+    KubectlClient.execute(["kubectl", "version"], timeout=3)
+    KubectlClient.configure(timeout=0)
+    KubectlClient.execute(["kubectl", "version"])
+    assert runner.calls == [3, None]
+
+
+def test_concurrency_is_limited(runner, monkeypatch):
+    KubectlClient.configure(max_concurrency=2)
+    lock = threading.Lock()
+    active, peak = [0], [0]
+
+    def run(argv, **kwargs):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        threading.Event().wait(0.05)
+        with lock:
+            active[0] -= 1
+        return subprocess.CompletedProcess(argv, 0, "ok", "")
+
+    monkeypatch.setattr(subprocess, "run", run)
+    threads = [threading.Thread(target=KubectlClient.execute, args=(["kubectl", "get", "pods"],)) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert peak[0] == 2
+
+
+# /stats/summary de un kubelet (recortado: sin red, volúmenes ni filesystem)
+STATS_SUMMARY = json.loads("""
+{
+  "node": {"nodeName": "node-a", "cpu": {"usageNanoCores": 412345678}, "memory": {"workingSetBytes": 3221225472}},
+  "pods": [
+    {"podRef": {"name": "web-0", "namespace": "shop", "uid": "uid-shop-web-0"},
+     "containers": [
+       {"name": "app", "startTime": "2024-05-01T10:00:00Z",
+        "cpu": {"time": "2024-05-01T12:00:00Z", "usageNanoCores": 138215432, "usageCoreNanoSeconds": 9876543210},
+        "memory": {"time": "2024-05-01T12:00:00Z", "availableBytes": 405000000, "usageBytes": 140000000,
+                   "workingSetBytes": 131072001, "rssBytes": 120000000, "pageFaults": 10, "majorPageFaults": 0}},
+       {"name": "istio-proxy", "startTime": "2024-05-01T10:00:00Z",
+        "cpu": {"usageNanoCores": 1}, "memory": {"workingSetBytes": 52428800, "rssBytes": 50000000}}
+     ]},
+    {"podRef": {"name": "agent-x", "namespace": "kube-system", "uid": "uid-kube-system-agent-x"},
+     "containers": [
+       {"name": "agent", "startTime": "2024-05-01T11:59:58Z", "cpu": {}, "memory": {}}
+     ]}
+  ]
+}
+""")
+
+
+def test_stats_summary_is_parsed_to_exact_values():
+    metrics = KubectlClient.parse_stats_summary(STATS_SUMMARY)
+    assert set(metrics) == {("shop", "web-0"), ("kube-system", "agent-x")}
+    app = metrics[("shop", "web-0")]["app"]
+    assert (app["cpu_nanocores"], app["memory_bytes"]) == (138215432, 131072001)
+    assert (app["memory_rss_bytes"], app["memory_usage_bytes"]) == (120000000, 140000000)
+    # Texto estilo kubectl top: CPU redondeada hacia arriba, memoria hacia abajo
+    assert (app["cpu"], app["memory"], app["namespace"]) == ("139m", "125Mi", "shop")
+    proxy = metrics[("shop", "web-0")]["istio-proxy"]
+    assert (proxy["cpu"], proxy["memory"], proxy["memory_usage_bytes"]) == ("1m", "50Mi", None)
+    # Contenedor recién iniciado, todavía sin estadísticas
+    agent = metrics[("kube-system", "agent-x")]["agent"]
+    assert (agent["cpu"], agent["memory"], agent["cpu_nanocores"], agent["memory_bytes"]) == ("-", "-", None, None)
+
+
+def test_stats_summary_namespace_filter_and_merge():
+    metrics = KubectlClient.parse_stats_summary(STATS_SUMMARY, namespace="shop")
+    assert list(metrics) == [("shop", "web-0")]
+    other = {"pods": [{"podRef": {"name": "db-0", "namespace": "shop"}, "containers": []}]}
+    assert KubectlClient.parse_stats_summary(other, metrics) is metrics
+    assert set(metrics) == {("shop", "web-0"), ("shop", "db-0")}
+
+
+def test_kubelet_metrics_query_each_node(monkeypatch):
+    paths = []
+
+    def execute(cmd, ignore_errors=False, timeout=None, binary=False):
+        paths.append(cmd[-1])
+        # node-b no responde: se omite sin invalidar el resto
+        return json.dumps(STATS_SUMMARY).encode() if "node-a" in cmd[-1] else b""
+
+    monkeypatch.setattr(KubectlClient, "execute", staticmethod(execute))
+    monkeypatch.setattr(KubectlClient, "get_nodes",
+                        staticmethod(lambda: {"items": [{"metadata": {"name": "node-a"}},
+                                                        {"metadata": {"name": "node-b"}}]}))
+    metrics = KubectlClient.get_kubelet_metrics(all_namespaces=True)
+    assert sorted(paths) == ["/api/v1/nodes/node-a/proxy/stats/summary", "/api/v1/nodes/node-b/proxy/stats/summary"]
+    assert metrics[("shop", "web-0")]["app"]["cpu_nanocores"] == 138215432
+    # Con spec.nodeName=X solo se consulta ese kubelet
+    paths.clear()
+    KubectlClient.get_kubelet_metrics("shop", field_selector="spec.nodeName=node-a")
+    assert paths == ["/api/v1/nodes/node-a/proxy/stats/summary"]
+
+
+def query(path):
+    parts = urlsplit(path)
+    return parts.path, {key: values[0] for key, values in parse_qs(parts.query).items()}
+
+
+def test_metrics_path_pushes_only_metadata_terms():
+    path, params = query(KubectlClient.metrics_path(
+        "shop", False, field_selector="spec.nodeName=node-a, metadata.name!=web-0,status.phase=Running"))
+    assert path == f"{METRICS_API}/namespaces/shop/pods"
+    assert params == {"limit": str(METRICS_PAGE_SIZE), "fieldSelector": "metadata.name!=web-0"}
+    # Sin términos metadata.* no se envía fieldSelector
+    _, params = query(KubectlClient.metrics_path(None, True, field_selector="spec.nodeName=node-a"))
+    assert "fieldSelector" not in params
+
+
+def test_metrics_path_encodes_selectors_and_continue():
+    selector = "app in (web,api),tier!=cache,team=a&b"
+    path = KubectlClient.metrics_path("my ns", False, "tok/en=", selector, "metadata.namespace==shop")
+    assert " " not in path and "&b" not in path and "(" not in path
+    path, params = query(path)
+    assert path == f"{METRICS_API}/namespaces/my%20ns/pods"
+    assert params == {"limit": str(METRICS_PAGE_SIZE), "labelSelector": selector,
+                      "fieldSelector": "metadata.namespace==shop", "continue": "tok/en="}
+
+
+def test_pods_receive_the_whole_field_selector(monkeypatch):
+    # La lista de pods se filtra en el API server con todos los términos; las métricas se cruzan con ella
+    commands = []
+    monkeypatch.setattr(KubectlClient, "execute",
+                        staticmethod(lambda cmd, **kwargs: commands.append(cmd) or b'{"items": []}'))
+    KubectlClient.get_pods("shop", False, "app=web", "spec.nodeName=node-a,metadata.name=web-0")
+    assert commands == [["kubectl", "get", "pods", "-n", "shop", "-l", "app=web",
+                         "--field-selector", "spec.nodeName=node-a,metadata.name=web-0", "-o", "json"]]
+
+
+def test_metrics_outside_the_pod_list_are_dropped():
+    # metrics.k8s.io no filtra por spec.nodeName: web-1 (otro nodo) llega en las métricas pero no en los pods
+    metrics = {("shop", "web-0"): {"app": KubectlClient._usage_entry("shop", 10_000_000, 2 ** 20)},
+               ("shop", "web-1"): {"app": KubectlClient._usage_entry("shop", 20_000_000, 2 ** 20)}}
+    args = make_args("--field-selector", "spec.nodeName=node-a")
+    rows = KRCAnalyzer(args).collect({"items": [make_pod("web-0")]}, metrics).rows
+    assert [row[ROW_COLUMNS.index("POD")] for row in rows] == ["web-0"]
+
+
+@pytest.fixture
+def context_lookups(monkeypatch):
+    """kubectl falso con listas vacías; cuenta las consultas del namespace del contexto"""
+    lookups = []
+
+    def execute(cmd, ignore_errors=False, timeout=None, binary=False):
+        if cmd[1:3] == ["config", "view"]:
+            lookups.append(cmd)
+            return "shop"
+        return b'{"items": []}' if binary else '{"items": []}'
+
+    monkeypatch.setattr(KubectlClient, "execute", staticmethod(execute))
+    return lookups
+
+
+@pytest.mark.parametrize("run", [
+    lambda: KRCAnalyzer(make_args()).collect(),
+    lambda: ResourceRecommender(make_args("recommend")).collect(),
+    lambda: OOMReporter(make_args("oom")).collect(),
+    lambda: QuotaAuditor(make_args("quotas")).run(),
+    lambda: AutoscalerAuditor(make_args("autoscalers")).fetch(),
+], ids=["collect", "recommend", "oom", "quotas", "autoscalers"])
+def test_current_namespace_is_resolved_once(context_lookups, run):
+    run()
+    assert len(context_lookups) == 1
+
+
+def test_namespace_is_not_resolved_with_all_namespaces(context_lookups):
+    assert KubectlClient.resolve_namespace("shop", True) is None
+    assert KubectlClient.resolve_namespace("batch") == "batch"
+    KRCAnalyzer(make_args("-A")).collect()
+    assert context_lookups == []
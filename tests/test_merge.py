@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# tests/test_merge.py - Resumen de flota a partir de snapshots (krca merge)
+
+import pytest
+
+from krca.merge import CONTAINERS, DANGER, MEM_DEFICIT, UNDER, FleetMerge, FleetPartial
+from krca.snapshot import SnapshotStore
+
+from .helpers import make_args
+
+
+def record(namespace, pod, severity="ok", memory="64Mi", lim_mem="128Mi", req_mem="64Mi"):
+    return {"namespace": namespace, "workload": f"Deployment/{pod}", "container": "app", "pod": pod,
+            "cpu": "100m", "req_cpu": "100m", "lim_cpu": "1", "memory": memory, "req_mem": req_mem,
+            "lim_mem": lim_mem, "status": "Running", "restarts": 0, "last_state": "-", "severity": severity}
+
+
+@pytest.fixture
+def snapshots(tmp_path):
+    """Cuatro clusters con los mismos namespaces y un peor contenedor distinto en cada uno"""
+    paths = []
+    for number in range(4):
+        records = [record("shop", f"web-{i}") for i in range(10)]
+        records.append(record("shop", f"db-{number}", "danger", memory=f"{200 + number}Mi", req_mem="128Mi"))
+        records.append(record(f"team-{number}", "api", "warning", memory="100Mi"))
+        path = str(tmp_path / f"cluster-{number}.ndjson")
+        SnapshotStore.write(records, path, use_color=False)
+        paths.append(path)
+    return paths
+
+
+def summary(paths, workers, top=3):
+    result = FleetMerge(make_args("merge", *paths, "--workers", str(workers), "--top", str(top))).collect(paths)
+    offenders = [(entry[2][0], entry[2][2]) for entry in sorted(result.offenders, reverse=True)]
+    return result.clusters, result.containers, result.namespaces, offenders
+
+
+def test_process_pool_matches_serial(snapshots):
+    assert summary(snapshots, workers=4) == summary(snapshots, workers=1)
+
+
+def test_totals_and_worst_containers(snapshots):
+    clusters, containers, namespaces, offenders = summary(snapshots, workers=2)
+    assert (clusters, containers) == (4, 48)
+    assert namespaces["shop"][CONTAINERS] == 44
+    assert namespaces["shop"][DANGER] == 4
+    assert namespaces["shop"][UNDER] == 4
+    assert namespaces["shop"][MEM_DEFICIT] == sum((72 + n) * 2 ** 20 for n in range(4))
+    assert namespaces["team-0"][CONTAINERS] == 1
+    # Peores: danger primero y, entre ellos, el de mayor uso sobre el limit
+    assert offenders == [("cluster-3", "db-3"), ("cluster-2", "db-2"), ("cluster-1", "db-1")]
+
+
+def test_combine_keeps_only_top():
+    partial = FleetPartial(2)
+    for number in range(5):
+        other = FleetPartial(2)
+        other.add(f"c{number}", record("shop", f"web-{number}", memory=f"{number + 1}0Mi"))
+        partial.combine(other)
+    assert len(partial.offenders) == 2
+    assert partial.containers == 5
+    assert sorted(entry[2][0] for entry in partial.offenders) == ["c3", "c4"]
+
+
+def test_cluster_names_disambiguate_repeated_files():
+    names = FleetMerge.cluster_names(["eu/prod.ndjson", "us/prod.ndjson", "dev.parquet"])
+    assert names == {"eu/prod.ndjson": "eu/prod", "us/prod.ndjson": "us/prod", "dev.parquet": "dev"}
+
+
+def test_invalid_snapshot_names_the_file(tmp_path):
+    path = tmp_path / "broken.ndjson"
+    path.write_text('{"namespace": "shop"}\n')
+    with pytest.raises(ValueError, match="broken.ndjson: snapshot inválido"):
+        FleetMerge.summarize_file(str(path), "broken", 5)
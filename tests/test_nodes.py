@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# tests/test_nodes.py - Asignación por nodo y reempaquetado estimado (nodes)
+
+import json
+
+import pytest
+
+from krca.decoding import JsonDecoder
+from krca.kubectl import KubectlClient
+from krca.nodes import NodeAuditor, NodeUsage
+
+from .helpers import make_args, make_metrics, make_pod
+
+
+def resources(cpu, memory, lim_cpu=None, lim_mem=None):
+    limits = {key: value for key, value in (("cpu", lim_cpu), ("memory", lim_mem)) if value}
+    return {"requests": {"cpu": cpu, "memory": memory}, "limits": limits}
+
+
+def with_init(pod, *containers, overhead=None):
+    """Agrega init containers (nombre, resources, restartPolicy) y spec.overhead al pod"""
+    pod["spec"]["initContainers"] = [
+        dict({"name": name, "resources": res}, **({"restartPolicy": policy} if policy else {}))
+        for name, res, policy in containers
+    ]
+    if overhead:
+        pod["spec"]["overhead"] = overhead
+    return pod
+
+
+def test_regular_containers_are_summed():
+    pod = make_pod("web-0", containers={"app": resources("200m", "128Mi", "1", "256Mi"),
+                                        "sidecar": resources("50m", "32Mi")})
+    assert NodeAuditor.pod_resources(pod) == (250, 160 * 2 ** 20, 1000, 256 * 2 ** 20)
+
+
+def test_largest_init_container_wins():
+    # El init pide más CPU que la suma de los contenedores; la memoria sigue siendo la de los contenedores
+    pod = with_init(make_pod("web-0", containers={"app": resources("200m", "256Mi")}),
+                    ("migrate", resources("1", "64Mi"), None), ("warmup", resources("500m", "32Mi"), None))
+    req_cpu, req_mem, _, _ = NodeAuditor.pod_resources(pod)
+    assert (req_cpu, req_mem) == (1000, 256 * 2 ** 20)
+
+
+def test_sidecars_run_with_later_inits_and_containers():
+    pod = with_init(make_pod("web-0", containers={"app": resources("200m", "128Mi")}),
+                    ("proxy", resources("100m", "64Mi"), "Always"), ("migrate", resources("250m", "512Mi"), None))
+    req_cpu, req_mem, _, _ = NodeAuditor.pod_resources(pod)
+    # migrate corre con el proxy ya iniciado (350m, 576Mi) y supera a app + proxy (300m, 192Mi)
+    assert req_cpu == 350
+    assert req_mem == 576 * 2 ** 20
+
+
+def test_overhead_is_added():
+    pod = with_init(make_pod("web-0", containers={"app": resources("200m", "128Mi", "500m")}),
+                    overhead={"cpu": "250m", "memory": "120Mi"})
+    # Sin limit de memoria el overhead no crea uno
+    assert NodeAuditor.pod_resources(pod) == (450, 248 * 2 ** 20, 750, 0)
+
+
+@pytest.mark.parametrize("backend", JsonDecoder.available())
+def test_decoders_keep_restart_policy_and_overhead(backend):
+    pod = with_init(make_pod("web-0", containers={"app": resources("200m", "128Mi")}),
+                    ("proxy", resources("100m", "64Mi"), "Always"), overhead={"cpu": "50m"})
+    [decoded] = JsonDecoder.loads_pods(json.dumps({"items": [pod]}).encode(), backend)["items"]
+    assert NodeAuditor.pod_resources(decoded) == NodeAuditor.pod_resources(pod) == (350, 192 * 2 ** 20, 0, 0)
+
+
+@pytest.fixture
+def cluster(monkeypatch):
+    nodes = {"items": [
+        {"metadata": {"name": name}, "status": {"allocatable": {"cpu": "2", "memory": "4Gi"}}}
+        for name in ("node-a", "node-b")
+    ]}
+    pods = {"items": [
+        with_init(make_pod("web-0", containers={"app": resources("500m", "1Gi", "3", "2Gi")}),
+                  ("migrate", resources("1500m", "256Mi"), None)),
+        make_pod("agent-a", namespace="kube-system", containers={"agent": resources("100m", "128Mi")},
+                 owner=("DaemonSet", "agent")),
+        make_pod("db-0", node="node-b", containers={"postgres": resources("250m", "512Mi")}),
+        dict(make_pod("job-0", node="node-b", containers={"etl": resources("2", "1Gi")}),
+             status={"phase": "Succeeded"}),
+    ]}
+    metrics = make_metrics(("shop", "web-0", "app", "300m", "600Mi"), ("shop", "db-0", "postgres", "20m", "100Mi"))
+    monkeypatch.setattr(KubectlClient, "get_nodes", staticmethod(lambda: nodes))
+    monkeypatch.setattr(KubectlClient, "get_pods", staticmethod(lambda *args, **kwargs: pods))
+    monkeypatch.setattr(KubectlClient, "get_metrics", staticmethod(lambda *args, **kwargs: metrics))
+    return NodeAuditor(make_args("nodes")).collect()
+
+
+def test_collect_allocates_effective_requests(cluster):
+    node_a, node_b = cluster["node-a"], cluster["node-b"]
+    assert node_a.pods == 2
+    assert (node_a.req_cpu, node_a.req_mem) == (1600, (1024 + 128) * 2 ** 20)
+    assert (node_a.lim_cpu, node_a.cpu) == (3000, 300)
+    assert (node_a.fixed_cpu, node_a.movable) == (100, [(1500, 1024 * 2 ** 20)])
+    # El pod terminado no ocupa el nodo
+    assert (node_b.pods, node_b.req_cpu) == (1, 250)
+
+
+def test_flags(cluster):
+    auditor = NodeAuditor(make_args("nodes"))
+    assert auditor.flags(cluster["node-a"]) == ["OVERCOMMIT", "FRAGMENTED"]
+    assert auditor.flags(cluster["node-b"]) == []
+
+
+def node(name, alloc_cpu, alloc_mem, movable, fixed=(0.0, 0.0)):
+    usage = NodeUsage(name, alloc_cpu, alloc_mem)
+    usage.movable = list(movable)
+    usage.fixed_cpu, usage.fixed_mem = fixed
+    return usage
+
+
+def test_first_fit_decreasing_frees_nodes():
+    # Tres nodos a medio llenar caben en dos
+    nodes = [node("a", 1000, 1000, [(600, 100)]), node("b", 1000, 1000, [(400, 300)]),
+             node("c", 1000, 1000, [(500, 500), (100, 100)])]
+    assert NodeAuditor.estimate_freeable(nodes) == 1
+
+
+def test_daemonsets_stay_on_their_node():
+    # Los DaemonSets ocupan 500m en cada nodo: los pods movibles ya no caben en uno solo
+    nodes = [node("a", 1000, 1000, [(400, 100)], fixed=(500, 0)),
+             node("b", 1000, 1000, [(400, 100)], fixed=(500, 0))]
+    assert NodeAuditor.estimate_freeable(nodes) == 0
+    nodes = [node("a", 1000, 1000, [(400, 100)]), node("b", 1000, 1000, [(400, 100)])]
+    assert NodeAuditor.estimate_freeable(nodes) == 1
+
+
+def test_pod_that_fits_nowhere_frees_nothing():
+    assert NodeAuditor.estimate_freeable([node("a", 1000, 1000, [(1500, 100)]), node("b", 1000, 1000, [])]) == 0
+    assert NodeAuditor.estimate_freeable([]) == 0
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# tests/test_oom.py - Ranking de riesgo OOM (subcomando oom)
+
+from krca.kubectl import KubectlClient
+from krca.oom import OOMReporter
+
+from .helpers import make_args, make_metrics, make_pod
+
+
+def event(reason, count, field_path=None, uid="uid-shop-web-0", message=""):
+    involved = {"kind": "Pod", "uid": uid, "name": "web-0", "namespace": "shop"}
+    if field_path:
+        involved["fieldPath"] = field_path
+    return {"involvedObject": involved, "reason": reason, "message": message, "count": count}
+
+
+def test_events_are_keyed_by_container_field_path():
+    index = OOMReporter.build_event_index({"items": [
+        event("BackOff", 12, "spec.containers{sidecar}"),
+        event("Killing", 2, "spec.containers{sidecar}", message="Container sidecar OOMKilled"),
+        event("BackOff", 3, "spec.initContainers{migrate}"),
+        event("Started", 1, "spec.containers{app}"),
+    ]})
+    assert set(index) == {("uid-shop-web-0", "sidecar"), ("uid-shop-web-0", "migrate")}
+    sidecar = index[("uid-shop-web-0", "sidecar")]
+    assert (sidecar.oom, sidecar.backoff) == (2, 12)
+    assert OOMReporter.events_for(index, "uid-shop-web-0", "app") is None
+
+
+def test_events_without_field_path_apply_to_every_container():
+    index = OOMReporter.build_event_index({"items": [
+        event("OOMKilling", 1),
+        event("BackOff", 4, "spec.containers{sidecar}"),
+    ]})
+    app = OOMReporter.events_for(index, "uid-shop-web-0", "app")
+    sidecar = OOMReporter.events_for(index, "uid-shop-web-0", "sidecar")
+    assert (app.oom, app.backoff) == (1, 0)
+    assert (sidecar.oom, sidecar.backoff) == (1, 4)
+
+
+def test_sidecar_events_do_not_rank_the_app_container(monkeypatch):
+    limits = {"limits": {"memory": "512Mi"}}
+    pods = {"items": [make_pod("web-0", containers={"app": limits, "sidecar": limits},
+                               statuses={"sidecar": (7, "OOMKilled")})]}
+    metrics = make_metrics(("shop", "web-0", "app", "10m", "128Mi"),
+                           ("shop", "web-0", "sidecar", "10m", "500Mi"))
+    events = {"items": [event("BackOff", 12, "spec.containers{sidecar}"),
+                        event("Killing", 2, "spec.containers{sidecar}", message="OOMKilled")]}
+    monkeypatch.setattr(KubectlClient, "fetch_all", staticmethod(
+        lambda calls: {"pods": pods, "metrics": metrics, "events": events}))
+
+    results = OOMReporter(make_args("oom", "-A")).collect()
+    by_container = {row[2]: row for _, row in results}
+    assert set(by_container) == {"sidecar"}
+    assert by_container["sidecar"][8:10] == ["2", "12"]
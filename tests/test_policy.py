@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# tests/test_policy.py - Umbrales por namespace, workload o etiqueta (--policy)
+
+import pytest
+
+from krca.aggregator import UsageAggregator
+from krca.colorizer import ResourceColorizer
+from krca.core import KRCAnalyzer
+from krca.models import Thresholds
+from krca.policy import PolicyIndex
+
+from .helpers import make_args, make_metrics, make_pod, make_row
+
+DEFAULT = Thresholds(60, 75, 300, 5)
+
+POLICY = """
+rules:
+  - name: critical
+    labels: {tier: critical}
+    thresholds: {warning: 30, danger: 40}
+  - name: batch
+    namespace: batch
+    thresholds: {warning: 85, danger: 95}
+"""
+
+
+@pytest.fixture
+def policy_file(tmp_path):
+    path = tmp_path / "policy.yaml"
+    path.write_text(POLICY)
+    return str(path)
+
+
+def test_first_matching_rule_wins(policy_file):
+    policy = PolicyIndex.load(policy_file, DEFAULT)
+    assert policy.lookup("batch", "Job/etl", {"tier": "critical"}) == (30, 40, 300, 5)
+    assert policy.lookup("batch", "Job/etl") == (85, 95, 300, 5)
+    assert policy.lookup("shop", "Deployment/web") == (60, 75, 300, 5)
+
+
+def test_cache_ignores_labels_no_rule_uses(policy_file):
+    # Las réplicas de un StatefulSet solo difieren en etiquetas por pod: comparten la entrada
+    policy = PolicyIndex.load(policy_file, DEFAULT)
+    for ordinal in range(50):
+        labels = {"app": "db", "statefulset.kubernetes.io/pod-name": f"db-{ordinal}",
+                  "controller-revision-hash": f"db-{ordinal % 3}"}
+        assert policy.lookup("shop", "StatefulSet/db", labels) == (60, 75, 300, 5)
+    assert len(policy._cache) == 1
+    assert policy.lookup("shop", "StatefulSet/db", {"tier": "critical"}) == (30, 40, 300, 5)
+    assert len(policy._cache) == 2
+
+
+def test_pod_thresholds_only_keep_the_last_pass(policy_file):
+    analyzer = KRCAnalyzer(make_args("--policy", policy_file))
+    first = {"items": [make_pod(f"web-{i}") for i in range(3)]}
+    second = {"items": [make_pod("web-9")]}
+    analyzer.collect(first, {})
+    assert len(analyzer._pod_thresholds) == 3
+    analyzer.collect(second, {})
+    assert list(analyzer._pod_thresholds) == [("shop", "web-9")]
+
+
+def test_group_colors_use_the_group_policy():
+    # 50% del limit (bajo el request): rojo con la regla critical (danger 40), no con los globales
+    row = make_row(CPU="500m", REQ_CPU="800m", LIM_CPU="1", MEMORY="64Mi", REQ_MEM="128Mi", LIM_MEM="1Gi")
+    aggregator = UsageAggregator('namespace')
+    aggregator.add(row, (30, 40, 300, 5))
+    [grouped] = aggregator.rows()
+    colored = aggregator.apply_colors(grouped, (60, 75, 300, 5))
+    assert colored[2].startswith(ResourceColorizer.RED)
+
+    aggregator = UsageAggregator('namespace')
+    aggregator.add(row, (30, 40, 300, 5))
+    aggregator.add(make_row(POD="web-1", CPU="500m", REQ_CPU="800m", LIM_CPU="1"), (60, 75, 300, 5))
+    [grouped] = aggregator.rows()
+    colored = aggregator.apply_colors(grouped, (60, 75, 300, 5))
+    # Umbrales mezclados: se usan los globales (50% no llega a warning 60)
+    assert not colored[2].startswith((ResourceColorizer.RED, ResourceColorizer.YELLOW))
+
+
+def test_grouped_analysis_passes_pod_thresholds(policy_file, monkeypatch):
+    analyzer = KRCAnalyzer(make_args("--group-by", "namespace", "--policy", policy_file))
+    added = []
+    monkeypatch.setattr(UsageAggregator, "add", lambda self, row, thresholds=None: added.append(thresholds))
+    monkeypatch.setattr(KRCAnalyzer, "_render", lambda self, rows, headers, colors=None: None)
+    pods = {"items": [make_pod("web-0", labels={"tier": "critical"}), make_pod("etl", namespace="batch")]}
+    analyzer._analyze_grouped(pods, make_metrics())
+    assert added == [(30, 40, 300, 5), (85, 95, 300, 5)]
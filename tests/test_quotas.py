@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# tests/test_quotas.py - Valores por defecto de LimitRange y holgura de ResourceQuota (quotas)
+
+import pytest
+
+from krca.quotas import QuotaAuditor
+
+from .helpers import make_args, make_pod
+
+LIMIT_RANGES = {"items": [
+    {"metadata": {"name": "defaults", "namespace": "shop"}, "spec": {"limits": [
+        {"type": "Container",
+         "default": {"cpu": "500m", "memory": "512Mi"},
+         "defaultRequest": {"cpu": "100m"},
+         "min": {"cpu": "50m"}, "max": {"memory": "1Gi"},
+         "maxLimitRequestRatio": {"cpu": "4"}},
+        {"type": "Pod", "max": {"cpu": "100m"}},
+    ]}},
+    # Un segundo LimitRange: se aplica el min más alto y el max más bajo; los defaults del primero
+    {"metadata": {"name": "strict", "namespace": "shop"}, "spec": {"limits": [
+        {"default": {"cpu": "2"}, "min": {"cpu": "20m"}, "max": {"memory": "768Mi"}},
+    ]}},
+]}
+
+QUOTAS = {"items": [
+    {"metadata": {"name": "compute", "namespace": "shop"},
+     "spec": {"hard": {"requests.cpu": "2", "limits.memory": "4Gi", "pods": "10"}},
+     "status": {"hard": {"requests.cpu": "2", "limits.memory": "4Gi", "pods": "10"},
+                "used": {"requests.cpu": "1800m", "limits.memory": "1Gi", "pods": "3"}}},
+    {"metadata": {"name": "mem", "namespace": "batch"},
+     "spec": {"hard": {"requests.memory": "1Gi"}},
+     "status": {"hard": {"requests.memory": "1Gi"}}},
+]}
+
+
+def container(req_cpu="<none>", lim_cpu="<none>", req_mem="<none>", lim_mem="<none>"):
+    return {"name": "app", "req_cpu": req_cpu, "lim_cpu": lim_cpu, "req_mem": req_mem, "lim_mem": lim_mem}
+
+
+@pytest.fixture
+def auditor():
+    return QuotaAuditor(make_args("quotas"))
+
+
+@pytest.fixture
+def limits(auditor):
+    return auditor.build_limits_index(LIMIT_RANGES)["shop"]
+
+
+def test_limit_ranges_are_combined(limits):
+    assert limits.default == {"cpu": "500m", "memory": "512Mi"}
+    assert limits.default_request == {"cpu": "100m", "memory": "512Mi"}
+    assert limits.min == {"cpu": "50m"}
+    assert limits.max == {"memory": "768Mi"}
+    assert limits.ratio == {"cpu": "4"}
+
+
+def test_defaults_fill_missing_values(auditor, limits):
+    values, sources = auditor.effective_resources(container(), limits)
+    assert values == {"req_cpu": "100m", "lim_cpu": "500m", "req_mem": "512Mi", "lim_mem": "512Mi"}
+    assert set(sources.values()) == {"LimitRange"}
+
+
+def test_limit_only_container_gets_request_equal_to_limit(auditor, limits):
+    values, sources = auditor.effective_resources(container(lim_cpu="1", lim_mem="256Mi"), limits)
+    # El request igualado al limit gana al defaultRequest del LimitRange
+    assert (values["req_cpu"], sources["req_cpu"]) == ("1", "limit")
+    assert (values["req_mem"], sources["req_mem"]) == ("256Mi", "limit")
+    assert sources["lim_cpu"] == sources["lim_mem"] == "spec"
+
+
+def test_without_limit_range_only_the_limit_is_copied(auditor):
+    values, sources = auditor.effective_resources(container(lim_mem="256Mi"), None)
+    assert values == {"req_cpu": "<none>", "lim_cpu": "<none>", "req_mem": "256Mi", "lim_mem": "256Mi"}
+    assert sources == {"lim_mem": "spec", "req_mem": "limit"}
+
+
+def test_min_max_and_ratio_violations(auditor, limits):
+    values = container(req_cpu="10m", lim_cpu="1", req_mem="512Mi", lim_mem="1Gi")
+    assert auditor.check(values, limits, set()) == ["BELOW_MIN:req_cpu", "ABOVE_MAX:lim_mem", "RATIO:cpu"]
+    assert auditor.check(container(req_cpu="100m", lim_cpu="400m"), limits, set()) == []
+
+
+def test_quota_requires_values(auditor):
+    assert auditor.check(container(req_cpu="100m"), None, {"req_cpu", "lim_mem"}) == ["QUOTA_REJECT:lim_mem"]
+
+
+def test_container_rows_list_only_defaulted_or_failing(auditor):
+    pods = {"items": [
+        make_pod("web-0", containers={"app": {}}),
+        make_pod("web-1", containers={"app": {"requests": {"cpu": "100m", "memory": "128Mi"},
+                                              "limits": {"cpu": "200m", "memory": "256Mi"}}}),
+        make_pod("etl-0", namespace="batch", containers={"etl": {"requests": {"cpu": "1"}}}),
+    ]}
+    quota_index = auditor.build_quota_index(QUOTAS)
+    rows, total = auditor.container_rows(pods, auditor.build_limits_index(LIMIT_RANGES), quota_index)
+    assert total == 3
+    # Los valores por defecto también se validan: 500m / 100m supera el ratio 4 del LimitRange
+    assert [(row[1], row[-1]) for row in rows] == [
+        ("web-0", "RATIO:cpu"),
+        ("etl-0", "QUOTA_REJECT:req_mem"),
+    ]
+    assert rows[0][3:7] == ["100m (LimitRange)", "500m (LimitRange)", "512Mi (LimitRange)", "512Mi (LimitRange)"]
+
+
+def test_quota_headroom_per_namespace(auditor):
+    rows = auditor.quota_rows(auditor.build_quota_index(QUOTAS))
+    assert rows == [
+        ["batch", "mem", "requests.memory", "0", "1Gi", "1Gi (100%)"],
+        ["shop", "compute", "requests.cpu", "1800m", "2", "200m (10%)"],
+        ["shop", "compute", "limits.memory", "1Gi", "4Gi", "3Gi (75%)"],
+    ]
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# tests/test_recommender.py - Pruebas del subcomando recommend
+
+import json
+
+import pytest
+
+from krca.cli import parse_args
+from krca.core import analyze_resources
+from krca.kubectl import KubectlClient
+from krca.recommender import ResourceRecommender, UsageSamples
+from krca.sampling import UsageSampler
+from krca.utils import KRCAUtils
+
+from .helpers import make_args, make_metrics, make_pod
+
+
+@pytest.mark.parametrize("pct", [150, 100.5, 0, -5])
+def test_percentile_out_of_range_is_rejected(pct, capsys):
+    args = parse_args(["recommend", "--no-color", "--percentile", str(pct)])
+    assert analyze_resources(args) == 1
+    assert "--percentile fuera de rango" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("pct", [0.1, 50, 95, 100])
+def test_percentile_in_range_is_valid(pct):
+    assert KRCAUtils.validate_percentile(pct)
+
+
+def test_percentile_interpolates_between_samples():
+    values = [10.0, 20.0, 30.0, 40.0, 50.0]
+    assert KRCAUtils.percentile(values, 100) == 50.0
+    assert KRCAUtils.percentile(values, 50) == 30.0
+    assert KRCAUtils.percentile(values, 95) == pytest.approx(48.0)
+    assert KRCAUtils.percentile([], 95) is None
+
+
+def samples_for(spec):
+    samples = UsageSamples(dict({"name": "app"}, **spec))
+    samples.replicas = 2
+    for value in (800, 870, 700):
+        samples.cpu.append(value)
+        samples.memory.append(value * 2 ** 20)
+    return samples
+
+
+def test_equal_values_written_differently_are_not_recommended():
+    # p95 + 15% y máximo + 50% de las muestras: 993m/993Mi y 1305m/1305Mi
+    recommender = ResourceRecommender(make_args("recommend"))
+    key = ("shop", "Deployment", "web", "app")
+    [rec] = recommender.recommend({key: samples_for({"req_cpu": "<none>", "req_mem": "<none>",
+                                                    "lim_cpu": "<none>", "lim_mem": "<none>"})})
+    assert rec.recommended == {"req_cpu": "993m", "req_mem": "993Mi", "lim_cpu": "1305m", "lim_mem": "1305Mi"}
+    spec = {"req_cpu": "993000u", "req_mem": "1016832Ki", "lim_cpu": "1305000000n", "lim_mem": "1336320Ki"}
+    assert recommender.recommend({key: samples_for(spec)}) == []
+    assert ResourceRecommender.unchanged({"req_cpu": "1", "req_mem": "1Gi", "lim_cpu": "2", "lim_mem": "2Gi"},
+                                         {"req_cpu": "1000m", "req_mem": "1024Mi",
+                                          "lim_cpu": "2000m", "lim_mem": "2048Mi"})
+
+
+def test_sample_lists_pods_before_sampling(monkeypatch, capsys):
+    calls = []
+
+    def get_pods(*args):
+        calls.append("pods")
+        return {"items": [make_pod("web-0", containers={"app": {"requests": {"cpu": "10m"}}},
+                                   owner=("ReplicaSet", "web-7d9f8c6b5"))]}
+
+    def snapshots(*args):
+        calls.append("sample")
+        # web-0 se reemplaza durante la ventana: sus muestras siguen contando
+        return iter([make_metrics(("shop", "web-0", "app", "200m", "64Mi"))] * 3)
+
+    monkeypatch.setattr(KubectlClient, "get_pods", staticmethod(get_pods))
+    monkeypatch.setattr(UsageSampler, "snapshots", staticmethod(snapshots))
+    args = make_args("recommend", "--sample", "3", "--every", "1", "--format", "json")
+    assert ResourceRecommender(args).run() == 0
+    assert calls == ["pods", "sample"]
+    [rec] = json.loads(capsys.readouterr().out)["recommendations"]
+    assert rec["recommended"]["req_cpu"] == "230m"
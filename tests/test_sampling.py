@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# tests/test_sampling.py - Resumen de muestras (--sample)
+
+from array import array
+
+import pytest
+
+from krca.sampling import SampleRing, UsageSampler
+
+from .helpers import make_args
+
+
+def sampler(*argv):
+    return UsageSampler(make_args("--sample", "3", *argv))
+
+
+def test_ring_keeps_last_samples():
+    ring = SampleRing(2)
+    for value in (1.0, 2.0, 3.0):
+        ring.add(value, value * 10)
+    assert sorted(ring.values("cpu")) == [2.0, 3.0]
+    assert ring.count == 2
+
+
+def test_fraction_is_strict_like_the_table():
+    # Exactamente en el limit no está "sobre el limit", igual que en la tabla principal
+    values = array('d', [100.0, 100.0, 101.0, 50.0])
+    assert sampler()._fraction(values, 100.0, 100) == "25%"
+    assert sampler()._fraction(values, 100.0, 50) == "75%"
+    assert sampler()._fraction(values, None, 100) == "-"
+
+
+@pytest.mark.parametrize("argv, flag", [
+    (("--policy", "policy.yaml"), "--policy"),
+    (("--group-by", "namespace"), "--group-by"),
+    (("-o", "wide"), "-o"),
+    (("--sort-by", "severity"), "--sort-by"),
+    (("--filter", "severity>=warning"), "--filter"),
+    (("--top", "5"), "--top"),
+])
+def test_rejects_table_options(argv, flag):
+    with pytest.raises(ValueError, match=f"{flag} no se puede usar con --sample"):
+        UsageSampler.check_options(make_args("--sample", "3", *argv))
+
+
+def test_rejects_snapshot_output():
+    with pytest.raises(ValueError, match="snapshots"):
+        UsageSampler.check_options(make_args("--sample", "3", "--output-file", "out.ndjson"))
+    UsageSampler.check_options(make_args("--sample", "3", "--output-file", "out.txt"))
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# tests/test_selection.py - Severidad, ratios y selección de filas (--sort-by/--filter/--top)
+
+import pytest
+
+from krca.colorizer import ResourceColorizer
+from krca.core import ROW_COLUMNS
+from krca.selection import RowSelector
+
+from .helpers import make_row
+
+
+def selector(**options):
+    return RowSelector(ROW_COLUMNS, **options)
+
+
+def test_exact_cpu_over_limit_is_danger():
+    # 250000001 nanocores se muestran como "251m" pero el límite es 250m
+    row = make_row(CPU="251m", CPU_NANOCORES=250_000_001, REQ_CPU="100m", LIM_CPU="250m")
+    assert selector().number(row, 'CPU') == pytest.approx(250.000001)
+    assert selector().severity(row) == ResourceColorizer.SEVERITY_DANGER
+
+
+def test_exact_memory_over_limit_hidden_by_rounding():
+    # Un byte sobre el límite: la tabla redondea a "512Mi", igual que el límite
+    limit = 512 * 2 ** 20
+    row = make_row(MEMORY="512Mi", MEMORY_BYTES=limit + 1, REQ_MEM="128Mi", LIM_MEM="512Mi")
+    assert selector().severity(row) == ResourceColorizer.SEVERITY_DANGER
+    assert selector().usage_colors(row)[3] == ResourceColorizer.RED
+    assert selector().value(row, 'mem-ratio') > 1
+
+
+def test_exact_usage_at_limit_is_not_over():
+    limit = 512 * 2 ** 20
+    row = make_row(MEMORY="512Mi", MEMORY_BYTES=limit, REQ_MEM="128Mi", LIM_MEM="512Mi")
+    assert selector().value(row, 'mem-ratio') == 1
+    assert selector().usage_colors(row)[3] != ResourceColorizer.RED
+
+
+def test_text_is_used_without_exact_values():
+    row = make_row(CPU="300m", REQ_CPU="100m", LIM_CPU="1")
+    assert selector().number(row, 'CPU') == 300
+    assert selector().value(row, 'cpu-ratio') == pytest.approx(0.3)
+
+
+def test_filter_and_top_use_exact_values():
+    rows = [
+        make_row(POD="a", MEMORY="512Mi", MEMORY_BYTES=512 * 2 ** 20 + 1, REQ_MEM="128Mi", LIM_MEM="512Mi"),
+        make_row(POD="b", MEMORY="512Mi", MEMORY_BYTES=512 * 2 ** 20 - 1, REQ_MEM="128Mi", LIM_MEM="512Mi"),
+    ]
+    chosen = selector(filters=["mem-ratio>1"]).select(rows)
+    assert [row[ROW_COLUMNS.index('POD')] for row in chosen] == ["a"]
+    top = selector(sort_by="severity", top=1).select(reversed(rows))
+    assert top[0][ROW_COLUMNS.index('POD')] == "a"
+
+
+def test_top_must_be_positive():
+    with pytest.raises(ValueError):
+        selector(top=0)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# tests/test_server.py - Caché de pods del subcomando serve (PodInformer)
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+from krca import server
+from krca.kubectl import KubectlClient
+from krca.server import PodInformer
+
+
+def pod(name, uid, **labels):
+    return {"metadata": {"name": name, "namespace": "shop", "uid": uid, "labels": labels,
+                         "resourceVersion": "10"}}
+
+
+@pytest.fixture
+def informer():
+    return PodInformer(all_namespaces=True)
+
+
+def test_list_replaces_the_cache_only_when_complete(informer, monkeypatch):
+    informer.pods = {"old": pod("old", "old")}
+    pages = [
+        {"metadata": {"continue": "p2"}, "items": [pod("a", "uid-a")]},
+        {"metadata": {"resourceVersion": "42"}, "items": [pod("b", "uid-b")]},
+    ]
+    seen = []
+
+    def execute(cmd, binary=False):
+        # Mientras se pagina, la caché anterior sigue completa y sin marcar sincronizada
+        seen.append((set(informer.pods), informer.synced.is_set(), cmd[-1]))
+        return json.dumps(pages[len(seen) - 1]).encode()
+
+    monkeypatch.setattr(KubectlClient, "execute", staticmethod(execute))
+    assert informer._list() == "42"
+    assert seen[0][:2] == ({"old"}, False) and seen[1][:2] == ({"old"}, False)
+    assert "continue=p2" in seen[1][2] and "limit=" in seen[0][2]
+    assert set(informer.pods) == {"uid-a", "uid-b"}
+    assert informer.synced.is_set()
+
+
+def fake_watch(monkeypatch, *chunks):
+    """Reemplaza kubectl por un proceso que escribe los bloques de bytes con pausas"""
+    script = ("import sys, time\n"
+              f"for chunk in {list(chunks)!r}:\n"
+              "    sys.stdout.buffer.write(chunk); sys.stdout.flush(); time.sleep(0.1)\n")
+    popen = subprocess.Popen
+    commands = []
+
+    def spawn(cmd, **kwargs):
+        commands.append(cmd)
+        return popen([sys.executable, "-c", script], **kwargs)
+
+    monkeypatch.setattr(server.subprocess, "Popen", spawn)
+    return commands
+
+
+def test_watch_decodes_multibyte_characters_split_across_chunks(informer, monkeypatch):
+    event = json.dumps({"type": "ADDED", "object": pod("web", "uid-w", team="diseño")},
+                       ensure_ascii=False).encode()
+    cut = event.index("ñ".encode()) + 1  # parte el carácter de dos bytes
+    commands = fake_watch(monkeypatch, event[:cut], event[cut:])
+
+    assert informer._watch("7") == "10"
+    assert informer.pods["uid-w"]["metadata"]["labels"]["team"] == "diseño"
+    assert "watch=1" in commands[0][-1] and "resourceVersion=7" in commands[0][-1]
+
+
+def test_watch_applies_changes_and_stops_on_error_event(informer, monkeypatch):
+    informer.pods = {"uid-a": pod("a", "uid-a"), "uid-b": pod("b", "uid-b")}
+    deleted = dict(pod("a", "uid-a"), metadata=dict(pod("a", "uid-a")["metadata"], resourceVersion="11"))
+    fake_watch(monkeypatch,
+               json.dumps({"type": "DELETED", "object": deleted}).encode(),
+               json.dumps({"type": "ERROR", "object": {"kind": "Status", "code": 410}}).encode())
+    assert informer._watch("10") is None
+    assert set(informer.pods) == {"uid-b"}
+
+
+def test_namespace_is_resolved_once(monkeypatch):
+    lookups = []
+    monkeypatch.setattr(KubectlClient, "get_current_namespace", staticmethod(lambda: lookups.append(1) or "shop"))
+    informer = PodInformer(selector="app=web")
+    paths = [informer._path(limit=500), informer._path(limit=500, **{"continue": "p2"}), informer._path(watch=1)]
+    assert lookups == [1]
+    assert all(path.startswith("/api/v1/namespaces/shop/pods?") for path in paths)
+    assert PodInformer("batch")._path() == "/api/v1/namespaces/batch/pods?"
+    assert lookups == [1]
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# tests/test_snapshot.py - Snapshots de auditoría y diff (krca diff)
+
+import json
+
+import pytest
+
+from krca.snapshot import MIXED, AuditDiff, SnapshotStore, UnsortedSnapshot
+
+from .helpers import make_args
+
+
+def record(namespace="shop", workload="Deployment/web", container="app", pod="web-0",
+           severity="ok", req_cpu="100m", **fields):
+    values = {"namespace": namespace, "workload": workload, "container": container, "pod": pod,
+              "cpu": "10m", "req_cpu": req_cpu, "lim_cpu": "1", "memory": "64Mi",
+              "req_mem": "128Mi", "lim_mem": "<none>", "status": "Running", "restarts": 0,
+              "last_state": "-", "severity": severity}
+    values.update(fields)
+    return values
+
+
+def write(path, records, shuffle=False):
+    """Snapshot NDJSON tal cual (sin ordenar si shuffle) o con SnapshotStore.write"""
+    if shuffle:
+        with open(path, "w", encoding="utf-8") as f:
+            for item in records:
+                f.write(json.dumps(item) + "\n")
+    else:
+        assert SnapshotStore.write(records, str(path), use_color=False)
+    return str(path)
+
+
+OLD = [
+    record(pod="web-0"), record(pod="web-1"),
+    record(container="sidecar"),
+    record(workload="StatefulSet/db", container="postgres", pod="db-0"),
+    record(namespace="batch", workload="Job/etl", container="etl", pod="etl-1"),
+]
+NEW = [
+    record(pod="web-0", severity="danger"), record(pod="web-1"), record(pod="web-2"),
+    record(container="sidecar"),
+    record(workload="StatefulSet/db", container="postgres", pod="db-0", req_cpu="500m"),
+    record(namespace="kube-system", workload="DaemonSet/agent", container="agent", pod="agent-x"),
+]
+
+
+def compare(tmp_path, shuffle=False):
+    # shuffle: registros en orden inverso, escritos sin ordenar
+    prefix = "unsorted-" if shuffle else ""
+    old = write(tmp_path / f"{prefix}old.ndjson", OLD[::-1] if shuffle else OLD, shuffle)
+    new = write(tmp_path / f"{prefix}new.ndjson", NEW[::-1] if shuffle else NEW, shuffle)
+    return AuditDiff(make_args("diff")).compare(old, new)
+
+
+def test_written_snapshots_are_sorted_by_key(tmp_path):
+    path = write(tmp_path / "snap.ndjson", list(reversed(OLD)))
+    keys = [SnapshotStore.key(item) for item in SnapshotStore.read(path)]
+    assert keys == sorted(keys)
+
+
+@pytest.mark.parametrize("extension", [".ndjson", ".jsonl", ".json"])
+def test_roundtrip(tmp_path, extension):
+    path = write(tmp_path / f"snap{extension}", OLD)
+    assert sorted(map(SnapshotStore.key, SnapshotStore.read(path))) == sorted(map(SnapshotStore.key, OLD))
+
+
+def test_merge_join_finds_every_change(tmp_path):
+    rows, counts = compare(tmp_path)
+    assert counts == {"ADDED": 1, "REMOVED": 1, "CHANGED": 2}
+    changes = {(row[0], row[2]): row for row in rows}
+    assert changes[("shop", "app")][3:6] == ["CHANGED", "ok -> danger", "2 -> 3"]
+    assert changes[("shop", "postgres")][6] == "100m -> 500m"
+    assert changes[("batch", "etl")][3] == "REMOVED"
+    assert changes[("kube-system", "agent")][3] == "ADDED"
+    # Sin cambios (sidecar) no hay fila
+    assert ("shop", "sidecar") not in changes
+
+
+def test_unsorted_snapshots_fall_back_to_hash_join(tmp_path, monkeypatch):
+    joins = []
+    hash_join = AuditDiff.hash_join
+    monkeypatch.setattr(AuditDiff, "hash_join", staticmethod(lambda *args: joins.append(1) or hash_join(*args)))
+    assert compare(tmp_path, shuffle=True) == compare(tmp_path)
+    assert joins == [1]
+
+
+def test_groups_reject_unsorted_input():
+    with pytest.raises(UnsortedSnapshot):
+        list(AuditDiff.groups([record(container="b"), record(container="a")]))
+
+
+def test_merge_pairs_both_sides_in_key_order():
+    old = AuditDiff.groups(record(container=name) for name in "ace")
+    new = AuditDiff.groups(record(container=name) for name in "bcd")
+    pairs = [(a.key[2] if a else None, b.key[2] if b else None) for a, b in AuditDiff.merge(old, new)]
+    assert pairs == [("a", None), (None, "b"), ("c", "c"), (None, "d"), ("e", None)]
+
+
+def test_group_marks_mixed_specs():
+    [group] = AuditDiff.groups([record(pod="web-0"), record(pod="web-1", req_cpu="200m", severity="warning")])
+    assert group.replicas == 2
+    assert group.spec["req_cpu"] == MIXED
+    assert group.spec["lim_cpu"] == "1"
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# tests/test_specs.py - Recursos de contenedores compartidos entre réplicas (SpecCache)
+
+import pytest
+
+from krca.kubectl import KubectlClient
+
+from .helpers import make_pod
+
+RESOURCES = {"requests": {"cpu": "100m", "memory": "128Mi"}, "limits": {"cpu": "1"}}
+
+
+def replica(name, resources=RESOURCES):
+    pod = make_pod(name, containers={"app": resources}, owner=("ReplicaSet", "web-7d9f8c6b5"))
+    pod["metadata"]["labels"]["pod-template-hash"] = "7d9f8c6b5"
+    return pod
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    KubectlClient.specs.clear()
+    yield
+    KubectlClient.specs.clear()
+
+
+def test_replicas_share_records():
+    first = KubectlClient.container_records(replica("web-0"))
+    second = KubectlClient.container_records(replica("web-1"))
+    assert first is second
+    assert dict(first[0]) == {"name": "app", "type": "container", "req_cpu": "100m",
+                              "req_mem": "128Mi", "lim_cpu": "1", "lim_mem": "<none>"}
+    with pytest.raises(TypeError):
+        first[0]["req_cpu"] = "1"
+
+
+def test_modified_replica_does_not_take_the_template():
+    KubectlClient.container_records(replica("web-0"))
+    resized = KubectlClient.container_records(replica("web-1", {"requests": {"cpu": "250m"}}))
+    assert resized[0]["req_cpu"] == "250m"
+
+
+def test_public_api_returns_mutable_copies():
+    containers = KubectlClient.get_container_resources(replica("web-0"))
+    containers[0]["req_cpu"] = "999m"
+    assert KubectlClient.get_container_resources(replica("web-1"))[0]["req_cpu"] == "100m"
+    assert KubectlClient.container_records(replica("web-2"))[0]["req_cpu"] == "100m"
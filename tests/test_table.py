@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# tests/test_table.py - Tablas plain de TableRenderer (la salida que generaba tabulate)
+
+import pytest
+
+from krca.colorizer import ResourceColorizer
+from krca.exporter import Exporter
+from krca.table import ANSI_CODES, TYPE_FLOAT, TYPE_INT, TYPE_STR, TableRenderer
+
+BOLD, RED, RESET = ResourceColorizer.BOLD, ResourceColorizer.RED, ResourceColorizer.RESET
+
+# Salidas de referencia generadas con tabulate(data, headers, showindex=..., tablefmt="plain")
+CONTAINERS = (
+    [["shop", "web-0", "app", "250m", "100m", "500m", "128Mi", "<none>", 0],
+     ["kube-system", "agent-x1", "agent", "1200m", "<none>", "<none>", "34Mi", "64Mi", 12]],
+    ["NAMESPACE", "POD", "CONTAINER", "CPU", "REQ_CPU", "LIM_CPU", "MEMORY", "LIM_MEM", "RESTARTS"],
+)
+CONTAINERS_PLAIN = "\n".join([
+    "NAMESPACE    POD       CONTAINER    CPU    REQ_CPU    LIM_CPU    MEMORY    LIM_MEM      RESTARTS",
+    "shop         web-0     app          250m   100m       500m       128Mi     <none>              0",
+    "kube-system  agent-x1  agent        1200m  <none>     <none>     34Mi      64Mi               12",
+])
+CONTAINERS_NUMBERED = "\n".join([
+    "    NAMESPACE    POD       CONTAINER    CPU    REQ_CPU    LIM_CPU    MEMORY    LIM_MEM      RESTARTS",
+    " 0  shop         web-0     app          250m   100m       500m       128Mi     <none>              0",
+    " 1  kube-system  agent-x1  agent        1200m  <none>     <none>     34Mi      64Mi               12",
+])
+
+# Columnas numéricas en texto (alineadas por el punto decimal), con miles, vacías y de texto
+MIXED = (
+    [["a", "2.53", "0.3", "0", "1,000", "-"],
+     ["bb", "10", "12.125", "7", "25", "3"],
+     ["ccc", "-1.5", "1e3", "", "2,500.5", "x"]],
+    ["NAME", "COST", "RATIO", "COUNT", "BIG", "TEXT"],
+)
+MIXED_PLAIN = "\n".join([
+    "NAME      COST     RATIO    COUNT     BIG  TEXT",
+    "a         2.53     0.3          0  1000    -",
+    "bb       10       12.125        7    25    3",
+    "ccc      -1.5   1000               2500.5  x",
+])
+MIXED_NUMBERED = "\n".join([
+    "    NAME      COST     RATIO    COUNT     BIG  TEXT",
+    " 0  a         2.53     0.3          0  1000    -",
+    " 1  bb       10       12.125        7    25    3",
+    " 2  ccc      -1.5   1000               2500.5  x",
+])
+
+# Valores que no son str: None, int, float y bool
+TYPED = (
+    [["a", None, 1.5, True], ["b", 3, None, False]],
+    ["K", "INT", "FLOAT", "FLAG"],
+)
+TYPED_PLAIN = "\n".join([
+    "K      INT    FLOAT  FLAG",
+    "a               1.5  True",
+    "b        3           False",
+])
+TYPED_NUMBERED = "\n".join([
+    "    K      INT    FLOAT  FLAG",
+    " 0  a               1.5  True",
+    " 1  b        3           False",
+])
+
+GOLDEN = [
+    (CONTAINERS, False, CONTAINERS_PLAIN),
+    (CONTAINERS, True, CONTAINERS_NUMBERED),
+    (MIXED, False, MIXED_PLAIN),
+    (MIXED, True, MIXED_NUMBERED),
+    (TYPED, False, TYPED_PLAIN),
+    (TYPED, True, TYPED_NUMBERED),
+]
+
+
+@pytest.mark.parametrize("table, show_index, expected", GOLDEN)
+def test_plain_output_matches_tabulate(table, show_index, expected):
+    data, headers = table
+    assert Exporter.render_table(data, headers, False, show_index) == expected
+
+
+@pytest.mark.parametrize("table, show_index, expected", GOLDEN)
+def test_colors_do_not_change_the_layout(table, show_index, expected):
+    data, headers = table
+    colors = [[RED] * len(row) for row in data]
+    colored = Exporter.render_table(data, headers, True, show_index, colors)
+    assert ANSI_CODES.sub("", colored) == expected
+    # Celdas ya coloreadas (otros subcomandos): la misma tabla
+    precolored = [[f"{RED}{'' if value is None else value}{RESET}" for value in row] for row in data]
+    assert ANSI_CODES.sub("", Exporter.render_table(precolored, headers, True, show_index)) == expected
+
+
+def test_colored_cells_and_bold_headers():
+    table = Exporter.render_table([["shop", "250m", 3]], ["NAMESPACE", "CPU", "RESTARTS"], True,
+                                  colors=[[None, RED, None]])
+    assert table == "\n".join([
+        f"{BOLD}NAMESPACE{RESET}    {BOLD}CPU{RESET}      {BOLD}RESTARTS{RESET}",
+        f"shop         {RED}250m{RESET}            3",
+    ])
+
+
+def test_colors_are_ignored_without_color():
+    data, headers = CONTAINERS
+    colors = [[RED] * len(row) for row in data]
+    assert Exporter.render_table(data, headers, False, False, colors) == CONTAINERS_PLAIN
+
+
+def test_empty_table_has_only_headers():
+    assert Exporter.render_table([], ["NAMESPACE", "COUNT"], False) == "NAMESPACE    COUNT"
+
+
+@pytest.mark.parametrize("values, expected", [
+    (["1", "2", "x"], TYPE_STR),
+    (["1", "", None], TYPE_INT),
+    (["1", "2.5"], TYPE_FLOAT),
+    (["1,000", "25"], TYPE_INT),
+    ([f"{RED}12{RESET}", "3"], TYPE_INT),
+])
+def test_column_type(values, expected):
+    assert TableRenderer.column_type(values) == expected
+
+
+def test_float_format_per_column():
+    # Montos con dos decimales fijos; las demás columnas decimales siguen con "g"
+    table = Exporter.render_table([["a", "0.5", "2.53"], ["b", "1", "0.3"], ["c", "2", "0"]],
+                                  ["NAME", "CPU", "COST"], False, float_format=["g", "g", ".2f"])
+    assert table == "\n".join([
+        "NAME      CPU    COST",
+        "a         0.5    2.53",
+        "b         1      0.30",
+        "c         2      0.00",
+    ])
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# tests/test_tui.py - Orden, filtro y navegación de la interfaz interactiva (sin curses)
+
+from krca.core import ROW_COLUMNS
+from krca.selection import RowSelector
+from krca.tui import AuditBrowser, TableView
+
+from .helpers import make_row
+
+ROWS = [
+    ("web-0", "Running", "250m"),
+    ("api-0", "Running", "-"),
+    ("Web-1", "CrashLoopBackOff", "100m"),
+    ("db-0", "Running", "900m"),
+]
+
+
+def make_view():
+    return TableView(
+        ["POD", "STATUS", "CPU"], list(ROWS),
+        numeric={2: [250.0, None, 100.0, 900.0]},
+        severities=[0] * len(ROWS),
+        search=(0, 1),
+    )
+
+
+def visible(view):
+    return [view.rows[i][0] for i in view.window(0, len(view))]
+
+
+def test_order_is_computed_once_per_column():
+    view = make_view()
+    # Numéricas de mayor a menor con los valores no definidos al final; texto sin distinguir mayúsculas
+    assert view.order(2) == [3, 0, 2, 1]
+    assert view.order(0) == [1, 3, 0, 2]
+    assert view.order(2) is view.order(2)
+
+
+def test_filter_reuses_the_result_of_each_prefix():
+    view = make_view()
+    calls = []
+    matches = view._matches
+    view._matches = lambda query, indices: calls.append((query, len(indices))) or matches(query, indices)
+
+    for query in ("w", "we", "web"):
+        view.filter(query)
+    assert visible(view) == ["web-0", "Web-1"]
+    # Cada carácter filtra solo el resultado anterior
+    assert calls == [("w", 4), ("we", 2), ("web", 2)]
+
+    # Borrar vuelve al resultado guardado sin volver a filtrar
+    view.filter("we")
+    assert visible(view) == ["web-0", "Web-1"] and len(calls) == 3
+    view.filter("")
+    assert len(view) == 4 and len(calls) == 3
+
+    # Una consulta que no extiende la anterior parte de la tabla completa
+    view.filter("web crash")
+    view.filter("db")
+    assert visible(view) == ["db-0"]
+    assert calls[-2:] == [("web crash", 4), ("db", 4)]
+
+
+def test_sort_keeps_the_active_filter():
+    view = make_view()
+    view.filter("running")
+    view.sort(2)
+    assert visible(view) == ["db-0", "web-0", "api-0"]
+    view.toggle_reverse()
+    assert visible(view) == ["api-0", "web-0", "db-0"]
+
+    # Al ordenar se deja de invertir, y el filtro sigue valiendo para la consulta extendida y al borrarla
+    view.sort(0)
+    view.filter("running w")
+    assert visible(view) == ["web-0"]
+    view.filter("")
+    assert visible(view) == ["api-0", "db-0", "web-0", "Web-1"]
+
+
+def test_window_reads_the_visible_slice():
+    view = make_view()
+    view.sort(2)
+    assert view.window(1, 2) == [0, 2]
+    view.toggle_reverse()
+    assert view.window(0, 10) == [1, 2, 0, 3]
+
+
+def make_browser():
+    rows = [
+        make_row(NAMESPACE="shop", WORKLOAD="Deployment/web", POD="web-0"),
+        make_row(NAMESPACE="shop", WORKLOAD="Deployment/web", POD="web-1"),
+        make_row(NAMESPACE="shop", WORKLOAD="StatefulSet/db", POD="db-0"),
+        make_row(NAMESPACE="auth", WORKLOAD="Deployment/login", POD="login-0"),
+    ]
+    return AuditBrowser(rows, RowSelector(ROW_COLUMNS))
+
+
+def test_child_drills_down_to_containers():
+    browser = make_browser()
+    namespaces = browser.view(())
+    assert [row[0] for row in namespaces.rows] == ["auth", "shop"]
+    path = browser.child((), 1)
+    assert path == ("shop",)
+
+    workloads = browser.view(path)
+    assert [row[0] for row in workloads.rows] == ["Deployment/web", "StatefulSet/db"]
+    path = browser.child(path, 0)
+    assert path == ("shop", "Deployment/web")
+
+    containers = browser.view(path)
+    assert [row[2] for row in containers.rows] == ["web-0", "web-1"]
+    assert browser.child(path, 0) is None
+    assert browser.child(AuditBrowser.ALL, 0) is None
+    assert len(browser.view(AuditBrowser.ALL)) == 4
+
+
+def test_views_keep_their_sort_and_filter():
+    browser = make_browser()
+    view = browser.view(())
+    view.sort(0)
+    view.toggle_reverse()
+    view.filter("sh")
+    browser.child((), view.index(0))
+    assert browser.view(()) is view
+    assert (view.sort_column, view.reverse, view.query) == (0, True, "sh")